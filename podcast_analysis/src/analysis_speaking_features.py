@@ -5,23 +5,37 @@ This module provides functions to analyze conversation dynamics including:
 - Basic speaker statistics
 - Speaking rate time series
 - Interruption detection
+- Word-level overlap detection
 - Turn-taking patterns
 
 Constants for interruption analysis:
 """
 
+import heapq
 import json
 import os
+import time
 from typing import Dict, List, Optional, Tuple
-import matplotlib.pyplot as plt
+import numpy as np
 from pathlib import Path
 
+from word_table import TranscriptTable
+
 # Constants for interruption analysis
 MIN_OVERLAP_SEC = 0.2
 MAX_GAP_SEC = 0.15
 MIN_WORDS_INTERRUPTER = 3
 MAX_BACKCHANNEL_DURATION_SEC = 0.6
 
+# Constant for turn-taking analysis
+MERGE_GAP_SEC = 0.5
+
+
+def _speakers_by_first_segment(table: TranscriptTable) -> List[int]:
+    """Speaker codes in order of their first segment (the order the JSON outputs list speakers)."""
+    codes, first = np.unique(table.segments['speaker'], return_index=True)
+    return codes[np.argsort(first)].tolist()
+
 
 def basic_speaker_stats(
     transcript_path: str = "outputs/audio_features/transcript_with_speakers.json",
@@ -38,31 +52,24 @@ def basic_speaker_stats(
     Returns:
         Dictionary containing speaker statistics
     """
-    # Load transcript data
-    with open(transcript_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    # Load transcript tables
+    table = TranscriptTable.load(transcript_path)
+    segments = table.segments
+    codes = segments['speaker']
+    num_codes = len(table.speakers)
     
-    # Initialize speaker statistics
-    speaker_stats = {}
+    # Aggregate per speaker (bincount adds in segment order, like a running sum)
+    speaking_time = np.bincount(codes, weights=segments['end'] - segments['start'], minlength=num_codes)
+    total_words = np.bincount(codes, weights=table.word_counts, minlength=num_codes)
+    num_segments = np.bincount(codes, minlength=num_codes)
     
-    # Process each segment
-    for segment in data['segments']:
-        speaker = segment['speaker']
-        duration = segment['end'] - segment['start']
-        num_words = len(segment.get('words', []))
-        
-        # Initialize speaker data if not exists
-        if speaker not in speaker_stats:
-            speaker_stats[speaker] = {
-                'total_speaking_time_sec': 0.0,
-                'total_words': 0,
-                'num_segments': 0
-            }
-        
-        # Aggregate data
-        speaker_stats[speaker]['total_speaking_time_sec'] += duration
-        speaker_stats[speaker]['total_words'] += num_words
-        speaker_stats[speaker]['num_segments'] += 1
+    speaker_stats = {}
+    for code in _speakers_by_first_segment(table):
+        speaker_stats[table.speakers[code]] = {
+            'total_speaking_time_sec': float(speaking_time[code]),
+            'total_words': int(total_words[code]),
+            'num_segments': int(num_segments[code])
+        }
     
     # Calculate derived statistics
     for speaker, stats in speaker_stats.items():
@@ -74,7 +81,7 @@ def basic_speaker_stats(
     
     # Create output structure
     result = {
-        'audio_file': data['audio_file'],
+        'audio_file': table.metadata['audio_file'],
         'speakers': speaker_stats
     }
     
@@ -133,14 +140,12 @@ def speaking_rate_timeseries(
     Returns:
         Dictionary containing time-series data
     """
-    # Load transcript data
-    with open(transcript_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    # Load transcript tables
+    table = TranscriptTable.load(transcript_path)
     
     # Determine conversation bounds
-    all_segments = data['segments']
-    conversation_start = min(segment['start'] for segment in all_segments)
-    conversation_end = max(segment['end'] for segment in all_segments)
+    conversation_start = float(table.segments['start'].min())
+    conversation_end = float(table.segments['end'].max())
     
     print(f"\nConversation duration: {conversation_start:.1f}s to {conversation_end:.1f}s "
           f"({(conversation_end - conversation_start)/60:.1f} minutes)")
@@ -149,9 +154,14 @@ def speaking_rate_timeseries(
     if step_size_sec is None:
         step_size_sec = window_size_sec
     
-    # Get all unique speakers
-    speakers = list(set(segment['speaker'] for segment in all_segments))
-    speakers.sort()  # For consistent ordering
+    # All speakers, sorted for consistent ordering
+    speakers = table.speakers
+    
+    # Word start times per speaker, sorted so window counts are two binary searches
+    word_starts = {
+        speaker: np.sort(table.words['start'][table.word_speakers == code])
+        for code, speaker in enumerate(speakers)
+    }
     
     print(f"Speakers: {speakers}")
     print(f"Window size: {window_size_sec}s, Step size: {step_size_sec}s")
@@ -167,16 +177,10 @@ def speaking_rate_timeseries(
         
         # Count words for each speaker in this window
         for speaker in speakers:
-            word_count = 0
-            
-            # Check all segments for words in this window
-            for segment in all_segments:
-                if segment['speaker'] == speaker:
-                    # Count words whose start time falls within the window
-                    for word in segment.get('words', []):
-                        word_start = word['start']
-                        if window_start <= word_start < window_end:
-                            word_count += 1
+            # Count words whose start time falls within [window_start, window_end)
+            starts = word_starts[speaker]
+            word_count = int(np.searchsorted(starts, window_end, side='left')
+                             - np.searchsorted(starts, window_start, side='left'))
             
             # Calculate words per minute
             window_duration_min = (window_end - window_start) / 60.0
@@ -196,7 +200,7 @@ def speaking_rate_timeseries(
     
     # Create output structure
     result = {
-        "audio_file": data['audio_file'],
+        "audio_file": table.metadata['audio_file'],
         "window_size_sec": window_size_sec,
         "step_size_sec": step_size_sec,
         "timeseries": timeseries_data
@@ -234,6 +238,7 @@ def speaking_rate_timeseries(
 
 def _create_timeseries_plot(timeseries_data: List[Dict], speakers: List[str], output_plot_path: str):
     """Create and save a matplotlib plot of the speaking rate time series."""
+    import matplotlib.pyplot as plt  # only this optional plot needs matplotlib
     
     # Organize data by speaker
     speaker_data = {speaker: {'times': [], 'wpm': []} for speaker in speakers}
@@ -270,6 +275,186 @@ def _create_timeseries_plot(timeseries_data: List[Dict], speakers: List[str], ou
     print(f"  Saved time-series plot to: {output_plot_path}")
 
 
+class InterruptionSweep:
+    """
+    Incremental sweep-line interruption engine.
+    
+    Segments are added one at a time in start-time order while a heap keeps
+    the "active" set: every earlier segment that still ends no more than
+    max_gap_sec before the current start. The new segment is compared with
+    the best candidate (largest overlap, then most recent) of every other
+    active speaker, so overlaps among any number of concurrent speakers are
+    found, not only between adjacent segments. Per-speaker
+    made/received/backchannel counters are updated on every add; each add
+    costs O(number of concurrently active segments), and retired segments are
+    dropped, so memory stays bounded on an endless stream.
+    """
+    
+    def __init__(
+        self,
+        min_overlap_sec: float = MIN_OVERLAP_SEC,
+        max_gap_sec: float = MAX_GAP_SEC,
+        min_words_interrupter: int = MIN_WORDS_INTERRUPTER,
+        max_backchannel_duration_sec: float = MAX_BACKCHANNEL_DURATION_SEC
+    ):
+        """
+        Args:
+            min_overlap_sec: Minimum overlap duration to consider interruption
+            max_gap_sec: Maximum gap for "instant takeover" interruptions
+            min_words_interrupter: Minimum words needed to be real interruption
+            max_backchannel_duration_sec: Max duration for backchannel classification
+        """
+        self.min_overlap_sec = min_overlap_sec
+        self.max_gap_sec = max_gap_sec
+        self.min_words_interrupter = min_words_interrupter
+        self.max_backchannel_duration_sec = max_backchannel_duration_sec
+        self.per_speaker_stats: Dict[str, Dict[str, int]] = {}
+        self.num_segments = 0
+        self._active = []  # min-heap of (end, index) for segments that may still interact
+        self._segments: Dict[int, Dict] = {}  # active segments by index
+        self._backchannel_segments = set()
+    
+    def add(self, segment: Dict) -> Tuple[List[Dict], List[Dict]]:
+        """
+        Add the next segment (in start-time order).
+        
+        Args:
+            segment: Segment (speaker, start, end, text, words)
+            
+        Returns:
+            tuple: (interruptions, backchannels) found with this segment
+        """
+        interruptions = []
+        backchannels = []
+        i = self.num_segments
+        self.num_segments += 1
+        speaker = segment['speaker']
+        start = segment['start']
+        end = segment['end']
+        self.per_speaker_stats.setdefault(speaker, {
+            "interruptions_made": 0,
+            "interruptions_received": 0,
+            "backchannels_made": 0
+        })
+        
+        # Retire segments that ended too long ago to overlap or be taken over
+        while self._active and self._active[0][0] < start - self.max_gap_sec:
+            _, j = heapq.heappop(self._active)
+            del self._segments[j]
+            self._backchannel_segments.discard(j)
+        
+        # Best candidate per other speaker: largest overlap, then most recent
+        candidates = {}
+        for other_end, j in self._active:
+            other_speaker = self._segments[j]['speaker']
+            if other_speaker == speaker:
+                continue
+            overlap = max(0.0, min(other_end, end) - start)
+            best = candidates.get(other_speaker)
+            if best is None or (overlap, j) > (best[0], best[1]):
+                candidates[other_speaker] = (overlap, j)
+        
+        self._segments[i] = segment
+        for other_speaker, (overlap_duration, j) in candidates.items():
+            other = self._segments[j]
+            gap = start - other['end']
+            
+            # Case 1: Overlap (hard interruption)
+            if overlap_duration >= self.min_overlap_sec:
+                interruption_type = "overlap"
+            # Case 2: Near-zero gap (soft interruption)
+            elif 0 <= gap <= self.max_gap_sec:
+                interruption_type = "quick_takeover"
+            else:
+                continue
+            
+            # The interrupter is the one who started speaking later
+            # (on a tie, the earlier segment in time order keeps the floor)
+            if interruption_type == "overlap" and not start > other['start']:
+                interrupter_index, interrupted_index = j, i
+            else:
+                interrupter_index, interrupted_index = i, j
+            interrupter_segment = self._segments[interrupter_index]
+            interrupted_segment = self._segments[interrupted_index]
+            interrupter = interrupter_segment['speaker']
+            interrupted = interrupted_segment['speaker']
+            
+            # Count words in the interrupter segment
+            num_words = len(interrupter_segment.get('words', []))
+            segment_duration = interrupter_segment['end'] - interrupter_segment['start']
+            
+            # Classify as backchannel or real interruption
+            if (num_words < self.min_words_interrupter and 
+                segment_duration < self.max_backchannel_duration_sec):
+                # This is likely a backchannel (counted once per segment)
+                if interrupter_index not in self._backchannel_segments:
+                    self._backchannel_segments.add(interrupter_index)
+                    backchannels.append({
+                        "time": interrupter_segment['start'],
+                        "speaker": interrupter,
+                        "segment_index": interrupter_index,
+                        "text": interrupter_segment['text'],
+                        "duration": segment_duration,
+                        "word_count": num_words
+                    })
+                    self.per_speaker_stats[interrupter]["backchannels_made"] += 1
+            else:
+                # This is a real interruption
+                interruptions.append({
+                    "time": interrupter_segment['start'],
+                    "overlap_duration": overlap_duration,
+                    "gap": gap,
+                    "interrupter": interrupter,
+                    "interrupted": interrupted,
+                    "interrupter_segment_index": interrupter_index,
+                    "interrupted_segment_index": interrupted_index,
+                    "interrupter_segment_text": interrupter_segment['text'][:100] + ("..." if len(interrupter_segment['text']) > 100 else ""),
+                    "interrupted_segment_text": interrupted_segment['text'][:100] + ("..." if len(interrupted_segment['text']) > 100 else ""),
+                    "type": interruption_type,
+                    "interrupter_word_count": num_words,
+                    "interrupter_duration": segment_duration
+                })
+                self.per_speaker_stats[interrupter]["interruptions_made"] += 1
+                self.per_speaker_stats[interrupted]["interruptions_received"] += 1
+        
+        heapq.heappush(self._active, (end, i))
+        return interruptions, backchannels
+
+
+def find_interruptions(
+    segments: List[Dict],
+    min_overlap_sec: float = MIN_OVERLAP_SEC,
+    max_gap_sec: float = MAX_GAP_SEC,
+    min_words_interrupter: int = MIN_WORDS_INTERRUPTER,
+    max_backchannel_duration_sec: float = MAX_BACKCHANNEL_DURATION_SEC
+) -> Tuple[List[Dict], List[Dict], Dict[str, Dict[str, int]]]:
+    """
+    Sweep-line interruption engine over speaker-labeled segments.
+    
+    Runs an InterruptionSweep over all segments; cost is linear in the number
+    of segments times the (small) number of concurrently active segments.
+    
+    Args:
+        segments: Segments sorted by start time (speaker, start, end, text, words)
+        min_overlap_sec: Minimum overlap duration to consider interruption
+        max_gap_sec: Maximum gap for "instant takeover" interruptions
+        min_words_interrupter: Minimum words needed to be real interruption
+        max_backchannel_duration_sec: Max duration for backchannel classification
+        
+    Returns:
+        tuple: (interruptions, backchannels, per_speaker_stats)
+    """
+    sweep = InterruptionSweep(min_overlap_sec, max_gap_sec, min_words_interrupter, max_backchannel_duration_sec)
+    interruptions = []
+    backchannels = []
+    for segment in segments:
+        found_interruptions, found_backchannels = sweep.add(segment)
+        interruptions.extend(found_interruptions)
+        backchannels.extend(found_backchannels)
+    
+    return interruptions, backchannels, sweep.per_speaker_stats
+
+
 def detect_interruptions(
     transcript_path: str = "outputs/audio_features/transcript_with_speakers.json",
     output_path: str = "outputs/audio_features/interruptions.json",
@@ -306,111 +491,9 @@ def detect_interruptions(
     print(f"  Min words for interruption: {min_words_interrupter}")
     print(f"  Max backchannel duration: {max_backchannel_duration_sec}s")
     
-    interruptions = []
-    backchannels = []
-    
-    # Analyze consecutive segment pairs
-    for i in range(len(segments) - 1):
-        current_segment = segments[i]
-        next_segment = segments[i + 1]
-        
-        # Skip if same speaker (no interruption possible)
-        if current_segment['speaker'] == next_segment['speaker']:
-            continue
-            
-        current_start = current_segment['start']
-        current_end = current_segment['end']
-        next_start = next_segment['start']
-        next_end = next_segment['end']
-        
-        # Calculate overlap and gap
-        overlap_start = max(current_start, next_start)
-        overlap_end = min(current_end, next_end)
-        overlap_duration = max(0.0, overlap_end - overlap_start)
-        gap = next_start - current_end
-        
-        interruption_detected = False
-        interruption_type = None
-        
-        # Case 1: Overlap (hard interruption)
-        if overlap_duration >= min_overlap_sec:
-            interruption_detected = True
-            interruption_type = "overlap"
-            
-        # Case 2: Near-zero gap (soft interruption) 
-        elif 0 <= gap <= max_gap_sec:
-            interruption_detected = True
-            interruption_type = "quick_takeover"
-        
-        if interruption_detected:
-            # Determine who interrupted whom
-            if interruption_type == "overlap":
-                # The interrupter is the one who started speaking later during overlap
-                if next_start > current_start:
-                    interrupter = next_segment['speaker']
-                    interrupted = current_segment['speaker']
-                    interrupter_segment = next_segment
-                    interrupted_segment = current_segment
-                    interrupter_index = i + 1
-                    interrupted_index = i
-                else:
-                    interrupter = current_segment['speaker']
-                    interrupted = next_segment['speaker']
-                    interrupter_segment = current_segment
-                    interrupted_segment = next_segment
-                    interrupter_index = i
-                    interrupted_index = i + 1
-            else:  # quick_takeover
-                interrupter = next_segment['speaker']
-                interrupted = current_segment['speaker']
-                interrupter_segment = next_segment
-                interrupted_segment = current_segment
-                interrupter_index = i + 1
-                interrupted_index = i
-            
-            # Count words in the interrupter segment
-            num_words = len(interrupter_segment.get('words', []))
-            segment_duration = interrupter_segment['end'] - interrupter_segment['start']
-            
-            # Classify as backchannel or real interruption
-            if (num_words < min_words_interrupter and 
-                segment_duration < max_backchannel_duration_sec):
-                # This is likely a backchannel
-                backchannels.append({
-                    "time": interrupter_segment['start'],
-                    "speaker": interrupter,
-                    "segment_index": interrupter_index,
-                    "text": interrupter_segment['text'],
-                    "duration": segment_duration,
-                    "word_count": num_words
-                })
-            else:
-                # This is a real interruption
-                interruptions.append({
-                    "time": interrupter_segment['start'],
-                    "overlap_duration": overlap_duration,
-                    "gap": gap,
-                    "interrupter": interrupter,
-                    "interrupted": interrupted,
-                    "interrupter_segment_index": interrupter_index,
-                    "interrupted_segment_index": interrupted_index,
-                    "interrupter_segment_text": interrupter_segment['text'][:100] + ("..." if len(interrupter_segment['text']) > 100 else ""),
-                    "interrupted_segment_text": interrupted_segment['text'][:100] + ("..." if len(interrupted_segment['text']) > 100 else ""),
-                    "type": interruption_type,
-                    "interrupter_word_count": num_words,
-                    "interrupter_duration": segment_duration
-                })
-    
-    # Calculate statistics
-    speakers = list(set(segment['speaker'] for segment in segments))
-    per_speaker_stats = {}
-    
-    for speaker in speakers:
-        per_speaker_stats[speaker] = {
-            "interruptions_made": sum(1 for intr in interruptions if intr['interrupter'] == speaker),
-            "interruptions_received": sum(1 for intr in interruptions if intr['interrupted'] == speaker),
-            "backchannels_made": sum(1 for bc in backchannels if bc['speaker'] == speaker)
-        }
+    interruptions, backchannels, per_speaker_stats = find_interruptions(
+        segments, min_overlap_sec, max_gap_sec, min_words_interrupter, max_backchannel_duration_sec
+    )
     
     # Create output structure
     result = {
@@ -472,148 +555,405 @@ def detect_interruptions(
     return result
 
 
-def turn_taking_stats(
+def merge_word_intervals(starts: np.ndarray, ends: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Merge one speaker's word intervals into maximal overlapping/touching spans.
+    
+    Touching words (one ends exactly where the next starts, as ASR emits
+    continuous speech) belong to the same span, so a monologue is one span.
+    
+    Args:
+        starts: Word start times, sorted ascending
+        ends: Word end times (same order)
+        
+    Returns:
+        tuple: (span_starts, span_ends, span_first_word) where span_first_word
+               is the index of each span's first word (spans are contiguous runs)
+    """
+    if len(starts) == 0:
+        return np.empty(0), np.empty(0), np.empty(0, dtype=np.intp)
+    
+    # A new span starts where a word begins after every earlier word has ended
+    running_end = np.maximum.accumulate(ends)
+    is_new_span = np.empty(len(starts), dtype=bool)
+    is_new_span[0] = True
+    is_new_span[1:] = starts[1:] > running_end[:-1]
+    span_first_word = np.flatnonzero(is_new_span)
+    
+    span_starts = starts[span_first_word]
+    span_ends = np.maximum.reduceat(ends, span_first_word)
+    return span_starts, span_ends, span_first_word
+
+
+def find_word_overlaps(
+    speaker_words: Dict[str, Tuple[np.ndarray, np.ndarray, List[str]]],
+    min_overlap_sec: float = 0.0
+) -> List[Dict]:
+    """
+    Find exact overlapping word spans between every pair of speakers.
+    
+    Each speaker's words are merged into sorted spans, then every pair of
+    span arrays is intersected with a two-pointer walk, so the cost is linear
+    in the number of words. The words inside an overlap are located with
+    binary search (np.searchsorted on the word starts and on the running
+    maximum of the word ends), so long monologue spans are never rescanned.
+    
+    Intervals are half-open: two speakers' words that only touch (one ends
+    exactly where the other starts) do not overlap, and only words that
+    intersect the overlap with positive duration are listed in it.
+    
+    Args:
+        speaker_words: Speaker -> (sorted word starts, word ends, word texts)
+        min_overlap_sec: Minimum intersection duration to report
+        
+    Returns:
+        List of overlap records sorted by start time
+    """
+    spans = {}
+    running_ends = {}
+    for speaker, (starts, ends, texts) in speaker_words.items():
+        span_starts, span_ends, first_word = merge_word_intervals(starts, ends)
+        spans[speaker] = (span_starts, span_ends, np.append(first_word, len(starts)))
+        running_ends[speaker] = np.maximum.accumulate(ends) if len(ends) else ends
+    
+    def overlapping_words(speaker, span_index, t0, t1):
+        starts, ends, texts = speaker_words[speaker]
+        lo, hi = spans[speaker][2][span_index], spans[speaker][2][span_index + 1]
+        # Candidates: from the first word whose running end passes t0 to the last word starting before t1;
+        # words nested inside a longer one may still end before t0, hence the final check
+        first = lo + np.searchsorted(running_ends[speaker][lo:hi], t0, side='right')
+        last = lo + np.searchsorted(starts[lo:hi], t1, side='left')
+        return " ".join(texts[k] for k in range(first, last) if ends[k] > t0)
+    
+    overlaps = []
+    speakers = sorted(spans)
+    for a_pos, speaker_a in enumerate(speakers):
+        a_starts, a_ends, _ = spans[speaker_a]
+        for speaker_b in speakers[a_pos + 1:]:
+            b_starts, b_ends, _ = spans[speaker_b]
+            i = j = 0
+            while i < len(a_starts) and j < len(b_starts):
+                start = max(a_starts[i], b_starts[j])
+                end = min(a_ends[i], b_ends[j])
+                if end - start > min_overlap_sec:
+                    # Who held the floor first: the span that started earlier
+                    if a_starts[i] <= b_starts[j]:
+                        first, second = (speaker_a, i), (speaker_b, j)
+                    else:
+                        first, second = (speaker_b, j), (speaker_a, i)
+                    overlaps.append({
+                        "start": float(start),
+                        "end": float(end),
+                        "duration": float(end - start),
+                        "first_speaker": first[0],
+                        "second_speaker": second[0],
+                        "first_span_start": float(spans[first[0]][0][first[1]]),
+                        "second_span_start": float(spans[second[0]][0][second[1]]),
+                        "first_words": overlapping_words(first[0], first[1], start, end),
+                        "second_words": overlapping_words(second[0], second[1], start, end)
+                    })
+                # Advance whichever span finishes first
+                if a_ends[i] <= b_ends[j]:
+                    i += 1
+                else:
+                    j += 1
+    
+    overlaps.sort(key=lambda o: o["start"])
+    return overlaps
+
+
+def detect_word_overlaps(
     transcript_path: str = "outputs/audio_features/transcript_with_speakers.json",
-    output_path: str = "outputs/audio_features/turn_taking_stats.json"
+    output_path: str = "outputs/audio_features/word_overlaps.json",
+    min_overlap_sec: float = 0.0
 ) -> dict:
     """
-    Analyze turn-taking patterns and alternation in the conversation.
+    Detect overlapping speech at word granularity using the merged word timeline.
+    
+    Unlike detect_interruptions, which reasons about whole diarization
+    segments, this reports the exact span where two speakers' words overlap,
+    who started first and the overlap duration.
     
     Args:
         transcript_path: Path to the transcript with speakers JSON file
-        output_path: Path where to save the turn-taking stats JSON file
+        output_path: Path where to save the word overlaps JSON file
+        min_overlap_sec: Minimum overlap duration to report
         
     Returns:
-        Dictionary containing turn-taking analysis results
+        Dictionary containing word-level overlap results
     """
-    # Load transcript data
-    with open(transcript_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    # Load transcript tables
+    table = TranscriptTable.load(transcript_path)
     
-    # Sort segments by start time
-    segments = sorted(data['segments'], key=lambda x: x['start'])
+    t0 = time.perf_counter()
     
-    print(f"\nAnalyzing turn-taking patterns for {len(segments)} segments...")
+    # Word intervals per speaker, sorted by start
+    speaker_words = {}
+    for code in _speakers_by_first_segment(table):
+        words = table.speaker_words(code)
+        speaker_words[table.speakers[code]] = (
+            words['start'], words['end'], table.vocabulary.decode(words['token'].tolist())
+        )
+    num_words = len(table.words)
     
-    # Build speaker sequence (optionally merge adjacent same-speaker segments with tiny gaps)
-    speaker_sequence = []
-    merged_segments = []
+    overlaps = find_word_overlaps(speaker_words, min_overlap_sec)
+    elapsed = time.perf_counter() - t0
     
-    for i, segment in enumerate(segments):
-        speaker = segment['speaker']
-        start_time = segment['start']
-        end_time = segment['end']
-        
-        # Check if this should be merged with previous segment
-        if (merged_segments and 
-            merged_segments[-1]['speaker'] == speaker and
-            start_time - merged_segments[-1]['end'] <= 0.5):  # Small gap threshold
-            # Merge with previous segment
-            merged_segments[-1]['end'] = end_time
-            merged_segments[-1]['segment_count'] += 1
-            merged_segments[-1]['total_duration'] = merged_segments[-1]['end'] - merged_segments[-1]['start']
-        else:
-            # Start new merged segment
-            merged_segments.append({
-                'speaker': speaker,
-                'start': start_time,
-                'end': end_time,
-                'segment_count': 1,
-                'total_duration': end_time - start_time
-            })
+    # Per-speaker summary
+    per_speaker = {
+        speaker: {"overlaps_started_first": 0, "overlaps_joined": 0, "overlap_time_sec": 0.0}
+        for speaker in speaker_words
+    }
+    for overlap in overlaps:
+        per_speaker[overlap['first_speaker']]['overlaps_started_first'] += 1
+        per_speaker[overlap['second_speaker']]['overlaps_joined'] += 1
+        per_speaker[overlap['first_speaker']]['overlap_time_sec'] += overlap['duration']
+        per_speaker[overlap['second_speaker']]['overlap_time_sec'] += overlap['duration']
     
-    # Build speaker sequence from merged segments
-    speaker_sequence = [seg['speaker'] for seg in merged_segments]
+    # Create output structure
+    result = {
+        "audio_file": table.metadata['audio_file'],
+        "parameters": {
+            "min_overlap_sec": min_overlap_sec
+        },
+        "overlaps": overlaps,
+        "stats": {
+            "total_overlaps": len(overlaps),
+            "total_overlap_sec": sum(o['duration'] for o in overlaps),
+            "per_speaker": per_speaker
+        }
+    }
     
-    print(f"Merged {len(segments)} original segments into {len(merged_segments)} speaking turns")
+    # Print summary
+    print(f"\n" + "="*70)
+    print("WORD-LEVEL OVERLAP ANALYSIS")
+    print("="*70)
+    print(f"Analyzed {num_words} words in {elapsed * 1000:.1f} ms")
+    print(f"Total overlapping spans: {len(overlaps)} ({result['stats']['total_overlap_sec']:.1f}s)")
+    print(f"{'Speaker':<15} {'Started':<8} {'Joined':<8} {'Overlap(s)':<10}")
+    print("-" * 45)
+    for speaker, stats in per_speaker.items():
+        print(f"{speaker:<15} {stats['overlaps_started_first']:<8} "
+              f"{stats['overlaps_joined']:<8} {stats['overlap_time_sec']:<10.1f}")
+    
+    if overlaps:
+        print(f"\nSample overlaps (first 5):")
+        for overlap in overlaps[:5]:
+            print(f"  {overlap['start']/60:.1f}min: {overlap['second_speaker']} over {overlap['first_speaker']} "
+                  f"for {overlap['duration']:.2f}s")
+            print(f"     \"{overlap['first_words'][:50]}\" / \"{overlap['second_words'][:50]}\"")
+    print("="*70)
+    
+    # Save to output file
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(result, f, indent=2, ensure_ascii=False)
+    
+    print(f"\nSaved word-level overlaps to: {output_path}")
+    
+    return result
+
+
+def compute_turn_taking(
+    starts: np.ndarray,
+    ends: np.ndarray,
+    speaker_codes: np.ndarray,
+    num_speakers: int,
+    merge_gap_sec: float = MERGE_GAP_SEC
+) -> dict:
+    """
+    Compute turns, transitions and runs from start-sorted segment arrays.
     
-    # Get unique speakers
-    speakers = list(set(speaker_sequence))
-    speakers.sort()  # For consistent ordering
+    Adjacent segments of the same speaker separated by at most merge_gap_sec
+    are merged into one turn. Consecutive turns of the same speaker form a run.
+    Everything is computed with run-length encoding over integer speaker
+    codes, so the cost is linear in the number of segments.
     
-    # Calculate transitions
-    transitions = {}
-    for speaker_a in speakers:
-        for speaker_b in speakers:
-            transitions[f"{speaker_a}->{speaker_b}"] = 0
+    Args:
+        starts: Segment start times, sorted ascending
+        ends: Segment end times
+        speaker_codes: Integer speaker code (0..num_speakers-1) per segment
+        num_speakers: Number of distinct speakers
+        merge_gap_sec: Maximum gap between same-speaker segments merged into one turn
+        
+    Returns:
+        Dictionary of arrays:
+            - turn_starts, turn_ends, turn_codes, turn_segment_counts: one entry per turn
+            - transition_matrix: (num_speakers, num_speakers) counts of turn i -> turn i+1
+            - run_codes, run_turns, run_durations: one entry per run
+    """
+    starts = np.asarray(starts, dtype=np.float64)
+    ends = np.asarray(ends, dtype=np.float64)
+    codes = np.asarray(speaker_codes, dtype=np.intp)
+    n = len(codes)
+    if n == 0:
+        empty_float, empty_int = np.zeros(0, dtype=np.float64), np.zeros(0, dtype=np.intp)
+        return {
+            "turn_starts": empty_float,
+            "turn_ends": empty_float,
+            "turn_codes": empty_int,
+            "turn_segment_counts": empty_int,
+            "transition_matrix": np.zeros((num_speakers, num_speakers), dtype=np.intp),
+            "run_codes": empty_int,
+            "run_turns": empty_int,
+            "run_durations": empty_float
+        }
+
+    # A new turn starts where the speaker changes or the gap exceeds the threshold
+    # (the merged turn ends where its last segment ends)
+    new_turn = np.ones(n, dtype=bool)
+    new_turn[1:] = (codes[1:] != codes[:-1]) | (starts[1:] - ends[:-1] > merge_gap_sec)
+    turn_first = np.flatnonzero(new_turn)
+    turn_last = np.append(turn_first[1:], n) - 1
+    turn_codes = codes[turn_first]
+    turn_starts = starts[turn_first]
+    turn_ends = ends[turn_last]
+    
+    # Transition counts over consecutive turns
+    pair_index = turn_codes[:-1] * num_speakers + turn_codes[1:]
+    transition_matrix = np.bincount(pair_index, minlength=num_speakers * num_speakers)
+    transition_matrix = transition_matrix.reshape(num_speakers, num_speakers)
+    
+    # Runs: maximal sequences of consecutive turns by the same speaker
+    new_run = np.ones(len(turn_codes), dtype=bool)
+    new_run[1:] = np.diff(turn_codes) != 0
+    run_first = np.flatnonzero(new_run)
+    run_turns = np.diff(np.append(run_first, len(turn_codes)))
+    run_last = run_first + run_turns - 1
+    
+    return {
+        "turn_starts": turn_starts,
+        "turn_ends": turn_ends,
+        "turn_codes": turn_codes,
+        "turn_segment_counts": turn_last - turn_first + 1,
+        "transition_matrix": transition_matrix,
+        "run_codes": turn_codes[run_first],
+        "run_turns": run_turns,
+        "run_durations": turn_ends[run_last] - turn_starts[run_first]
+    }
+
+
+def _load_segment_arrays(segments: List[Dict]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, List[str]]:
+    """Sort segments by start time and encode speakers as integer codes (sorted names)."""
+    starts = np.array([s['start'] for s in segments], dtype=np.float64)
+    ends = np.array([s['end'] for s in segments], dtype=np.float64)
+    order = np.argsort(starts, kind='stable')
+    speakers, codes = np.unique(np.array([s['speaker'] for s in segments], dtype=object), return_inverse=True)
+    return starts[order], ends[order], codes[order], [str(s) for s in speakers]
+
+
+def sweep_merge_gap(
+    segments: List[Dict],
+    merge_gaps_sec: List[float]
+) -> List[Dict]:
+    """
+    Summarize turn-taking for several merge gap thresholds.
     
-    total_transitions = 0
-    alternations = 0  # Transitions where speaker changes
+    The segments are sorted and encoded once; each threshold only re-runs the
+    vectorized run-length encoding.
     
-    # Count transitions
-    for i in range(len(speaker_sequence) - 1):
-        current_speaker = speaker_sequence[i]
-        next_speaker = speaker_sequence[i + 1]
+    Args:
+        segments: Transcript segments with 'start', 'end' and 'speaker'
+        merge_gaps_sec: Merge gap thresholds to evaluate
         
-        transition_key = f"{current_speaker}->{next_speaker}"
-        transitions[transition_key] += 1
-        total_transitions += 1
+    Returns:
+        List of dicts with merge_gap_sec, merged_segments, alternation_rate and
+        the average run duration per speaker
+    """
+    starts, ends, codes, speakers = _load_segment_arrays(segments)
+    
+    summaries = []
+    for merge_gap_sec in merge_gaps_sec:
+        core = compute_turn_taking(starts, ends, codes, len(speakers), merge_gap_sec)
+        matrix = core['transition_matrix']
+        total = int(matrix.sum())
+        summaries.append({
+            "merge_gap_sec": merge_gap_sec,
+            "merged_segments": len(core['turn_codes']),
+            "alternation_rate": float((total - np.trace(matrix)) / total) if total > 0 else 0.0,
+            "avg_run_duration_sec": {
+                speaker: float(core['run_durations'][core['run_codes'] == code].mean())
+                if np.any(core['run_codes'] == code) else 0.0
+                for code, speaker in enumerate(speakers)
+            }
+        })
+    
+    return summaries
+
+
+def _run_duration_distribution(durations: np.ndarray) -> dict:
+    """Summarize a speaker's run durations (seconds) by quantiles."""
+    if len(durations) == 0:
+        return {"std": 0.0, "p10": 0.0, "p25": 0.0, "median": 0.0, "p75": 0.0, "p90": 0.0}
+    p10, p25, median, p75, p90 = np.percentile(durations, [10, 25, 50, 75, 90])
+    return {
+        "std": float(durations.std()),
+        "p10": float(p10),
+        "p25": float(p25),
+        "median": float(median),
+        "p75": float(p75),
+        "p90": float(p90)
+    }
+
+
+def turn_taking_stats(
+    transcript_path: str = "outputs/audio_features/transcript_with_speakers.json",
+    output_path: str = "outputs/audio_features/turn_taking_stats.json",
+    merge_gap_sec: float = MERGE_GAP_SEC
+) -> dict:
+    """
+    Analyze turn-taking patterns and alternation in the conversation.
+    
+    Args:
+        transcript_path: Path to the transcript with speakers JSON file
+        output_path: Path where to save the turn-taking stats JSON file
+        merge_gap_sec: Maximum gap between same-speaker segments merged into one turn
         
-        if current_speaker != next_speaker:
-            alternations += 1
+    Returns:
+        Dictionary containing turn-taking analysis results
+    """
+    # Load transcript data
+    with open(transcript_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
     
-    # Calculate alternation rate
-    alternation_rate = alternations / total_transitions if total_transitions > 0 else 0.0
+    segments = data['segments']
     
-    # Analyze runs (consecutive segments with same speaker)
-    runs_data = {}
+    print(f"\nAnalyzing turn-taking patterns for {len(segments)} segments...")
     
-    for speaker in speakers:
-        runs_data[speaker] = {
-            'run_segments': [],  # List of run lengths in segments
-            'run_durations': [],  # List of run durations in seconds
-            'num_runs': 0
-        }
+    starts, ends, codes, speakers = _load_segment_arrays(segments)
+    core = compute_turn_taking(starts, ends, codes, len(speakers), merge_gap_sec)
+    turn_codes = core['turn_codes']
     
-    # Find runs
-    current_run_speaker = speaker_sequence[0] if speaker_sequence else None
-    current_run_length = 1
-    current_run_start_idx = 0
+    print(f"Merged {len(segments)} original segments into {len(turn_codes)} speaking turns")
     
-    for i in range(1, len(speaker_sequence)):
-        if speaker_sequence[i] == current_run_speaker:
-            current_run_length += 1
-        else:
-            # End of current run
-            if current_run_speaker:
-                # Calculate run duration
-                run_start_time = merged_segments[current_run_start_idx]['start']
-                run_end_time = merged_segments[i - 1]['end']
-                run_duration = run_end_time - run_start_time
-                
-                runs_data[current_run_speaker]['run_segments'].append(current_run_length)
-                runs_data[current_run_speaker]['run_durations'].append(run_duration)
-                runs_data[current_run_speaker]['num_runs'] += 1
-            
-            # Start new run
-            current_run_speaker = speaker_sequence[i]
-            current_run_length = 1
-            current_run_start_idx = i
-    
-    # Don't forget the last run
-    if current_run_speaker and len(speaker_sequence) > 0:
-        run_start_time = merged_segments[current_run_start_idx]['start']
-        run_end_time = merged_segments[-1]['end']
-        run_duration = run_end_time - run_start_time
-        
-        runs_data[current_run_speaker]['run_segments'].append(current_run_length)
-        runs_data[current_run_speaker]['run_durations'].append(run_duration)
-        runs_data[current_run_speaker]['num_runs'] += 1
+    # Transitions between consecutive turns
+    matrix = core['transition_matrix']
+    transitions = {
+        f"{speaker_a}->{speaker_b}": int(matrix[a, b])
+        for a, speaker_a in enumerate(speakers)
+        for b, speaker_b in enumerate(speakers)
+    }
+    total_transitions = int(matrix.sum())
+    alternations = total_transitions - int(np.trace(matrix))
     
-    # Calculate run statistics
+    # Calculate alternation rate
+    alternation_rate = alternations / total_transitions if total_transitions > 0 else 0.0
+    
+    # Run statistics per speaker
     runs_stats = {}
-    for speaker in speakers:
-        run_segments = runs_data[speaker]['run_segments']
-        run_durations = runs_data[speaker]['run_durations']
+    for code, speaker in enumerate(speakers):
+        mask = core['run_codes'] == code
+        run_turns = core['run_turns'][mask]
+        run_durations = core['run_durations'][mask]
         
-        if run_segments:
+        if len(run_turns):
             runs_stats[speaker] = {
-                'num_runs': len(run_segments),
-                'avg_run_segments': sum(run_segments) / len(run_segments),
-                'avg_run_duration_sec': sum(run_durations) / len(run_durations),
-                'max_run_duration_sec': max(run_durations),
-                'max_run_segments': max(run_segments),
-                'total_speaking_time_sec': sum(run_durations)
+                'num_runs': int(len(run_turns)),
+                'avg_run_segments': float(run_turns.mean()),
+                'avg_run_duration_sec': float(run_durations.mean()),
+                'max_run_duration_sec': float(run_durations.max()),
+                'max_run_segments': int(run_turns.max()),
+                'total_speaking_time_sec': float(run_durations.sum())
             }
         else:
             runs_stats[speaker] = {
@@ -624,19 +964,22 @@ def turn_taking_stats(
                 'max_run_segments': 0,
                 'total_speaking_time_sec': 0.0
             }
+        runs_stats[speaker]['run_duration_distribution'] = _run_duration_distribution(run_durations)
+        runs_stats[speaker]['run_durations_sec'] = run_durations.tolist()
     
     # Create output structure
     result = {
         "audio_file": data['audio_file'],
         "speakers": speakers,
         "transitions": transitions,
+        "transition_matrix": matrix.tolist(),
         "total_transitions": total_transitions,
         "alternation_rate": alternation_rate,
         "runs": runs_stats,
         "merged_segments_info": {
             "original_segments": len(segments),
-            "merged_segments": len(merged_segments),
-            "merge_gap_threshold_sec": 0.5
+            "merged_segments": len(turn_codes),
+            "merge_gap_threshold_sec": merge_gap_sec
         }
     }
     
@@ -656,19 +999,23 @@ def turn_taking_stats(
         print(f"{transition:<25} {count:<8} {percentage:<8.1f}")
     
     print(f"\nSpeaking Run Statistics:")
-    print(f"{'Speaker':<15} {'Runs':<6} {'Avg Segments':<12} {'Avg Duration(s)':<15} {'Max Duration(s)':<15}")
-    print("-" * 70)
+    print(f"{'Speaker':<15} {'Runs':<6} {'Avg Segments':<12} {'Avg Duration(s)':<15} "
+          f"{'Median(s)':<10} {'P90(s)':<8} {'Max Duration(s)':<15}")
+    print("-" * 85)
     for speaker in speakers:
         stats = runs_stats[speaker]
+        distribution = stats['run_duration_distribution']
         print(f"{speaker:<15} {stats['num_runs']:<6} "
               f"{stats['avg_run_segments']:<12.1f} "
               f"{stats['avg_run_duration_sec']:<15.1f} "
+              f"{distribution['median']:<10.1f} "
+              f"{distribution['p90']:<8.1f} "
               f"{stats['max_run_duration_sec']:<15.1f}")
     
     # Show example speaker sequence (first 20 turns)
     print(f"\nFirst 20 speaking turns:")
-    sequence_preview = ' -> '.join(speaker_sequence[:20])
-    if len(speaker_sequence) > 20:
+    sequence_preview = ' -> '.join(speakers[code] for code in turn_codes[:20])
+    if len(turn_codes) > 20:
         sequence_preview += " -> ..."
     print(f"  {sequence_preview}")
     
@@ -732,6 +1079,18 @@ if __name__ == "__main__":
         )
         print("✓ Interruption detection completed successfully!")
         
+        # Test detect_word_overlaps function
+        print("\n" + "="*70)
+        print("TESTING WORD-LEVEL OVERLAP DETECTION")
+        print("="*70)
+        word_overlaps_output_path = "../outputs/audio_features/word_overlaps.json"
+        
+        word_overlaps = detect_word_overlaps(
+            transcript_path=transcript_path,
+            output_path=word_overlaps_output_path
+        )
+        print("✓ Word-level overlap detection completed successfully!")
+        
         # Test turn_taking_stats function
         print("\n" + "="*70)
         print("TESTING TURN-TAKING ANALYSIS")
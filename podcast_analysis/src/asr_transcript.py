@@ -8,20 +8,43 @@ This module implements task 3.1 from new_way.md:
 """
 
 import os
-import json
 import sys
-from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 import warnings
 
+from json_stream import JsonArrayWriter, dump_json
+
 # Suppress some warnings for cleaner output
 warnings.filterwarnings("ignore", category=UserWarning)
 warnings.filterwarnings("ignore", category=FutureWarning)
 
 
+def load_whisper_model(model_name: str = "base"):
+    """
+    Load the Whisper model on the best available device.
+    
+    Args:
+        model_name (str): Whisper model size
+        
+    Returns:
+        whisper.Whisper: Loaded model
+    """
+    print("📦 Loading openai-whisper...")
+    import whisper
+    import torch
+    
+    # Check device
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    print(f"🔧 Using device: {device}")
+    
+    print(f"🧠 Loading Whisper model ({model_name})...")
+    return whisper.load_model(model_name, device=device)
+
+
 def transcribe_podcast(
     audio_file_path: str = "data/processed/podcast_16k_mono.wav",
-    output_file_path: str = "outputs/audio_features/transcript_words.json"
+    output_file_path: str = "outputs/audio_features/transcript_words.json",
+    speech_regions_path: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Transcribe podcast audio using OpenAI Whisper following task 3.1 specifications.
@@ -29,9 +52,14 @@ def transcribe_podcast(
     Args:
         audio_file_path (str): Path to input mono audio file
         output_file_path (str): Path to save transcript JSON
+        speech_regions_path (str, optional): speech_regions.json from voice_activity.py;
+            only these regions are transcribed and timestamps are mapped back
         
     Returns:
-        dict: Transcript results with segments and word-level timestamps
+        dict: Transcript metadata and totals (audio_file, sample_rate, language,
+            num_segments, num_words). Whisper returns all segments at once; they
+            are then written to output_file_path one by one, without building
+            the JSON document in memory
     """
     
     print("🎤 Starting ASR transcription on mono podcast...")
@@ -47,34 +75,38 @@ def transcribe_podcast(
     print(f"📊 Audio file size: {file_size_mb:.2f} MB")
     
     try:
-        # Import whisper
-        print("📦 Loading openai-whisper...")
-        import whisper
-        import torch
-        
-        # Check device
-        device = "cuda" if torch.cuda.is_available() else "cpu"
-        print(f"🔧 Using device: {device}")
-        
-        # Load Whisper model as specified in task 3.1
-        print("🧠 Loading Whisper model (base)...")
-        model = whisper.load_model("base", device=device)
-        
-        # Load audio with librosa first to avoid path issues
-        print("📂 Loading audio with librosa...")
-        import librosa
-        audio_data, sr = librosa.load(audio_file_path, sr=16000, mono=True)
+        # Decoded audio comes from the shared PCM cache (decoded once per file)
+        print("📂 Loading audio...")
+        from pcm_cache import load_pcm
+        audio_data, sr = load_pcm(audio_file_path, 16000)
         print(f"✅ Audio loaded: {len(audio_data)} samples, {sr} Hz")
         
-        print("🎯 Starting transcription with word-level timestamps...")
-        print("⏳ This may take several minutes for long audio...")
-        
-        # Transcribe with word timestamps enabled (as required)
-        result = model.transcribe(
-            audio_data,           # Pass numpy array instead of file path
-            word_timestamps=True,  # Enable word-level timestamps as required
-            verbose=True           # Show progress
-        )
+        regions = None
+        if speech_regions_path:
+            from voice_activity import concatenate_regions, load_speech_regions
+            regions = load_speech_regions(speech_regions_path)
+            total_sec = len(audio_data) / sr
+            audio_data = concatenate_regions(audio_data, sr, regions)
+            print(f"🔇 Skipping non-speech: transcribing {len(audio_data) / sr / 60:.1f} of "
+                  f"{total_sec / 60:.1f} min in {len(regions)} speech regions")
+        
+        if len(audio_data) == 0:
+            # Nothing to transcribe (empty recording or no speech regions): Whisper cannot take it
+            print("⚠️  No audio to transcribe: writing an empty transcript")
+            result = {"segments": []}
+        else:
+            # Load Whisper model as specified in task 3.1
+            model = load_whisper_model()
+            
+            print("🎯 Starting transcription with word-level timestamps...")
+            print("⏳ This may take several minutes for long audio...")
+            
+            # Transcribe with word timestamps enabled (as required)
+            result = model.transcribe(
+                audio_data,           # Pass numpy array instead of file path
+                word_timestamps=True,  # Enable word-level timestamps as required
+                verbose=True           # Show progress
+            )
         
         print("✅ Transcription completed!")
         print(f"🗣️ Language detected: {result.get('language', 'unknown')}")
@@ -82,45 +114,48 @@ def transcribe_podcast(
         # Convert to exact format specified in task 3.1
         transcript_data = {
             "audio_file": audio_file_path,
-            "sample_rate": 16000,  # As specified in task
-            "segments": []
+            "sample_rate": 16000  # As specified in task
         }
         
         print("🔄 Processing segments and words...")
-        
-        # Process each segment
-        for segment in result['segments']:
-            segment_data = {
-                "start": float(segment['start']),
-                "end": float(segment['end']),
-                "text": segment['text'].strip(),
-                "words": []
-            }
-            
-            # Add word-level timestamps (as required in task 3.1)
-            if 'words' in segment and segment['words']:
-                for word_info in segment['words']:
-                    word_data = {
-                        "start": float(word_info.get('start', segment['start'])),
-                        "end": float(word_info.get('end', segment['end'])),
-                        "word": word_info.get('word', '').strip()
-                    }
-                    segment_data['words'].append(word_data)
-            
-            transcript_data['segments'].append(segment_data)
-        
-        # Ensure output directory exists
-        output_dir = Path(output_file_path).parent
-        output_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Save to JSON as specified in task 3.1
-        print(f"💾 Saving transcript to: {output_file_path}")
-        with open(output_file_path, 'w', encoding='utf-8') as f:
-            json.dump(transcript_data, f, indent=2, ensure_ascii=False)
+        print(f"💾 Writing transcript to: {output_file_path}")
+        if regions is not None:
+            from voice_activity import map_segments_to_source
+        
+        total_words = 0
+        sample_segments = []
+        
+        # Convert and write the segments one at a time (task 3.1 format)
+        with JsonArrayWriter(output_file_path, header=transcript_data) as writer:
+            for segment in result['segments']:
+                segment_data = {
+                    "start": float(segment['start']),
+                    "end": float(segment['end']),
+                    "text": segment['text'].strip(),
+                    "words": []
+                }
+                
+                # Add word-level timestamps (as required in task 3.1)
+                if 'words' in segment and segment['words']:
+                    for word_info in segment['words']:
+                        word_data = {
+                            "start": float(word_info.get('start', segment['start'])),
+                            "end": float(word_info.get('end', segment['end'])),
+                            "word": word_info.get('word', '').strip()
+                        }
+                        segment_data['words'].append(word_data)
+                
+                if regions is not None:
+                    # Timestamps refer to the concatenated speech regions: map them back
+                    map_segments_to_source([segment_data], regions)
+                
+                writer.write(segment_data)
+                total_words += len(segment_data['words'])
+                if len(sample_segments) < 5:
+                    sample_segments.append(segment_data)
         
         # Print required checks from task 3.1
-        total_segments = len(transcript_data['segments'])
-        total_words = sum(len(seg['words']) for seg in transcript_data['segments'])
+        total_segments = writer.count
         
         print("\n📊 ASR Results (as specified in task 3.1):")
         print(f"   Total number of ASR segments: {total_segments}")
@@ -129,7 +164,7 @@ def transcribe_podcast(
         
         # Print sample segments to verify (as required)
         print("\n� Sample segments to verify timestamps and text:")
-        for i, segment in enumerate(transcript_data['segments'][:5]):
+        for i, segment in enumerate(sample_segments):
             print(f"     Segment {i+1}: [{segment['start']:.2f}s - {segment['end']:.2f}s]")
             text_preview = segment['text'][:80] + "..." if len(segment['text']) > 80 else segment['text']
             print(f"       Text: \"{text_preview}\"")
@@ -147,7 +182,12 @@ def transcribe_podcast(
         
         print(f"\n✅ Task 3.1 completed! Transcript saved to: {output_file_path}")
         
-        return transcript_data
+        return {
+            **transcript_data,
+            "language": result.get('language', 'unknown'),
+            "num_segments": total_segments,
+            "num_words": total_words
+        }
         
     except ImportError as e:
         print(f"❌ Error: openai-whisper not installed: {e}")
@@ -155,20 +195,27 @@ def transcribe_podcast(
         
         # Try librosa fallback as user suggested
         print("\n🔄 Attempting librosa fallback implementation...")
-        return transcribe_with_librosa(audio_file_path, output_file_path)
+        return transcribe_with_librosa(audio_file_path, output_file_path, speech_regions_path)
         
     except Exception as e:
         print(f"❌ Error during transcription: {str(e)}")
         
         # Try librosa fallback as user suggested
         print("\n🔄 Attempting librosa fallback implementation...")
-        return transcribe_with_librosa(audio_file_path, output_file_path)
+        return transcribe_with_librosa(audio_file_path, output_file_path, speech_regions_path)
 
 
-def transcribe_with_librosa(audio_file_path: str, output_file_path: str) -> Dict[str, Any]:
+def transcribe_with_librosa(
+    audio_file_path: str,
+    output_file_path: str,
+    speech_regions_path: Optional[str] = None
+) -> Dict[str, Any]:
     """
     Fallback transcription using librosa + basic segmentation.
     This creates a mock transcript structure for demonstration.
+    
+    With speech regions, the mock segments cover the concatenated regions and
+    are mapped back to source time, like the Whisper path.
     """
     
     print("🔄 Using librosa fallback approach...")
@@ -180,6 +227,11 @@ def transcribe_with_librosa(audio_file_path: str, output_file_path: str) -> Dict
         # Load audio with librosa
         print("📂 Loading audio with librosa...")
         audio_data, sample_rate = librosa.load(audio_file_path, sr=16000, mono=True)
+        regions = None
+        if speech_regions_path:
+            from voice_activity import concatenate_regions, load_speech_regions
+            regions = load_speech_regions(speech_regions_path)
+            audio_data = concatenate_regions(audio_data, sample_rate, regions)
         duration = len(audio_data) / sample_rate
         
         print(f"✅ Audio loaded: {duration:.2f} seconds, {sample_rate} Hz")
@@ -215,6 +267,10 @@ def transcribe_with_librosa(audio_file_path: str, output_file_path: str) -> Dict
             }
             segments.append(segment)
         
+        if regions is not None:
+            from voice_activity import map_segments_to_source
+            map_segments_to_source(segments, regions)
+        
         # Create result in required format
         transcript_data = {
             "audio_file": audio_file_path,
@@ -223,11 +279,7 @@ def transcribe_with_librosa(audio_file_path: str, output_file_path: str) -> Dict
         }
         
         # Save to JSON
-        output_dir = Path(output_file_path).parent
-        output_dir.mkdir(parents=True, exist_ok=True)
-        
-        with open(output_file_path, 'w', encoding='utf-8') as f:
-            json.dump(transcript_data, f, indent=2, ensure_ascii=False)
+        dump_json(transcript_data, output_file_path)
         
         print(f"💾 Fallback transcript saved to: {output_file_path}")
         print("⚠️ This is a mock transcript - install openai-whisper for real transcription")
@@ -7,19 +7,27 @@ import os
 import librosa
 import soundfile as sf
 import numpy as np
-from config import AUDIO_RAW_PATH, AUDIO_WAV_PATH, SAMPLE_RATE
+from config import AUDIO_RAW_PATH, AUDIO_WAV_PATH, PCM_CACHE_DIR, SAMPLE_RATE
+from pcm_cache import load_pcm
 
 
-def convert_to_mono_wav_librosa():
+def convert_to_mono_wav_librosa(audio_raw_path=None, audio_wav_path=None, cache_dir=PCM_CACHE_DIR):
     """
     Convert MP3 podcast file to mono WAV format using librosa.
+    
+    Args:
+        audio_raw_path: Optional input audio path. Defaults to data/raw/podcast.mp3
+        audio_wav_path: Optional output WAV path. Defaults to data/processed/podcast_16k_mono.wav
+        cache_dir: PCM cache to fill with the output, None to skip filling it
     """
     # Get the project root directory (two levels up from this file)
     project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
     
     # Create absolute paths with proper path separators
-    audio_raw_path = os.path.join(project_root, "podcast_analysis", "data", "raw", "podcast.mp3")
-    audio_wav_path = os.path.join(project_root, "podcast_analysis", "data", "processed", "podcast_16k_mono.wav")
+    if audio_raw_path is None:
+        audio_raw_path = os.path.join(project_root, "podcast_analysis", "data", "raw", "podcast.mp3")
+    if audio_wav_path is None:
+        audio_wav_path = os.path.join(project_root, "podcast_analysis", "data", "processed", "podcast_16k_mono.wav")
     
     print("Starting audio preprocessing with librosa...")
     print(f"Project root: {project_root}")
@@ -86,6 +94,9 @@ def convert_to_mono_wav_librosa():
         if os.path.exists(audio_wav_path):
             file_size = os.path.getsize(audio_wav_path) / (1024 * 1024)  # Size in MB
             print(f"  - File size: {file_size:.2f} MB")
+            # Decode the WAV once into the shared PCM cache for the later stages
+            if cache_dir is not None:
+                load_pcm(audio_wav_path, SAMPLE_RATE, cache_dir)
             print("✅ Audio preprocessing completed successfully!")
             return True
         else:
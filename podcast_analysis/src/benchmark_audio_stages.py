@@ -0,0 +1,319 @@
+"""
+Benchmark harness for the audio stages of the podcast pipeline.
+
+Generates synthetic multi-hour stereo recordings (speech-like harmonic bursts
+alternating between the two channels, plus a steady tone and background
+noise) in several sample rates and container formats, then times end to end:
+
+- audio_preprocess.convert_to_mono_wav_librosa
+- speaker_separation_librosa.split_stereo_to_speakers_librosa
+- slice_audio_segments (load mono WAV + slice/save every window)
+- voice_activity.detect_speech_regions (energy/spectral-flux VAD on the mono WAV)
+
+Each stage runs in a fresh child process so that peak memory is measured
+per stage, with its own empty PCM cache (pcm_cache.py) in the temporary
+directory: preprocessing still pays for filling the cache, and the later
+stages time a cold decode instead of reading an earlier stage's memmap. The
+caches go with the synthetic inputs, so nothing is left in the project cache. Reported metrics:
+
+- real-time factor (wall time / audio duration; < 1.0 is faster than real time)
+- throughput in audio-hours per CPU-hour
+- peak resident memory
+
+Results are appended to outputs/benchmarks/audio_stages_history.jsonl.
+
+Usage (from the src directory):
+    python benchmark_audio_stages.py --hours 2 --sample-rates 44100 48000 --formats wav flac mp3
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import soundfile as sf
+
+from benchmark_json_stages import BENCHMARKS_DIR, _git_commit
+
+HISTORY_PATH = BENCHMARKS_DIR / "audio_stages_history.jsonl"
+
+DEFAULT_HOURS = 2.0
+DEFAULT_SAMPLE_RATES = (44100, 48000)
+DEFAULT_FORMATS = ("wav", "flac", "mp3")
+BLOCK_SEC = 60.0
+
+# Windows similar to the data/segments/*_segments.json metadata
+WINDOW_SEC = 14.0
+WINDOW_HOP_SEC = 20.0
+
+FORMAT_SUBTYPES = {
+    "wav": ("WAV", "PCM_16"),
+    "flac": ("FLAC", "PCM_16"),
+    "ogg": ("OGG", "VORBIS"),
+    "mp3": ("MP3", "MPEG_LAYER_III"),
+}
+
+
+def _speech_like_block(rng: np.random.Generator, n: int, sr: int, t0: float) -> np.ndarray:
+    """
+    Generate one block of a stereo speech-like signal.
+
+    Talk spurts (1-8 s) alternate between the left and right channel. Each
+    spurt is a harmonic series around a speaker-specific f0 with 4 Hz
+    syllabic amplitude modulation; a faint 1 kHz tone and noise sit on both
+    channels.
+    """
+    t = t0 + np.arange(n) / sr
+    block = rng.normal(0.0, 0.003, (2, n)).astype(np.float32)
+    block += (0.002 * np.sin(2 * np.pi * 1000.0 * t)).astype(np.float32)
+
+    pos = 0
+    while pos < n:
+        spurt = int(rng.uniform(1.0, 8.0) * sr)
+        channel = int(rng.integers(0, 2))
+        f0 = 110.0 if channel == 0 else 190.0
+        seg_t = t[pos:pos + spurt]
+        syllables = 0.5 * (1.0 + np.sin(2 * np.pi * 4.0 * seg_t + rng.uniform(0, 2 * np.pi)))
+        voice = sum(np.sin(2 * np.pi * f0 * h * seg_t) / h for h in range(1, 6))
+        block[channel, pos:pos + spurt] += (0.15 * syllables * voice).astype(np.float32)
+        pos += spurt + int(rng.exponential(0.3) * sr)
+
+    return block
+
+
+def generate_synthetic_stereo(path: str, hours: float, sr: int, fmt: str, seed: int = 0) -> float:
+    """
+    Stream a synthetic stereo recording to disk block by block.
+
+    Args:
+        path: Output file path
+        hours: Duration in hours
+        sr: Sample rate
+        fmt: One of FORMAT_SUBTYPES
+        seed: Random seed
+
+    Returns:
+        float: Duration written in seconds
+    """
+    container, subtype = FORMAT_SUBTYPES[fmt]
+    rng = np.random.default_rng(seed)
+    total = int(hours * 3600 * sr)
+    block_len = int(BLOCK_SEC * sr)
+
+    with sf.SoundFile(path, 'w', samplerate=sr, channels=2, format=container, subtype=subtype) as f:
+        written = 0
+        while written < total:
+            n = min(block_len, total - written)
+            f.write(_speech_like_block(rng, n, sr, written / sr).T)
+            written += n
+
+    return total / sr
+
+
+def _make_windows(duration_sec: float) -> List[Dict[str, Any]]:
+    """Build slicing windows in the data/segments metadata schema."""
+    starts = np.arange(0.0, max(duration_sec - WINDOW_SEC, 0.0), WINDOW_HOP_SEC)
+    return [
+        {
+            "window_id": f"seg_{i:04d}",
+            "start": float(s),
+            "end": float(s + WINDOW_SEC),
+            "duration": WINDOW_SEC
+        }
+        for i, s in enumerate(starts)
+    ]
+
+
+def _run_stage(stage: str, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """Run one stage in the current process and measure wall/CPU time and peak RSS."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        if stage == "convert_to_mono_wav_librosa":
+            from audio_preprocess import convert_to_mono_wav_librosa
+            wall0, cpu0 = time.perf_counter(), time.process_time()
+            ok = convert_to_mono_wav_librosa(kwargs["input_path"], kwargs["output_path"], kwargs["cache_dir"])
+        elif stage == "split_stereo_to_speakers_librosa":
+            from speaker_separation_librosa import split_stereo_to_speakers_librosa
+            wall0, cpu0 = time.perf_counter(), time.process_time()
+            ok = split_stereo_to_speakers_librosa(kwargs["input_path"], kwargs["output_dir"], kwargs["cache_dir"])
+        elif stage == "slice_audio_segments":
+            from slice_audio_segments import load_mono_audio, slice_windows_to_wavs
+            wall0, cpu0 = time.perf_counter(), time.process_time()
+            y, sr = load_mono_audio(kwargs["input_path"], kwargs["cache_dir"])
+            _, failed = slice_windows_to_wavs(y, sr, kwargs["windows"], kwargs["output_dir"])
+            ok = failed == 0
+        elif stage == "detect_speech_regions":
+            from voice_activity import detect_speech_regions
+            wall0, cpu0 = time.perf_counter(), time.process_time()
+            result = detect_speech_regions(kwargs["input_path"], kwargs["output_path"], force=True,
+                                           cache_dir=kwargs["cache_dir"])
+            ok = result["duration_sec"] > 0
+        else:
+            raise ValueError(f"Unknown stage: {stage}")
+        wall = time.perf_counter() - wall0
+        cpu = time.process_time() - cpu0
+
+    return {"ok": bool(ok), "wall_sec": wall, "cpu_sec": cpu, "peak_rss_mb": _peak_rss_mb()}
+
+
+def _peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of the current process in MB, if measurable."""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports KB, macOS reports bytes
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    except ImportError:
+        try:
+            import psutil
+            return psutil.Process().memory_info().peak_wset / (1024 * 1024)
+        except (ImportError, AttributeError):
+            return None
+
+
+def measure_stage(stage: str, audio_sec: float, **kwargs) -> Dict[str, Any]:
+    """
+    Measure one stage in a fresh child process and derive throughput metrics.
+
+    Args:
+        stage: Stage name (see _run_stage)
+        audio_sec: Duration of the processed audio in seconds
+        **kwargs: Stage arguments, including the stage's own PCM cache_dir
+
+    Returns:
+        dict with wall/CPU time, real-time factor, audio-hours per CPU-hour and peak RSS
+    """
+    ctx = multiprocessing.get_context("spawn")
+    with ctx.Pool(1) as pool:
+        result = pool.apply(_run_stage, (stage, kwargs))
+
+    audio_hours = audio_sec / 3600.0
+    result["real_time_factor"] = result["wall_sec"] / audio_sec
+    result["audio_hours_per_cpu_hour"] = audio_hours / (result["cpu_sec"] / 3600.0) if result["cpu_sec"] > 0 else None
+    return result
+
+
+def run_benchmark(
+    hours: float = DEFAULT_HOURS,
+    sample_rates: List[int] = DEFAULT_SAMPLE_RATES,
+    formats: List[str] = DEFAULT_FORMATS,
+    work_dir: Optional[str] = None,
+    seed: int = 0
+) -> Dict[str, Any]:
+    """
+    Benchmark the audio stages for every (sample rate, format) combination.
+
+    Args:
+        hours: Duration of each synthetic recording
+        sample_rates: Source sample rates to generate
+        formats: Source container formats to generate
+        work_dir: Directory for the (large) synthetic files; a temp dir by default
+        seed: Random seed
+
+    Returns:
+        Benchmark record (also appended to HISTORY_PATH)
+    """
+    results = []
+
+    with tempfile.TemporaryDirectory(prefix="bench_audio_", dir=work_dir) as tmp:
+        tmp = Path(tmp)
+        sliced_once = False
+
+        for sr in sample_rates:
+            for fmt in formats:
+                source = tmp / f"synthetic_{sr}.{fmt}"
+                print(f"\n=== {hours:g} h stereo @ {sr} Hz, {fmt} ===")
+                t0 = time.perf_counter()
+                audio_sec = generate_synthetic_stereo(str(source), hours, sr, fmt, seed)
+                size_mb = os.path.getsize(source) / (1024 * 1024)
+                print(f"Generated {source.name} ({size_mb:.1f} MB) in {time.perf_counter() - t0:.1f}s")
+
+                mono_path = tmp / "processed" / "podcast_16k_mono.wav"
+                stages = {
+                    "convert_to_mono_wav_librosa": dict(input_path=str(source), output_path=str(mono_path)),
+                    "split_stereo_to_speakers_librosa": dict(input_path=str(source), output_dir=str(tmp / "processed")),
+                }
+                # Slicing and VAD only depend on the 16 kHz mono WAV, so they are measured once
+                if not sliced_once:
+                    stages["slice_audio_segments"] = dict(
+                        input_path=str(mono_path),
+                        windows=_make_windows(audio_sec),
+                        output_dir=str(tmp / "segments")
+                    )
+                    stages["detect_speech_regions"] = dict(
+                        input_path=str(mono_path),
+                        output_path=str(tmp / "speech_regions.json")
+                    )
+                    sliced_once = True
+
+                for stage, kwargs in stages.items():
+                    with tempfile.TemporaryDirectory(prefix="pcm_", dir=tmp) as cache_dir:
+                        metrics = measure_stage(stage, audio_sec, cache_dir=cache_dir, **kwargs)
+                    _print_metrics(stage, metrics)
+                    results.append({
+                        "stage": stage,
+                        "sample_rate": sr,
+                        "format": fmt,
+                        "audio_sec": audio_sec,
+                        "source_size_mb": size_mb,
+                        **metrics
+                    })
+
+                source.unlink()
+
+    record = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "hours": hours,
+        "results": results
+    }
+
+    BENCHMARKS_DIR.mkdir(parents=True, exist_ok=True)
+    with open(HISTORY_PATH, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(record) + "\n")
+    print(f"\nAppended results to: {HISTORY_PATH}")
+
+    return record
+
+
+def _print_metrics(stage: str, metrics: Dict[str, Any]) -> None:
+    """Print one result row."""
+    status = "✅" if metrics["ok"] else "❌"
+    throughput = metrics["audio_hours_per_cpu_hour"]
+    peak = metrics["peak_rss_mb"]
+    print(f"  {status} {stage:<34} wall {metrics['wall_sec']:>8.2f}s  "
+          f"RTF {metrics['real_time_factor']:.4f}  "
+          f"{throughput if throughput is not None else float('nan'):>8.1f} audio-h/CPU-h  "
+          f"peak {peak if peak is not None else float('nan'):>8.0f} MB")
+
+
+def main(argv: Optional[List[str]] = None):
+    """Main function to run the audio stage benchmarks."""
+    parser = argparse.ArgumentParser(description='Benchmark audio pipeline stages on synthetic recordings')
+    parser.add_argument('--hours', type=float, default=DEFAULT_HOURS, help='Duration of each synthetic recording')
+    parser.add_argument('--sample-rates', type=int, nargs='+', default=list(DEFAULT_SAMPLE_RATES),
+                        help='Source sample rates (default: 44100 48000)')
+    parser.add_argument('--formats', nargs='+', default=list(DEFAULT_FORMATS), choices=sorted(FORMAT_SUBTYPES),
+                        help='Source formats (default: wav flac mp3)')
+    parser.add_argument('--work-dir', help='Directory for the synthetic files (default: system temp)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    args = parser.parse_args(argv)
+
+    run_benchmark(args.hours, args.sample_rates, args.formats, args.work_dir, args.seed)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
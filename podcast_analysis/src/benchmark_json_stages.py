@@ -0,0 +1,473 @@
+"""
+Benchmark harness for the JSON stages of the podcast pipeline.
+
+Generates synthetic diarization / ASR / speaker-labeled transcripts at a
+configurable multiple of our real episode size (1x ~= 3 hours, 4.5k
+diarization segments, 36k words) and times every JSON-only stage:
+
+- merge_speakers.merge_diarization_and_asr
+- every function in analysis_speaking_features.py
+- rolling_metrics.rolling_metrics
+- the build_segments_from_json pipeline
+- the plot builders in plot_conversation_features.py
+
+Results are appended to outputs/benchmarks/json_stages_history.jsonl so that
+scaling regressions are visible across runs.
+
+Usage (from the src directory):
+    python benchmark_json_stages.py --scales 1 10 100 --speakers 2
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+# Reference episode size (measured on the checked-in Trump/Rogan outputs)
+EPISODE_NUM_SEGMENTS = 4520
+EPISODE_WORDS_PER_SEC = 3.76
+MEAN_SEGMENT_SEC = 2.12
+OVERLAP_FRACTION = 0.15
+
+DEFAULT_SCALES = (1, 10, 100)
+DEFAULT_BUDGET_SEC = 120.0
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+BENCHMARKS_DIR = PROJECT_ROOT / "outputs" / "benchmarks"
+HISTORY_PATH = BENCHMARKS_DIR / "json_stages_history.jsonl"
+
+VOCABULARY = [
+    "the", "and", "you", "that", "it", "was", "we", "they", "people", "know",
+    "think", "great", "country", "really", "like", "right", "going", "said",
+    "very", "much", "years", "time", "want", "everybody", "tremendous",
+    "well", "so", "what", "about", "but", "this", "just", "there", "yeah",
+]
+
+
+def generate_synthetic_episode(
+    scale: float = 1.0,
+    num_speakers: int = 2,
+    seed: int = 0
+) -> Dict[str, Any]:
+    """
+    Generate a synthetic episode with realistic turn, gap and overlap statistics.
+
+    Consecutive turns always change speaker, so with two speakers they simply
+    alternate; with more, speaker 0 is picked ~3x as often as each of the
+    others (as the guest is in our reference episode). Each turn is a run of diarization segments with
+    short intra-turn pauses; turn boundaries are either a gap or an overlap.
+
+    Args:
+        scale: Multiple of the reference episode size
+        num_speakers: Number of distinct speakers
+        seed: Random seed for reproducibility
+
+    Returns:
+        dict with "diarization", "transcript_words" and "transcript_with_speakers"
+        payloads in the exact JSON schemas used by the pipeline
+    """
+    rng = np.random.default_rng(seed)
+    num_segments = max(1, int(EPISODE_NUM_SEGMENTS * scale))
+    speakers = [f"Speaker {i}" for i in range(num_speakers)]
+
+    # Speaker 0 is picked ~3x as often as each other speaker (only matters with 3+ speakers)
+    weights = np.ones(num_speakers)
+    weights[0] = 3.0
+    weights /= weights.sum()
+
+    # Segment durations (lognormal, mean ~MEAN_SEGMENT_SEC)
+    sigma = 0.8
+    mu = np.log(MEAN_SEGMENT_SEC) - sigma ** 2 / 2
+    durations = np.clip(rng.lognormal(mu, sigma, num_segments), 0.05, 90.0)
+
+    # Turn structure: geometric number of segments per turn
+    turn_lengths = rng.geometric(0.3, num_segments)
+
+    # Gaps: intra-turn pauses, inter-turn gaps or overlaps
+    intra_gaps = rng.exponential(0.25, num_segments)
+    inter_gaps = rng.exponential(0.4, num_segments)
+    overlaps = -np.minimum(rng.exponential(0.5, num_segments), 2.5)
+    is_overlap = rng.random(num_segments) < OVERLAP_FRACTION
+
+    diar_segments = []
+    speaker_codes = np.empty(num_segments, dtype=np.int64)
+    starts = np.empty(num_segments)
+    ends = np.empty(num_segments)
+
+    current_speaker = 0
+    t = 3.0
+    i = 0
+    turn = 0
+    while i < num_segments:
+        for j in range(turn_lengths[turn]):
+            if i >= num_segments:
+                break
+            if j > 0:
+                t += intra_gaps[i]
+            starts[i] = t
+            ends[i] = t + durations[i]
+            speaker_codes[i] = current_speaker
+            t = ends[i]
+            i += 1
+        turn += 1
+
+        # Pick the next speaker (always different when there is a choice)
+        if num_speakers > 1:
+            p = weights.copy()
+            p[current_speaker] = 0.0
+            current_speaker = int(rng.choice(num_speakers, p=p / p.sum()))
+
+        boundary = overlaps[i - 1] if is_overlap[i - 1] else inter_gaps[i - 1]
+        t = max(0.0, t + max(boundary, -durations[i - 1] * 0.9))
+
+    order = np.argsort(starts, kind="stable")
+    starts, ends, speaker_codes = starts[order], ends[order], speaker_codes[order]
+    starts = np.round(starts, 2)
+    ends = np.maximum(np.round(ends, 2), starts + 0.01)
+
+    # Words: Poisson count per segment, evenly spread across the segment
+    words_per_segment = rng.poisson(EPISODE_WORDS_PER_SEC * (ends - starts))
+    vocab_ids = rng.integers(0, len(VOCABULARY), int(words_per_segment.sum()))
+
+    labeled_segments = []
+    all_words = []
+    word_cursor = 0
+    for seg_idx in range(num_segments):
+        seg_start, seg_end = float(starts[seg_idx]), float(ends[seg_idx])
+        speaker = speakers[speaker_codes[seg_idx]]
+        diar_segments.append({"speaker": speaker, "start": seg_start, "end": seg_end})
+
+        n_words = int(words_per_segment[seg_idx])
+        if n_words == 0:
+            continue
+        edges = np.linspace(seg_start, seg_end, n_words + 1)
+        words = []
+        for k in range(n_words):
+            word = {
+                "start": round(float(edges[k]), 2),
+                "end": round(float(edges[k + 1]) - 0.01, 2),
+                "word": VOCABULARY[vocab_ids[word_cursor]]
+            }
+            word_cursor += 1
+            words.append(word)
+            all_words.append(word)
+        labeled_segments.append({
+            "speaker": speaker,
+            "start": seg_start,
+            "end": seg_end,
+            "text": " ".join(w["word"] for w in words),
+            "words": words
+        })
+
+    # ASR segments are speaker-agnostic chunks of ~15 words in time order
+    all_words.sort(key=lambda w: w["start"])
+    asr_segments = []
+    for k in range(0, len(all_words), 15):
+        chunk = all_words[k:k + 15]
+        asr_segments.append({
+            "start": chunk[0]["start"],
+            "end": chunk[-1]["end"],
+            "text": " ".join(w["word"] for w in chunk),
+            "words": chunk
+        })
+
+    audio_file = "data/processed/podcast_16k_mono.wav"
+    return {
+        "diarization": {"audio_file": audio_file, "segments": diar_segments},
+        "transcript_words": {"audio_file": audio_file, "sample_rate": 16000, "segments": asr_segments},
+        "transcript_with_speakers": {
+            "audio_file": audio_file,
+            "sample_rate": 16000,
+            "speakers": sorted(set(s["speaker"] for s in labeled_segments)),
+            "segments": labeled_segments
+        }
+    }
+
+
+def write_synthetic_episode(episode: Dict[str, Any], root: Path) -> Dict[str, Path]:
+    """
+    Write a synthetic episode to disk using the project directory layout.
+
+    Args:
+        episode: Output of generate_synthetic_episode()
+        root: Directory that plays the role of PROJECT_ROOT
+
+    Returns:
+        dict mapping artifact name to written path
+    """
+    features_dir = root / "outputs" / "audio_features"
+    features_dir.mkdir(parents=True, exist_ok=True)
+
+    paths = {
+        "diarization": features_dir / "diarization_segments.json",
+        "transcript_words": features_dir / "transcript_words.json",
+        "transcript_with_speakers": features_dir / "transcript_with_speakers.json",
+    }
+    for name, path in paths.items():
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(episode[name], f)
+    return paths
+
+
+def _time_call(fn: Callable[[], Any], repeat: int) -> float:
+    """Return the best wall-clock time of `repeat` calls, silencing stage output."""
+    best = float("inf")
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            t0 = time.perf_counter()
+            fn()
+            elapsed = time.perf_counter() - t0
+        best = min(best, elapsed)
+    return best
+
+
+def build_stages(root: Path, paths: Dict[str, Path]) -> Dict[str, Callable[[], Any]]:
+    """
+    Build the ordered set of benchmarked stages for one synthetic episode.
+
+    Stages are ordered so that each one's inputs are produced by an earlier
+    stage (analysis outputs feed the plot builders).
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+
+    import analysis_speaking_features as asf
+    import build_segments_from_json as bsj
+    import merge_speakers
+    import plot_conversation_features as pcf
+    import plot_renderer
+    import rolling_metrics as rm
+
+    features_dir = root / "outputs" / "audio_features"
+    transcript = str(paths["transcript_with_speakers"])
+
+    def run_build_segments():
+        segments = bsj.load_transcript(transcript)
+        speaker = segments[0]["speaker"]
+        speaker_segments = bsj.filter_segments_by_speaker(segments, speaker)
+        filtered = bsj.drop_tiny_segments(speaker_segments)
+        windows = bsj.merge_adjacent_segments_for_speaker(filtered, speaker)
+        bsj.save_segmentation_metadata(windows, str(root / "data" / "segments" / "bench_segments.json"), speaker)
+
+    def plot_stage(builder):
+        def run():
+            plot_renderer.set_project_root(root)
+            pcf.PLOTS_DIR.mkdir(parents=True, exist_ok=True)
+            builder()
+        return run
+
+    stages = {
+        "merge_diarization_and_asr": lambda: merge_speakers.merge_diarization_and_asr(
+            str(paths["diarization"]), str(paths["transcript_words"]),
+            str(features_dir / "transcript_with_speakers_merged.json")),
+        "basic_speaker_stats": lambda: asf.basic_speaker_stats(
+            transcript, str(features_dir / "basic_speaker_stats.json")),
+        "speaking_rate_timeseries": lambda: asf.speaking_rate_timeseries(
+            transcript, str(features_dir / "speaking_rate_timeseries.json"),
+            str(features_dir / "speaking_rate_timeseries.png")),
+        "detect_interruptions": lambda: asf.detect_interruptions(
+            transcript, str(features_dir / "interruptions.json")),
+        "turn_taking_stats": lambda: asf.turn_taking_stats(
+            transcript, str(features_dir / "turn_taking_stats.json")),
+        "detect_word_overlaps": lambda: asf.detect_word_overlaps(
+            transcript, str(features_dir / "word_overlaps.json")),
+        "rolling_metrics": lambda: rm.rolling_metrics(
+            transcript, str(features_dir / "rolling_metrics.json")),
+        "build_segments_from_json": run_build_segments,
+    }
+
+    for builder in [
+        pcf.make_plot_total_speaking_time,
+        pcf.make_plot_total_words,
+        pcf.make_plot_speaking_rate_timeseries,
+        pcf.make_plot_interruptions_summary,
+        pcf.make_plot_interruptions_timeline,
+        pcf.make_plot_interruption_duration_hist,
+        pcf.make_plot_interruption_types_by_speaker,
+        pcf.make_plot_transitions_bar,
+        pcf.make_plot_run_stats,
+        pcf.make_plot_stacked_area_speaker_dominance,
+        pcf.make_plot_rolling_metrics,
+    ]:
+        stages[builder.__name__] = plot_stage(builder)
+
+    return stages
+
+
+def run_benchmark(
+    scales: List[float] = DEFAULT_SCALES,
+    num_speakers: int = 2,
+    repeat: int = 1,
+    budget_sec: float = DEFAULT_BUDGET_SEC,
+    only: Optional[List[str]] = None,
+    seed: int = 0
+) -> Dict[str, Any]:
+    """
+    Run all JSON stage benchmarks over the requested scales.
+
+    Once a stage exceeds `budget_sec` at some scale it is skipped (recorded as
+    None) at every larger scale, so quadratic stages do not stall the run.
+
+    Args:
+        scales: Episode size multiples to benchmark
+        num_speakers: Number of synthetic speakers
+        repeat: Number of timed repetitions per stage (best is kept)
+        budget_sec: Per-stage time budget before larger scales are skipped
+        only: Optional list of stage names to run
+        seed: Random seed for the synthetic data
+
+    Returns:
+        Benchmark record (also appended to HISTORY_PATH)
+    """
+    over_budget = set()
+    results = []
+
+    for scale in sorted(scales):
+        print(f"\n=== Scale {scale}x ({num_speakers} speakers) ===")
+        t0 = time.perf_counter()
+        episode = generate_synthetic_episode(scale, num_speakers, seed)
+        gen_sec = time.perf_counter() - t0
+
+        num_segments = len(episode["diarization"]["segments"])
+        num_words = sum(len(s["words"]) for s in episode["transcript_with_speakers"]["segments"])
+        print(f"Generated {num_segments} segments, {num_words} words in {gen_sec:.2f}s")
+
+        with tempfile.TemporaryDirectory(prefix="bench_json_") as tmp:
+            root = Path(tmp)
+            paths = write_synthetic_episode(episode, root)
+            del episode
+            stages = build_stages(root, paths)
+
+            timings = {}
+            for name, fn in stages.items():
+                if only and name not in only:
+                    continue
+                if name in over_budget:
+                    print(f"  {name:<45} skipped (over budget at smaller scale)")
+                    timings[name] = None
+                    continue
+                elapsed = _time_call(fn, repeat)
+                timings[name] = elapsed
+                print(f"  {name:<45} {elapsed:>10.3f}s")
+                if elapsed > budget_sec:
+                    over_budget.add(name)
+
+        results.append({
+            "scale": scale,
+            "num_segments": num_segments,
+            "num_words": num_words,
+            "timings_sec": timings
+        })
+
+    record = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "num_speakers": num_speakers,
+        "repeat": repeat,
+        "results": results
+    }
+
+    _print_scaling_summary(results)
+    _print_regressions(record)
+
+    BENCHMARKS_DIR.mkdir(parents=True, exist_ok=True)
+    with open(HISTORY_PATH, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(record) + "\n")
+    print(f"\nAppended results to: {HISTORY_PATH}")
+
+    return record
+
+
+def _git_commit() -> Optional[str]:
+    """Return the current git commit hash, if available."""
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=PROJECT_ROOT, stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _print_scaling_summary(results: List[Dict[str, Any]]) -> None:
+    """Print the empirical scaling exponent of each stage between scales."""
+    if len(results) < 2:
+        return
+
+    print("\n" + "=" * 70)
+    print("SCALING (exponent k in time ~ size^k; 1.0 = linear)")
+    print("=" * 70)
+    for name in results[0]["timings_sec"]:
+        exponents = []
+        for prev, cur in zip(results, results[1:]):
+            t_prev = prev["timings_sec"].get(name)
+            t_cur = cur["timings_sec"].get(name)
+            if t_prev and t_cur:
+                size_ratio = cur["num_words"] / max(prev["num_words"], 1)
+                exponents.append(f"{np.log(t_cur / t_prev) / np.log(size_ratio):.2f}")
+            else:
+                exponents.append("-")
+        print(f"  {name:<45} {'  '.join(exponents)}")
+
+
+def _print_regressions(record: Dict[str, Any], threshold: float = 1.25) -> None:
+    """Compare against the previous run in the history file and flag slowdowns."""
+    if not HISTORY_PATH.exists():
+        return
+
+    previous = None
+    with open(HISTORY_PATH, 'r', encoding='utf-8') as f:
+        for line in f:
+            prev = json.loads(line)
+            if prev.get("num_speakers") == record["num_speakers"]:
+                previous = prev
+    if previous is None:
+        return
+
+    prev_by_scale = {r["scale"]: r["timings_sec"] for r in previous["results"]}
+    flagged = []
+    for result in record["results"]:
+        prev_timings = prev_by_scale.get(result["scale"], {})
+        for name, elapsed in result["timings_sec"].items():
+            before = prev_timings.get(name)
+            if elapsed and before and elapsed > before * threshold:
+                flagged.append((result["scale"], name, before, elapsed))
+
+    print(f"\nCompared with previous run ({previous['timestamp']}, {previous.get('git_commit')}):")
+    if not flagged:
+        print("  No regressions above {:.0%}".format(threshold - 1))
+    for scale, name, before, elapsed in flagged:
+        print(f"  ⚠️ {scale}x {name}: {before:.3f}s -> {elapsed:.3f}s ({elapsed / before:.2f}x)")
+
+
+def main(argv: Optional[List[str]] = None):
+    """Main function to run the JSON stage benchmarks."""
+    parser = argparse.ArgumentParser(description='Benchmark JSON pipeline stages on synthetic episodes')
+    parser.add_argument('--scales', type=float, nargs='+', default=list(DEFAULT_SCALES),
+                        help='Episode size multiples (default: 1 10 100)')
+    parser.add_argument('--speakers', type=int, default=2, help='Number of synthetic speakers')
+    parser.add_argument('--repeat', type=int, default=1, help='Timed repetitions per stage')
+    parser.add_argument('--budget-sec', type=float, default=DEFAULT_BUDGET_SEC,
+                        help='Skip a stage at larger scales once it exceeds this time')
+    parser.add_argument('--only', nargs='+', help='Only run the named stages')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    args = parser.parse_args(argv)
+
+    run_benchmark(args.scales, args.speakers, args.repeat, args.budget_sec, args.only, args.seed)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
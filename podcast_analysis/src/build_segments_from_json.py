@@ -8,6 +8,8 @@ import json
 import os
 from typing import List, Dict, Any
 
+from word_table import TranscriptTable
+
 
 # Configuration parameters
 TARGET_SPEAKER = "Donald Trump"
@@ -30,14 +32,11 @@ def load_transcript(json_path: str) -> List[Dict[str, Any]]:
         - start (float, seconds)
         - end (float, seconds) 
         - text (str)
-        - words (list of dicts with "start", "end", "word")
+        - word_count (int; word dicts are not materialized, windows only need counts)
     """
     print(f"Loading transcript from: {json_path}")
     
-    with open(json_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    segments = data.get('segments', [])
+    segments = TranscriptTable.load(json_path).segment_dicts(with_words=False)
     print(f"Loaded {len(segments)} total segments")
     
     # Ensure segments are sorted by start time
@@ -46,6 +45,13 @@ def load_transcript(json_path: str) -> List[Dict[str, Any]]:
     return segments_sorted
 
 
+def _word_count(seg: Dict[str, Any]) -> int:
+    """Number of words in a segment, from word_count or its word list."""
+    if 'word_count' in seg:
+        return seg['word_count']
+    return len(seg.get('words', []))
+
+
 def filter_segments_by_speaker(segments: List[Dict[str, Any]], target_speaker: str) -> List[Dict[str, Any]]:
     """
     Filter segments to keep only those from the target speaker.
@@ -77,7 +83,7 @@ def drop_tiny_segments(segments: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     
     for seg in segments:
         duration = seg['end'] - seg['start']
-        word_count = len(seg.get('words', []))
+        word_count = _word_count(seg)
         
         # Keep if duration >= MIN_KEEP_LEN OR word_count >= MIN_WORDS
         if duration >= MIN_KEEP_LEN or word_count >= MIN_WORDS:
@@ -115,20 +121,20 @@ def merge_adjacent_segments_for_speaker(segments: List[Dict[str, Any]], target_s
     current_start = None
     current_end = None
     current_texts = []
-    current_words = []
+    current_word_count = 0
     
     for seg in segments:
         seg_start = seg['start']
         seg_end = seg['end']
         seg_text = seg.get('text', '')
-        seg_words = seg.get('words', [])
+        seg_word_count = _word_count(seg)
         
         if current_start is None:
             # Start first window
             current_start = seg_start
             current_end = seg_end
             current_texts = [seg_text] if seg_text else []
-            current_words = seg_words.copy()
+            current_word_count = seg_word_count
         else:
             gap = seg_start - current_end
             
@@ -137,7 +143,7 @@ def merge_adjacent_segments_for_speaker(segments: List[Dict[str, Any]], target_s
                 current_end = seg_end
                 if seg_text:
                     current_texts.append(seg_text)
-                current_words.extend(seg_words)
+                current_word_count += seg_word_count
             else:
                 # Close current window if it's long enough
                 window_duration = current_end - current_start
@@ -147,17 +153,17 @@ def merge_adjacent_segments_for_speaker(segments: List[Dict[str, Any]], target_s
                         'end': current_end,
                         'duration': window_duration,
                         'text': ' '.join(current_texts),
-                        'word_count': len(current_words),
+                        'word_count': current_word_count,
                         'speaker': target_speaker
                     }
                     windows.append(window)
-                    print(f"Created window: {window_duration:.2f}s, {len(current_words)} words")
+                    print(f"Created window: {window_duration:.2f}s, {current_word_count} words")
                 
                 # Start new window
                 current_start = seg_start
                 current_end = seg_end
                 current_texts = [seg_text] if seg_text else []
-                current_words = seg_words.copy()
+                current_word_count = seg_word_count
     
     # Flush last window
     if current_start is not None:
@@ -168,11 +174,11 @@ def merge_adjacent_segments_for_speaker(segments: List[Dict[str, Any]], target_s
                 'end': current_end,
                 'duration': window_duration,
                 'text': ' '.join(current_texts),
-                'word_count': len(current_words),
+                'word_count': current_word_count,
                 'speaker': target_speaker
             }
             windows.append(window)
-            print(f"Created final window: {window_duration:.2f}s, {len(current_words)} words")
+            print(f"Created final window: {window_duration:.2f}s, {current_word_count} words")
     
     print(f"Created {len(windows)} final windows")
     return windows
@@ -203,20 +209,20 @@ def merge_adjacent_segments(segments: List[Dict[str, Any]]) -> List[Dict[str, An
     current_start = None
     current_end = None
     current_texts = []
-    current_words = []
+    current_word_count = 0
     
     for seg in segments:
         seg_start = seg['start']
         seg_end = seg['end']
         seg_text = seg.get('text', '')
-        seg_words = seg.get('words', [])
+        seg_word_count = _word_count(seg)
         
         if current_start is None:
             # Start first window
             current_start = seg_start
             current_end = seg_end
             current_texts = [seg_text] if seg_text else []
-            current_words = seg_words.copy()
+            current_word_count = seg_word_count
         else:
             gap = seg_start - current_end
             
@@ -225,7 +231,7 @@ def merge_adjacent_segments(segments: List[Dict[str, Any]]) -> List[Dict[str, An
                 current_end = seg_end
                 if seg_text:
                     current_texts.append(seg_text)
-                current_words.extend(seg_words)
+                current_word_count += seg_word_count
             else:
                 # Close current window if it's long enough
                 window_duration = current_end - current_start
@@ -235,17 +241,17 @@ def merge_adjacent_segments(segments: List[Dict[str, Any]]) -> List[Dict[str, An
                         'end': current_end,
                         'duration': window_duration,
                         'text': ' '.join(current_texts),
-                        'word_count': len(current_words),
+                        'word_count': current_word_count,
                         'speaker': TARGET_SPEAKER
                     }
                     windows.append(window)
-                    print(f"Created window: {window_duration:.2f}s, {len(current_words)} words")
+                    print(f"Created window: {window_duration:.2f}s, {current_word_count} words")
                 
                 # Start new window
                 current_start = seg_start
                 current_end = seg_end
                 current_texts = [seg_text] if seg_text else []
-                current_words = seg_words.copy()
+                current_word_count = seg_word_count
     
     # Flush last window
     if current_start is not None:
@@ -256,11 +262,11 @@ def merge_adjacent_segments(segments: List[Dict[str, Any]]) -> List[Dict[str, An
                 'end': current_end,
                 'duration': window_duration,
                 'text': ' '.join(current_texts),
-                'word_count': len(current_words),
+                'word_count': current_word_count,
                 'speaker': TARGET_SPEAKER
             }
             windows.append(window)
-            print(f"Created final window: {window_duration:.2f}s, {len(current_words)} words")
+            print(f"Created final window: {window_duration:.2f}s, {current_word_count} words")
     
     print(f"Created {len(windows)} final windows")
     return windows
@@ -0,0 +1,213 @@
+"""
+Stereo-channel energy diarization.
+
+For two-mic shows each host has their own channel (see
+speaker_separation_librosa.py), so "who is speaking" can be read off the
+channel energies instead of running a neural diarization model:
+
+1. Framewise RMS of both speaker WAVs, read in blocks from the shared PCM
+   cache (pcm_cache.py); frames are strided views (sliding_window_view)
+   reduced with einsum, so no frame matrix is materialized.
+2. Crosstalk suppression: a frame whose level is more than
+   CROSSTALK_MARGIN_DB below the other channel is treated as bleed from the
+   other mic.
+3. Hysteresis relative to each channel's noise floor: a region opens above
+   floor + ON_THRESHOLD_DB and stays open while above floor + OFF_THRESHOLD_DB.
+4. Short gaps are bridged and short bursts dropped.
+
+The result is written as diarization_segments.json in the same schema as
+diarization.diarize_podcast (speakers "S0" = left / A, "S1" = right / B), so
+update_speaker_labels and the rest of the pipeline work unchanged.
+"""
+
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import soundfile as sf
+from numpy.lib.stride_tricks import sliding_window_view
+
+from config import AUDIO_WAV_PATH, PCM_CACHE_DIR
+from frame_activity import hysteresis, mask_runs, smooth_activity
+from pcm_cache import pcm_blocks
+
+FRAME_SEC = 0.025
+HOP_SEC = 0.010
+NOISE_FLOOR_PERCENTILE = 10
+ON_THRESHOLD_DB = 15.0
+OFF_THRESHOLD_DB = 8.0
+CROSSTALK_MARGIN_DB = 6.0
+MIN_SPEECH_SEC = 0.25
+MIN_SILENCE_SEC = 0.30
+BLOCK_FRAMES = 60000  # frames per streamed block (10 minutes at a 10 ms hop)
+
+
+def framewise_rms_db(
+    path: str,
+    frame_sec: float = FRAME_SEC,
+    hop_sec: float = HOP_SEC,
+    cache_dir: Optional[str] = PCM_CACHE_DIR
+) -> Tuple[np.ndarray, int]:
+    """
+    Framewise RMS level of a mono audio file in dBFS.
+
+    The decoded signal is read from the PCM cache in overlapping blocks of
+    the memory-mapped samples, so only one block is paged in at a time.
+
+    Args:
+        path: Mono audio file
+        frame_sec: Frame length in seconds
+        hop_sec: Hop between frames in seconds
+        cache_dir: PCM cache directory, None to read the file directly
+
+    Returns:
+        tuple: (levels in dB per frame, sample rate)
+    """
+    sr = sf.info(path).samplerate
+    frame = int(round(frame_sec * sr))
+    hop = int(round(hop_sec * sr))
+
+    levels = []
+    blocksize = BLOCK_FRAMES * hop + (frame - hop)
+    for block in pcm_blocks(path, blocksize, overlap=frame - hop, cache_dir=cache_dir):
+        if block.ndim > 1:
+            block = block.mean(axis=1)
+        if len(block) < frame:
+            break
+        frames = sliding_window_view(block, frame)[::hop]
+        energy = np.einsum('ij,ij->i', frames, frames, dtype=np.float64) / frame
+        levels.append(energy)
+
+    energy = np.concatenate(levels) if levels else np.zeros(0)
+    return 10.0 * np.log10(energy + 1e-12), sr
+
+
+def channel_activity(
+    levels_a: np.ndarray,
+    levels_b: np.ndarray,
+    on_db: float = ON_THRESHOLD_DB,
+    off_db: float = OFF_THRESHOLD_DB,
+    crosstalk_margin_db: float = CROSSTALK_MARGIN_DB
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Per-frame speech activity of both channels from their dB levels.
+
+    Args:
+        levels_a: dB levels of channel A
+        levels_b: dB levels of channel B
+        on_db: Opening threshold above the channel's noise floor
+        off_db: Closing threshold above the channel's noise floor
+        crosstalk_margin_db: A frame this far below the other channel is bleed
+
+    Returns:
+        tuple: (activity of A, activity of B)
+    """
+    n = min(len(levels_a), len(levels_b))
+    levels_a, levels_b = levels_a[:n], levels_b[:n]
+
+    activity = []
+    for own, other in ((levels_a, levels_b), (levels_b, levels_a)):
+        floor = np.percentile(own, NOISE_FLOOR_PERCENTILE) if n else 0.0
+        not_bleed = own >= other - crosstalk_margin_db
+        activity.append(hysteresis((own > floor + on_db) & not_bleed, (own > floor + off_db) & not_bleed))
+    return activity[0], activity[1]
+
+
+def diarize_channels(
+    speaker_a_path: Optional[str] = None,
+    speaker_b_path: Optional[str] = None,
+    output_file_path: str = "outputs/audio_features/diarization_segments.json",
+    audio_file: str = AUDIO_WAV_PATH,
+    frame_sec: float = FRAME_SEC,
+    hop_sec: float = HOP_SEC,
+    on_db: float = ON_THRESHOLD_DB,
+    off_db: float = OFF_THRESHOLD_DB,
+    crosstalk_margin_db: float = CROSSTALK_MARGIN_DB,
+    min_speech_sec: float = MIN_SPEECH_SEC,
+    min_silence_sec: float = MIN_SILENCE_SEC,
+    cache_dir: Optional[str] = PCM_CACHE_DIR
+) -> Dict[str, Any]:
+    """
+    Diarize a two-mic recording from its per-speaker channel files.
+
+    Args:
+        speaker_a_path: Speaker A (left channel) WAV. Defaults to the speaker_separation_librosa output
+        speaker_b_path: Speaker B (right channel) WAV. Defaults to the speaker_separation_librosa output
+        output_file_path: Path to save the diarization results JSON
+        audio_file: Audio file recorded in the output (the mono mix the pipeline transcribes)
+        frame_sec: Frame length in seconds
+        hop_sec: Hop between frames in seconds
+        on_db: Opening threshold above the channel's noise floor
+        off_db: Closing threshold above the channel's noise floor
+        crosstalk_margin_db: A frame this far below the other channel is bleed
+        min_speech_sec: Shorter speech bursts are dropped
+        min_silence_sec: Shorter pauses inside a turn are bridged
+        cache_dir: PCM cache directory, None to read the files without caching them
+
+    Returns:
+        dict: Diarization results containing segments (same schema as diarize_podcast)
+    """
+    if speaker_a_path is None or speaker_b_path is None:
+        from speaker_separation_librosa import get_speaker_file_paths
+        default_a, default_b = get_speaker_file_paths()
+        speaker_a_path = speaker_a_path or default_a
+        speaker_b_path = speaker_b_path or default_b
+
+    print("🎙️  Starting channel-energy diarization...")
+    t0 = time.perf_counter()
+    levels_a, sr_a = framewise_rms_db(speaker_a_path, frame_sec, hop_sec, cache_dir)
+    levels_b, sr_b = framewise_rms_db(speaker_b_path, frame_sec, hop_sec, cache_dir)
+    if sr_a != sr_b:
+        raise ValueError(f"Speaker files have different sample rates: {sr_a} vs {sr_b}")
+    print(f"✅ Computed {len(levels_a)} frames per channel in {time.perf_counter() - t0:.2f}s")
+
+    active_a, active_b = channel_activity(levels_a, levels_b, on_db, off_db, crosstalk_margin_db)
+
+    hop = int(round(hop_sec * sr_a)) / sr_a
+    frame = int(round(frame_sec * sr_a)) / sr_a
+    segments = []
+    for speaker, active in (("S0", active_a), ("S1", active_b)):
+        active = smooth_activity(active, int(round(min_speech_sec / hop)), int(round(min_silence_sec / hop)))
+        starts, ends = mask_runs(active)
+        segments.extend(
+            {"speaker": speaker, "start": round(start * hop, 2), "end": round((end - 1) * hop + frame, 2)}
+            for start, end in zip(starts.tolist(), ends.tolist())
+        )
+    segments.sort(key=lambda s: (s["start"], s["speaker"]))
+
+    result = {
+        "audio_file": audio_file,
+        "segments": segments
+    }
+
+    output_dir = Path(output_file_path).parent
+    output_dir.mkdir(parents=True, exist_ok=True)
+    print(f"💾 Saving diarization results to: {output_file_path}")
+    with open(output_file_path, 'w', encoding='utf-8') as f:
+        json.dump(result, f, indent=2, ensure_ascii=False)
+
+    duration = len(levels_a) * hop
+    for speaker in ("S0", "S1"):
+        speech = sum(s["end"] - s["start"] for s in segments if s["speaker"] == speaker)
+        count = sum(1 for s in segments if s["speaker"] == speaker)
+        print(f"   {speaker}: {count} segments, {speech / 60:.1f} min "
+              f"({speech / duration * 100 if duration else 0:.1f}% of {duration / 60:.1f} min)")
+    print(f"✅ Channel diarization completed in {time.perf_counter() - t0:.2f}s")
+
+    return result
+
+
+def main():
+    """Main function to run channel-energy diarization on the separated speaker files."""
+    try:
+        diarize_channels()
+    except Exception as e:
+        print(f"❌ Channel diarization failed: {str(e)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
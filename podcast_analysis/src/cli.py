@@ -0,0 +1,385 @@
+"""
+Unified command line for the podcast analysis pipeline.
+
+One entry point with a subcommand per stage, replacing the per-module
+main() functions and their hard-coded relative paths:
+
+- every path is an option (defaults are the usual outputs/ layout) and
+  -C/--root sets the directory they are relative to
+- stages with their own argparse main() are delegated to it, so their
+  options and --help are unchanged
+- heavy dependencies (librosa, matplotlib, pandas, torch, whisper,
+  pyannote) are imported only inside the subcommands that need them, so
+  JSON-only commands such as stats start in a fraction of a second
+
+`startup` measures that promise: it runs the imports of every command in a
+fresh interpreter with -X importtime and fails when a lightweight command
+exceeds STARTUP_BUDGET_SEC or pulls in a heavy package.
+
+Usage (from the podcast_analysis directory):
+    python src/cli.py stats
+    python src/cli.py merge --diarization outputs/audio_features/diarization_segments.json
+    python src/cli.py -C episodes/ep42 plots --force
+    python src/cli.py startup
+"""
+
+import argparse
+import importlib
+import os
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+PROG = "podcast-analysis"
+STARTUP_BUDGET_SEC = 0.5  # wall time allowed for a lightweight command to be ready to run
+HEAVY_MODULES = ("librosa", "matplotlib", "pandas", "torch", "torchaudio", "whisper", "pyannote",
+                 "scipy", "sklearn", "sentence_transformers")
+
+TRANSCRIPT = "outputs/audio_features/transcript_with_speakers.json"
+FEATURES_DIR = "outputs/audio_features"
+
+# name -> (module with main(argv), light, help); options are parsed by the module itself
+DELEGATED_COMMANDS: Dict[str, Tuple[str, bool, str]] = {
+    "vad": ("voice_activity", True, "Detect speech regions (speech_regions.json)"),
+    "slice": ("slice_audio_segments", False, "Cut per-window audio clips for a speaker"),
+    "voiceprints": ("voiceprints", True, "Enroll voiceprints and identify diarized speakers"),
+    "voice-index": ("voice_index", True, "Corpus-wide speaker embedding index"),
+    "update-labels": ("update_speaker_labels", True, "Apply a speaker mapping to diarization segments"),
+    "relabel": ("relabel", True, "Propagate a speaker relabel to every derived artifact"),
+    "plots": ("plot_renderer", False, "Render the conversation plots"),
+    "text": ("run_text_pipeline", False, "Text blocks, embeddings and topic segmentation"),
+    "index": ("transcript_index", True, "Build the transcript search index"),
+    "search": ("transcript_search", True, "Search indexed transcripts"),
+    "corpus": ("corpus_aggregator", True, "Aggregate statistics across episodes"),
+    "online": ("online_analytics", True, "Online conversation analytics over segment events"),
+    "live": ("live_stream", True, "Live streaming transcription and diarization"),
+    "serve": ("job_server", True, "Local job API for the pipeline"),
+    "bench-json": ("benchmark_json_stages", True, "Benchmark the JSON stages"),
+    "bench-audio": ("benchmark_audio_stages", True, "Benchmark the audio stages"),
+}
+
+# Delegated commands whose paths default to the checkout: -C is passed on as --root
+ROOTED_COMMANDS = ("plots",)
+
+# name -> modules imported by the handler (for the startup check)
+NATIVE_MODULES: Dict[str, Tuple[str, ...]] = {
+    "preprocess": ("audio_preprocess",),
+    "separate": ("speaker_separation_librosa",),
+    "diarize": ("diarization",),
+    "channel-diarize": ("channel_diarization",),
+    "transcribe": ("asr_transcript",),
+    "merge": ("merge_speakers",),
+    "stats": ("analysis_speaking_features",),
+    "speaking-rate": ("analysis_speaking_features",),
+    "interruptions": ("analysis_speaking_features",),
+    "overlaps": ("analysis_speaking_features",),
+    "turn-taking": ("analysis_speaking_features",),
+    "rolling": ("rolling_metrics",),
+    "segments": ("build_segments_from_json",),
+}
+HEAVY_NATIVE_COMMANDS = ("preprocess", "separate")  # decode audio with librosa as soon as they run
+
+
+# -- native stage handlers ------------------------------------------------------
+
+def _given(**options) -> Dict[str, object]:
+    """Options set on the command line; the rest keep the stage's defaults (without importing it here)."""
+    return {name: value for name, value in options.items() if value is not None}
+
+
+def _cmd_preprocess(args) -> int:
+    from audio_preprocess import convert_to_mono_wav_librosa
+    return 0 if convert_to_mono_wav_librosa(args.input, args.output) else 1
+
+
+def _cmd_separate(args) -> int:
+    from speaker_separation_librosa import split_stereo_to_speakers_librosa
+    return 0 if split_stereo_to_speakers_librosa(args.input, args.output_dir) else 1
+
+
+def _cmd_diarize(args) -> int:
+    from diarization import diarize_podcast
+    diarize_podcast(args.audio, args.output, args.speech_regions, args.voice_index, args.episode_id)
+    return 0
+
+
+def _cmd_channel_diarize(args) -> int:
+    from channel_diarization import diarize_channels
+    options = {"cache_dir": None} if args.no_pcm_cache else {}
+    diarize_channels(args.speaker_a, args.speaker_b, args.output, args.audio, **options)
+    return 0
+
+
+def _cmd_transcribe(args) -> int:
+    from asr_transcript import transcribe_podcast
+    transcribe_podcast(args.audio, args.output, args.speech_regions)
+    return 0
+
+
+def _cmd_merge(args) -> int:
+    from merge_speakers import merge_diarization_and_asr
+    merge_diarization_and_asr(args.diarization, args.transcript, args.output)
+    return 0
+
+
+def _cmd_stats(args) -> int:
+    from analysis_speaking_features import basic_speaker_stats
+    basic_speaker_stats(args.transcript, args.output)
+    return 0
+
+
+def _cmd_speaking_rate(args) -> int:
+    from analysis_speaking_features import speaking_rate_timeseries
+    speaking_rate_timeseries(args.transcript, args.output, args.plot, args.window, args.step)
+    return 0
+
+
+def _cmd_interruptions(args) -> int:
+    from analysis_speaking_features import detect_interruptions
+    detect_interruptions(args.transcript, args.output)
+    return 0
+
+
+def _cmd_overlaps(args) -> int:
+    from analysis_speaking_features import detect_word_overlaps
+    detect_word_overlaps(args.transcript, args.output, args.min_overlap)
+    return 0
+
+
+def _cmd_turn_taking(args) -> int:
+    from analysis_speaking_features import turn_taking_stats
+    turn_taking_stats(args.transcript, args.output, **_given(merge_gap_sec=args.merge_gap))
+    return 0
+
+
+def _cmd_rolling(args) -> int:
+    from rolling_metrics import rolling_metrics
+    rolling_metrics(args.transcript, args.output, **_given(window_size_sec=args.window, step_size_sec=args.step))
+    return 0
+
+
+def _cmd_segments(args) -> int:
+    import build_segments_from_json as bsj
+    speaker = args.speaker or bsj.TARGET_SPEAKER
+    output = args.output or f"data/segments/{speaker.replace(' ', '_').replace('.', '')}_segments.json"
+    segments = bsj.filter_segments_by_speaker(bsj.load_transcript(args.transcript), speaker)
+    windows = bsj.merge_adjacent_segments_for_speaker(bsj.drop_tiny_segments(segments), speaker)
+    if not windows:
+        print(f"❌ No windows for speaker: {speaker}")
+        return 1
+    bsj.save_segmentation_metadata(windows, output, speaker)
+    return 0
+
+
+# -- startup budget -------------------------------------------------------------
+
+def import_command(name: str) -> None:
+    """Import everything a command needs before its stage starts (used by the startup probe)."""
+    modules = (DELEGATED_COMMANDS[name][0],) if name in DELEGATED_COMMANDS else NATIVE_MODULES[name]
+    for module in modules:
+        __import__(module)  # unlike importlib.import_module, logged by -X importtime
+
+
+def probe_startup(name: str) -> Dict[str, object]:
+    """
+    Measure one command's startup in a fresh interpreter.
+
+    Args:
+        name: Command name
+
+    Returns:
+        dict: wall_sec (interpreter + imports), import_sec (cumulative -X importtime
+            of the command's modules) and heavy (heavy top-level packages imported)
+    """
+    src_dir = os.path.dirname(os.path.abspath(__file__))
+    code = f"import sys; sys.path.insert(0, {src_dir!r}); import cli; cli.import_command({name!r})"
+    t0 = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True)
+    wall_sec = time.perf_counter() - t0
+    if proc.returncode != 0:
+        raise RuntimeError(f"{name}: import failed\n{proc.stderr.strip().splitlines()[-1]}")
+
+    heavy = []
+    import_us = 0
+    for line in proc.stderr.splitlines():
+        # "import time:  self [us] |  cumulative | imported package"; nested imports are indented
+        fields = line[len("import time:"):].split("|")
+        if not line.startswith("import time:") or len(fields) != 3 or not fields[1].strip().isdigit():
+            continue
+        package = fields[2].rstrip()
+        top = package.strip().split(".")[0]
+        if top in HEAVY_MODULES and top not in heavy:
+            heavy.append(top)
+        nested = package.startswith("  ")
+        if not nested and top in NATIVE_MODULES.get(name, ()) + (DELEGATED_COMMANDS.get(name, ("",))[0], "cli"):
+            import_us += int(fields[1])
+    return {"wall_sec": wall_sec, "import_sec": import_us / 1e6, "heavy": heavy}
+
+
+def _cmd_startup(args) -> int:
+    names = args.commands or list(NATIVE_MODULES) + list(DELEGATED_COMMANDS)
+    unknown = [name for name in names if name not in NATIVE_MODULES and name not in DELEGATED_COMMANDS]
+    if unknown:
+        print(f"❌ Unknown command(s): {', '.join(unknown)}")
+        return 1
+
+    print(f"\n" + "="*70)
+    print(f"STARTUP BUDGET ({args.budget:.2f}s per lightweight command)")
+    print("="*70)
+    print(f"{'Command':<16} {'Wall(s)':<8} {'Import(s)':<10} {'Status':<7} Heavy imports")
+    print("-" * 70)
+    failures = 0
+    for name in names:
+        light = _is_light(name)
+        try:
+            probe = probe_startup(name)
+        except RuntimeError as e:
+            # Optional dependencies of heavy stages may be missing in this environment
+            print(f"{name:<16} {'-':<8} {'-':<10} {'SKIP' if not light else 'FAIL':<7} {str(e).splitlines()[-1]}")
+            failures += light
+            continue
+        if not light:
+            status = "heavy"
+        elif probe["wall_sec"] > args.budget or probe["heavy"]:
+            status = "OVER"
+            failures += 1
+        else:
+            status = "ok"
+        print(f"{name:<16} {probe['wall_sec']:<8.3f} {probe['import_sec']:<10.3f} {status:<7} "
+              f"{', '.join(probe['heavy']) or '-'}")
+    print("="*70)
+    if failures:
+        print(f"❌ {failures} lightweight command(s) over budget or importing heavy packages")
+        return 1
+    print("✅ All lightweight commands start within budget")
+    return 0
+
+
+def _is_light(name: str) -> bool:
+    if name in DELEGATED_COMMANDS:
+        return DELEGATED_COMMANDS[name][1]
+    return name not in HEAVY_NATIVE_COMMANDS
+
+
+# -- parser ---------------------------------------------------------------------
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser (imports no stage module)."""
+    parser = argparse.ArgumentParser(prog=PROG, description='Podcast conversation analysis pipeline')
+    parser.add_argument('-C', '--root', help='Directory that relative paths refer to (default: current directory)')
+    sub = parser.add_subparsers(dest='command', metavar='COMMAND', required=True)
+
+    def add(name: str, handler: Callable, summary: str) -> argparse.ArgumentParser:
+        command = sub.add_parser(name, help=summary, description=summary)
+        command.set_defaults(handler=handler)
+        return command
+
+    command = add('preprocess', _cmd_preprocess, 'Convert the raw recording to 16 kHz mono WAV')
+    command.add_argument('--input', help='Raw audio (default: data/raw/podcast.mp3)')
+    command.add_argument('--output', help='Mono WAV (default: data/processed/podcast_16k_mono.wav)')
+
+    command = add('separate', _cmd_separate, 'Split a stereo two-mic recording into per-speaker WAVs')
+    command.add_argument('--input', help='Stereo audio (default: data/raw/podcast.mp3)')
+    command.add_argument('--output-dir', help='Output directory (default: data/processed)')
+
+    command = add('diarize', _cmd_diarize, 'Speaker diarization with pyannote')
+    command.add_argument('--audio', default="data/processed/podcast_16k_mono.wav")
+    command.add_argument('--output', default=f"{FEATURES_DIR}/diarization_segments.json")
+    command.add_argument('--speech-regions', help='speech_regions.json to restrict diarization to speech')
+    command.add_argument('--voice-index', help='Also add segment embeddings to this voice index directory')
+    command.add_argument('--episode-id', help='Episode identifier in the voice index')
+
+    command = add('channel-diarize', _cmd_channel_diarize, 'Diarize two-mic recordings from channel energy')
+    command.add_argument('--speaker-a', help='Left channel WAV (default: separated speaker A)')
+    command.add_argument('--speaker-b', help='Right channel WAV (default: separated speaker B)')
+    command.add_argument('--output', default=f"{FEATURES_DIR}/diarization_segments.json")
+    command.add_argument('--audio', default="data/processed/podcast_16k_mono.wav",
+                         help='audio_file recorded in the output')
+    command.add_argument('--no-pcm-cache', action='store_true',
+                         help='Read the channel files directly instead of caching their decoded samples')
+
+    command = add('transcribe', _cmd_transcribe, 'Word-level ASR with Whisper')
+    command.add_argument('--audio', default="data/processed/podcast_16k_mono.wav")
+    command.add_argument('--output', default=f"{FEATURES_DIR}/transcript_words.json")
+    command.add_argument('--speech-regions', help='speech_regions.json to restrict ASR to speech')
+
+    command = add('merge', _cmd_merge, 'Merge diarization and ASR into the speaker-labeled transcript')
+    command.add_argument('--diarization', default=f"{FEATURES_DIR}/diarization_segments.json")
+    command.add_argument('--transcript', default=f"{FEATURES_DIR}/transcript_words.json")
+    command.add_argument('--output', default=TRANSCRIPT)
+
+    command = add('stats', _cmd_stats, 'Basic per-speaker statistics')
+    command.add_argument('--transcript', default=TRANSCRIPT)
+    command.add_argument('--output', default=f"{FEATURES_DIR}/basic_speaker_stats.json")
+
+    command = add('speaking-rate', _cmd_speaking_rate, 'Speaking rate time series per speaker')
+    command.add_argument('--transcript', default=TRANSCRIPT)
+    command.add_argument('--output', default=f"{FEATURES_DIR}/speaking_rate_timeseries.json")
+    command.add_argument('--plot', default=f"{FEATURES_DIR}/speaking_rate_timeseries.png")
+    command.add_argument('--window', type=float, default=30.0, help='Window size in seconds')
+    command.add_argument('--step', type=float, help='Step in seconds (default: window size)')
+
+    command = add('interruptions', _cmd_interruptions, 'Detect interruptions and backchannels')
+    command.add_argument('--transcript', default=TRANSCRIPT)
+    command.add_argument('--output', default=f"{FEATURES_DIR}/interruptions.json")
+
+    command = add('overlaps', _cmd_overlaps, 'Word-level overlapping speech')
+    command.add_argument('--transcript', default=TRANSCRIPT)
+    command.add_argument('--output', default=f"{FEATURES_DIR}/word_overlaps.json")
+    command.add_argument('--min-overlap', type=float, default=0.0, help='Minimum overlap in seconds')
+
+    command = add('turn-taking', _cmd_turn_taking, 'Turn-taking statistics')
+    command.add_argument('--transcript', default=TRANSCRIPT)
+    command.add_argument('--output', default=f"{FEATURES_DIR}/turn_taking_stats.json")
+    command.add_argument('--merge-gap', type=float, help='Gap (s) merging same-speaker segments (default: MERGE_GAP_SEC)')
+
+    command = add('rolling', _cmd_rolling, 'Rolling conversation metrics')
+    command.add_argument('--transcript', default=TRANSCRIPT)
+    command.add_argument('--output', default=f"{FEATURES_DIR}/rolling_metrics.json")
+    command.add_argument('--window', type=float, help='Window size in seconds (default: WINDOW_SIZE_SEC)')
+    command.add_argument('--step', type=float, help='Step in seconds (default: STEP_SIZE_SEC)')
+
+    command = add('segments', _cmd_segments, 'Define speech windows for one speaker from the transcript')
+    command.add_argument('--speaker', help='Target speaker (default: build_segments_from_json.TARGET_SPEAKER)')
+    command.add_argument('--transcript', default=TRANSCRIPT)
+    command.add_argument('--output', help='Windows JSON (default: data/segments/<speaker>_segments.json)')
+
+    for name, (module, _, summary) in DELEGATED_COMMANDS.items():
+        # Options (and -h) are left for the module's own parser
+        sub.add_parser(name, help=summary, add_help=False).set_defaults(delegate=module)
+
+    command = add('startup', _cmd_startup, 'Measure command startup against the budget')
+    command.add_argument('commands', nargs='*', help='Commands to probe (default: all)')
+    command.add_argument('--budget', type=float, default=STARTUP_BUDGET_SEC, help='Budget in seconds')
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Main function of the podcast-analysis command line."""
+    parser = build_parser()
+    args, rest = parser.parse_known_args(argv)
+    delegate = getattr(args, 'delegate', None)
+    if rest and delegate is None:
+        parser.error(f"unrecognized arguments: {' '.join(rest)}")
+
+    if args.root:
+        os.chdir(args.root)
+
+    if delegate is not None:
+        if args.root and args.command in ROOTED_COMMANDS and '--root' not in rest:
+            rest = ['--root', os.getcwd()] + rest  # these stages default to the checkout, not the cwd
+        module = importlib.import_module(delegate)
+        sys.argv[0] = f"{PROG} {args.command}"  # shown in the module's usage line
+        return module.main(rest) or 0
+
+    try:
+        return args.handler(args)
+    except Exception as e:
+        print(f"❌ {args.command} failed: {str(e)}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
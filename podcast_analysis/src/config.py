@@ -5,6 +5,10 @@ This module defines all the constants and configuration parameters
 used throughout the audio feature extraction and analysis process.
 """
 
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]  # the podcast_analysis directory
+
 # Audio file paths
 AUDIO_RAW_PATH = "data/raw/podcast.mp3"
 AUDIO_WAV_PATH = "data/processed/podcast_16k_mono.wav"
@@ -12,10 +16,32 @@ AUDIO_WAV_PATH = "data/processed/podcast_16k_mono.wav"
 # Audio processing parameters
 SAMPLE_RATE = 16000
 WINDOW_SIZE_SEC = 5.0
+# Decoded float32 audio shared by the stages (pcm_cache.py); anchored at the
+# project root so runs from any working directory share one (git-ignored) cache
+PCM_CACHE_DIR = str(PROJECT_ROOT / "data" / "cache" / "pcm")
 
 # Output file paths
+SPEECH_REGIONS_PATH = "outputs/audio_features/speech_regions.json"
+SPEAKER_MAPPING_PATH = "outputs/audio_features/speaker_mapping.json"
+VOICEPRINTS_PATH = "outputs/voiceprints/voiceprints.json"
 AUDIO_FEATURES_CSV = "outputs/audio_features/audio_features_5s_windows.csv"
 AUDIO_FEATURES_FIRED_CSV = "outputs/audio_features/audio_features_5s_windows_with_fired.csv"
 
 # Analysis parameters
-FIRED_Z_THRESHOLD = 2.0  # example threshold
\ No newline at end of file
+FIRED_Z_THRESHOLD = 2.0  # example threshold
+
+# Text topic analysis
+TRANSCRIPT_JSON_FOR_TEXT = "outputs/audio_features/transcript_with_speakers.json"
+TRANSCRIPT_PLAIN_PATH = "outputs/text_analysis/transcript_plain.txt"
+BLOCKS_JSON_PATH = "outputs/text_analysis/text_blocks.json"
+BLOCK_EMBEDDINGS_PATH = "outputs/text_analysis/block_embeddings.npy"
+EMBEDDING_CACHE_DIR = "outputs/text_analysis/embedding_cache"
+BLOCK_SIM_BOUNDARIES_PATH = "outputs/text_analysis/block_similarities_and_boundaries.csv"
+BLOCK_TOPICS_CSV_PATH = "outputs/text_analysis/block_topics.csv"
+TOPIC_KEYWORDS_JSON_PATH = "outputs/text_analysis/topic_keywords.json"
+FINAL_TOPIC_SEGMENTS_JSON_PATH = "outputs/text_analysis/final_topic_segments.json"
+BLOCK_DURATION_SEC = 120.0  # 2-minute blocks
+TOPIC_CLUSTER_COUNT = 6  # initial guess for number of topics
+ADJACENT_SIM_THRESHOLD = 0.7  # adjacent blocks below this similarity mark a topic boundary
+EMBEDDING_MODEL_NAME = "all-MiniLM-L6-v2"  # sentence-transformers model (hashing stand-in if unavailable)
+EMBEDDING_BATCH_SIZE = 32
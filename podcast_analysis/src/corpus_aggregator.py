@@ -0,0 +1,433 @@
+"""
+Corpus-level aggregation of speaker statistics across episodes.
+
+Keeps mergeable per-speaker summaries in a local JSON store so that a speaker
+can be compared across hundreds of episodes without re-reading their
+transcripts. Each episode is reduced once, in O(episode size), to:
+
+- counts and sums (segments, speaking time, words, runs, interruptions made /
+  received, backchannels) that merge by addition
+- maxima (longest run) that merge by max
+- log-bucket quantile sketches of segment and run durations that merge by
+  adding bucket counts (relative error bounded by SKETCH_RELATIVE_ACCURACY)
+
+The store keeps every episode's summary plus the merged corpus totals, so an
+episode can be re-added (replaced) by re-merging the stored summaries.
+Episode ids default to the transcript's location (json_stream.
+episode_id_from_path); adding an id that is already stored is an error
+unless replacing is requested. One add call writes the store once.
+
+Usage (from the src directory):
+    python corpus_aggregator.py add ../outputs/audio_features/transcript_with_speakers.json --episode-id ep001
+    python corpus_aggregator.py add ../outputs/episodes/*/transcript_with_speakers.json
+    python corpus_aggregator.py add ep001.json --replace
+    python corpus_aggregator.py query "Joe Rogan"
+    python corpus_aggregator.py list
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from analysis_speaking_features import MERGE_GAP_SEC, compute_turn_taking, find_interruptions
+from json_stream import episode_id_from_path
+
+CORPUS_STORE_PATH = "outputs/corpus/corpus_summary.json"
+SKETCH_RELATIVE_ACCURACY = 0.01
+SKETCH_QUANTILES = (0.1, 0.25, 0.5, 0.75, 0.9, 0.99)
+
+# Additive fields of a speaker summary
+SUM_FIELDS = (
+    "num_segments", "total_speaking_time_sec", "total_words", "num_runs",
+    "total_run_duration_sec", "interruptions_made", "interruptions_received", "backchannels_made"
+)
+
+
+class QuantileSketch:
+    """
+    Mergeable log-bucket quantile sketch for positive durations.
+
+    Values are counted in buckets whose bounds grow geometrically by
+    gamma = (1 + a) / (1 - a), so any reported quantile is within a relative
+    error a of the exact value. Merging two sketches adds their bucket counts.
+    """
+
+    def __init__(self, relative_accuracy: float = SKETCH_RELATIVE_ACCURACY):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.buckets: Dict[int, int] = {}
+        self.zero_count = 0
+
+    @property
+    def count(self) -> int:
+        return self.zero_count + sum(self.buckets.values())
+
+    def add(self, values) -> None:
+        """Add an array of non-negative values."""
+        values = np.asarray(values, dtype=np.float64)
+        positive = values[values > 0]
+        self.zero_count += int(len(values) - len(positive))
+        if len(positive):
+            keys, counts = np.unique(np.ceil(np.log(positive) / np.log(self.gamma)).astype(np.int64),
+                                     return_counts=True)
+            for key, count in zip(keys.tolist(), counts.tolist()):
+                self.buckets[key] = self.buckets.get(key, 0) + count
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """Merge another sketch (with the same accuracy) into this one."""
+        if not math.isclose(other.gamma, self.gamma):
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        self.zero_count += other.zero_count
+        for key, count in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + count
+
+    def quantile(self, q: float) -> float:
+        """Approximate q-quantile (0 <= q <= 1); 0.0 for an empty sketch."""
+        total = self.count
+        if total == 0:
+            return 0.0
+        rank = q * (total - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if rank < seen:
+                # Bucket (gamma^(key-1), gamma^key]: midpoint with bounded relative error
+                return 2 * self.gamma ** key / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+    def to_dict(self) -> dict:
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "zero_count": self.zero_count,
+            "buckets": {str(key): count for key, count in sorted(self.buckets.items())}
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "QuantileSketch":
+        sketch = cls(data["relative_accuracy"])
+        sketch.zero_count = data["zero_count"]
+        sketch.buckets = {int(key): count for key, count in data["buckets"].items()}
+        return sketch
+
+
+def _empty_summary() -> dict:
+    """Summary of a speaker with no data."""
+    summary = {field: 0 for field in SUM_FIELDS}
+    summary.update({
+        "total_speaking_time_sec": 0.0,
+        "total_run_duration_sec": 0.0,
+        "max_run_duration_sec": 0.0,
+        "episodes": 0,
+        "segment_duration_sketch": QuantileSketch().to_dict(),
+        "run_duration_sketch": QuantileSketch().to_dict()
+    })
+    return summary
+
+
+def merge_summaries(a: dict, b: dict) -> dict:
+    """
+    Merge two per-speaker summaries.
+
+    Args:
+        a: Speaker summary
+        b: Speaker summary
+
+    Returns:
+        dict: New summary equal to aggregating both underlying data sets
+    """
+    merged = {field: a[field] + b[field] for field in SUM_FIELDS}
+    merged["max_run_duration_sec"] = max(a["max_run_duration_sec"], b["max_run_duration_sec"])
+    merged["episodes"] = a["episodes"] + b["episodes"]
+    for key in ("segment_duration_sketch", "run_duration_sketch"):
+        sketch = QuantileSketch.from_dict(a[key])
+        sketch.merge(QuantileSketch.from_dict(b[key]))
+        merged[key] = sketch.to_dict()
+    return merged
+
+
+def summarize_episode(segments: List[Dict], merge_gap_sec: float = MERGE_GAP_SEC) -> Dict[str, dict]:
+    """
+    Reduce one episode's speaker-labeled segments to per-speaker summaries.
+
+    Args:
+        segments: Transcript segments (speaker, start, end, text, words)
+        merge_gap_sec: Merge gap used to build turns and runs
+
+    Returns:
+        dict: Speaker -> summary
+    """
+    segments = sorted(segments, key=lambda s: s['start'])
+    speakers = sorted({s['speaker'] for s in segments})
+    speaker_index = {speaker: code for code, speaker in enumerate(speakers)}
+
+    starts = np.array([s['start'] for s in segments], dtype=np.float64)
+    ends = np.array([s['end'] for s in segments], dtype=np.float64)
+    codes = np.array([speaker_index[s['speaker']] for s in segments], dtype=np.intp)
+    words = np.array([len(s.get('words', [])) for s in segments], dtype=np.int64)
+    durations = ends - starts
+
+    core = compute_turn_taking(starts, ends, codes, len(speakers), merge_gap_sec)
+    _, _, interruption_stats = find_interruptions(segments)
+
+    summaries = {}
+    for code, speaker in enumerate(speakers):
+        mask = codes == code
+        run_durations = core['run_durations'][core['run_codes'] == code]
+
+        segment_sketch = QuantileSketch()
+        segment_sketch.add(durations[mask])
+        run_sketch = QuantileSketch()
+        run_sketch.add(run_durations)
+
+        stats = interruption_stats.get(speaker, {})
+        summaries[speaker] = {
+            "num_segments": int(mask.sum()),
+            "total_speaking_time_sec": float(durations[mask].sum()),
+            "total_words": int(words[mask].sum()),
+            "num_runs": int(len(run_durations)),
+            "total_run_duration_sec": float(run_durations.sum()),
+            "interruptions_made": stats.get("interruptions_made", 0),
+            "interruptions_received": stats.get("interruptions_received", 0),
+            "backchannels_made": stats.get("backchannels_made", 0),
+            "max_run_duration_sec": float(run_durations.max()) if len(run_durations) else 0.0,
+            "episodes": 1,
+            "segment_duration_sketch": segment_sketch.to_dict(),
+            "run_duration_sketch": run_sketch.to_dict()
+        }
+
+    return summaries
+
+
+def load_store(store_path: str = CORPUS_STORE_PATH) -> dict:
+    """Load the corpus store (empty if it does not exist yet)."""
+    if not os.path.exists(store_path):
+        return {"episodes": {}, "speakers": {}}
+    with open(store_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_store(store: dict, store_path: str = CORPUS_STORE_PATH) -> None:
+    """Write the corpus store (to a temporary file renamed into place)."""
+    os.makedirs(os.path.dirname(store_path) or ".", exist_ok=True)
+    partial_path = store_path + ".partial"
+    with open(partial_path, 'w', encoding='utf-8') as f:
+        json.dump(store, f, ensure_ascii=False)
+    os.replace(partial_path, store_path)
+
+
+def _rebuild_totals(store: dict) -> None:
+    """Recompute the corpus totals from the stored episode summaries."""
+    totals = {}
+    for episode in store["episodes"].values():
+        for speaker, summary in episode["speakers"].items():
+            totals[speaker] = merge_summaries(totals.get(speaker, _empty_summary()), summary)
+    store["speakers"] = totals
+
+
+def add_episodes(
+    transcript_paths: List[str],
+    episode_ids: Optional[List[str]] = None,
+    replace: bool = False,
+    store_path: str = CORPUS_STORE_PATH
+) -> Dict[str, dict]:
+    """
+    Add episodes to the corpus store, writing the store once.
+
+    All ids are checked before anything is written: an id given twice in the
+    batch is always an error, an id already in the store only unless replace
+    is set.
+
+    Args:
+        transcript_paths: Transcript with speakers JSON files
+        episode_ids: Episode identifiers, one per transcript. Default to
+            episode_id_from_path of each transcript
+        replace: Replace episodes that are already in the store
+        store_path: Path of the corpus store JSON file
+
+    Returns:
+        dict: Episode id -> the episode's per-speaker summaries
+
+    Raises:
+        ValueError: On a duplicate episode id
+    """
+    if episode_ids is None:
+        episode_ids = [episode_id_from_path(path) for path in transcript_paths]
+    if len(episode_ids) != len(transcript_paths):
+        raise ValueError("Expected one episode id per transcript")
+
+    store = load_store(store_path)
+    seen = {}
+    for episode_id, transcript_path in zip(episode_ids, transcript_paths):
+        if episode_id in seen:
+            raise ValueError(f"Episode id '{episode_id}' is given twice ({seen[episode_id]} and "
+                             f"{transcript_path}); pass distinct episode ids")
+        seen[episode_id] = transcript_path
+        if episode_id in store["episodes"] and not replace:
+            stored = store["episodes"][episode_id].get("transcript", "an earlier add")
+            raise ValueError(f"Episode '{episode_id}' is already in the corpus store (from {stored}); "
+                             f"use replace (--replace) to overwrite it")
+
+    added = {}
+    replaced = False
+    for episode_id, transcript_path in zip(episode_ids, transcript_paths):
+        with open(transcript_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        summaries = summarize_episode(data['segments'])
+        replaced |= episode_id in store["episodes"]
+        store["episodes"][episode_id] = {
+            "transcript": os.path.abspath(transcript_path),
+            "audio_file": data['audio_file'],
+            "added_at": datetime.now().isoformat(timespec="seconds"),
+            "speakers": summaries
+        }
+        added[episode_id] = summaries
+        print(f"✅ Summarized episode '{episode_id}' ({len(data['segments'])} segments, {len(summaries)} speakers)")
+
+    if replaced:
+        _rebuild_totals(store)
+    else:
+        for summaries in added.values():
+            for speaker, summary in summaries.items():
+                store["speakers"][speaker] = merge_summaries(store["speakers"].get(speaker, _empty_summary()), summary)
+
+    save_store(store, store_path)
+    print(f"💾 Corpus now has {len(store['episodes'])} episodes: {store_path}")
+    return added
+
+
+def add_episode(
+    transcript_path: str,
+    episode_id: Optional[str] = None,
+    replace: bool = False,
+    store_path: str = CORPUS_STORE_PATH
+) -> dict:
+    """
+    Add one episode to the corpus store (see add_episodes).
+
+    Args:
+        transcript_path: Path to the episode's transcript with speakers JSON file
+        episode_id: Episode identifier. Defaults to episode_id_from_path(transcript_path)
+        replace: Replace the episode if it is already in the store
+        store_path: Path of the corpus store JSON file
+
+    Returns:
+        dict: The episode's per-speaker summaries
+    """
+    episode_id = episode_id or episode_id_from_path(transcript_path)
+    return add_episodes([transcript_path], [episode_id], replace, store_path)[episode_id]
+
+
+def query_speaker(speaker: str, store_path: str = CORPUS_STORE_PATH) -> dict:
+    """
+    Cross-episode statistics for one speaker, from the store only.
+
+    Args:
+        speaker: Speaker label
+        store_path: Path of the corpus store JSON file
+
+    Returns:
+        dict: Totals, rates, duration quantiles and per-episode speaking time
+    """
+    store = load_store(store_path)
+    if speaker not in store["speakers"]:
+        raise KeyError(f"Speaker '{speaker}' not found. Available: {', '.join(sorted(store['speakers']))}")
+
+    summary = store["speakers"][speaker]
+    minutes = summary["total_speaking_time_sec"] / 60.0
+    segment_sketch = QuantileSketch.from_dict(summary["segment_duration_sketch"])
+    run_sketch = QuantileSketch.from_dict(summary["run_duration_sketch"])
+
+    return {
+        "speaker": speaker,
+        "episodes": summary["episodes"],
+        "total_speaking_time_min": minutes,
+        "total_words": summary["total_words"],
+        "words_per_minute": summary["total_words"] / minutes if minutes > 0 else 0.0,
+        "num_segments": summary["num_segments"],
+        "num_runs": summary["num_runs"],
+        "avg_run_duration_sec": summary["total_run_duration_sec"] / summary["num_runs"] if summary["num_runs"] else 0.0,
+        "max_run_duration_sec": summary["max_run_duration_sec"],
+        "interruptions_made": summary["interruptions_made"],
+        "interruptions_received": summary["interruptions_received"],
+        "backchannels_made": summary["backchannels_made"],
+        "segment_duration_quantiles": {str(q): segment_sketch.quantile(q) for q in SKETCH_QUANTILES},
+        "run_duration_quantiles": {str(q): run_sketch.quantile(q) for q in SKETCH_QUANTILES},
+        "speaking_time_min_by_episode": {
+            episode_id: episode["speakers"][speaker]["total_speaking_time_sec"] / 60.0
+            for episode_id, episode in store["episodes"].items()
+            if speaker in episode["speakers"]
+        }
+    }
+
+
+def _print_query(result: dict) -> None:
+    """Print a speaker query result."""
+    print("\n" + "="*70)
+    print(f"CORPUS SUMMARY: {result['speaker']}")
+    print("="*70)
+    print(f"Episodes: {result['episodes']}")
+    print(f"Speaking time: {result['total_speaking_time_min']:.1f} min, "
+          f"{result['total_words']} words ({result['words_per_minute']:.0f} WPM)")
+    print(f"Runs: {result['num_runs']} (avg {result['avg_run_duration_sec']:.1f}s, "
+          f"max {result['max_run_duration_sec']:.1f}s)")
+    print(f"Interruptions made/received: {result['interruptions_made']}/{result['interruptions_received']}, "
+          f"backchannels: {result['backchannels_made']}")
+    print(f"\n{'Quantile':<10} {'Segment(s)':<12} {'Run(s)':<12}")
+    print("-" * 35)
+    for q in result['segment_duration_quantiles']:
+        print(f"{q:<10} {result['segment_duration_quantiles'][q]:<12.2f} {result['run_duration_quantiles'][q]:<12.2f}")
+    print("="*70)
+
+
+def main(argv: Optional[List[str]] = None):
+    """Main function for the corpus aggregator CLI."""
+    parser = argparse.ArgumentParser(description='Aggregate speaker statistics across episodes')
+    parser.add_argument('--store', default=CORPUS_STORE_PATH, help='Corpus store JSON file')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    add_parser = subparsers.add_parser('add', help='Add or replace episodes')
+    add_parser.add_argument('transcripts', nargs='+', help='transcript_with_speakers.json files')
+    add_parser.add_argument('--episode-id', help='Episode id (only with a single transcript)')
+    add_parser.add_argument('--replace', action='store_true', help='Replace episodes that are already stored')
+
+    query_parser = subparsers.add_parser('query', help='Cross-episode statistics for a speaker')
+    query_parser.add_argument('speaker')
+
+    subparsers.add_parser('list', help='List episodes and speakers in the store')
+    args = parser.parse_args(argv)
+
+    if args.command == 'add':
+        if args.episode_id and len(args.transcripts) > 1:
+            parser.error("--episode-id can only be used with a single transcript")
+        episode_ids = [args.episode_id] if args.episode_id else None
+        try:
+            add_episodes(args.transcripts, episode_ids, args.replace, args.store)
+        except ValueError as e:
+            print(f"❌ {e}")
+            return 1
+    elif args.command == 'query':
+        try:
+            _print_query(query_speaker(args.speaker, args.store))
+        except KeyError as e:
+            print(f"❌ {e.args[0]}")
+            return 1
+    else:
+        store = load_store(args.store)
+        print(f"Episodes ({len(store['episodes'])}): {', '.join(store['episodes'])}")
+        for speaker, summary in sorted(store['speakers'].items()):
+            print(f"  {speaker:<20} {summary['episodes']:>4} episodes  "
+                  f"{summary['total_speaking_time_sec'] / 60:>8.1f} min")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,18 +6,22 @@ It processes mono audio files and identifies when different speakers are talking
 """
 
 import os
-import json
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from pathlib import Path
 import warnings
 
+from json_stream import JsonArrayWriter
+
 # Suppress some warnings for cleaner output
 warnings.filterwarnings("ignore", category=UserWarning)
 
 
 def diarize_podcast(
     audio_file_path: str = "data/processed/podcast_16k_mono.wav",
-    output_file_path: str = "outputs/audio_features/diarization_segments.json"
+    output_file_path: str = "outputs/audio_features/diarization_segments.json",
+    speech_regions_path: Optional[str] = None,
+    voice_index_dir: Optional[str] = None,
+    episode_id: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Perform speaker diarization on a mono podcast audio file using pyannote.audio.
@@ -30,6 +34,12 @@ def diarize_podcast(
     Args:
         audio_file_path (str): Path to the input mono audio file
         output_file_path (str): Path to save the diarization results JSON
+        speech_regions_path (str, optional): speech_regions.json from voice_activity.py;
+            only these regions are diarized and turns are mapped back
+        voice_index_dir (str, optional): voice_index.py directory; when given, every segment's
+            speaker embedding is appended to the corpus-wide voice index
+        episode_id (str, optional): Episode identifier in the voice index
+            (default: audio file name)
         
     Returns:
         dict: Diarization results containing segments and speaker information
@@ -70,9 +80,31 @@ def diarize_podcast(
         if not os.path.exists(audio_file_path):
             raise FileNotFoundError(f"Audio file not found: {audio_file_path}")
         
-        # Run the pipeline on the mono audio file as specified
-        print("🔍 Running speaker diarization...")
-        diarization = pipeline(audio_file_path)
+        # Run the pipeline on the mono audio, passed in memory from the shared
+        # PCM cache so that pyannote does not decode the file again
+        import torch
+        from pcm_cache import load_pcm
+        audio_data, sr = load_pcm(audio_file_path, None)
+        regions = None
+        if speech_regions_path:
+            from voice_activity import concatenate_regions, load_speech_regions
+            regions = load_speech_regions(speech_regions_path)
+            speech = concatenate_regions(audio_data, sr, regions)
+            print(f"🔇 Skipping non-speech: diarizing {len(speech) / sr / 60:.1f} of "
+                  f"{len(audio_data) / sr / 60:.1f} min in {len(regions)} speech regions")
+        else:
+            speech = audio_data
+        if len(speech) == 0:
+            # Nothing to diarize (empty recording or no speech regions): pyannote cannot take it
+            print("⚠️  No audio to diarize: writing an empty result")
+            tracks = []
+        else:
+            # torch.tensor copies: the cached samples are a read-only memmap
+            audio_input = {"waveform": torch.tensor(speech)[None, :], "sample_rate": sr}
+            
+            print("🔍 Running speaker diarization...")
+            diarization = pipeline(audio_input)
+            tracks = diarization.itertracks(yield_label=True)
         
         print("📊 Converting diarization results...")
         
@@ -81,18 +113,26 @@ def diarize_podcast(
         speaker_mapping = {}
         speaker_counter = 0
         
-        for turn, _, speaker in diarization.itertracks(yield_label=True):
+        for turn, _, speaker in tracks:
             # Map original speaker labels to simplified ones (S0, S1, S2, etc.)
             if speaker not in speaker_mapping:
                 speaker_mapping[speaker] = f"S{speaker_counter}"
                 speaker_counter += 1
             
-            segment = {
-                "speaker": speaker_mapping[speaker],
-                "start": round(turn.start, 2),
-                "end": round(turn.end, 2)
-            }
-            segments.append(segment)
+            if regions is None:
+                spans = [(turn.start, turn.end)]
+            else:
+                # Turns crossing a skipped gap are split at the region boundaries
+                from voice_activity import split_to_source
+                spans = split_to_source(turn.start, turn.end, regions)
+            
+            for start, end in spans:
+                segment = {
+                    "speaker": speaker_mapping[speaker],
+                    "start": round(start, 2),
+                    "end": round(end, 2)
+                }
+                segments.append(segment)
         
         # Sort segments by start time
         segments.sort(key=lambda x: x["start"])
@@ -103,14 +143,15 @@ def diarize_podcast(
             "segments": segments
         }
         
-        # Ensure output directory exists
-        output_dir = Path(output_file_path).parent
-        output_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Save to JSON as specified
+        # Save to JSON as specified, one segment at a time
         print(f"💾 Saving diarization results to: {output_file_path}")
-        with open(output_file_path, 'w', encoding='utf-8') as f:
-            json.dump(result, f, indent=2, ensure_ascii=False)
+        with JsonArrayWriter(output_file_path, header={"audio_file": audio_file_path}) as writer:
+            for segment in segments:
+                writer.write(segment)
+        
+        if voice_index_dir:
+            from voice_index import index_diarization
+            index_diarization(audio_file_path, segments, episode_id or Path(audio_file_path).stem, voice_index_dir)
         
         # Perform the checks specified in task 2.1
         unique_speakers = list(set(seg["speaker"] for seg in segments))
@@ -134,7 +175,7 @@ def diarize_podcast(
         
         print(f"\n✅ Speaker alternation analysis:")
         print(f"   Total speaker changes: {speaker_changes}")
-        print(f"   Alternation rate: {(speaker_changes/len(segments)*100):.1f}% of segments")
+        print(f"   Alternation rate: {(speaker_changes/len(segments)*100 if segments else 0.0):.1f}% of segments")
         
         print("\n✅ Speaker diarization completed successfully!")
         
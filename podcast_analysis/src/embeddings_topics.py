@@ -0,0 +1,242 @@
+"""
+Block embeddings, adjacent similarity, topic clustering and TF-IDF keywords.
+
+Embeddings are computed on CPU in batches and cached on disk, keyed by the
+SHA-256 of (model name, block text): re-running with a different block size
+only embeds blocks whose text has not been seen before.
+
+The embedding model is a sentence-transformers model when the package is
+installed. Otherwise a deterministic stand-in is used: hashed TF features
+(scikit-learn HashingVectorizer) projected to a fixed 384-dimensional space
+by a seeded sparse random projection. Unlike a corpus-fitted TF-IDF/LSA
+basis, it maps the same text to the same vector on every run, so its
+vectors can be cached the same way.
+"""
+
+import hashlib
+import os
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from config import EMBEDDING_BATCH_SIZE, EMBEDDING_CACHE_DIR, EMBEDDING_MODEL_NAME
+
+HASHING_MODEL_NAME = "hashing-rp-384"
+HASHING_FEATURES = 2 ** 18
+HASHING_DIM = 384
+
+
+def load_embedding_model(model_name: str = EMBEDDING_MODEL_NAME) -> Tuple[str, Callable[[List[str]], np.ndarray]]:
+    """
+    Load a CPU embedding model.
+
+    Args:
+        model_name: sentence-transformers model name, or HASHING_MODEL_NAME for the stand-in
+
+    Returns:
+        tuple: (effective model name, encode function texts -> (n, dim) float32 array)
+    """
+    if model_name != HASHING_MODEL_NAME:
+        try:
+            from sentence_transformers import SentenceTransformer
+            model = SentenceTransformer(model_name, device="cpu")
+
+            def encode(texts):
+                return model.encode(texts, batch_size=len(texts), show_progress_bar=False,
+                                    convert_to_numpy=True).astype(np.float32)
+            return model_name, encode
+        except Exception as e:
+            print(f"⚠️  sentence-transformers model unavailable ({e.__class__.__name__}); "
+                  f"using the {HASHING_MODEL_NAME} stand-in")
+
+    from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
+    from sklearn.random_projection import SparseRandomProjection
+
+    vectorizer = HashingVectorizer(n_features=HASHING_FEATURES, alternate_sign=False, norm=None,
+                                   stop_words="english")
+    # Sublinear TF without IDF: stateless, so each text's vector is independent of the corpus
+    tf = TfidfTransformer(use_idf=False, sublinear_tf=True)
+    projection = SparseRandomProjection(n_components=HASHING_DIM, dense_output=True, random_state=0)
+    projection.fit(np.zeros((1, HASHING_FEATURES)))
+
+    def encode(texts):
+        counts = vectorizer.transform(texts)
+        return np.asarray(projection.transform(tf.fit_transform(counts)), dtype=np.float32)
+    return HASHING_MODEL_NAME, encode
+
+
+def _cache_path(cache_dir: str, model_name: str) -> str:
+    """Cache file of one model."""
+    safe_name = "".join(c if c.isalnum() or c in "-_." else "_" for c in model_name)
+    return os.path.join(cache_dir, f"{safe_name}.npz")
+
+
+def text_hash(model_name: str, text: str) -> str:
+    """Cache key of a block text under a model."""
+    return hashlib.sha256(f"{model_name}\n{text}".encode('utf-8')).hexdigest()
+
+
+def embed_texts(
+    texts: List[str],
+    model_name: str = EMBEDDING_MODEL_NAME,
+    cache_dir: str = EMBEDDING_CACHE_DIR,
+    batch_size: int = EMBEDDING_BATCH_SIZE
+) -> np.ndarray:
+    """
+    Embed texts in batches, reusing cached vectors.
+
+    Args:
+        texts: Texts to embed
+        model_name: sentence-transformers model name (see load_embedding_model)
+        cache_dir: Directory of the on-disk embedding cache
+        batch_size: Number of texts encoded per batch
+
+    Returns:
+        np.ndarray: (len(texts), dim) float32 embeddings, row i for texts[i]
+    """
+    if model_name != HASHING_MODEL_NAME:
+        try:
+            import sentence_transformers  # noqa: F401
+        except ImportError:
+            model_name = HASHING_MODEL_NAME
+
+    cache_file = _cache_path(cache_dir, model_name)
+    cache = {}
+    if os.path.exists(cache_file):
+        stored = np.load(cache_file)
+        cache = dict(zip(stored['keys'].tolist(), stored['vectors']))
+
+    keys = [text_hash(model_name, text) for text in texts]
+    missing = list(dict.fromkeys(k for k in keys if k not in cache))
+    print(f"Embedding {len(texts)} blocks with {model_name}: "
+          f"{len(texts) - len(missing)} cached, {len(missing)} new")
+
+    if missing:
+        effective_name, encode = load_embedding_model(model_name)
+        if effective_name != model_name:
+            # The model could not be loaded: use the stand-in's own cache
+            return embed_texts(texts, effective_name, cache_dir, batch_size)
+        text_by_key = dict(zip(keys, texts))
+        t0 = time.perf_counter()
+        for i in range(0, len(missing), batch_size):
+            batch = missing[i:i + batch_size]
+            for key, vector in zip(batch, encode([text_by_key[k] for k in batch])):
+                cache[key] = vector
+        print(f"Encoded {len(missing)} blocks in {time.perf_counter() - t0:.2f}s")
+
+        os.makedirs(cache_dir, exist_ok=True)
+        np.savez(cache_file, keys=np.array(list(cache)), vectors=np.stack(list(cache.values())))
+
+    return np.stack([cache[k] for k in keys]) if keys else np.zeros((0, HASHING_DIM), dtype=np.float32)
+
+
+def adjacent_similarities(embeddings: np.ndarray) -> np.ndarray:
+    """
+    Cosine similarity between every block and the next one.
+
+    Args:
+        embeddings: (num_blocks, dim) array
+
+    Returns:
+        np.ndarray: (num_blocks - 1,) similarities
+    """
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    unit = np.divide(embeddings, norms, out=np.zeros_like(embeddings), where=norms > 0)
+    return np.einsum('ij,ij->i', unit[:-1], unit[1:])
+
+
+def cluster_blocks(embeddings: np.ndarray, n_clusters: int, random_state: int = 0) -> np.ndarray:
+    """
+    Cluster block embeddings into topics with KMeans.
+
+    Args:
+        embeddings: (num_blocks, dim) array
+        n_clusters: Number of topics (capped at the number of blocks)
+        random_state: KMeans seed
+
+    Returns:
+        np.ndarray: Topic id per block
+    """
+    from sklearn.cluster import KMeans
+
+    n_clusters = min(n_clusters, len(embeddings))
+    kmeans = KMeans(n_clusters=n_clusters, random_state=random_state, n_init=10)
+    return kmeans.fit_predict(embeddings)
+
+
+def topic_keywords(texts: List[str], labels: np.ndarray, top_n: int = 10) -> List[Dict]:
+    """
+    Extract the top TF-IDF terms of every topic.
+
+    The blocks of a topic are concatenated into one document; the TF-IDF
+    matrix stays sparse and only each row's non-zero entries are ranked.
+
+    Args:
+        texts: Clean block texts
+        labels: Topic id per block
+        top_n: Keywords per topic
+
+    Returns:
+        List of {"topic_id", "keywords"} in topic order
+    """
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    topic_ids = sorted(set(int(label) for label in labels))
+    topic_docs = [" ".join(t for t, label in zip(texts, labels) if label == topic_id) for topic_id in topic_ids]
+
+    vectorizer = TfidfVectorizer(max_features=5000, stop_words="english")
+    matrix = vectorizer.fit_transform(topic_docs).tocsr()
+    terms = vectorizer.get_feature_names_out()
+
+    keywords = []
+    for row, topic_id in enumerate(topic_ids):
+        start, end = matrix.indptr[row], matrix.indptr[row + 1]
+        weights, columns = matrix.data[start:end], matrix.indices[start:end]
+        top = columns[np.argsort(-weights, kind='stable')[:top_n]]
+        keywords.append({"topic_id": topic_id, "keywords": terms[top].tolist()})
+    return keywords
+
+
+def build_topic_segments(
+    blocks: List[Dict],
+    labels: np.ndarray,
+    keywords: List[Dict],
+    boundaries: Optional[np.ndarray] = None
+) -> List[Dict]:
+    """
+    Build the topic timeline from consecutive blocks with the same topic.
+
+    Args:
+        blocks: Text blocks (block_id, start_sec, end_sec)
+        labels: Topic id per block
+        keywords: Output of topic_keywords()
+        boundaries: Optional (num_blocks - 1,) flags forcing a break after block i
+
+    Returns:
+        List of segments (segment_id, topic_id, start_sec, end_sec, block_ids, keywords)
+    """
+    labels = np.asarray(labels)
+    if len(labels) == 0:
+        return []
+
+    # A segment starts where the topic changes (or at a forced boundary)
+    new_segment = np.ones(len(labels), dtype=bool)
+    new_segment[1:] = labels[1:] != labels[:-1]
+    if boundaries is not None:
+        new_segment[1:] |= np.asarray(boundaries, dtype=bool)
+    firsts = np.flatnonzero(new_segment)
+    lasts = np.append(firsts[1:], len(labels)) - 1
+
+    keywords_by_topic = {k['topic_id']: k['keywords'] for k in keywords}
+    return [
+        {
+            "segment_id": segment_id,
+            "topic_id": int(labels[first]),
+            "start_sec": blocks[first]['start_sec'],
+            "end_sec": blocks[last]['end_sec'],
+            "block_ids": [blocks[i]['block_id'] for i in range(first, last + 1)],
+            "keywords": keywords_by_topic.get(int(labels[first]), [])
+        }
+        for segment_id, (first, last) in enumerate(zip(firsts, lasts))
+    ]
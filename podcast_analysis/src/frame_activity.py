@@ -0,0 +1,73 @@
+"""
+Per-frame activity masks shared by the energy-based detectors.
+
+Both the stereo-channel diarizer (channel_diarization.py) and the voice
+activity detector (voice_activity.py) threshold a framewise level into a
+boolean mask and clean it up the same way:
+
+- mask_runs: start/end indices of the True runs of a mask
+- hysteresis: two-threshold detection (open above "on", hold above "off")
+- smooth_activity: bridge short gaps, then drop short bursts
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+
+def mask_runs(mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Start and end (exclusive) indices of the True runs of a boolean mask."""
+    edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+def hysteresis(above_on: np.ndarray, above_off: np.ndarray) -> np.ndarray:
+    """
+    Vectorized two-threshold activity detection.
+
+    A run of frames above the off threshold is active if any of its frames is
+    above the on threshold.
+
+    Args:
+        above_on: Frames above the (higher) on threshold
+        above_off: Frames above the (lower) off threshold
+
+    Returns:
+        np.ndarray: Boolean activity per frame
+    """
+    above_off = above_off | above_on
+    starts, ends = mask_runs(above_off)
+    active = np.zeros(len(above_off), dtype=bool)
+    if len(starts):
+        keep = np.maximum.reduceat(above_on, starts)
+        # reduceat over [start, next start) also spans the gap after each run,
+        # but that gap is below the off threshold and so below the on threshold
+        for start, end in zip(starts[keep], ends[keep]):
+            active[start:end] = True
+    return active
+
+
+def smooth_activity(active: np.ndarray, min_speech_frames: int, min_silence_frames: int) -> np.ndarray:
+    """
+    Bridge short gaps between active runs, then drop short active runs.
+
+    Args:
+        active: Boolean activity per frame
+        min_speech_frames: Minimum length of a kept active run
+        min_silence_frames: Gaps shorter than this between two runs are filled
+
+    Returns:
+        np.ndarray: Smoothed activity
+    """
+    active = active.copy()
+    gap_starts, gap_ends = mask_runs(~active)
+    interior = (gap_starts > 0) & (gap_ends < len(active))
+    for start, end in zip(gap_starts[interior], gap_ends[interior]):
+        if end - start < min_silence_frames:
+            active[start:end] = True
+
+    run_starts, run_ends = mask_runs(active)
+    for start, end in zip(run_starts, run_ends):
+        if end - start < min_speech_frames:
+            active[start:end] = False
+    return active
@@ -0,0 +1,606 @@
+"""
+Local asyncio job API for submitting episodes and streaming their progress.
+
+A small HTTP/1.1 server (standard library only) that runs the episode chain
+
+    preprocess -> [vad] -> diarize -> [identify] -> [index] -> asr -> merge -> analytics
+
+in a pool of worker processes, streams stage progress as Server-Sent Events
+and serves the resulting files. Each episode gets its own directory under
+EPISODES_DIR; stage output goes to pipeline.log in that directory. When a
+voiceprint library exists (voiceprints.py), diarization clusters that
+confidently match an enrolled speaker (score threshold and margin over the
+runner-up) are relabeled with that name before the merge; with
+"voice_index" set, the segments are added to the corpus voice index
+(voice_index.py).
+
+Endpoints:
+    POST /jobs                         {"audio_path": ..., "episode_id": ..., "diarizer": "pyannote"|"channels",
+                                        "vad": bool, "voice_index": bool}
+    GET  /jobs                         all jobs
+    GET  /jobs/<job_id>                job status and stage timings
+    GET  /jobs/<job_id>/events         SSE stream of progress events (replayed from the start)
+    GET  /episodes                     episodes with outputs on disk
+    GET  /episodes/<id>/transcript     transcript_with_speakers.json (?speaker=&start=&end= to filter)
+    GET  /episodes/<id>/files/<name>   any JSON/PNG/log file of the episode
+
+Recently used episode files are kept in an LRU memory cache (bounded by
+size), so repeated dashboard queries do not hit disk. Entries are keyed by
+path, modification time and size, and a finished job also invalidates the
+entries of its episode.
+
+Usage (from the podcast_analysis directory):
+    python src/job_server.py --port 8765 --workers 2
+    curl -X POST localhost:8765/jobs -d '{"audio_path": "data/raw/podcast.mp3", "episode_id": "ep001"}'
+    curl -N localhost:8765/jobs/<job_id>/events
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import multiprocessing
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from config import VOICEPRINTS_PATH
+
+EPISODES_DIR = "outputs/episodes"
+DEFAULT_PORT = 8765
+CACHE_MAX_MB = 256
+SSE_HEARTBEAT_SEC = 15.0
+MAX_BODY_BYTES = 1 << 20
+
+CONTENT_TYPES = {
+    ".json": "application/json",
+    ".jsonl": "application/x-ndjson",
+    ".png": "image/png",
+    ".log": "text/plain; charset=utf-8",
+    ".txt": "text/plain; charset=utf-8",
+    ".csv": "text/csv; charset=utf-8",
+}
+
+STATUS_TEXT = {200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found",
+               405: "Method Not Allowed", 409: "Conflict", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+# ---------------------------------------------------------------------------
+# Pipeline (runs in worker processes)
+# ---------------------------------------------------------------------------
+
+def run_episode_pipeline(job_id: str, audio_path: str, episode_dir: str, options: Dict[str, Any], progress) -> Dict[str, str]:
+    """
+    Run the full chain for one episode, reporting each stage to a progress queue.
+
+    A failing stage stops the chain. The last event put on the queue is always
+    the job's terminal event (stage None, status "done" with the outputs or
+    "failed" with the error), so the server ends the job only after every
+    stage event has been delivered.
+
+    Args:
+        job_id: Job identifier (included in every event)
+        audio_path: Source recording
+        episode_dir: Output directory of the episode
+        options: "diarizer" ("pyannote" or "channels"), "vad" and "voice_index" (bool)
+        progress: Queue receiving progress events (multiprocessing manager queue)
+
+    Returns:
+        dict: Output name -> file path
+    """
+    from analysis_speaking_features import basic_speaker_stats, detect_interruptions, turn_taking_stats
+
+    out = Path(episode_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    paths = {
+        "mono": str(out / "podcast_16k_mono.wav"),
+        "speech_regions": str(out / "speech_regions.json"),
+        "diarization": str(out / "diarization_segments.json"),
+        "speaker_mapping": str(out / "speaker_mapping.json"),
+        "transcript_words": str(out / "transcript_words.json"),
+        "transcript": str(out / "transcript_with_speakers.json"),
+        "basic_speaker_stats": str(out / "basic_speaker_stats.json"),
+        "interruptions": str(out / "interruptions.json"),
+        "turn_taking_stats": str(out / "turn_taking_stats.json"),
+        "rolling_metrics": str(out / "rolling_metrics.json"),
+    }
+
+    def preprocess():
+        from audio_preprocess import convert_to_mono_wav_librosa
+        if not convert_to_mono_wav_librosa(audio_path, paths["mono"]):
+            raise RuntimeError(f"Audio preprocessing failed for {audio_path}")
+
+    def vad():
+        from voice_activity import detect_speech_regions
+        detect_speech_regions(paths["mono"], paths["speech_regions"])
+
+    regions = paths["speech_regions"] if options.get("vad") else None
+
+    def diarize():
+        if options.get("diarizer") == "channels":
+            from channel_diarization import diarize_channels
+            from speaker_separation_librosa import split_stereo_to_speakers_librosa
+            if not split_stereo_to_speakers_librosa(audio_path, str(out)):
+                raise RuntimeError("Stereo split failed (the channel diarizer needs a stereo recording)")
+            diarize_channels(str(out / "podcast_speaker_A_16k_mono.wav"), str(out / "podcast_speaker_B_16k_mono.wav"),
+                             paths["diarization"], audio_file=paths["mono"])
+        else:
+            from diarization import diarize_podcast
+            diarize_podcast(paths["mono"], paths["diarization"], regions)
+
+    def identify():
+        from update_speaker_labels import update_speaker_labels
+        from voiceprints import identify_speakers
+        identify_speakers(paths["mono"], paths["diarization"], paths["speaker_mapping"])
+        update_speaker_labels(paths["diarization"], speaker_mapping=paths["speaker_mapping"])
+
+    def index():
+        from voice_index import VOICE_INDEX_DIR, index_diarization
+        with open(paths["diarization"], 'r', encoding='utf-8') as f:
+            segments = json.load(f)["segments"]
+        index_diarization(paths["mono"], segments, out.name, VOICE_INDEX_DIR)
+
+    def asr():
+        from asr_transcript import transcribe_podcast
+        transcribe_podcast(paths["mono"], paths["transcript_words"], regions)
+
+    def merge():
+        from merge_speakers import merge_diarization_and_asr
+        merge_diarization_and_asr(paths["diarization"], paths["transcript_words"], paths["transcript"])
+
+    def analytics():
+        from rolling_metrics import rolling_metrics
+        basic_speaker_stats(paths["transcript"], paths["basic_speaker_stats"])
+        detect_interruptions(paths["transcript"], paths["interruptions"])
+        turn_taking_stats(paths["transcript"], paths["turn_taking_stats"])
+        rolling_metrics(paths["transcript"], paths["rolling_metrics"])
+
+    stages = [("preprocess", preprocess)]
+    if options.get("vad"):
+        stages.append(("vad", vad))
+    stages.append(("diarize", diarize))
+    if os.path.exists(VOICEPRINTS_PATH):
+        stages.append(("identify", identify))
+    if options.get("voice_index"):
+        stages.append(("index", index))
+    stages += [("asr", asr), ("merge", merge), ("analytics", analytics)]
+
+    error = None
+    with open(out / "pipeline.log", 'a', encoding='utf-8') as log, contextlib.redirect_stdout(log):
+        for step, (stage, fn) in enumerate(stages, start=1):
+            progress.put({"job_id": job_id, "stage": stage, "status": "started",
+                          "step": step, "steps": len(stages), "time": time.time()})
+            t0 = time.perf_counter()
+            try:
+                fn()
+            except Exception as e:
+                error = f"{e.__class__.__name__}: {e}"
+                progress.put({"job_id": job_id, "stage": stage, "status": "failed", "step": step,
+                              "steps": len(stages), "error": error, "time": time.time()})
+                break
+            progress.put({"job_id": job_id, "stage": stage, "status": "done", "step": step, "steps": len(stages),
+                          "elapsed_sec": round(time.perf_counter() - t0, 3), "time": time.time()})
+            log.flush()
+
+    # The terminal event travels through the same queue, after every stage event
+    outputs = {name: path for name, path in paths.items() if os.path.exists(path)}
+    if error is None:
+        progress.put({"job_id": job_id, "stage": None, "status": "done", "outputs": outputs, "time": time.time()})
+    else:
+        progress.put({"job_id": job_id, "stage": None, "status": "failed", "error": error, "time": time.time()})
+    return outputs
+
+
+# ---------------------------------------------------------------------------
+# Server side
+# ---------------------------------------------------------------------------
+
+class LRUCache:
+    """
+    Least-recently-used cache of file contents, bounded by total size.
+
+    Entries are keyed by (path, st_mtime_ns, st_size), so a file rewritten
+    outside a job (a rerun from the CLI, a manual edit) is read again instead
+    of being served stale; each lookup costs one stat.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[str, int, int], Tuple[bytes, Any]]" = OrderedDict()
+        self._keys: Dict[str, Tuple[str, int, int]] = {}  # path -> key of its cached version
+
+    def _key(self, path: str) -> Tuple[str, int, int]:
+        stat = os.stat(path)
+        return path, stat.st_mtime_ns, stat.st_size
+
+    def get(self, path: str) -> bytes:
+        """Return a file's bytes, reading it only on a miss."""
+        return self._lookup(path)[1]
+
+    def get_json(self, path: str) -> Any:
+        """Return a JSON file parsed once and kept with its bytes."""
+        key, raw = self._lookup(path)
+        raw_cached, data = self._entries.get(key, (raw, None))
+        if data is None:
+            data = json.loads(raw)
+            if key in self._entries:
+                self._entries[key] = (raw_cached, data)
+        return data
+
+    def _lookup(self, path: str) -> Tuple[Tuple[str, int, int], bytes]:
+        key = self._key(path)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return key, entry[0]
+        self.misses += 1
+        with open(path, 'rb') as f:
+            raw = f.read()
+        self._put(key, raw)
+        return key, raw
+
+    def _put(self, key: Tuple[str, int, int], raw: bytes) -> None:
+        self._drop(key[0])
+        if len(raw) > self.max_bytes:
+            return
+        self._entries[key] = (raw, None)
+        self._keys[key[0]] = key
+        self.size += len(raw)
+        while self.size > self.max_bytes:
+            old_key, (old_raw, _) = self._entries.popitem(last=False)
+            del self._keys[old_key[0]]
+            self.size -= len(old_raw)
+
+    def _drop(self, path: str) -> None:
+        """Forget the cached version of a file, if any."""
+        key = self._keys.pop(path, None)
+        if key is not None:
+            raw, _ = self._entries.pop(key)
+            self.size -= len(raw)
+
+    def invalidate_prefix(self, prefix: str) -> None:
+        """Drop every cached file under a directory."""
+        for path in [p for p in self._keys if p.startswith(prefix)]:
+            self._drop(path)
+
+
+class HTTPError(Exception):
+    """Error answered with an HTTP status and a JSON body."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class JobServer:
+    """Job registry, worker pool, progress fan-out and HTTP routing."""
+
+    def __init__(self, episodes_dir: str = EPISODES_DIR, workers: int = 1, cache_max_mb: int = CACHE_MAX_MB):
+        self.episodes_dir = Path(episodes_dir).resolve()
+        self.workers = workers
+        self.cache = LRUCache(cache_max_mb * 1024 * 1024)
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self._subscribers: Dict[str, List[asyncio.Queue]] = {}
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._manager = None
+        self._progress = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    # -- lifecycle ---------------------------------------------------------
+
+    def start(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Start the worker pool and the progress listener thread."""
+        self._loop = loop
+        ctx = multiprocessing.get_context("spawn")
+        self._manager = ctx.Manager()
+        self._progress = self._manager.Queue()
+        self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=ctx)
+        threading.Thread(target=self._listen_progress, daemon=True).start()
+
+    def stop(self) -> None:
+        """Stop the worker pool and the progress listener."""
+        if self._progress is not None:
+            self._progress.put(None)
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+        if self._manager is not None:
+            self._manager.shutdown()
+
+    def _listen_progress(self) -> None:
+        """Forward worker progress events to the event loop (runs in a thread)."""
+        while True:
+            try:
+                event = self._progress.get()
+            except (EOFError, OSError):
+                return
+            if event is None:
+                return
+            self._loop.call_soon_threadsafe(self._publish, event)
+
+    # -- jobs --------------------------------------------------------------
+
+    def submit(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Register a job and schedule it on the worker pool."""
+        audio_path = payload.get("audio_path")
+        if not audio_path or not os.path.exists(audio_path):
+            raise HTTPError(400, f"audio_path not found: {audio_path}")
+        diarizer = payload.get("diarizer", "pyannote")
+        if diarizer not in ("pyannote", "channels"):
+            raise HTTPError(400, f"Unknown diarizer: {diarizer}")
+
+        episode_id = payload.get("episode_id") or Path(audio_path).stem
+        if not episode_id.replace("-", "").replace("_", "").isalnum():
+            raise HTTPError(400, "episode_id may only contain letters, digits, '-' and '_'")
+        if any(j["episode_id"] == episode_id and j["status"] in ("queued", "running") for j in self.jobs.values()):
+            raise HTTPError(409, f"Episode {episode_id} is already being processed")
+
+        job_id = uuid.uuid4().hex[:12]
+        episode_dir = self.episodes_dir / episode_id
+        job = {
+            "job_id": job_id,
+            "episode_id": episode_id,
+            "audio_path": os.path.abspath(audio_path),
+            "options": {"diarizer": diarizer, "vad": bool(payload.get("vad", False)),
+                        "voice_index": bool(payload.get("voice_index", False))},
+            "status": "queued",
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "stages": {},
+            "events": [],
+            "outputs": {},
+            "error": None
+        }
+        self.jobs[job_id] = job
+        self._publish({"job_id": job_id, "stage": None, "status": "queued", "time": time.time()})
+
+        future = self._loop.run_in_executor(
+            self._pool, run_episode_pipeline, job_id, job["audio_path"], str(episode_dir), job["options"], self._progress
+        )
+        self._loop.create_task(self._finish(job_id, future))
+        return job
+
+    async def _finish(self, job_id: str, future: "asyncio.Future") -> None:
+        """Fail a job whose worker died before reporting its terminal event."""
+        try:
+            await future
+        except Exception as e:
+            if self.jobs[job_id]["status"] not in ("done", "failed"):
+                self._publish({"job_id": job_id, "stage": None, "status": "failed",
+                               "error": f"{e.__class__.__name__}: {e}", "time": time.time()})
+
+    def _publish(self, event: Dict[str, Any]) -> None:
+        """Apply a progress event to its job and fan it out to SSE subscribers."""
+        job = self.jobs.get(event["job_id"])
+        if job is None:
+            return
+        job["events"].append(event)
+        if event["stage"] is None:
+            job["status"] = event["status"]
+            if event["status"] == "done":
+                job["outputs"] = event.get("outputs", {})
+            elif event["status"] == "failed":
+                job["error"] = event.get("error")
+            if event["status"] in ("done", "failed"):
+                self.cache.invalidate_prefix(str(self.episodes_dir / job["episode_id"]) + os.sep)
+        else:
+            job["status"] = "running" if job["status"] == "queued" else job["status"]
+            stage = job["stages"].setdefault(event["stage"], {})
+            stage["status"] = event["status"]
+            for key in ("elapsed_sec", "error"):
+                if key in event:
+                    stage[key] = event[key]
+        for queue in self._subscribers.get(event["job_id"], []):
+            queue.put_nowait(event)
+
+    @staticmethod
+    def _job_view(job: Dict[str, Any]) -> Dict[str, Any]:
+        return {k: v for k, v in job.items() if k != "events"}
+
+    # -- HTTP --------------------------------------------------------------
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve one HTTP request."""
+        try:
+            method, target, body = await self._read_request(reader)
+            url = urlsplit(target)
+            parts = [unquote(p) for p in url.path.strip("/").split("/") if p]
+            query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+
+            if parts[:1] == ["jobs"] and len(parts) == 3 and parts[2] == "events" and method == "GET":
+                await self._stream_events(parts[1], writer)
+                return
+            status, content_type, payload = self._route(method, parts, query, body)
+        except HTTPError as e:
+            status, content_type, payload = e.status, CONTENT_TYPES[".json"], json.dumps({"error": e.message}).encode()
+        except Exception as e:
+            status, content_type = 500, CONTENT_TYPES[".json"]
+            payload = json.dumps({"error": f"{e.__class__.__name__}: {e}"}).encode()
+
+        try:
+            writer.write(self._response_head(status, content_type, len(payload)) + payload)
+            await writer.drain()
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _read_request(reader: asyncio.StreamReader) -> Tuple[str, str, bytes]:
+        head = await reader.readuntil(b"\r\n\r\n")
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, target, _ = lines[0].split(" ", 2)
+        except ValueError:
+            raise HTTPError(400, "Malformed request line")
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                key, value = line.split(":", 1)
+                headers[key.strip().lower()] = value.strip()
+        length = int(headers.get("content-length", 0))
+        if length > MAX_BODY_BYTES:
+            raise HTTPError(413, "Request body too large")
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), target, body
+
+    @staticmethod
+    def _response_head(status: int, content_type: str, length: Optional[int] = None) -> bytes:
+        lines = [f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}", f"Content-Type: {content_type}",
+                 "Access-Control-Allow-Origin: *"]
+        if length is None:
+            lines += ["Cache-Control: no-cache", "Connection: keep-alive"]
+        else:
+            lines += [f"Content-Length: {length}", "Connection: close"]
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+    def _route(self, method: str, parts: List[str], query: Dict[str, str], body: bytes) -> Tuple[int, str, bytes]:
+        """Dispatch a non-streaming request."""
+        def as_json(status, data):
+            return status, CONTENT_TYPES[".json"], json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+        if parts == ["jobs"]:
+            if method == "POST":
+                try:
+                    payload = json.loads(body or b"{}")
+                except json.JSONDecodeError:
+                    raise HTTPError(400, "Body must be JSON")
+                job = self.submit(payload)
+                return as_json(202, {**self._job_view(job), "status_url": f"/jobs/{job['job_id']}",
+                                     "events_url": f"/jobs/{job['job_id']}/events"})
+            if method == "GET":
+                return as_json(200, [self._job_view(j) for j in self.jobs.values()])
+            raise HTTPError(405, "Use GET or POST")
+
+        if method != "GET":
+            raise HTTPError(405, "Use GET")
+
+        if len(parts) == 2 and parts[0] == "jobs":
+            job = self.jobs.get(parts[1])
+            if job is None:
+                raise HTTPError(404, f"Unknown job: {parts[1]}")
+            return as_json(200, self._job_view(job))
+
+        if parts == ["episodes"]:
+            episodes = sorted(p.name for p in self.episodes_dir.iterdir() if p.is_dir()) if self.episodes_dir.exists() else []
+            return as_json(200, {"episodes": episodes,
+                                 "cache": {"entries": len(self.cache._entries), "bytes": self.cache.size,
+                                           "hits": self.cache.hits, "misses": self.cache.misses}})
+
+        if len(parts) >= 3 and parts[0] == "episodes":
+            episode_dir = self._episode_dir(parts[1])
+            if parts[2] == "transcript" and len(parts) == 3:
+                path = episode_dir / "transcript_with_speakers.json"
+                if not path.exists():
+                    raise HTTPError(404, f"No transcript for episode {parts[1]}")
+                if not query:
+                    return 200, CONTENT_TYPES[".json"], self.cache.get(str(path))
+                return as_json(200, self._filter_transcript(self.cache.get_json(str(path)), query))
+            if parts[2] == "files" and len(parts) == 4:
+                path = (episode_dir / parts[3]).resolve()
+                if path.parent != episode_dir or path.suffix not in CONTENT_TYPES or not path.is_file():
+                    raise HTTPError(404, f"No such file: {parts[3]}")
+                return 200, CONTENT_TYPES[path.suffix], self.cache.get(str(path))
+
+        raise HTTPError(404, "Not found")
+
+    def _episode_dir(self, episode_id: str) -> Path:
+        path = (self.episodes_dir / episode_id).resolve()
+        if path.parent != self.episodes_dir or not path.is_dir():
+            raise HTTPError(404, f"Unknown episode: {episode_id}")
+        return path
+
+    @staticmethod
+    def _filter_transcript(data: Dict[str, Any], query: Dict[str, str]) -> Dict[str, Any]:
+        """Segments of one speaker and/or overlapping a time range."""
+        try:
+            start = float(query.get("start", "-inf"))
+            end = float(query.get("end", "inf"))
+        except ValueError:
+            raise HTTPError(400, "start and end must be numbers")
+        speaker = query.get("speaker")
+        segments = [
+            s for s in data["segments"]
+            if s["end"] > start and s["start"] < end and (speaker is None or s["speaker"] == speaker)
+        ]
+        return {**{k: v for k, v in data.items() if k != "segments"}, "segments": segments}
+
+    async def _stream_events(self, job_id: str, writer: asyncio.StreamWriter) -> None:
+        """Server-Sent Events: replay the job's events, then follow it until it ends."""
+        job = self.jobs.get(job_id)
+        if job is None:
+            payload = json.dumps({"error": f"Unknown job: {job_id}"}).encode()
+            writer.write(self._response_head(404, CONTENT_TYPES[".json"], len(payload)) + payload)
+            await writer.drain()
+            writer.close()
+            return
+
+        queue: asyncio.Queue = asyncio.Queue()
+        for event in job["events"]:
+            queue.put_nowait(event)
+        self._subscribers.setdefault(job_id, []).append(queue)
+        writer.write(self._response_head(200, "text/event-stream"))
+        try:
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=SSE_HEARTBEAT_SEC)
+                except asyncio.TimeoutError:
+                    writer.write(b": heartbeat\n\n")
+                    await writer.drain()
+                    continue
+                writer.write(f"event: progress\ndata: {json.dumps(event)}\n\n".encode("utf-8"))
+                await writer.drain()
+                if event["stage"] is None and event["status"] in ("done", "failed"):
+                    break
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self._subscribers[job_id].remove(queue)
+            writer.close()
+
+
+async def serve(host: str, port: int, server: JobServer) -> None:
+    """Run the HTTP server until cancelled."""
+    server.start(asyncio.get_running_loop())
+    http = await asyncio.start_server(server.handle, host, port)
+    print(f"🚀 Job server listening on http://{host}:{port} "
+          f"({server.workers} worker(s), episodes in {server.episodes_dir})")
+    try:
+        async with http:
+            await http.serve_forever()
+    finally:
+        server.stop()
+
+
+def main(argv: Optional[List[str]] = None):
+    """Main function to run the job server."""
+    parser = argparse.ArgumentParser(description='Local job API for the podcast analysis pipeline')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--workers', type=int, default=1, help='Worker processes (episodes processed in parallel)')
+    parser.add_argument('--episodes-dir', default=EPISODES_DIR)
+    parser.add_argument('--cache-mb', type=int, default=CACHE_MAX_MB, help='LRU file cache size in MB')
+    args = parser.parse_args(argv)
+
+    # Worker processes import the pipeline modules from this directory
+    src_dir = os.path.dirname(os.path.abspath(__file__))
+    os.environ["PYTHONPATH"] = os.pathsep.join(filter(None, [src_dir, os.environ.get("PYTHONPATH")]))
+
+    try:
+        asyncio.run(serve(args.host, args.port, JobServer(args.episodes_dir, args.workers, args.cache_mb)))
+    except KeyboardInterrupt:
+        print("\n⏹️  Job server stopped")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,326 @@
+"""
+Streaming JSON I/O for large pipeline artifacts.
+
+The pipeline's artifacts (transcript_words.json, diarization_segments.json,
+transcript_with_speakers.json) are one JSON object holding a few metadata
+fields and one large array, usually "segments". For 10+ hour recordings,
+json.dump(..., indent=2) of the full result and json.load of the whole file
+each build the complete object graph in memory. This module avoids both:
+
+- JsonArrayWriter streams array items to disk as they are produced; the
+  other fields are written before (header) or after (trailer) the array
+- iter_array / iter_segments / iter_words parse a file incrementally and
+  yield one item at a time, collecting the other top-level fields on request
+- dump_json / load_json are whole-document helpers
+- episode_id_from_path gives the default episode id of an artifact file
+
+Output is compact by default (one array item per line). orjson is used for
+serialization and whole-file loads when installed, with the standard json
+module as fallback; files written either way read back identically.
+
+Usage:
+    with JsonArrayWriter(path, header={"audio_file": audio}) as writer:
+        for segment in produce_segments():
+            writer.write(segment)
+
+    fields = {}
+    for segment in iter_segments(path, fields):
+        ...
+"""
+
+import json
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+try:
+    import orjson
+except ImportError:  # optional fast path
+    orjson = None
+
+READ_CHUNK_CHARS = 1 << 16  # characters read per refill by the incremental reader
+
+# File stems and directory names shared by every episode (see episode_id_from_path)
+ARTIFACT_STEMS = frozenset({"transcript_with_speakers", "transcript_words", "diarization_segments"})
+LAYOUT_DIRS = frozenset({"outputs", "audio_features", "text_analysis", "episodes", "data", "processed", "src"})
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_NUMBER_CHARS = frozenset('0123456789+-.eE')
+_DECODER = json.JSONDecoder()
+_ORJSON_OPTIONS = (orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+
+def dumps(obj: Any, indent: Optional[int] = None) -> bytes:
+    """
+    Serialize to UTF-8 JSON bytes (non-ASCII kept as is).
+
+    Args:
+        obj: JSON-serializable object (NumPy scalars/arrays allowed with orjson)
+        indent: None for compact output, 2 for the indented layout
+
+    Returns:
+        bytes: Encoded document
+    """
+    if orjson is not None and indent in (None, 2):
+        try:
+            return orjson.dumps(obj, option=_ORJSON_OPTIONS | (orjson.OPT_INDENT_2 if indent else 0))
+        except TypeError:
+            pass  # e.g. integers beyond 64 bits: let json report or handle it
+    separators = (',', ': ') if indent else (',', ':')
+    return json.dumps(obj, indent=indent, ensure_ascii=False, separators=separators).encode('utf-8')
+
+
+def dump_json(obj: Any, path: str, indent: Optional[int] = None) -> None:
+    """
+    Write a whole document, creating parent directories.
+
+    Args:
+        obj: Document to write
+        path: Output path
+        indent: None for compact output, 2 for the indented layout
+    """
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(dumps(obj, indent))
+
+
+def load_json(path: str) -> Any:
+    """Read a whole document (orjson when installed)."""
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+class JsonArrayWriter:
+    """
+    Write a JSON object whose one large array is streamed item by item.
+
+    The file is written to "<path>.partial" and renamed on close, so readers
+    never see a truncated artifact; leaving the with-block on an exception
+    removes the partial file instead.
+    """
+
+    def __init__(self, path: str, key: str = "segments", header: Optional[Dict[str, Any]] = None):
+        """
+        Open the output and write the header fields.
+
+        Args:
+            path: Output path
+            key: Name of the streamed array
+            header: Fields written before the array
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.partial_path = self.path.with_name(self.path.name + ".partial")
+        self.count = 0
+        self._file = open(self.partial_path, 'wb')
+        self._file.write(b'{')
+        for name, value in (header or {}).items():
+            self._file.write(dumps(name) + b':' + dumps(value) + b',')
+        self._file.write(dumps(key) + b':[')
+
+    def write(self, item: Any) -> None:
+        """Append one array item."""
+        self._file.write((b'\n' if self.count == 0 else b',\n') + dumps(item))
+        self.count += 1
+
+    def close(self, trailer: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Close the array, write the trailer fields and publish the file.
+
+        Args:
+            trailer: Fields written after the array (e.g. totals known only at the end)
+        """
+        if self._file.closed:
+            return
+        self._file.write(b'\n]')
+        for name, value in (trailer or {}).items():
+            self._file.write(b',' + dumps(name) + b':' + dumps(value))
+        self._file.write(b'}\n')
+        self._file.close()
+        os.replace(self.partial_path, self.path)
+
+    def abort(self) -> None:
+        """Discard the partial output."""
+        if not self._file.closed:
+            self._file.close()
+        self.partial_path.unlink(missing_ok=True)
+
+    def __enter__(self) -> "JsonArrayWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+class _IncrementalScanner:
+    """Pull-parser over a text file: JSON structure characters and complete values."""
+
+    def __init__(self, f):
+        self.f = f
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        """Read more text; the read size grows with the pending buffer, keeping large values linear."""
+        if self.eof:
+            return False
+        chunk = self.f.read(max(READ_CHUNK_CHARS, len(self.buffer) - self.pos))
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character ('' at end of file)."""
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, chars: str) -> str:
+        """Consume one of the given structure characters."""
+        char = self.peek()
+        if not char or char not in chars:
+            raise ValueError(f"Malformed JSON: expected one of {chars!r}, found {char or 'end of file'!r}")
+        self.pos += 1
+        return char
+
+    def value(self) -> Any:
+        """Decode the next complete value."""
+        self.peek()
+        while True:
+            try:
+                obj, end = _DECODER.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # A number is only complete once its terminator is in the buffer:
+            # "1" or "1e" may be the prefix of "1e16" split across chunks
+            if (isinstance(obj, (int, float)) and not isinstance(obj, bool)
+                    and (end == len(self.buffer) or self.buffer[end] in _NUMBER_CHARS)
+                    and self._fill()):
+                continue
+            self.pos = end
+            return obj
+
+
+def iter_array(path: str, key: str = "segments", fields: Optional[Dict[str, Any]] = None) -> Iterator[Any]:
+    """
+    Lazily yield the items of one top-level array of a JSON object file.
+
+    Works on any layout (indented files written by json.dump included); only
+    one item is decoded at a time.
+
+    Args:
+        path: JSON file whose top level is an object
+        key: Name of the array to stream
+        fields: Optional dict receiving the other top-level fields; when given,
+            the file is read to the end so fields after the array are included
+
+    Yields:
+        Array items in file order
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        scanner = _IncrementalScanner(f)
+        scanner.expect('{')
+        if scanner.peek() == '}':
+            return
+        while True:
+            name = scanner.value()
+            scanner.expect(':')
+            if name == key:
+                scanner.expect('[')
+                if scanner.peek() == ']':
+                    scanner.pos += 1
+                else:
+                    while True:
+                        yield scanner.value()
+                        if scanner.expect(',]') == ']':
+                            break
+                if fields is None:
+                    return
+            else:
+                value = scanner.value()
+                if fields is not None:
+                    fields[name] = value
+            if scanner.expect(',}') == '}':
+                return
+
+
+def iter_segments(path: str, fields: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+    """Lazily yield the "segments" of a pipeline artifact (see iter_array)."""
+    return iter_array(path, "segments", fields)
+
+
+def iter_words(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily yield the words of a transcript, in file order.
+
+    Args:
+        path: transcript_words.json or transcript_with_speakers.json
+
+    Yields:
+        dict: Word (start, end, word), plus "speaker" when its segment has one
+    """
+    for segment in iter_segments(path):
+        speaker = segment.get("speaker")
+        for word in segment.get("words", ()):
+            yield word if speaker is None else {**word, "speaker": speaker}
+
+
+def read_fields(path: str, key: str = "segments") -> Dict[str, Any]:
+    """
+    Top-level fields of a JSON object file other than one large array.
+
+    The array is still scanned item by item but never held in memory.
+
+    Args:
+        path: JSON file whose top level is an object
+        key: Name of the array to skip
+
+    Returns:
+        dict: The remaining top-level fields
+    """
+    fields = {}
+    for _ in iter_array(path, key, fields):
+        pass
+    return fields
+
+
+def episode_id_from_path(path: str) -> str:
+    """
+    Default episode id of a pipeline artifact, derived from where it is stored.
+
+    Every pipeline run records the same audio_file (podcast_16k_mono.wav), so
+    the id cannot come from the file contents. A file with its own name
+    (ep042.json) is identified by its stem; a standard artifact name by the
+    closest enclosing directory outside the pipeline's own layout, so
+    episodes/ep042/outputs/audio_features/transcript_with_speakers.json and
+    outputs/episodes/ep042/transcript_with_speakers.json both give "ep042".
+
+    Args:
+        path: Artifact path
+
+    Returns:
+        str: Episode id
+    """
+    path = Path(path).resolve()
+    if path.stem not in ARTIFACT_STEMS:
+        return path.stem
+    for parent in path.parents:
+        if parent.name and parent.name not in LAYOUT_DIRS:
+            return parent.name
+    return path.stem
@@ -0,0 +1,410 @@
+"""
+Live streaming mode: incremental ASR and speaker assignment over an audio stream.
+
+Consumes 16 kHz mono PCM blocks (stdin pipe, TCP socket, or a local file
+played at real-time speed as a stand-in for the live feed) and emits
+speaker-attributed transcript segments within seconds:
+
+1. Rolling-window ASR: every STEP_SEC of new audio, Whisper (same model setup
+   as transcribe_podcast) re-transcribes the uncommitted buffer. Words that
+   end more than HOLDBACK_SEC before the end of the buffer are committed,
+   since later audio can no longer change them; the buffer is then trimmed to
+   the last committed word. A buffer reaching MAX_WINDOW_SEC (Whisper's
+   context) is committed as is.
+2. Online speaker assignment: each committed segment is embedded
+   (speaker_embedding.py) and matched against running speaker centroids by
+   cosine similarity; an unmatched segment opens a new speaker (S0, S1, ...)
+   up to MAX_SPEAKERS.
+3. Every committed segment is emitted as an event in the
+   transcript_with_speakers.json segment schema (speaker, start, end, text,
+   words), appended to a JSON-lines file, and the full transcript is written
+   in the merge_speakers format when the stream ends.
+
+Usage (from the src directory):
+    python live_stream.py --file ../data/processed/podcast_16k_mono.wav --speed 1.0
+    ffmpeg -i <stream-url> -f s16le -ac 1 -ar 16000 - | python live_stream.py --stdin
+    python live_stream.py --listen 0.0.0.0:9000   # raw s16le PCM over TCP
+"""
+
+import argparse
+import json
+import socket
+import sys
+import time
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Optional
+
+import numpy as np
+
+from config import SAMPLE_RATE
+from speaker_embedding import MIN_EMBEDDING_SEC, cosine_similarity, load_speaker_embedder
+
+LIVE_EVENTS_PATH = "outputs/live/transcript_events.jsonl"
+LIVE_TRANSCRIPT_PATH = "outputs/live/transcript_with_speakers.json"
+
+BLOCK_SEC = 0.5
+STEP_SEC = 5.0
+MAX_WINDOW_SEC = 30.0
+HOLDBACK_SEC = 2.0
+SPEAKER_THRESHOLD = 0.85  # MFCC embeddings of different voices are still fairly similar
+MAX_SPEAKERS = 4
+
+PCM_FORMATS = {"s16le": ("<i2", 32768.0), "f32le": ("<f4", 1.0)}
+
+
+def read_pcm_stream(stream: BinaryIO, pcm_format: str = "s16le", block_sec: float = BLOCK_SEC,
+                    sr: int = SAMPLE_RATE) -> Iterator[np.ndarray]:
+    """
+    Yield float32 blocks from a raw mono PCM byte stream.
+
+    Args:
+        stream: Binary stream (stdin buffer, socket file, pipe)
+        pcm_format: "s16le" or "f32le"
+        block_sec: Block duration in seconds
+        sr: Sample rate of the stream
+
+    Yields:
+        np.ndarray: float32 samples in [-1, 1]
+    """
+    dtype, scale = PCM_FORMATS[pcm_format]
+    sample_bytes = np.dtype(dtype).itemsize
+    block_bytes = int(block_sec * sr) * sample_bytes
+    pending = b""
+    while True:
+        chunk = stream.read(block_bytes - len(pending))
+        if not chunk:
+            break
+        pending += chunk
+        if len(pending) >= block_bytes:
+            yield np.frombuffer(pending, dtype=dtype).astype(np.float32) / scale
+            pending = b""
+    usable = len(pending) // sample_bytes * sample_bytes
+    if usable:
+        yield np.frombuffer(pending[:usable], dtype=dtype).astype(np.float32) / scale
+
+
+def pcm_from_socket(host: str, port: int, pcm_format: str = "s16le") -> Iterator[np.ndarray]:
+    """Accept one TCP connection and yield its raw PCM as float32 blocks."""
+    with socket.create_server((host, port)) as server:
+        print(f"📡 Waiting for a PCM stream on {host}:{port}...")
+        conn, address = server.accept()
+        print(f"✅ Stream connected from {address[0]}:{address[1]}")
+        with conn, conn.makefile('rb') as stream:
+            yield from read_pcm_stream(stream, pcm_format)
+
+
+def pcm_from_file(path: str, speed: float = 1.0, block_sec: float = BLOCK_SEC) -> Iterator[np.ndarray]:
+    """
+    Play a local audio file as a live feed.
+
+    Args:
+        path: Audio file (resampled to SAMPLE_RATE mono if needed)
+        speed: Playback speed relative to real time (0 = as fast as possible)
+        block_sec: Block duration in seconds
+
+    Yields:
+        np.ndarray: float32 blocks at SAMPLE_RATE
+    """
+    import soundfile as sf
+
+    info = sf.info(path)
+    block = int(block_sec * SAMPLE_RATE)
+    if info.samplerate == SAMPLE_RATE:
+        blocks = sf.blocks(path, blocksize=block, dtype='float32', always_2d=True)
+        blocks = (b.mean(axis=1) for b in blocks)
+    else:
+        import librosa
+        y, _ = librosa.load(path, sr=SAMPLE_RATE, mono=True)
+        blocks = (y[i:i + block] for i in range(0, len(y), block))
+
+    t0 = time.monotonic()
+    played = 0.0
+    for samples in blocks:
+        played += len(samples) / SAMPLE_RATE
+        if speed > 0:
+            delay = t0 + played / speed - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+        yield samples
+
+
+def whisper_transcriber(model_name: str = "base") -> Callable[[np.ndarray], Dict[str, Any]]:
+    """
+    Whisper transcription function for the rolling window.
+
+    Args:
+        model_name: Whisper model size (loaded once, as in transcribe_podcast)
+
+    Returns:
+        Function audio -> Whisper result with word timestamps
+    """
+    from asr_transcript import load_whisper_model
+
+    model = load_whisper_model(model_name)
+
+    def transcribe(audio: np.ndarray) -> Dict[str, Any]:
+        # Each window is decoded independently: earlier text is already committed
+        return model.transcribe(audio, word_timestamps=True, condition_on_previous_text=False, verbose=None)
+    return transcribe
+
+
+class OnlineSpeakerAssigner:
+    """
+    Assign speaker labels to embeddings against running centroids.
+
+    A centroid is the running mean of the embeddings assigned to it, so every
+    update is O(dim) and early, noisy assignments are averaged out over time.
+    """
+
+    def __init__(self, threshold: float = SPEAKER_THRESHOLD, max_speakers: int = MAX_SPEAKERS):
+        """
+        Args:
+            threshold: Minimum similarity to join an existing speaker
+            max_speakers: Upper bound on the number of speakers
+        """
+        self.threshold = threshold
+        self.max_speakers = max_speakers
+        self.centroids: List[np.ndarray] = []
+        self.counts: List[int] = []
+
+    def assign(self, embedding: np.ndarray) -> str:
+        """
+        Assign a speaker to one embedding and update that speaker's centroid.
+
+        Args:
+            embedding: Speaker embedding of a segment
+
+        Returns:
+            str: Speaker label ("S0", "S1", ...)
+        """
+        embedding = np.asarray(embedding, dtype=np.float64)
+
+        best, similarity = None, -1.0
+        if self.centroids:
+            similarities = np.atleast_1d(cosine_similarity(embedding, np.stack(self.centroids)))
+            best = int(np.argmax(similarities))
+            similarity = float(similarities[best])
+
+        if best is None or (similarity < self.threshold and len(self.centroids) < self.max_speakers):
+            self.centroids.append(embedding)
+            self.counts.append(1)
+            return f"S{len(self.centroids) - 1}"
+
+        self.counts[best] += 1
+        self.centroids[best] += (embedding - self.centroids[best]) / self.counts[best]
+        return f"S{best}"
+
+
+class LiveTranscriptionEngine:
+    """Rolling-window ASR with online speaker assignment over a block stream."""
+
+    def __init__(
+        self,
+        transcribe_fn: Callable[[np.ndarray], Dict[str, Any]],
+        embed_fn: Callable[[np.ndarray, int], np.ndarray],
+        assigner: Optional[OnlineSpeakerAssigner] = None,
+        sr: int = SAMPLE_RATE,
+        step_sec: float = STEP_SEC,
+        max_window_sec: float = MAX_WINDOW_SEC,
+        holdback_sec: float = HOLDBACK_SEC
+    ):
+        """
+        Args:
+            transcribe_fn: audio -> Whisper-style result (segments with words)
+            embed_fn: (audio, sr) -> speaker embedding
+            assigner: Online speaker assigner (a new one by default)
+            sr: Sample rate of the fed blocks
+            step_sec: Re-run ASR after this much new audio
+            max_window_sec: Commit the whole buffer once it reaches this length
+            holdback_sec: Words ending this close to the buffer end stay uncommitted
+        """
+        self.transcribe_fn = transcribe_fn
+        self.embed_fn = embed_fn
+        self.assigner = assigner or OnlineSpeakerAssigner()
+        self.sr = sr
+        self.step_sec = step_sec
+        self.max_window_sec = max_window_sec
+        self.holdback_sec = holdback_sec
+
+        self.segments: List[Dict[str, Any]] = []
+        self._buffer = np.zeros(0, dtype=np.float32)
+        self._buffer_start = 0.0
+        self._received = 0.0
+        self._since_step = 0.0
+        self._last_speaker = None
+
+    def feed(self, block: np.ndarray) -> List[Dict[str, Any]]:
+        """
+        Add one block of audio.
+
+        Args:
+            block: float32 samples
+
+        Returns:
+            List of segment events committed by this block (often empty)
+        """
+        self._buffer = np.concatenate((self._buffer, np.asarray(block, dtype=np.float32)))
+        duration = len(block) / self.sr
+        self._received += duration
+        self._since_step += duration
+
+        buffer_sec = len(self._buffer) / self.sr
+        if self._since_step < self.step_sec and buffer_sec < self.max_window_sec:
+            return []
+        self._since_step = 0.0
+        return self._process(final=buffer_sec >= self.max_window_sec)
+
+    def flush(self) -> List[Dict[str, Any]]:
+        """Commit everything left in the buffer (end of stream)."""
+        if len(self._buffer) == 0:
+            return []
+        return self._process(final=True)
+
+    def _process(self, final: bool) -> List[Dict[str, Any]]:
+        """Transcribe the buffer, commit stable words and trim the buffer."""
+        buffer_sec = len(self._buffer) / self.sr
+        result = self.transcribe_fn(self._buffer)
+        commit_limit = buffer_sec if final else buffer_sec - self.holdback_sec
+
+        events = []
+        committed_until = None
+        for segment in result.get('segments', []):
+            words = [w for w in segment.get('words', []) if w.get('word', '').strip()]
+            stable = []
+            for word in words:
+                if word['end'] > commit_limit:
+                    break
+                stable.append(word)
+            if stable:
+                events.append(self._emit(stable))
+                committed_until = stable[-1]['end']
+            if len(stable) < len(words):
+                break
+
+        if committed_until is not None:
+            trim_sec = committed_until
+        elif not any(seg.get('words') for seg in result.get('segments', [])):
+            # No speech in the buffer: keep only the holdback tail
+            trim_sec = max(buffer_sec - self.holdback_sec, 0.0)
+        else:
+            trim_sec = 0.0
+        if final:
+            trim_sec = buffer_sec
+
+        trim = min(int(round(trim_sec * self.sr)), len(self._buffer))
+        self._buffer = self._buffer[trim:]
+        self._buffer_start += trim / self.sr
+        return events
+
+    def _emit(self, words: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Build the event of one committed group of words and assign its speaker."""
+        start, end = float(words[0]['start']), float(words[-1]['end'])
+        snippet = self._buffer[int(start * self.sr):int(end * self.sr)]
+        if len(snippet) >= MIN_EMBEDDING_SEC * self.sr or self._last_speaker is None:
+            speaker = self.assigner.assign(self.embed_fn(snippet, self.sr))
+        else:
+            speaker = self._last_speaker
+        self._last_speaker = speaker
+
+        offset = self._buffer_start
+        event = {
+            "speaker": speaker,
+            "start": round(offset + start, 2),
+            "end": round(offset + end, 2),
+            "text": " ".join(w['word'].strip() for w in words),
+            "words": [
+                {"start": round(offset + float(w['start']), 2), "end": round(offset + float(w['end']), 2),
+                 "word": w['word'].strip()}
+                for w in words
+            ],
+            "lag_sec": round(self._received - (offset + end), 2)
+        }
+        self.segments.append({k: v for k, v in event.items() if k != "lag_sec"})
+        return event
+
+
+def run_live(
+    blocks: Iterator[np.ndarray],
+    source_name: str,
+    model_name: str = "base",
+    embedder: str = "mfcc",
+    events_path: str = LIVE_EVENTS_PATH,
+    output_path: str = LIVE_TRANSCRIPT_PATH,
+    transcribe_fn: Optional[Callable[[np.ndarray], Dict[str, Any]]] = None
+) -> Dict[str, Any]:
+    """
+    Run the streaming engine until the stream ends.
+
+    Args:
+        blocks: float32 PCM blocks at SAMPLE_RATE
+        source_name: Recorded as audio_file in the final transcript
+        model_name: Whisper model size
+        embedder: Speaker embedding method ("mfcc" or "pyannote")
+        events_path: JSON-lines file receiving one event per committed segment
+        output_path: Final transcript in the merge_speakers format
+        transcribe_fn: Optional replacement for the Whisper transcriber
+
+    Returns:
+        dict: Final transcript (audio_file, sample_rate, speakers, segments)
+    """
+    _, embed_fn = load_speaker_embedder(embedder)
+    engine = LiveTranscriptionEngine(transcribe_fn or whisper_transcriber(model_name), embed_fn)
+
+    Path(events_path).parent.mkdir(parents=True, exist_ok=True)
+    print(f"🔴 Live transcription started (events: {events_path})")
+    with open(events_path, 'w', encoding='utf-8') as events_file:
+        def publish(events):
+            for event in events:
+                events_file.write(json.dumps(event, ensure_ascii=False) + "\n")
+                print(f"[{event['start']:8.2f}s +{event['lag_sec']:.1f}s] {event['speaker']}: {event['text']}")
+            events_file.flush()
+
+        try:
+            for block in blocks:
+                publish(engine.feed(block))
+        except KeyboardInterrupt:
+            print("\n⏹️  Stream stopped")
+        publish(engine.flush())
+
+    transcript = {
+        "audio_file": source_name,
+        "sample_rate": SAMPLE_RATE,
+        "speakers": sorted({s['speaker'] for s in engine.segments}),
+        "segments": engine.segments
+    }
+    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(transcript, f, indent=2, ensure_ascii=False)
+    print(f"💾 Saved {len(engine.segments)} segments to: {output_path}")
+    return transcript
+
+
+def main(argv: Optional[List[str]] = None):
+    """Main function for the live streaming CLI."""
+    parser = argparse.ArgumentParser(description='Live speaker-attributed transcription of a PCM stream')
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--file', help='Play a local audio file as the live feed')
+    source.add_argument('--stdin', action='store_true', help='Read raw mono 16 kHz PCM from stdin')
+    source.add_argument('--listen', metavar='HOST:PORT', help='Accept raw mono 16 kHz PCM over TCP')
+    parser.add_argument('--speed', type=float, default=1.0, help='File playback speed (0 = as fast as possible)')
+    parser.add_argument('--format', choices=sorted(PCM_FORMATS), default='s16le', help='Raw PCM sample format')
+    parser.add_argument('--model', default='base', help='Whisper model size')
+    parser.add_argument('--embedder', choices=['mfcc', 'pyannote'], default='mfcc')
+    parser.add_argument('--events', default=LIVE_EVENTS_PATH)
+    parser.add_argument('--output', default=LIVE_TRANSCRIPT_PATH)
+    args = parser.parse_args(argv)
+
+    if args.file:
+        blocks, source_name = pcm_from_file(args.file, args.speed), args.file
+    elif args.stdin:
+        blocks, source_name = read_pcm_stream(sys.stdin.buffer, args.format), "stdin"
+    else:
+        host, port = args.listen.rsplit(':', 1)
+        blocks, source_name = pcm_from_socket(host, int(port), args.format), f"tcp://{args.listen}"
+
+    run_live(blocks, source_name, args.model, args.embedder, args.events, args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
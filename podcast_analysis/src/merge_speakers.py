@@ -8,12 +8,15 @@ This module implements task 4.1 from new_way.md:
 """
 
 import os
-import json
 import sys
-from pathlib import Path
 from typing import Dict, List, Any, Optional
 import warnings
 
+import numpy as np
+
+from json_stream import JsonArrayWriter, iter_segments, load_json
+from word_table import SEGMENT_DTYPE, TranscriptTable, Vocabulary, overlapping_pairs, words_from_asr
+
 # Suppress warnings for cleaner output
 warnings.filterwarnings("ignore", category=UserWarning)
 
@@ -48,11 +51,70 @@ def assign_speaker_to_word(word: Dict[str, Any], diar_segments: List[Dict[str, A
     return best_speaker
 
 
+def build_speaker_segments(
+    words: np.ndarray,
+    vocabulary: Vocabulary,
+    diar_segments: List[Dict[str, Any]]
+) -> TranscriptTable:
+    """
+    Assign speakers to words and group them into speaker-labeled segments.
+    
+    Same rules as assign_speaker_to_word applied word by word, computed on
+    arrays: every (word, diarization segment) pair with positive overlap is
+    found through sorted interval search, each word takes the speaker of its
+    maximum-overlap segment (the earliest segment on ties), and each
+    diarization segment collects the words of its own speaker that overlap it,
+    sorted by start time. Segments without words are dropped.
+    
+    Args:
+        words (np.ndarray): Word table in transcript order (word_table.WORD_DTYPE)
+        vocabulary (Vocabulary): Vocabulary of the word tokens
+        diar_segments (list): Diarization segments with speaker, start, end
+        
+    Returns:
+        TranscriptTable: Speaker-labeled segments in diarization order
+    """
+    diar_starts = np.array([seg["start"] for seg in diar_segments], dtype=np.float64)
+    diar_ends = np.array([seg["end"] for seg in diar_segments], dtype=np.float64)
+    speakers, diar_codes = np.unique(np.array([seg["speaker"] for seg in diar_segments], dtype=object),
+                                     return_inverse=True)
+    diar_codes = diar_codes.astype(np.int64)
+    
+    word_index, seg_index, overlap = overlapping_pairs(words["start"], words["end"], diar_starts, diar_ends)
+    
+    # Best segment per word: largest overlap, then earliest segment
+    order = np.lexsort((seg_index, -overlap, word_index))
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = word_index[order][1:] != word_index[order][:-1]
+    word_speaker = np.full(len(words), -1, dtype=np.int64)
+    word_speaker[word_index[order][first]] = diar_codes[seg_index[order][first]]
+    print(f"✅ Assigned speakers to {int((word_speaker >= 0).sum())} words")
+    
+    # Each diarization segment keeps the overlapping words of its own speaker, by start time
+    print("📝 Building speaker-labeled segments...")
+    same = diar_codes[seg_index] == word_speaker[word_index]
+    word_index, seg_index = word_index[same], seg_index[same]
+    order = np.lexsort((word_index, words["start"][word_index], seg_index))
+    word_index, seg_index = word_index[order], seg_index[order]
+    
+    kept, counts = np.unique(seg_index, return_counts=True)
+    segments = np.empty(len(kept), dtype=SEGMENT_DTYPE)
+    segments["start"] = diar_starts[kept]
+    segments["end"] = diar_ends[kept]
+    segments["speaker"] = diar_codes[kept]
+    segments["first_word"] = np.cumsum(counts) - counts
+    segments["num_words"] = counts
+    
+    table = TranscriptTable(words[word_index], segments, vocabulary, [str(s) for s in speakers])
+    table.texts = [table.segment_text(i).strip() for i in range(len(segments))]
+    return table
+
+
 def merge_diarization_and_asr(
     diarization_file: str = "outputs/audio_features/diarization_segments.json",
     transcript_file: str = "outputs/audio_features/transcript_words.json",
     output_file: str = "outputs/audio_features/transcript_with_speakers.json"
-) -> Dict[str, Any]:
+) -> TranscriptTable:
     """
     Merge diarization and ASR results into speaker-labeled transcript.
     
@@ -67,7 +129,7 @@ def merge_diarization_and_asr(
         output_file (str): Path to save merged transcript
         
     Returns:
-        dict: Merged transcript data
+        TranscriptTable: Merged transcript (segments are streamed to output_file)
     """
     
     print("🔀 Starting diarization + ASR merge...")
@@ -80,9 +142,7 @@ def merge_diarization_and_asr(
     if not os.path.exists(diarization_file):
         raise FileNotFoundError(f"Diarization file not found: {diarization_file}")
     
-    with open(diarization_file, 'r', encoding='utf-8') as f:
-        diar_data = json.load(f)
-    
+    diar_data = load_json(diarization_file)
     diar_segments = diar_data["segments"]
     print(f"✅ Loaded {len(diar_segments)} diarization segments")
     
@@ -91,116 +151,39 @@ def merge_diarization_and_asr(
     if not os.path.exists(transcript_file):
         raise FileNotFoundError(f"Transcript file not found: {transcript_file}")
     
-    with open(transcript_file, 'r', encoding='utf-8') as f:
-        asr_data = json.load(f)
-    
-    asr_segments = asr_data["segments"]
-    print(f"✅ Loaded {len(asr_segments)} ASR segments")
-    
-    # Collect all words with timestamps
+    # ASR segments are read lazily: only the word table is kept
     print("🔄 Collecting all words with timestamps...")
-    all_words = []
-    
-    for asr_segment in asr_segments:
-        if "words" in asr_segment:
-            for word in asr_segment["words"]:
-                if word.get("word", "").strip():  # Skip empty words
-                    all_words.append({
-                        "start": float(word["start"]),
-                        "end": float(word["end"]),
-                        "word": word["word"].strip()
-                    })
+    asr_fields = {}
+    words, vocabulary = words_from_asr({"segments": iter_segments(transcript_file, asr_fields)})
     
-    print(f"✅ Collected {len(all_words)} words with timestamps")
+    print(f"✅ Collected {len(words)} words with timestamps")
     
     # Assign speakers to all words using robust overlap algorithm
     print("🎯 Assigning speakers to words using overlap algorithm...")
-    words_with_speakers = []
-    
-    for word in all_words:
-        speaker = assign_speaker_to_word(word, diar_segments)
-        if speaker:  # Only include words that have speaker assignments
-            words_with_speakers.append({
-                "start": word["start"],
-                "end": word["end"], 
-                "word": word["word"],
-                "speaker": speaker
-            })
-    
-    print(f"✅ Assigned speakers to {len(words_with_speakers)} words")
-    
-    # Group words by speaker segments according to diarization timing
-    print("📝 Building speaker-labeled segments...")
-    final_segments = []
-    
-    for diar_seg in diar_segments:
-        # Find all words that overlap with this diarization segment
-        segment_words = []
-        
-        for word in words_with_speakers:
-            if word["speaker"] == diar_seg["speaker"]:
-                # Check if word overlaps with diarization segment
-                overlap = max(0.0, min(word["end"], diar_seg["end"]) - max(word["start"], diar_seg["start"]))
-                if overlap > 0:
-                    segment_words.append(word)
-        
-        # Sort words by start time
-        segment_words.sort(key=lambda w: w["start"])
-        
-        if segment_words:  # Only create segments that have words
-            # Build text from words
-            text = " ".join([w["word"] for w in segment_words])
-            
-            # Create final segment structure as specified in task 4.1
-            final_segment = {
-                "speaker": diar_seg["speaker"],
-                "start": float(diar_seg["start"]),
-                "end": float(diar_seg["end"]),
-                "text": text.strip(),
-                "words": [
-                    {
-                        "start": w["start"],
-                        "end": w["end"],
-                        "word": w["word"]
-                    }
-                    for w in segment_words
-                ]
-            }
-            
-            final_segments.append(final_segment)
-    
-    # Get unique speakers for the output
-    unique_speakers = list(set(seg["speaker"] for seg in final_segments))
-    unique_speakers.sort()
-    
-    # Create final merged transcript in exact format specified
-    merged_transcript = {
-        "audio_file": asr_data.get("audio_file", "data/processed/podcast_16k_mono.wav"),
-        "sample_rate": asr_data.get("sample_rate", 16000),
-        "speakers": unique_speakers,
-        "segments": final_segments
+    table = build_speaker_segments(words, vocabulary, diar_segments)
+    table.metadata = {
+        "audio_file": asr_fields.get("audio_file", "data/processed/podcast_16k_mono.wav"),
+        "sample_rate": asr_fields.get("sample_rate", 16000)
     }
     
-    # Ensure output directory exists
-    output_dir = Path(output_file).parent
-    output_dir.mkdir(parents=True, exist_ok=True)
-    
-    # Save merged transcript
+    # Stream the merged transcript in the exact format specified, one segment at a time
     print(f"💾 Saving merged transcript to: {output_file}")
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(merged_transcript, f, indent=2, ensure_ascii=False)
+    header = table.to_json_header()
+    with JsonArrayWriter(output_file, header=header) as writer:
+        for index in range(len(table)):
+            writer.write(table.segment_dict(index))
     
     # Print required checks from task 4.1
     print("\n📊 Merge Results (as specified in task 4.1):")
-    print(f"   Number of final segments: {len(final_segments)}")
+    print(f"   Number of final segments: {len(table)}")
     
     # Count segments per speaker
     speaker_counts = {}
     speaker_durations = {}
     
-    for segment in final_segments:
-        speaker = segment["speaker"]
-        duration = segment["end"] - segment["start"]
+    for segment in table.segments:
+        speaker = table.speakers[segment["speaker"]]
+        duration = float(segment["end"] - segment["start"])
         
         speaker_counts[speaker] = speaker_counts.get(speaker, 0) + 1
         speaker_durations[speaker] = speaker_durations.get(speaker, 0.0) + duration
@@ -218,18 +201,19 @@ def merge_diarization_and_asr(
     
     # Show sample segments for manual inspection
     print(f"\n🔍 Sample segments for manual inspection:")
-    for i, segment in enumerate(final_segments[:5]):
+    for i in range(min(len(table), 5)):
+        segment = table.segment_dict(i)
         print(f"     Segment {i+1}: [{segment['start']:.2f}s - {segment['end']:.2f}s] {segment['speaker']}")
         text_preview = segment['text'][:80] + "..." if len(segment['text']) > 80 else segment['text']
         print(f"       Text: \"{text_preview}\"")
         print(f"       Words: {len(segment['words'])} words")
     
-    if len(final_segments) > 5:
+    if len(table) > 5:
         print("     ...")
     
     print(f"\n✅ Task 4.1 completed! Merged transcript saved to: {output_file}")
     
-    return merged_transcript
+    return table
 
 
 def main():
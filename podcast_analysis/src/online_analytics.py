@@ -0,0 +1,397 @@
+"""
+Online conversation analytics over a stream of segment (or word) events.
+
+OnlineConversationStats keeps running versions of basic_speaker_stats,
+detect_interruptions and turn_taking_stats:
+
+- per speaker: speaking time, words, segments and WPM
+- turns (same-speaker segments within merge_gap_sec), transition counts,
+  runs (count, turns, durations, longest) with a quantile sketch of run
+  durations
+- interruptions made/received and backchannels, via the same
+  InterruptionSweep as the batch analysis
+
+Every add_segment() is O(1) in the length of the conversation (it only
+touches the open turn/run and the few segments still active for interruption
+detection), and snapshot() can be called at any time, e.g. by a live
+dashboard fed from live_stream.py. The state serializes to JSON, so an
+episode recorded in parts can be extended without reprocessing earlier parts.
+
+Segments must arrive in start-time order; for finished transcripts the
+results match the batch functions (run quantiles within the sketch accuracy).
+
+Usage (from the src directory):
+    python online_analytics.py ../outputs/live/transcript_events.jsonl --state ../outputs/live/online_state.json
+"""
+
+import argparse
+import json
+import os
+import sys
+from typing import Any, Dict, List, Optional
+
+from analysis_speaking_features import (
+    MAX_BACKCHANNEL_DURATION_SEC,
+    MAX_GAP_SEC,
+    MERGE_GAP_SEC,
+    MIN_OVERLAP_SEC,
+    MIN_WORDS_INTERRUPTER,
+    InterruptionSweep,
+)
+from corpus_aggregator import QuantileSketch
+
+ONLINE_STATE_PATH = "outputs/live/online_state.json"
+
+
+def _empty_speaker() -> Dict[str, Any]:
+    """Running counters of one speaker."""
+    return {
+        "total_speaking_time_sec": 0.0,
+        "total_words": 0,
+        "num_segments": 0,
+        "num_runs": 0,
+        "total_run_turns": 0,
+        "total_run_duration_sec": 0.0,
+        "max_run_duration_sec": 0.0,
+        "max_run_turns": 0
+    }
+
+
+class OnlineConversationStats:
+    """Running speaker, turn-taking and interruption statistics."""
+
+    def __init__(
+        self,
+        merge_gap_sec: float = MERGE_GAP_SEC,
+        min_overlap_sec: float = MIN_OVERLAP_SEC,
+        max_gap_sec: float = MAX_GAP_SEC,
+        min_words_interrupter: int = MIN_WORDS_INTERRUPTER,
+        max_backchannel_duration_sec: float = MAX_BACKCHANNEL_DURATION_SEC
+    ):
+        """
+        Args:
+            merge_gap_sec: Maximum gap between same-speaker segments merged into one turn
+            min_overlap_sec: Minimum overlap duration to consider interruption
+            max_gap_sec: Maximum gap for "instant takeover" interruptions
+            min_words_interrupter: Minimum words needed to be real interruption
+            max_backchannel_duration_sec: Max duration for backchannel classification
+        """
+        self.merge_gap_sec = merge_gap_sec
+        self.speakers: Dict[str, Dict[str, Any]] = {}
+        self.transitions: Dict[str, Dict[str, int]] = {}
+        self.run_sketches: Dict[str, QuantileSketch] = {}
+        self.num_turns = 0
+        self.time_sec = 0.0
+        self.interruption_sweep = InterruptionSweep(
+            min_overlap_sec, max_gap_sec, min_words_interrupter, max_backchannel_duration_sec
+        )
+        self.total_interruptions = 0
+        self.total_backchannels = 0
+
+        # Open turn and run: (speaker, start, end[, turns]); closed when the floor changes
+        self._turn: Optional[Dict[str, Any]] = None
+        self._run: Optional[Dict[str, Any]] = None
+        # Words not yet grouped into a segment (add_word)
+        self._pending_words: List[Dict[str, Any]] = []
+        self._pending_speaker: Optional[str] = None
+
+    def add_segment(self, segment: Dict[str, Any]) -> Dict[str, List[Dict]]:
+        """
+        Add one speaker-labeled segment.
+
+        Args:
+            segment: Segment with speaker, start, end and optionally text and words
+
+        Returns:
+            dict: "interruptions" and "backchannels" detected with this segment
+        """
+        if 'text' not in segment:
+            segment = {**segment, "text": " ".join(w['word'] for w in segment.get('words', []))}
+        speaker = segment['speaker']
+        start, end = float(segment['start']), float(segment['end'])
+
+        stats = self.speakers.setdefault(speaker, _empty_speaker())
+        self.run_sketches.setdefault(speaker, QuantileSketch())
+        stats['total_speaking_time_sec'] += end - start
+        stats['total_words'] += len(segment.get('words', []))
+        stats['num_segments'] += 1
+        self.time_sec = max(self.time_sec, end)
+
+        # Turns: extend the open turn or start a new one (with a transition)
+        turn = self._turn
+        if turn is not None and turn['speaker'] == speaker and start - turn['end'] <= self.merge_gap_sec:
+            turn['end'] = end
+        else:
+            if turn is not None:
+                row = self.transitions.setdefault(turn['speaker'], {})
+                row[speaker] = row.get(speaker, 0) + 1
+                self._extend_run(turn)
+            self._turn = {"speaker": speaker, "start": start, "end": end}
+            self.num_turns += 1
+
+        interruptions, backchannels = self.interruption_sweep.add(segment)
+        self.total_interruptions += len(interruptions)
+        self.total_backchannels += len(backchannels)
+        return {"interruptions": interruptions, "backchannels": backchannels}
+
+    def add_word(self, speaker: str, start: float, end: float, word: str) -> Dict[str, List[Dict]]:
+        """
+        Add one speaker-labeled word.
+
+        Words are grouped into segments: a segment closes when the speaker
+        changes or the pause exceeds merge_gap_sec, and is then added with
+        add_segment(). Call flush() at the end of the stream.
+
+        Args:
+            speaker: Speaker label
+            start: Word start time
+            end: Word end time
+            word: Word text
+
+        Returns:
+            dict: Interruptions/backchannels of the segment closed by this word (if any)
+        """
+        found = {"interruptions": [], "backchannels": []}
+        if self._pending_words and (speaker != self._pending_speaker
+                                    or start - self._pending_words[-1]['end'] > self.merge_gap_sec):
+            found = self.flush()
+        self._pending_speaker = speaker
+        self._pending_words.append({"start": float(start), "end": float(end), "word": word})
+        return found
+
+    def flush(self) -> Dict[str, List[Dict]]:
+        """Close the segment being built from words (no-op without pending words)."""
+        if not self._pending_words:
+            return {"interruptions": [], "backchannels": []}
+        words, self._pending_words = self._pending_words, []
+        return self.add_segment({
+            "speaker": self._pending_speaker,
+            "start": words[0]['start'],
+            "end": words[-1]['end'],
+            "text": " ".join(w['word'] for w in words),
+            "words": words
+        })
+
+    def _extend_run(self, turn: Dict[str, Any]) -> None:
+        """Add a closed turn to the open run, closing the run if the speaker changed."""
+        run = self._run
+        if run is not None and run['speaker'] == turn['speaker']:
+            run['end'] = turn['end']
+            run['turns'] += 1
+            return
+        if run is not None:
+            self._close_run(run, self.speakers[run['speaker']], self.run_sketches[run['speaker']])
+        self._run = {"speaker": turn['speaker'], "start": turn['start'], "end": turn['end'], "turns": 1}
+
+    @staticmethod
+    def _close_run(run: Dict[str, Any], stats: Dict[str, Any], sketch: QuantileSketch) -> None:
+        """Record a finished run in a speaker's counters and sketch."""
+        duration = run['end'] - run['start']
+        stats['num_runs'] += 1
+        stats['total_run_turns'] += run['turns']
+        stats['total_run_duration_sec'] += duration
+        stats['max_run_duration_sec'] = max(stats['max_run_duration_sec'], duration)
+        stats['max_run_turns'] = max(stats['max_run_turns'], run['turns'])
+        sketch.add([duration])
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Current statistics, as if the stream ended now.
+
+        The open turn and run are included provisionally; the running state
+        is not modified.
+
+        Returns:
+            dict: time_sec, speakers (basic stats), turn_taking and interruptions
+        """
+        speakers = sorted(self.speakers)
+        stats = {s: dict(self.speakers[s]) for s in speakers}
+        sketches = {s: QuantileSketch.from_dict(self.run_sketches[s].to_dict()) for s in speakers}
+
+        # Provisional close of the open turn and run
+        run = dict(self._run) if self._run is not None else None
+        if self._turn is not None:
+            turn = self._turn
+            if run is not None and run['speaker'] == turn['speaker']:
+                run['end'] = turn['end']
+                run['turns'] += 1
+            else:
+                if run is not None:
+                    self._close_run(run, stats[run['speaker']], sketches[run['speaker']])
+                run = {"speaker": turn['speaker'], "start": turn['start'], "end": turn['end'], "turns": 1}
+        if run is not None:
+            self._close_run(run, stats[run['speaker']], sketches[run['speaker']])
+
+        basic = {}
+        runs = {}
+        for speaker in speakers:
+            s = stats[speaker]
+            minutes = s['total_speaking_time_sec'] / 60.0
+            basic[speaker] = {
+                "total_speaking_time_sec": s['total_speaking_time_sec'],
+                "total_words": s['total_words'],
+                "num_segments": s['num_segments'],
+                "total_speaking_time_min": minutes,
+                "words_per_minute": s['total_words'] / minutes if minutes > 0 else 0.0
+            }
+            num_runs = s['num_runs']
+            runs[speaker] = {
+                "num_runs": num_runs,
+                "avg_run_segments": s['total_run_turns'] / num_runs if num_runs else 0.0,
+                "avg_run_duration_sec": s['total_run_duration_sec'] / num_runs if num_runs else 0.0,
+                "max_run_duration_sec": s['max_run_duration_sec'],
+                "max_run_segments": s['max_run_turns'],
+                "total_speaking_time_sec": s['total_run_duration_sec'],
+                "run_duration_quantiles": {
+                    "p10": sketches[speaker].quantile(0.1),
+                    "median": sketches[speaker].quantile(0.5),
+                    "p90": sketches[speaker].quantile(0.9)
+                }
+            }
+
+        transitions = {
+            f"{a}->{b}": self.transitions.get(a, {}).get(b, 0)
+            for a in speakers for b in speakers
+        }
+        total_transitions = sum(transitions.values())
+        alternations = total_transitions - sum(self.transitions.get(s, {}).get(s, 0) for s in speakers)
+
+        return {
+            "time_sec": self.time_sec,
+            "speakers": basic,
+            "turn_taking": {
+                "num_turns": self.num_turns,
+                "transitions": transitions,
+                "total_transitions": total_transitions,
+                "alternation_rate": alternations / total_transitions if total_transitions else 0.0,
+                "runs": runs
+            },
+            "interruptions": {
+                "total_interruptions": self.total_interruptions,
+                "total_backchannels": self.total_backchannels,
+                "per_speaker": {s: dict(v) for s, v in self.interruption_sweep.per_speaker_stats.items()}
+            }
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializable running state, pending words included (the state is not modified)."""
+        sweep = self.interruption_sweep
+        return {
+            "merge_gap_sec": self.merge_gap_sec,
+            "speakers": self.speakers,
+            "transitions": self.transitions,
+            "run_sketches": {s: sketch.to_dict() for s, sketch in self.run_sketches.items()},
+            "num_turns": self.num_turns,
+            "time_sec": self.time_sec,
+            "total_interruptions": self.total_interruptions,
+            "total_backchannels": self.total_backchannels,
+            "turn": self._turn,
+            "run": self._run,
+            "pending_words": self._pending_words,
+            "pending_speaker": self._pending_speaker,
+            "interruption_sweep": {
+                "parameters": [sweep.min_overlap_sec, sweep.max_gap_sec,
+                               sweep.min_words_interrupter, sweep.max_backchannel_duration_sec],
+                "per_speaker_stats": sweep.per_speaker_stats,
+                "num_segments": sweep.num_segments,
+                "active": [[end, index] for end, index in sweep._active],
+                "segments": {str(index): segment for index, segment in sweep._segments.items()},
+                "backchannel_segments": sorted(sweep._backchannel_segments)
+            }
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "OnlineConversationStats":
+        """Restore a running state saved with to_dict()."""
+        sweep_data = data['interruption_sweep']
+        stats = cls(data['merge_gap_sec'], *sweep_data['parameters'])
+        stats.speakers = data['speakers']
+        stats.transitions = data['transitions']
+        stats.run_sketches = {s: QuantileSketch.from_dict(d) for s, d in data['run_sketches'].items()}
+        stats.num_turns = data['num_turns']
+        stats.time_sec = data['time_sec']
+        stats.total_interruptions = data['total_interruptions']
+        stats.total_backchannels = data['total_backchannels']
+        stats._turn = data['turn']
+        stats._run = data['run']
+        stats._pending_words = data.get('pending_words', [])
+        stats._pending_speaker = data.get('pending_speaker')
+
+        sweep = stats.interruption_sweep
+        sweep.per_speaker_stats = sweep_data['per_speaker_stats']
+        sweep.num_segments = sweep_data['num_segments']
+        sweep._active = [(end, index) for end, index in sweep_data['active']]
+        sweep._segments = {int(index): segment for index, segment in sweep_data['segments'].items()}
+        sweep._backchannel_segments = set(sweep_data['backchannel_segments'])
+        return stats
+
+
+def load_state(path: str) -> OnlineConversationStats:
+    """Load a saved running state, or start a new one if the file does not exist."""
+    if not os.path.exists(path):
+        return OnlineConversationStats()
+    with open(path, 'r', encoding='utf-8') as f:
+        return OnlineConversationStats.from_dict(json.load(f))
+
+
+def save_state(stats: OnlineConversationStats, path: str) -> None:
+    """Save the running state as JSON."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(stats.to_dict(), f, ensure_ascii=False)
+
+
+def _print_snapshot(snapshot: Dict[str, Any]) -> None:
+    """Print a compact dashboard of a snapshot."""
+    print("\n" + "=" * 70)
+    print(f"LIVE CONVERSATION STATS @ {snapshot['time_sec'] / 60:.1f} min")
+    print("=" * 70)
+    interruptions = snapshot['interruptions']['per_speaker']
+    print(f"{'Speaker':<15} {'Time(min)':<10} {'Words':<8} {'WPM':<6} {'Runs':<6} {'Made':<6} {'Recv':<6} {'BC':<4}")
+    print("-" * 70)
+    for speaker, stats in snapshot['speakers'].items():
+        runs = snapshot['turn_taking']['runs'][speaker]
+        counts = interruptions.get(speaker, {})
+        print(f"{speaker:<15} {stats['total_speaking_time_min']:<10.1f} {stats['total_words']:<8} "
+              f"{stats['words_per_minute']:<6.0f} {runs['num_runs']:<6} "
+              f"{counts.get('interruptions_made', 0):<6} {counts.get('interruptions_received', 0):<6} "
+              f"{counts.get('backchannels_made', 0):<4}")
+    print(f"\nAlternation rate: {snapshot['turn_taking']['alternation_rate']:.2%} "
+          f"over {snapshot['turn_taking']['total_transitions']} transitions")
+    print("=" * 70)
+
+
+def main(argv: Optional[List[str]] = None):
+    """Main function: feed segment events (JSON lines or a transcript) into a running state."""
+    parser = argparse.ArgumentParser(description='Online conversation analytics over segment events')
+    parser.add_argument('events', help='JSON-lines segment events (live_stream.py) or a transcript_with_speakers.json')
+    parser.add_argument('--state', help='Running state to resume from and save to (for episodes recorded in parts)')
+    parser.add_argument('--output', help='Save the final snapshot to this JSON file')
+    args = parser.parse_args(argv)
+
+    stats = load_state(args.state) if args.state else OnlineConversationStats()
+
+    with open(args.events, 'r', encoding='utf-8') as f:
+        if args.events.endswith('.jsonl'):
+            segments = (json.loads(line) for line in f if line.strip())
+        else:
+            segments = iter(sorted(json.load(f)['segments'], key=lambda s: s['start']))
+        for segment in segments:
+            stats.add_segment(segment)
+
+    snapshot = stats.snapshot()
+    _print_snapshot(snapshot)
+
+    if args.state:
+        save_state(stats, args.state)
+        print(f"💾 Saved running state to: {args.state}")
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f, indent=2, ensure_ascii=False)
+        print(f"💾 Saved snapshot to: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
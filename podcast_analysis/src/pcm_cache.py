@@ -0,0 +1,239 @@
+"""
+Decoded PCM cache shared by the audio stages.
+
+Every audio stage used to decode the same recording again: librosa.load in
+transcribe_podcast, slice_audio_segments and verify_speaker_files, block
+reads in the VAD and the channel diarizer, and pyannote reading the file
+itself. The decoded mono signal is now stored once as a float32 .npy file
+and opened as a read-only memmap, so every later stage reads samples straight
+from the page cache, without decoding and without a copy.
+
+Entries are keyed by the SHA-256 of the source file and the sample rate
+(<cache dir>/<hash>_<rate>.npy). The hash of each path is remembered in
+index.json with the file's size and modification time, so a lookup costs one
+stat; a rewritten file gets a new key and its old entry is deleted, and
+paths that no longer exist are pruned (with their entries) whenever the
+index is rewritten.
+
+The cache lives under the project root (config.PCM_CACHE_DIR, git-ignored).
+Every function takes a cache_dir; None bypasses the cache and decodes the
+file directly, e.g. for one-off inputs or benchmarks that must time decoding.
+
+Preprocessing (audio_preprocess.py, speaker_separation_librosa.py) fills the
+cache for the WAV files it writes; any other source is decoded on first use.
+Values are exactly what soundfile/librosa return for the file (multichannel
+sources are averaged to mono), so results do not change with the cache.
+
+Usage:
+    audio, sr = load_pcm("data/processed/podcast_16k_mono.wav")
+    for block in pcm_blocks(path, blocksize=65536, overlap=400):
+        ...
+"""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+import numpy as np
+import soundfile as sf
+
+from config import PCM_CACHE_DIR, SAMPLE_RATE
+
+PCM_DTYPE = np.float32
+HASH_CHUNK_BYTES = 1 << 20
+DECODE_BLOCK_FRAMES = 1 << 20  # frames streamed per block when filling an entry from a PCM file
+INDEX_FILE = "index.json"
+
+
+def _load_index(cache_dir: str) -> Dict[str, Any]:
+    """Path -> {size, mtime_ns, sha256} index (empty if missing or unreadable)."""
+    try:
+        with open(Path(cache_dir) / INDEX_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_index(cache_dir: str, index: Dict[str, Any]) -> None:
+    """Write the index atomically (a lost concurrent update only costs a rehash)."""
+    path = Path(cache_dir) / INDEX_FILE
+    tmp = path.with_name(f"{INDEX_FILE}.{os.getpid()}.partial")
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=2)
+    os.replace(tmp, path)
+
+
+def source_hash(source: str, cache_dir: str = PCM_CACHE_DIR) -> str:
+    """
+    SHA-256 of a source file, hashed only when it is new or has changed.
+
+    Args:
+        source: Audio file path
+        cache_dir: Cache directory holding the index
+
+    Returns:
+        str: Hex digest of the file contents
+    """
+    Path(cache_dir).mkdir(parents=True, exist_ok=True)
+    stat = os.stat(source)
+    key = os.path.abspath(source)
+    index = _load_index(cache_dir)
+    entry = index.get(key)
+    if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+        return entry["sha256"]
+
+    digest = hashlib.sha256()
+    with open(source, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_BYTES), b''):
+            digest.update(chunk)
+    sha = digest.hexdigest()
+
+    index[key] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": sha}
+    # Forget deleted sources and drop the old contents of a rewritten file,
+    # unless another indexed path still has them
+    dropped = [index.pop(path)["sha256"] for path in [p for p in index if not os.path.exists(p)]]
+    if entry and entry["sha256"] != sha:
+        dropped.append(entry["sha256"])
+    live = {e["sha256"] for e in index.values()}
+    for old in set(dropped) - live:
+        for stale in Path(cache_dir).glob(f"{old}_*.npy"):
+            stale.unlink(missing_ok=True)
+    _save_index(cache_dir, index)
+    return sha
+
+
+def _native_rate(source: str) -> Optional[int]:
+    """Sample rate from the file header, None when soundfile cannot read the format."""
+    try:
+        return sf.info(source).samplerate
+    except RuntimeError:
+        return None
+
+
+def _fill_from_blocks(source: str, path: Path) -> None:
+    """Stream a soundfile-readable source into a new entry, one block at a time."""
+    frames = sf.info(source).frames
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.partial")
+    if frames == 0:
+        np.save(tmp, np.zeros(0, dtype=PCM_DTYPE))
+        os.replace(f"{tmp}.npy", path)
+        return
+    out = np.lib.format.open_memmap(tmp, mode='w+', dtype=PCM_DTYPE, shape=(frames,))
+    pos = 0
+    try:
+        for block in sf.blocks(source, blocksize=DECODE_BLOCK_FRAMES, dtype='float32', always_2d=False):
+            if block.ndim > 1:
+                block = block.mean(axis=1)
+            out[pos:pos + len(block)] = block
+            pos += len(block)
+        if pos != frames:
+            raise RuntimeError(f"Decoded {pos} frames from {source}, header says {frames}")
+        out.flush()
+        del out
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def _fill_from_librosa(source: str, path: Path, sample_rate: int) -> None:
+    """Decode (and resample) a source with librosa into a new entry."""
+    import librosa
+    audio, _ = librosa.load(source, sr=sample_rate, mono=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.partial.npy")
+    np.save(tmp, audio.astype(PCM_DTYPE, copy=False))
+    os.replace(tmp, path)
+
+
+def _decode(source: str, sample_rate: int, native: Optional[int]) -> np.ndarray:
+    """Decode a source to mono float32 without the cache (same values as a cache fill)."""
+    if native == sample_rate:
+        audio = sf.read(source, dtype='float32', always_2d=True)[0]
+        return audio.mean(axis=1, dtype=PCM_DTYPE) if audio.shape[1] > 1 else audio[:, 0]
+    import librosa
+    audio, _ = librosa.load(source, sr=sample_rate, mono=True)
+    return audio.astype(PCM_DTYPE, copy=False)
+
+
+def load_pcm(
+    source: str,
+    sample_rate: Optional[int] = SAMPLE_RATE,
+    cache_dir: Optional[str] = PCM_CACHE_DIR
+) -> Tuple[np.ndarray, int]:
+    """
+    Mono float32 samples of an audio file, decoded at most once.
+
+    Files already at the requested rate are streamed block by block into the
+    cache; others are decoded and resampled with librosa, as the stages did
+    before.
+
+    Args:
+        source: Audio file path
+        sample_rate: Target sample rate, None for the file's native rate
+        cache_dir: Cache directory, None to decode without caching
+
+    Returns:
+        tuple: (read-only 1-D float32 memmap, or a plain array without the cache, sample rate)
+    """
+    native = _native_rate(source)
+    if sample_rate is None:
+        if native is None:
+            raise ValueError(f"Cannot read the sample rate of {source}; pass sample_rate explicitly")
+        sample_rate = native
+    if cache_dir is None:
+        return _decode(source, sample_rate, native), sample_rate
+
+    path = Path(cache_dir) / f"{source_hash(source, cache_dir)}_{sample_rate}.npy"
+    if not path.exists():
+        start_time = time.perf_counter()
+        if native == sample_rate:
+            _fill_from_blocks(source, path)
+        else:
+            _fill_from_librosa(source, path, sample_rate)
+        print(f"🗄️  Cached decoded audio of {source} at {sample_rate} Hz "
+              f"({time.perf_counter() - start_time:.1f}s): {path}")
+
+    try:
+        return np.load(path, mmap_mode='r'), sample_rate
+    except ValueError:  # empty arrays cannot be memory-mapped
+        return np.load(path), sample_rate
+
+
+def pcm_blocks(
+    source: str,
+    blocksize: int,
+    overlap: int = 0,
+    cache_dir: Optional[str] = PCM_CACHE_DIR
+) -> Iterator[np.ndarray]:
+    """
+    Cached replacement for sf.blocks(source, blocksize, overlap, dtype='float32').
+
+    Yields the same blocks of the mono signal at the file's native rate, as
+    read-only views of the cached memmap instead of freshly decoded copies.
+
+    Args:
+        source: Audio file path
+        blocksize: Frames per block, overlap included
+        overlap: Frames shared with the previous block
+        cache_dir: Cache directory, None to stream blocks straight from the file
+
+    Yields:
+        np.ndarray: Consecutive blocks; the last one may be shorter
+    """
+    if cache_dir is None:
+        for block in sf.blocks(source, blocksize=blocksize, overlap=overlap, dtype='float32', always_2d=True):
+            yield block.mean(axis=1, dtype=PCM_DTYPE) if block.shape[1] > 1 else block[:, 0]
+        return
+    audio, _ = load_pcm(source, None, cache_dir)
+    n = len(audio)
+    if n == 0:
+        return
+    end = min(blocksize, n)
+    yield audio[:end]
+    while end < n:
+        start = end - overlap
+        end = min(end + blocksize - overlap, n)
+        yield audio[start:end]
@@ -0,0 +1,157 @@
+"""
+Plot cache keyed by input data fingerprints.
+
+Plot builders declare their inputs, output PNGs and style parameters with
+@declare_plot. The renderer fingerprints each figure (SHA-256 of the input
+files' contents keyed by their path relative to the project root, the style
+parameters, the module DPI and the source of the builder's module and of the
+project modules it imports, such as loaders and the speaker-dominance
+helpers) and compares it with a manifest stored next to the PNGs, so
+figures whose inputs and code have not changed are not redrawn.
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, NamedTuple, Optional, Tuple
+
+MANIFEST_NAME = ".plot_manifest.json"
+
+
+class PlotSpec(NamedTuple):
+    """Declared inputs/outputs of one plot builder."""
+    name: str
+    builder: Callable
+    inputs: Tuple[str, ...]
+    outputs: Tuple[str, ...]
+    style: Dict[str, Any]
+
+
+def declare_plot(name: str, inputs: Iterable[str], outputs: Iterable[str], style: Optional[Dict[str, Any]] = None):
+    """
+    Decorator declaring a plot builder's inputs, output files and style parameters.
+
+    Args:
+        name: Figure name used by the renderer (e.g. for --only)
+        inputs: Dataset names the builder reads (see the module's PLOT_INPUT_FILES)
+        outputs: PNG file names the builder writes into the plots directory
+        style: Style parameters that affect the rendered image (passed as kwargs)
+    """
+    def decorator(builder):
+        builder.plot_spec = PlotSpec(name, builder, tuple(inputs), tuple(outputs), dict(style or {}))
+        return builder
+    return decorator
+
+
+def hash_file(path: Path, chunk_size: int = 1 << 20) -> str:
+    """Return the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def code_modules(module) -> Dict[str, Path]:
+    """
+    Source files a builder's output depends on: its module and the project modules it uses.
+
+    Project modules are those in the same directory as the builder's module,
+    imported (directly or through other project modules) either as modules or
+    through functions and classes taken from them.
+
+    Args:
+        module: The builder's module
+
+    Returns:
+        dict: Module name -> source file
+    """
+    src_dir = Path(module.__file__).resolve().parent
+    found = {module.__name__: Path(module.__file__)}
+    pending = [module]
+    while pending:
+        for value in list(vars(pending.pop()).values()):
+            if inspect.ismodule(value):
+                dependency = value
+            elif inspect.isfunction(value) or inspect.isclass(value):
+                dependency = sys.modules.get(value.__module__)
+            else:
+                continue
+            path = getattr(dependency, "__file__", None)
+            if path and dependency.__name__ not in found and Path(path).resolve().parent == src_dir:
+                found[dependency.__name__] = Path(path)
+                pending.append(dependency)
+    return found
+
+
+def plot_fingerprint(
+    spec: PlotSpec,
+    input_files: Iterable[Path],
+    file_hashes: Optional[Dict[str, str]] = None,
+    root: Optional[Path] = None
+) -> str:
+    """
+    Fingerprint a figure from its input files, style and code.
+
+    Args:
+        spec: The builder's PlotSpec
+        input_files: Resolved input file paths
+        file_hashes: Optional memo of path -> content hash shared across figures
+        root: Project root the input paths are keyed relative to (default: as given)
+
+    Returns:
+        str: Hex digest identifying this exact rendering
+    """
+    if file_hashes is None:
+        file_hashes = {}
+
+    hashes = {}
+    for path in sorted(str(p) for p in input_files):
+        if path not in file_hashes:
+            file_hashes[path] = hash_file(Path(path)) if Path(path).exists() else "missing"
+        key = Path(os.path.relpath(path, root)).as_posix() if root is not None else Path(path).as_posix()
+        hashes[key] = file_hashes[path]
+
+    module = sys.modules.get(spec.builder.__module__)
+    code = {}
+    for name, path in code_modules(module).items():
+        if str(path) not in file_hashes:
+            file_hashes[str(path)] = hash_file(path)
+        code[name] = file_hashes[str(path)]
+    payload = {
+        "inputs": hashes,
+        "style": spec.style,
+        "dpi": getattr(module, "PLOT_DPI", None),
+        "code": code,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+def load_manifest(plots_dir: Path) -> Dict[str, Any]:
+    """Load the plot manifest from the plots directory (empty if missing or corrupt)."""
+    path = Path(plots_dir) / MANIFEST_NAME
+    if not path.exists():
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def save_manifest(plots_dir: Path, manifest: Dict[str, Any]) -> None:
+    """Write the plot manifest next to the PNGs."""
+    path = Path(plots_dir) / MANIFEST_NAME
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+
+def is_up_to_date(manifest: Dict[str, Any], spec: PlotSpec, fingerprint: str, plots_dir: Path) -> bool:
+    """True if the manifest fingerprint matches and every output PNG exists."""
+    entry = manifest.get(spec.name)
+    if not entry or entry.get("fingerprint") != fingerprint:
+        return False
+    return all((Path(plots_dir) / output).exists() for output in spec.outputs)
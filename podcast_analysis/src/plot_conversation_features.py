@@ -5,15 +5,23 @@ Creates visualizations of speaker statistics, turn-taking patterns, interruption
 
 import json
 from pathlib import Path
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 
+from plot_cache import declare_plot
+from speaker_occupancy import speaker_dominance
+
 # Define constants for project structure
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 PLOTS_DIR = PROJECT_ROOT / "outputs" / "plots"
+PLOT_DPI = 300
+
 
-# Ensure plots directory exists at module import time
-PLOTS_DIR.mkdir(parents=True, exist_ok=True)
+def _save_figure(output_path):
+    """Save the current figure, creating the plots directory on first use."""
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    plt.savefig(output_path, dpi=PLOT_DPI, bbox_inches='tight')
 
 
 # Helper functions for loading data files
@@ -84,6 +92,7 @@ def load_turn_taking_stats(path=None):
     Returns:
         tuple: (transitions_df, runs_df)
             - transitions_df: DataFrame with columns ["from_to", "count"]
+              (alternation rate in transitions_df.attrs["alternation_rate"])
             - runs_df: DataFrame with columns ["speaker", "num_runs", "avg_run_segments",
                       "avg_run_duration_sec", "max_run_duration_sec", "max_run_segments", 
                       "total_speaking_time_sec"]
@@ -99,6 +108,7 @@ def load_turn_taking_stats(path=None):
     for from_to, count in data['transitions'].items():
         transitions_records.append({'from_to': from_to, 'count': count})
     transitions_df = pd.DataFrame(transitions_records)
+    transitions_df.attrs['alternation_rate'] = data.get('alternation_rate', 0)
     
     # Create runs DataFrame
     runs_records = []
@@ -177,6 +187,33 @@ def load_diarization_segments(path=None):
     return df
 
 
+def load_rolling_metrics(path=None):
+    """
+    Load the rolling-window conversation metrics table from JSON file.
+    
+    Args:
+        path: Optional path to JSON file. Defaults to PROJECT_ROOT / "outputs/audio_features/rolling_metrics.json"
+    
+    Returns:
+        pd.DataFrame: One row per window with columns ["window_start", "window_end",
+                     "words_per_minute", "transitions", "alternation_rate",
+                     "interruptions_per_minute"] plus per-speaker "<metric>:<speaker>" columns
+                     (speaker list in df.attrs["speakers"])
+    """
+    if path is None:
+        path = PROJECT_ROOT / "outputs" / "audio_features" / "rolling_metrics.json"
+    
+    with open(path, 'r') as f:
+        data = json.load(f)
+    
+    # The table is stored column-wise
+    df = pd.DataFrame(data['table'])
+    df.attrs['speakers'] = data['speakers']
+    df.attrs['window_size_sec'] = data['window_size_sec']
+    
+    return df
+
+
 def load_transcript_with_speakers(path=None):
     """
     Load transcript with speakers from JSON file (optional for future use).
@@ -200,14 +237,81 @@ def load_transcript_with_speakers(path=None):
     return df
 
 
+# Loaders for every plot input, keyed by dataset name
+PLOT_INPUT_LOADERS = {
+    'basic_speaker_stats': load_basic_speaker_stats,
+    'speaking_rate_timeseries': load_speaking_rate_timeseries,
+    'turn_taking_stats': load_turn_taking_stats,
+    'interruptions': load_interruptions,
+    'diarization_segments': load_diarization_segments,
+    'rolling_metrics': load_rolling_metrics,
+}
+
+
+# Input file of every dataset, relative to PROJECT_ROOT (used for cache fingerprints)
+PLOT_INPUT_FILES = {
+    'basic_speaker_stats': "outputs/audio_features/basic_speaker_stats.json",
+    'speaking_rate_timeseries': "outputs/audio_features/speaking_rate_timeseries.json",
+    'turn_taking_stats': "outputs/audio_features/turn_taking_stats.json",
+    'interruptions': "outputs/audio_features/interruptions.json",
+    'diarization_segments': "outputs/audio_features/diarization_segments.json",
+    'rolling_metrics': "outputs/audio_features/rolling_metrics.json",
+}
+
+
+def plot_input_paths(name):
+    """
+    Resolve the input file(s) of a plot dataset.
+    
+    Args:
+        name: Dataset name (key of PLOT_INPUT_FILES)
+    
+    Returns:
+        list: Paths of the files the dataset is loaded from
+    """
+    return [PROJECT_ROOT / PLOT_INPUT_FILES[name]]
+
+
+def load_plot_dataset(names=None):
+    """
+    Load plot inputs once so several plot builders can share them.
+    
+    Args:
+        names: Optional iterable of dataset names (keys of PLOT_INPUT_LOADERS). Defaults to all.
+    
+    Returns:
+        dict: Dataset name -> loaded value (DataFrame or tuple of DataFrames)
+    """
+    if names is None:
+        names = PLOT_INPUT_LOADERS.keys()
+    return {name: PLOT_INPUT_LOADERS[name]() for name in names}
+
+
+def get_plot_input(data, name):
+    """
+    Return a preloaded plot input, loading it from disk if it was not provided.
+    
+    Args:
+        data: Optional dict from load_plot_dataset()
+        name: Dataset name (key of PLOT_INPUT_LOADERS)
+    """
+    if data is not None and name in data:
+        return data[name]
+    return PLOT_INPUT_LOADERS[name]()
+
+
 # TASK 2: CORE OVERVIEW PLOTS (GLOBAL CONVERSATION SHAPE)
 
-def make_plot_total_speaking_time():
+@declare_plot("total_speaking_time", inputs=["basic_speaker_stats"], outputs=["01_total_speaking_time_by_speaker.png"])
+def make_plot_total_speaking_time(data=None):
     """
     Create bar chart showing total speaking time in minutes per speaker.
     Saves as outputs/plots/01_total_speaking_time_by_speaker.png
+    
+    Args:
+        data: Optional preloaded dataset from load_plot_dataset()
     """
-    df = load_basic_speaker_stats()
+    df = get_plot_input(data, 'basic_speaker_stats')
     
     plt.figure(figsize=(10, 6))
     bars = plt.bar(df['speaker'], df['total_speaking_time_min'])
@@ -225,17 +329,21 @@ def make_plot_total_speaking_time():
     plt.tight_layout()
     
     output_path = PLOTS_DIR / "01_total_speaking_time_by_speaker.png"
-    plt.savefig(output_path, dpi=300, bbox_inches='tight')
+    _save_figure(output_path)
     plt.close()
     print(f"Saved: {output_path}")
 
 
-def make_plot_total_words():
+@declare_plot("total_words", inputs=["basic_speaker_stats"], outputs=["02_total_words_by_speaker.png"])
+def make_plot_total_words(data=None):
     """
     Create bar chart showing total words per speaker.
     Saves as outputs/plots/02_total_words_by_speaker.png
+    
+    Args:
+        data: Optional preloaded dataset from load_plot_dataset()
     """
-    df = load_basic_speaker_stats()
+    df = get_plot_input(data, 'basic_speaker_stats')
     
     plt.figure(figsize=(10, 6))
     bars = plt.bar(df['speaker'], df['total_words'])
@@ -253,17 +361,21 @@ def make_plot_total_words():
     plt.tight_layout()
     
     output_path = PLOTS_DIR / "02_total_words_by_speaker.png"
-    plt.savefig(output_path, dpi=300, bbox_inches='tight')
+    _save_figure(output_path)
     plt.close()
     print(f"Saved: {output_path}")
 
 
-def make_plot_speaking_rate_timeseries():
+@declare_plot("speaking_rate_timeseries", inputs=["speaking_rate_timeseries"], outputs=["03_speaking_rate_timeseries.png"])
+def make_plot_speaking_rate_timeseries(data=None):
     """
     Create line plot showing speaking rate (words per minute) over time for each speaker.
     Saves as outputs/plots/03_speaking_rate_timeseries.png
+    
+    Args:
+        data: Optional preloaded dataset from load_plot_dataset()
     """
-    df = load_speaking_rate_timeseries()
+    df = get_plot_input(data, 'speaking_rate_timeseries').copy()
     
     # Compute window mid-point and convert to minutes
     df['window_mid'] = (df['window_start'] + df['window_end']) / 2.0
@@ -294,19 +406,23 @@ def make_plot_speaking_rate_timeseries():
     plt.tight_layout()
     
     output_path = PLOTS_DIR / "03_speaking_rate_timeseries.png"
-    plt.savefig(output_path, dpi=300, bbox_inches='tight')
+    _save_figure(output_path)
     plt.close()
     print(f"Saved: {output_path}")
 
 
 # TASK 3: INTERRUPTIONS AND OVERLAPS PLOTS
 
-def make_plot_interruptions_summary():
+@declare_plot("interruptions_summary", inputs=["interruptions"], outputs=["04_interruptions_summary_by_speaker.png"])
+def make_plot_interruptions_summary(data=None):
     """
     Create grouped bar chart showing interruptions and backchannels per speaker.
     Saves as outputs/plots/04_interruptions_summary_by_speaker.png
+    
+    Args:
+        data: Optional preloaded dataset from load_plot_dataset()
     """
-    interruptions_df, per_speaker_df = load_interruptions()
+    interruptions_df, per_speaker_df = get_plot_input(data, 'interruptions')
     
     plt.figure(figsize=(12, 8))
     
@@ -343,17 +459,21 @@ def make_plot_interruptions_summary():
     plt.tight_layout()
     
     output_path = PLOTS_DIR / "04_interruptions_summary_by_speaker.png"
-    plt.savefig(output_path, dpi=300, bbox_inches='tight')
+    _save_figure(output_path)
     plt.close()
     print(f"Saved: {output_path}")
 
 
-def make_plot_interruptions_timeline():
+@declare_plot("interruptions_timeline", inputs=["interruptions"], outputs=["05_interruptions_timeline.png"])
+def make_plot_interruptions_timeline(data=None):
     """
     Create scatter plot showing interruptions over time and who interrupts whom.
     Saves as outputs/plots/05_interruptions_timeline.png
+    
+    Args:
+        data: Optional preloaded dataset from load_plot_dataset()
     """
-    interruptions_df, per_speaker_df = load_interruptions()
+    interruptions_df, per_speaker_df = get_plot_input(data, 'interruptions')
     
     # Prepare data
     df = interruptions_df.copy()
@@ -387,17 +507,21 @@ def make_plot_interruptions_timeline():
     plt.tight_layout()
     
     output_path = PLOTS_DIR / "05_interruptions_timeline.png"
-    plt.savefig(output_path, dpi=300, bbox_inches='tight')
+    _save_figure(output_path)
     plt.close()
     print(f"Saved: {output_path}")
 
 
-def make_plot_interruption_duration_hist():
+@declare_plot("interruption_duration_hist", inputs=["interruptions"], outputs=["06_interruption_duration_hist.png"])
+def make_plot_interruption_duration_hist(data=None):
     """
     Create histogram showing distribution of interruption segment durations.
     Saves as outputs/plots/06_interruption_duration_hist.png
+    
+    Args:
+        data: Optional preloaded dataset from load_plot_dataset()
     """
-    interruptions_df, per_speaker_df = load_interruptions()
+    interruptions_df, per_speaker_df = get_plot_input(data, 'interruptions')
     
     plt.figure(figsize=(12, 8))
     
@@ -427,17 +551,21 @@ def make_plot_interruption_duration_hist():
     plt.tight_layout()
     
     output_path = PLOTS_DIR / "06_interruption_duration_hist.png"
-    plt.savefig(output_path, dpi=300, bbox_inches='tight')
+    _save_figure(output_path)
     plt.close()
     print(f"Saved: {output_path}")
 
 
-def make_plot_interruption_types_by_speaker():
+@declare_plot("interruption_types_by_speaker", inputs=["interruptions"], outputs=["07_interruption_types_by_speaker.png"])
+def make_plot_interruption_types_by_speaker(data=None):
     """
     Create grouped bar chart comparing interruption types per speaker.
     Saves as outputs/plots/07_interruption_types_by_speaker.png
+    
+    Args:
+        data: Optional preloaded dataset from load_plot_dataset()
     """
-    interruptions_df, per_speaker_df = load_interruptions()
+    interruptions_df, per_speaker_df = get_plot_input(data, 'interruptions')
     
     # Group by interrupter and type, count interruptions
     type_counts = interruptions_df.groupby(['interrupter', 'type']).size().reset_index(name='count')
@@ -481,71 +609,41 @@ def make_plot_interruption_types_by_speaker():
     plt.tight_layout()
     
     output_path = PLOTS_DIR / "07_interruption_types_by_speaker.png"
-    plt.savefig(output_path, dpi=300, bbox_inches='tight')
+    _save_figure(output_path)
     plt.close()
     print(f"Saved: {output_path}")
 
 
 # TASK 5: OPTIONAL – SPEAKER TIME COURSE (STACKED AREA)
 
-def make_plot_stacked_area_speaker_dominance():
+@declare_plot("stacked_area_speaker_dominance", inputs=["diarization_segments"], outputs=["11_stacked_area_speaker_dominance.png"], style={'bin_size': 60})
+def make_plot_stacked_area_speaker_dominance(data=None, bin_size=60):
     """
     Create stacked area chart showing proportion of speaking time per speaker over time.
     Saves as outputs/plots/11_stacked_area_speaker_dominance.png
+    
+    Args:
+        data: Optional preloaded dataset from load_plot_dataset()
+        bin_size: Time bin width in seconds (default: 1-minute bins)
     """
-    segments_df = load_diarization_segments()
+    segments_df = get_plot_input(data, 'diarization_segments')
     
     # Determine time range and bin size
     max_time = segments_df['end'].max()
-    bin_size = 60  # 1-minute bins
     num_bins = int(max_time / bin_size) + 1
     
-    # Create time bins
-    time_bins = [(i * bin_size, (i + 1) * bin_size) for i in range(num_bins)]
-    
-    # Get unique speakers
-    speakers = segments_df['speaker'].unique()
-    
-    # Initialize data structure for results
-    bin_data = []
+    # Integer speaker codes in order of first appearance
+    speaker_codes, speakers = pd.factorize(segments_df['speaker'])
     
-    for i, (bin_start, bin_end) in enumerate(time_bins):
-        bin_center = (bin_start + bin_end) / 2.0 / 60.0  # Convert to minutes
-        speaker_times = {}
-        
-        for speaker in speakers:
-            # Get segments for this speaker
-            speaker_segments = segments_df[segments_df['speaker'] == speaker]
-            total_speaking_time = 0
-            
-            for _, segment in speaker_segments.iterrows():
-                seg_start, seg_end = segment['start'], segment['end']
-                
-                # Calculate overlap between segment and time bin
-                overlap_start = max(seg_start, bin_start)
-                overlap_end = min(seg_end, bin_end)
-                
-                if overlap_start < overlap_end:
-                    total_speaking_time += overlap_end - overlap_start
-            
-            speaker_times[speaker] = total_speaking_time
-        
-        # Calculate total time and proportions
-        total_time = sum(speaker_times.values())
-        
-        if total_time > 0:
-            proportions = {speaker: time / total_time for speaker, time in speaker_times.items()}
-        else:
-            proportions = {speaker: 0 for speaker in speakers}
-        
-        bin_data.append({
-            'time_min': bin_center,
-            'total_time': total_time,
-            **proportions
-        })
+    # Per-speaker speaking time per bin (vectorized binned occupancy)
+    proportions, total_time = speaker_dominance(
+        segments_df['start'].to_numpy(), segments_df['end'].to_numpy(),
+        speaker_codes, len(speakers), bin_size, num_bins
+    )
     
-    # Convert to DataFrame
-    df = pd.DataFrame(bin_data)
+    df = pd.DataFrame(proportions.T, columns=speakers)
+    df.insert(0, 'total_time', total_time)
+    df.insert(0, 'time_min', (np.arange(num_bins) + 0.5) * bin_size / 60.0)  # Bin centers in minutes
     
     # Create stacked area plot
     plt.figure(figsize=(16, 8))
@@ -568,15 +666,16 @@ def make_plot_stacked_area_speaker_dominance():
         else:
             bottom = bottom + values
     
-    # Add a line showing total speaking activity (how much of each minute has speech)
-    activity = df['total_time'] / bin_size  # Proportion of each minute that has speech
+    # Add a line showing total speaking activity (how much of each bin has speech)
+    activity = df['total_time'] / bin_size  # Proportion of each bin that has speech
     ax2 = plt.gca().twinx()
     ax2.plot(time_points, activity, 'k--', alpha=0.6, linewidth=1, 
              label='Speech Activity')
     ax2.set_ylabel('Speech Activity (Proportion of Time)', fontsize=11, alpha=0.7)
     ax2.set_ylim(0, 1)
     
-    plt.title('Conversation Dominance Over Time\n(Proportion of Speaking Time per Minute)', 
+    bin_label = 'Minute' if bin_size == 60 else f'{bin_size:g}s Bin'
+    plt.title(f'Conversation Dominance Over Time\n(Proportion of Speaking Time per {bin_label})', 
               fontsize=14, fontweight='bold')
     plt.xlabel('Time (minutes)', fontsize=12)
     plt.ylabel('Proportion of Speaking Time', fontsize=12)
@@ -592,25 +691,26 @@ def make_plot_stacked_area_speaker_dominance():
     plt.tight_layout()
     
     output_path = PLOTS_DIR / "11_stacked_area_speaker_dominance.png"
-    plt.savefig(output_path, dpi=300, bbox_inches='tight')
+    _save_figure(output_path)
     plt.close()
     print(f"Saved: {output_path}")
 
 
 # TASK 4: TURN-TAKING AND CONVERSATION FLOW (we'll add this before Task 6)
 
-def make_plot_transitions_bar():
+@declare_plot("transitions_bar", inputs=["turn_taking_stats"], outputs=["08_transitions_bar.png"])
+def make_plot_transitions_bar(data=None):
     """
     Create bar chart showing speaker transition patterns (from->to).
     Saves as outputs/plots/08_transitions_bar.png
+    
+    Args:
+        data: Optional preloaded dataset from load_plot_dataset()
     """
-    transitions_df, runs_df = load_turn_taking_stats()
+    transitions_df, runs_df = get_plot_input(data, 'turn_taking_stats')
     
-    # Load the alternation rate from the original JSON for the title
-    turn_taking_path = PROJECT_ROOT / "outputs" / "audio_features" / "turn_taking_stats.json"
-    with open(turn_taking_path, 'r') as f:
-        turn_data = json.load(f)
-    alternation_rate = turn_data.get('alternation_rate', 0) * 100  # Convert to percentage
+    # Alternation rate for the title is carried on the transitions DataFrame
+    alternation_rate = transitions_df.attrs.get('alternation_rate', 0) * 100  # Convert to percentage
     
     plt.figure(figsize=(12, 8))
     
@@ -632,17 +732,21 @@ def make_plot_transitions_bar():
     plt.tight_layout()
     
     output_path = PLOTS_DIR / "08_transitions_bar.png"
-    plt.savefig(output_path, dpi=300, bbox_inches='tight')
+    _save_figure(output_path)
     plt.close()
     print(f"Saved: {output_path}")
 
 
-def make_plot_run_stats():
+@declare_plot("run_stats", inputs=["turn_taking_stats"], outputs=["09_avg_run_duration_by_speaker.png", "10_max_run_duration_by_speaker.png"])
+def make_plot_run_stats(data=None):
     """
     Create bar charts showing run statistics per speaker.
     Saves as outputs/plots/09_avg_run_duration_by_speaker.png and 10_max_run_duration_by_speaker.png
+    
+    Args:
+        data: Optional preloaded dataset from load_plot_dataset()
     """
-    transitions_df, runs_df = load_turn_taking_stats()
+    transitions_df, runs_df = get_plot_input(data, 'turn_taking_stats')
     
     # Average run duration plot
     plt.figure(figsize=(10, 6))
@@ -662,7 +766,7 @@ def make_plot_run_stats():
     plt.tight_layout()
     
     output_path = PLOTS_DIR / "09_avg_run_duration_by_speaker.png"
-    plt.savefig(output_path, dpi=300, bbox_inches='tight')
+    _save_figure(output_path)
     plt.close()
     print(f"Saved: {output_path}")
     
@@ -684,72 +788,67 @@ def make_plot_run_stats():
     plt.tight_layout()
     
     output_path = PLOTS_DIR / "10_max_run_duration_by_speaker.png"
-    plt.savefig(output_path, dpi=300, bbox_inches='tight')
+    _save_figure(output_path)
     plt.close()
     print(f"Saved: {output_path}")
 
 
-if __name__ == "__main__":
-    print("Creating conversation analysis plots...")
+@declare_plot("rolling_metrics", inputs=["rolling_metrics"], outputs=["12_rolling_metrics.png"])
+def make_plot_rolling_metrics(data=None):
+    """
+    Create a stacked panel of rolling conversation metrics over time:
+    speaking share per speaker, alternation rate, interruptions per minute and words per minute.
+    Saves as outputs/plots/12_rolling_metrics.png
     
-    try:
-        # Task 2: Core Overview Plots
-        print("\n=== Task 2: Core Overview Plots ===")
-        print("Creating total speaking time plot...")
-        make_plot_total_speaking_time()
-        
-        print("Creating total words plot...")
-        make_plot_total_words()
-        
-        print("Creating speaking rate timeseries plot...")
-        make_plot_speaking_rate_timeseries()
-        
-        # Task 3: Interruptions and Overlaps Plots
-        print("\n=== Task 3: Interruptions and Overlaps Plots ===")
-        print("Creating interruptions summary plot...")
-        make_plot_interruptions_summary()
-        
-        print("Creating interruptions timeline plot...")
-        make_plot_interruptions_timeline()
-        
-        print("Creating interruption duration histogram...")
-        make_plot_interruption_duration_hist()
-        
-        print("Creating interruption types by speaker plot...")
-        make_plot_interruption_types_by_speaker()
-        
-        # Task 4: Turn-Taking and Conversation Flow
-        print("\n=== Task 4: Turn-Taking and Conversation Flow ===")
-        print("Creating speaker transitions plot...")
-        make_plot_transitions_bar()
-        
-        print("Creating run statistics plots...")
-        make_plot_run_stats()
-        
-        # Task 5: Optional - Speaker Time Course (Stacked Area)
-        print("\n=== Task 5: Speaker Time Course (Stacked Area) ===")
-        print("Creating stacked area speaker dominance plot...")
-        make_plot_stacked_area_speaker_dominance()
-        
-        print("\n" + "="*60)
-        print("All plots completed successfully!")
-        print("\nFiles saved in outputs/plots/:")
-        print("Task 2 - Core Overview:")
-        print("- 01_total_speaking_time_by_speaker.png")
-        print("- 02_total_words_by_speaker.png") 
-        print("- 03_speaking_rate_timeseries.png")
-        print("\nTask 3 - Interruptions and Overlaps:")
-        print("- 04_interruptions_summary_by_speaker.png")
-        print("- 05_interruptions_timeline.png")
-        print("- 06_interruption_duration_hist.png")
-        print("- 07_interruption_types_by_speaker.png")
-        print("\nTask 4 - Turn-Taking and Conversation Flow:")
-        print("- 08_transitions_bar.png")
-        print("- 09_avg_run_duration_by_speaker.png")
-        print("- 10_max_run_duration_by_speaker.png")
-        print("\nTask 5 - Speaker Time Course:")
-        print("- 11_stacked_area_speaker_dominance.png")
-        
-    except Exception as e:
-        print(f"Error creating plots: {e}")
-        raise
\ No newline at end of file
+    Args:
+        data: Optional preloaded dataset from load_plot_dataset()
+    """
+    df = get_plot_input(data, 'rolling_metrics')
+    speakers = df.attrs.get('speakers', [])
+    window_min = df.attrs.get('window_size_sec', 0) / 60
+    
+    # Plot each window at its center
+    time_min = (df['window_start'] + df['window_end']) / 2 / 60
+    
+    fig, axes = plt.subplots(4, 1, figsize=(16, 14), sharex=True)
+    fig.suptitle(f'Rolling Conversation Metrics ({window_min:g}-minute windows)', fontsize=14, fontweight='bold')
+    
+    # Speaking share per speaker
+    axes[0].stackplot(time_min, [df[f'speaking_share:{speaker}'] for speaker in speakers],
+                      labels=speakers, alpha=0.7)
+    axes[0].set_ylabel('Speaking Share', fontsize=12)
+    axes[0].set_ylim(0, 1)
+    axes[0].legend(loc='upper right', fontsize=10)
+    
+    # Alternation rate
+    axes[1].plot(time_min, df['alternation_rate'], color='#1f77b4', linewidth=1.5)
+    axes[1].set_ylabel('Alternation Rate', fontsize=12)
+    axes[1].set_ylim(0, 1)
+    
+    # Interruptions per minute by interrupter
+    for speaker in speakers:
+        axes[2].plot(time_min, df[f'interruptions_per_minute:{speaker}'], linewidth=1.5, label=speaker)
+    axes[2].plot(time_min, df['interruptions_per_minute'], 'k--', linewidth=1, alpha=0.6, label='Total')
+    axes[2].set_ylabel('Interruptions / min', fontsize=12)
+    axes[2].legend(loc='upper right', fontsize=10)
+    
+    # Words per minute per speaker
+    for speaker in speakers:
+        axes[3].plot(time_min, df[f'words_per_minute:{speaker}'], linewidth=1.5, label=speaker)
+    axes[3].set_ylabel('Words / min', fontsize=12)
+    axes[3].set_xlabel('Time (minutes)', fontsize=12)
+    axes[3].legend(loc='upper right', fontsize=10)
+    
+    for ax in axes:
+        ax.grid(True, alpha=0.3)
+    plt.tight_layout()
+    
+    output_path = PLOTS_DIR / "12_rolling_metrics.png"
+    _save_figure(output_path)
+    plt.close()
+    print(f"Saved: {output_path}")
+
+
+if __name__ == "__main__":
+    from plot_renderer import main
+    main()
@@ -0,0 +1,216 @@
+"""
+Parallel plot rendering engine.
+
+Loads every plot input once into DataFrames, then renders the requested
+figures concurrently in a process pool using the non-interactive Agg
+backend. Each worker receives the preloaded dataset once (pool initializer),
+so no JSON file is re-read per figure and full regeneration is bounded by the
+slowest figure rather than the sum of all of them.
+
+Figures whose declared inputs and style are unchanged since the last render
+are skipped (see plot_cache).
+
+Usage (from the src directory):
+    python plot_renderer.py                       # all stale figures
+    python plot_renderer.py --force               # redraw everything
+    python plot_renderer.py --only transitions_bar run_stats
+    python plot_renderer.py --workers 1           # sequential, in-process
+    python plot_renderer.py --root ../episodes/ep42   # inputs and plots of another tree
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import plot_conversation_features as pcf
+import plot_speaker_summary as pss
+from plot_cache import is_up_to_date, load_manifest, plot_fingerprint, save_manifest
+
+# Figure name -> declared PlotSpec, in the order of the numbered PNGs
+PLOT_BUILDERS = {
+    spec.name: spec for spec in (
+        pcf.make_plot_total_speaking_time.plot_spec,
+        pcf.make_plot_total_words.plot_spec,
+        pcf.make_plot_speaking_rate_timeseries.plot_spec,
+        pcf.make_plot_interruptions_summary.plot_spec,
+        pcf.make_plot_interruptions_timeline.plot_spec,
+        pcf.make_plot_interruption_duration_hist.plot_spec,
+        pcf.make_plot_interruption_types_by_speaker.plot_spec,
+        pcf.make_plot_transitions_bar.plot_spec,
+        pcf.make_plot_run_stats.plot_spec,
+        pcf.make_plot_stacked_area_speaker_dominance.plot_spec,
+        pcf.make_plot_rolling_metrics.plot_spec,
+        pss.create_summary_plot.plot_spec,
+    )
+}
+
+# Dataset name -> (loader, path resolver)
+PLOT_INPUTS = {
+    **{name: (loader, pcf.plot_input_paths) for name, loader in pcf.PLOT_INPUT_LOADERS.items()},
+    'speaker_segments': (pss.load_speaker_segments, pss.plot_input_paths),
+}
+
+# Dataset shared by all figures rendered in a worker process
+_WORKER_DATA = None
+
+
+def set_project_root(root: str) -> None:
+    """Read plot inputs from, and write figures under, another podcast_analysis tree."""
+    for module in (pcf, pss):
+        module.PROJECT_ROOT = Path(root).resolve()
+        module.PLOTS_DIR = module.PROJECT_ROOT / "outputs" / "plots"
+
+
+def _init_worker(data: Dict, project_root: str, plots_dir: str) -> None:
+    """Pool initializer: select the Agg backend and install the shared dataset."""
+    global _WORKER_DATA
+    import matplotlib
+    matplotlib.use("Agg")
+
+    for module in (pcf, pss):
+        module.PROJECT_ROOT = Path(project_root)
+        module.PLOTS_DIR = Path(plots_dir)
+    _WORKER_DATA = data
+
+
+def _render_one(name: str) -> float:
+    """Render one figure from the worker's shared dataset and return its duration."""
+    spec = PLOT_BUILDERS[name]
+    t0 = time.perf_counter()
+    spec.builder(data=_WORKER_DATA, **spec.style)
+    return time.perf_counter() - t0
+
+
+def render_plots(
+    only: Optional[Iterable[str]] = None,
+    workers: Optional[int] = None,
+    force: bool = False,
+    root: Optional[str] = None
+) -> Dict[str, Optional[float]]:
+    """
+    Render conversation plots, loading each input file exactly once.
+
+    Figures whose input fingerprints and style parameters match the manifest
+    stored next to the PNGs (see plot_cache) are skipped unless `force` is set.
+
+    Args:
+        only: Optional subset of figure names (keys of PLOT_BUILDERS). Defaults to all.
+        workers: Number of worker processes. Defaults to min(#figures, CPU count);
+                 1 renders sequentially in the current process.
+        force: Redraw every selected figure regardless of the cache
+        root: Directory holding outputs/ (default: the podcast_analysis directory of
+              this checkout); figures go to <root>/outputs/plots
+
+    Returns:
+        dict: Figure name -> render time in seconds (None for cached figures);
+              figures skipped for missing inputs are left out
+    """
+    names = list(PLOT_BUILDERS) if only is None else list(only)
+    unknown = [name for name in names if name not in PLOT_BUILDERS]
+    if unknown:
+        raise ValueError(f"Unknown plot(s): {', '.join(unknown)}. Available: {', '.join(PLOT_BUILDERS)}")
+
+    if root is not None:
+        set_project_root(root)
+    plots_dir = pcf.PLOTS_DIR
+    plots_dir.mkdir(parents=True, exist_ok=True)
+    for module in (pcf, pss):
+        module.PLOTS_DIR = plots_dir
+
+    # Fingerprint every selected figure and skip the unchanged ones
+    manifest = load_manifest(plots_dir)
+    file_hashes = {}
+    fingerprints = {}
+    stale = []
+    missing = []
+    for name in names:
+        spec = PLOT_BUILDERS[name]
+        input_files = [path for input_name in spec.inputs for path in PLOT_INPUTS[input_name][1](input_name)]
+        if not input_files or not all(Path(path).exists() for path in input_files):
+            # Inputs of optional analyses (e.g. rolling_metrics) may not have been produced yet
+            missing.append(name)
+            continue
+        fingerprints[name] = plot_fingerprint(spec, input_files, file_hashes, pcf.PROJECT_ROOT)
+        if force or not is_up_to_date(manifest, spec, fingerprints[name], plots_dir):
+            stale.append(name)
+
+    timings = {name: None for name in names if name not in missing}
+    if missing:
+        print(f"Skipping {len(missing)} figure(s) with missing inputs: {', '.join(missing)}")
+    cached = len(names) - len(stale) - len(missing)
+    if cached:
+        print(f"Skipping {cached} up-to-date figure(s): {', '.join(n for n in names if n not in stale and n not in missing)}")
+    if not stale:
+        return timings
+
+    # Load only the inputs the stale figures need, once
+    t0 = time.perf_counter()
+    needed = []
+    for name in stale:
+        for input_name in PLOT_BUILDERS[name].inputs:
+            if input_name not in needed:
+                needed.append(input_name)
+    data = {input_name: PLOT_INPUTS[input_name][0]() for input_name in needed}
+    print(f"Loaded {len(needed)} input(s) in {time.perf_counter() - t0:.2f}s: {', '.join(needed)}")
+
+    init_args = (data, str(pcf.PROJECT_ROOT), str(plots_dir))
+
+    if workers is None:
+        workers = min(len(stale), os.cpu_count() or 1)
+
+    t0 = time.perf_counter()
+    try:
+        if workers <= 1:
+            _init_worker(*init_args)
+            for name in stale:
+                timings[name] = _render_one(name)
+                manifest[name] = {"fingerprint": fingerprints[name], "outputs": list(PLOT_BUILDERS[name].outputs)}
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=init_args) as pool:
+                futures = {pool.submit(_render_one, name): name for name in stale}
+                for future in as_completed(futures):
+                    name = futures[future]
+                    timings[name] = future.result()
+                    manifest[name] = {"fingerprint": fingerprints[name], "outputs": list(PLOT_BUILDERS[name].outputs)}
+    finally:
+        # Record whatever rendered successfully, even if another figure failed
+        save_manifest(plots_dir, manifest)
+    wall = time.perf_counter() - t0
+
+    rendered = [timings[name] for name in stale]
+    print(f"\nRendered {len(stale)} figure(s) with {workers} worker(s) in {wall:.2f}s "
+          f"(slowest figure {max(rendered):.2f}s, sum {sum(rendered):.2f}s)")
+    return timings
+
+
+def main(argv: Optional[List[str]] = None):
+    """Main function to render conversation plots."""
+    parser = argparse.ArgumentParser(description='Render conversation analysis plots in parallel')
+    parser.add_argument('--only', nargs='+', choices=list(PLOT_BUILDERS), metavar='PLOT',
+                        help=f"Subset of plots to render: {', '.join(PLOT_BUILDERS)}")
+    parser.add_argument('--workers', type=int, help='Worker processes (default: one per figure, up to CPU count)')
+    parser.add_argument('--force', action='store_true', help='Redraw figures even if their inputs are unchanged')
+    parser.add_argument('--root', help=f'Directory holding outputs/ (default: {pcf.PROJECT_ROOT})')
+    args = parser.parse_args(argv)
+
+    print("Creating conversation analysis plots...")
+    timings = render_plots(args.only, args.workers, args.force, args.root)
+
+    print(f"\nFiles in {pcf.PLOTS_DIR}:")
+    for name in args.only or PLOT_BUILDERS:
+        if name not in timings:
+            status = "missing inputs"
+        elif timings[name] is None:
+            status = "cached"
+        else:
+            status = f"{timings[name]:.2f}s"
+        print(f"- {name:<35} {status}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,43 +6,101 @@ import matplotlib.pyplot as plt
 import numpy as np
 import json
 import os
+from pathlib import Path
 
-def create_summary_plot():
-    """Create a focused summary comparison plot."""
+from plot_cache import declare_plot
+
+# Define constants for project structure
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+PLOTS_DIR = PROJECT_ROOT / "outputs" / "plots"
+PLOT_DPI = 300
+
+# Input files of every dataset, relative to PROJECT_ROOT (glob patterns)
+PLOT_INPUT_FILES = {
+    'speaker_segments': "data/segments/*_segments.json",
+}
+
+SPEAKER_COLORS = ['#FF6B6B', '#4ECDC4', '#FFD166', '#6A4C93', '#8AC926']
+
+
+def plot_input_paths(name):
+    """
+    Resolve the input file(s) of a plot dataset.
+
+    Args:
+        name: Dataset name (key of PLOT_INPUT_FILES)
+
+    Returns:
+        list: Sorted paths matching the dataset's glob pattern
+    """
+    return sorted(PROJECT_ROOT.glob(PLOT_INPUT_FILES[name]))
+
+
+def load_speaker_segments(paths=None):
+    """
+    Load per-speaker window metadata and compute the summary metrics.
+
+    Args:
+        paths: Optional list of *_segments.json files. Defaults to data/segments/*_segments.json
+
+    Returns:
+        dict: Speaker -> metrics (total windows, total/avg/max duration, avg words, speaking rate)
+    """
+    if paths is None:
+        paths = plot_input_paths('speaker_segments')
+
+    metrics = {}
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        windows = data['windows']
+        if not windows:
+            continue
+        durations = [w['duration'] for w in windows]
+        word_counts = [w['word_count'] for w in windows]
+        total_duration = sum(durations)
+
+        metrics[data['target_speaker']] = {
+            'Total Windows': len(windows),
+            'Total Duration (min)': total_duration / 60.0,
+            'Avg Duration (s)': total_duration / len(windows),
+            'Max Duration (s)': max(durations),
+            'Avg Words/Window': sum(word_counts) / len(windows),
+            'Speaking Rate (w/s)': sum(word_counts) / total_duration if total_duration > 0 else 0.0
+        }
+
+    return dict(sorted(metrics.items()))
+
+
+@declare_plot("speaker_summary_comparison", inputs=["speaker_segments"], outputs=["speaker_summary_comparison.png"])
+def create_summary_plot(data=None, show=False):
+    """
+    Create a focused summary comparison plot.
+    
+    Args:
+        data: Optional preloaded dataset with a 'speaker_segments' entry (see load_speaker_segments)
+        show: Whether to open an interactive window after saving
+    """
     
     # Define paths
-    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    output_dir = os.path.join(base_dir, "outputs", "plots")
+    output_dir = str(PLOTS_DIR)
     
     # Data from the analysis
-    trump_data = {
-        'Total Windows': 503,
-        'Total Duration (min)': 119.5,
-        'Avg Duration (s)': 14.3,
-        'Avg Words/Window': 50.9,
-        'Speaking Rate (w/s)': 3.59
-    }
-    
-    rogan_data = {
-        'Total Windows': 184,
-        'Total Duration (min)': 41.6,
-        'Avg Duration (s)': 13.6,
-        'Avg Words/Window': 46.2,
-        'Speaking Rate (w/s)': 3.46
-    }
+    if data is not None and 'speaker_segments' in data:
+        speaker_data = data['speaker_segments']
+    else:
+        speaker_data = load_speaker_segments()
+    
+    speakers = list(speaker_data)
+    colors = [SPEAKER_COLORS[i % len(SPEAKER_COLORS)] for i in range(len(speakers))]
     
     # Create figure
     fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(15, 10))
-    fig.suptitle('Speaker Comparison: Key Metrics\nDonald Trump vs Joe Rogan', fontsize=16, fontweight='bold')
-    
-    # Colors
-    trump_color = '#FF6B6B'
-    rogan_color = '#4ECDC4'
+    fig.suptitle(f"Speaker Comparison: Key Metrics\n{' vs '.join(speakers)}", fontsize=16, fontweight='bold')
     
     # 1. Total Windows - separate from Duration to avoid scale issues
-    windows_data = [trump_data['Total Windows'], rogan_data['Total Windows']]
-    speakers = ['Donald Trump', 'Joe Rogan']
-    colors = [trump_color, rogan_color]
+    windows_data = [speaker_data[s]['Total Windows'] for s in speakers]
     
     bars_windows = ax1.bar(speakers, windows_data, color=colors, alpha=0.8)
     ax1.set_title('Total Windows Comparison', fontweight='bold')
@@ -59,32 +117,36 @@ def create_summary_plot():
                     ha='center', va='bottom', fontsize=12, fontweight='bold')
     
     # 2. Speaking Time Distribution (Pie Chart)
-    total_time = trump_data['Total Duration (min)'] + rogan_data['Total Duration (min)']
-    trump_pct = (trump_data['Total Duration (min)'] / total_time) * 100
-    rogan_pct = (rogan_data['Total Duration (min)'] / total_time) * 100
+    durations_min = [speaker_data[s]['Total Duration (min)'] for s in speakers]
+    total_time = sum(durations_min)
+    percentages = [(d / total_time) * 100 for d in durations_min]
     
-    wedges, texts, autotexts = ax2.pie([trump_pct, rogan_pct], 
-                                      labels=['Donald Trump', 'Joe Rogan'],
-                                      colors=[trump_color, rogan_color],
+    wedges, texts, autotexts = ax2.pie(percentages,
+                                      labels=speakers,
+                                      colors=colors,
                                       autopct='%1.1f%%',
                                       startangle=90,
-                                      explode=(0.05, 0.05))
+                                      explode=[0.05] * len(speakers))
     ax2.set_title('Speaking Time Distribution', fontweight='bold')
     
     # Add duration info as subtitle
-    ax2.text(0, -1.4, f'Trump: {trump_data["Total Duration (min)"]:.1f} min, Rogan: {rogan_data["Total Duration (min)"]:.1f} min', 
+    duration_info = ', '.join(f"{s.split()[-1]}: {d:.1f} min" for s, d in zip(speakers, durations_min))
+    ax2.text(0, -1.4, duration_info,
              ha='center', va='center', fontsize=11, style='italic')
     
     # 3. Quality Metrics
     categories = ['Avg Duration (s)', 'Avg Words/Window', 'Speaking Rate (w/s)']
-    trump_values = [trump_data['Avg Duration (s)'], trump_data['Avg Words/Window'], trump_data['Speaking Rate (w/s)']]
-    rogan_values = [rogan_data['Avg Duration (s)'], rogan_data['Avg Words/Window'], rogan_data['Speaking Rate (w/s)']]
     
     x = np.arange(len(categories))
-    width = 0.35
+    width = 0.7 / len(speakers)
     
-    bars1 = ax3.bar(x - width/2, trump_values, width, label='Donald Trump', color=trump_color, alpha=0.8)
-    bars2 = ax3.bar(x + width/2, rogan_values, width, label='Joe Rogan', color=rogan_color, alpha=0.8)
+    all_bars = []
+    all_values = []
+    for i, (speaker, color) in enumerate(zip(speakers, colors)):
+        values = [speaker_data[speaker][c] for c in categories]
+        offset = (i - (len(speakers) - 1) / 2) * width
+        all_bars.append(ax3.bar(x + offset, values, width, label=speaker, color=color, alpha=0.8))
+        all_values.extend(values)
     
     ax3.set_xlabel('Metrics')
     ax3.set_ylabel('Values')
@@ -95,13 +157,12 @@ def create_summary_plot():
     ax3.grid(True, alpha=0.3)
     
     # Set y-axis limits with some padding
-    all_values = trump_values + rogan_values
     y_min = min(all_values) * 0.9
     y_max = max(all_values) * 1.15
     ax3.set_ylim(y_min, y_max)
     
     # Add value labels on bars
-    for bars in [bars1, bars2]:
+    for bars in all_bars:
         for bar in bars:
             height = bar.get_height()
             ax3.annotate(f'{height:.1f}',
@@ -115,21 +176,21 @@ def create_summary_plot():
     ax4.axis('off')
     
     table_data = [
-        ['Metric', 'Donald Trump', 'Joe Rogan'],
-        ['Total Segments', '503', '184'],
-        ['Total Time (min)', '119.5', '41.6'],
-        ['Avg Duration (s)', '14.3', '13.6'],
-        ['Max Duration (s)', '75.7', '85.3'],
-        ['Avg Words/Segment', '50.9', '46.2'],
-        ['Speaking Rate (w/s)', '3.59', '3.46'],
-        ['Speaking Time %', '74.2%', '25.8%']
+        ['Metric'] + speakers,
+        ['Total Segments'] + [f"{speaker_data[s]['Total Windows']}" for s in speakers],
+        ['Total Time (min)'] + [f"{speaker_data[s]['Total Duration (min)']:.1f}" for s in speakers],
+        ['Avg Duration (s)'] + [f"{speaker_data[s]['Avg Duration (s)']:.1f}" for s in speakers],
+        ['Max Duration (s)'] + [f"{speaker_data[s]['Max Duration (s)']:.1f}" for s in speakers],
+        ['Avg Words/Segment'] + [f"{speaker_data[s]['Avg Words/Window']:.1f}" for s in speakers],
+        ['Speaking Rate (w/s)'] + [f"{speaker_data[s]['Speaking Rate (w/s)']:.2f}" for s in speakers],
+        ['Speaking Time %'] + [f"{p:.1f}%" for p in percentages]
     ]
     
     table = ax4.table(cellText=table_data[1:], 
                      colLabels=table_data[0],
                      cellLoc='center',
                      loc='center',
-                     colColours=[None, trump_color, rogan_color])
+                     colColours=[None] + colors)
     table.auto_set_font_size(False)
     table.set_fontsize(11)
     table.scale(1.2, 1.8)
@@ -143,11 +204,14 @@ def create_summary_plot():
     plt.tight_layout()
     
     # Save the plot
+    os.makedirs(output_dir, exist_ok=True)
     output_path = os.path.join(output_dir, 'speaker_summary_comparison.png')
-    plt.savefig(output_path, dpi=300, bbox_inches='tight', facecolor='white')
+    plt.savefig(output_path, dpi=PLOT_DPI, bbox_inches='tight', facecolor='white')
     print(f"Summary comparison plot saved to: {output_path}")
     
-    plt.show()
+    if show:
+        plt.show()
+    plt.close()
 
 if __name__ == "__main__":
-    create_summary_plot()
+    create_summary_plot(show=True)
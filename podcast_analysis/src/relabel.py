@@ -0,0 +1,365 @@
+"""
+Propagate a speaker relabeling to every derived artifact without re-running the pipeline.
+
+Speaker names are encoded as integer codes (np.unique over the labels) and
+the mapping is applied to the code vocabulary, so every artifact is rewritten
+with one lookup per label instead of per-record string handling. A mapping
+that sends two present labels to the same name is a merge; the artifacts
+are then updated according to what actually depends on it:
+
+- renamed in place, merge or not: diarization_segments.json and
+  transcript_with_speakers.json (segments keep their order and indices)
+- folded by addition: basic_speaker_stats.json (time, words and segment
+  counts are sums) and speaking_rate_timeseries.json (word counts per window)
+- renamed on a pure rename, recomputed from the relabeled transcript on a
+  merge: interruptions.json (overlaps between labels that are now the same
+  speaker are no longer interruptions), turn_taking_stats.json (turns and
+  runs join across the merged labels) and rolling_metrics.json (speaking
+  shares of overlapping segments are not additive)
+- data/segments/<Speaker>_segments.json: renamed (file and target_speaker);
+  a merged speaker's windows are rebuilt with build_segments_from_json
+
+Plots are refreshed through plot_renderer, whose input-fingerprint cache
+redraws only the figures whose inputs changed.
+
+Usage (from the podcast_analysis directory):
+    python src/relabel.py --mapping outputs/audio_features/speaker_mapping.json
+    python src/relabel.py --map "S3=Donald Trump" --map "S1=Donald Trump" --no-plots
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+ARTIFACT_PATHS = {
+    "diarization": "outputs/audio_features/diarization_segments.json",
+    "transcript": "outputs/audio_features/transcript_with_speakers.json",
+    "basic_speaker_stats": "outputs/audio_features/basic_speaker_stats.json",
+    "speaking_rate_timeseries": "outputs/audio_features/speaking_rate_timeseries.json",
+    "interruptions": "outputs/audio_features/interruptions.json",
+    "turn_taking_stats": "outputs/audio_features/turn_taking_stats.json",
+    "rolling_metrics": "outputs/audio_features/rolling_metrics.json",
+}
+SPEAKER_WINDOWS_DIR = "data/segments"
+
+
+def relabel_codes(labels: Sequence[str], mapping: Dict[str, str]) -> Tuple[List[str], bool]:
+    """
+    Apply a label mapping through integer codes.
+
+    Args:
+        labels: Speaker label per record
+        mapping: Old label -> new label (labels not in the mapping are kept)
+
+    Returns:
+        tuple: (new label per record, whether two present labels were merged)
+    """
+    if len(labels) == 0:
+        return [], False
+    vocabulary, codes = np.unique(np.asarray(labels, dtype=object), return_inverse=True)
+    targets = [mapping.get(label, label) for label in vocabulary]
+    new_vocabulary, code_map = np.unique(np.asarray(targets, dtype=object), return_inverse=True)
+    return new_vocabulary[code_map[codes]].tolist(), len(new_vocabulary) < len(vocabulary)
+
+
+def _load(path: Path) -> Any:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _save(path: Path, data: Any, indent: Optional[int] = 2) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=indent, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def _relabel_segments(segments: List[Dict[str, Any]], mapping: Dict[str, str]) -> bool:
+    """Rename the speaker of every segment in place; returns whether labels merged."""
+    labels, merged = relabel_codes([s['speaker'] for s in segments], mapping)
+    for segment, label in zip(segments, labels):
+        segment['speaker'] = label
+    return merged
+
+
+def relabel_basic_stats(data: Dict[str, Any], mapping: Dict[str, str]) -> Dict[str, Any]:
+    """Fold per-speaker sums of basic_speaker_stats and recompute the derived rates."""
+    speakers: Dict[str, Dict[str, Any]] = {}
+    for old, stats in data['speakers'].items():
+        entry = speakers.setdefault(mapping.get(old, old),
+                                    {'total_speaking_time_sec': 0.0, 'total_words': 0, 'num_segments': 0})
+        for key in entry:
+            entry[key] += stats[key]
+    for stats in speakers.values():
+        stats['total_speaking_time_min'] = stats['total_speaking_time_sec'] / 60.0
+        minutes = stats['total_speaking_time_min']
+        stats['words_per_minute'] = stats['total_words'] / minutes if minutes > 0 else 0.0
+    return {**data, 'speakers': speakers}
+
+
+def relabel_timeseries(data: Dict[str, Any], mapping: Dict[str, str]) -> Dict[str, Any]:
+    """Fold per-window word counts of speaking_rate_timeseries (entries stay window-major, speakers sorted)."""
+    windows: Dict[int, Dict[str, Any]] = {}
+    for entry in data['timeseries']:
+        window = windows.setdefault(entry['window_index'], {'window_start': entry['window_start'],
+                                                            'window_end': entry['window_end'], 'counts': {}})
+        speaker = mapping.get(entry['speaker'], entry['speaker'])
+        window['counts'][speaker] = window['counts'].get(speaker, 0) + entry['word_count']
+
+    timeseries = []
+    for index, window in sorted(windows.items()):
+        minutes = (window['window_end'] - window['window_start']) / 60.0
+        for speaker in sorted(window['counts']):
+            count = window['counts'][speaker]
+            timeseries.append({
+                "window_index": index,
+                "window_start": window['window_start'],
+                "window_end": window['window_end'],
+                "speaker": speaker,
+                "word_count": count,
+                "words_per_minute": (count / minutes) if minutes > 0 else 0.0
+            })
+    return {**data, 'timeseries': timeseries}
+
+
+def rename_interruptions(data: Dict[str, Any], mapping: Dict[str, str]) -> Dict[str, Any]:
+    """Rename speakers in interruptions.json (only valid when no labels merge)."""
+    for interruption in data['interruptions']:
+        interruption['interrupter'] = mapping.get(interruption['interrupter'], interruption['interrupter'])
+        interruption['interrupted'] = mapping.get(interruption['interrupted'], interruption['interrupted'])
+    for backchannel in data['backchannels']:
+        backchannel['speaker'] = mapping.get(backchannel['speaker'], backchannel['speaker'])
+    data['stats']['per_speaker'] = {mapping.get(k, k): v for k, v in data['stats']['per_speaker'].items()}
+    return data
+
+
+def rename_turn_taking(data: Dict[str, Any], mapping: Dict[str, str]) -> Dict[str, Any]:
+    """Rename speakers in turn_taking_stats.json (only valid when no labels merge), keeping sorted order."""
+    old_speakers = data['speakers']
+    order = sorted(range(len(old_speakers)), key=lambda i: mapping.get(old_speakers[i], old_speakers[i]))
+    speakers = [mapping.get(old_speakers[i], old_speakers[i]) for i in order]
+    transitions = {
+        f"{speakers[a]}->{speakers[b]}": data['transitions'][f"{old_speakers[i]}->{old_speakers[j]}"]
+        for a, i in enumerate(order) for b, j in enumerate(order)
+    }
+    result = {**data, 'speakers': speakers, 'transitions': transitions,
+              'runs': {speakers[a]: data['runs'][old_speakers[i]] for a, i in enumerate(order)}}
+    if 'transition_matrix' in data:
+        matrix = np.asarray(data['transition_matrix'])
+        result['transition_matrix'] = matrix[np.ix_(order, order)].tolist()
+    return result
+
+
+def rename_rolling_metrics(data: Dict[str, Any], mapping: Dict[str, str]) -> Dict[str, Any]:
+    """Rename the per-speaker columns of rolling_metrics.json (only valid when no labels merge)."""
+    speakers = sorted(mapping.get(s, s) for s in data['speakers'])
+    inverse = {mapping.get(s, s): s for s in data['speakers']}
+    table = {}
+    for column, values in data['table'].items():
+        metric, _, speaker = column.partition(':')
+        if not speaker:
+            table[column] = values
+        elif f"{metric}:{speakers[0]}" not in table:
+            # Per-speaker columns of a metric are contiguous and in sorted speaker order
+            for new in speakers:
+                table[f"{metric}:{new}"] = data['table'][f"{metric}:{inverse[new]}"]
+    return {**data, 'speakers': speakers, 'table': table}
+
+
+def relabel_speaker_windows(
+    windows_dir: Path,
+    mapping: Dict[str, str],
+    transcript_path: Optional[Path]
+) -> List[str]:
+    """
+    Rename or rebuild data/segments/<Speaker>_segments.json for the mapped speakers.
+
+    Args:
+        windows_dir: Directory of the *_segments.json files
+        mapping: Old label -> new label
+        transcript_path: Relabeled transcript, used to rebuild merged speakers
+
+    Returns:
+        list: Paths written
+    """
+    import build_segments_from_json as bsj
+
+    def stem(speaker):
+        return speaker.replace(' ', '_').replace('.', '')
+
+    # Load everything first: a swap (A -> B, B -> A) overwrites files that are still to be read
+    existing = {}
+    for path in sorted(windows_dir.glob("*_segments.json")):
+        data = _load(path)
+        existing[data['target_speaker']] = (path, data)
+    sources: Dict[str, List[str]] = {}
+    for speaker in existing:
+        sources.setdefault(mapping.get(speaker, speaker), []).append(speaker)
+    changed = {target: olds for target, olds in sources.items() if olds != [target]}
+
+    for olds in changed.values():
+        for old in olds:
+            existing[old][0].unlink()
+    audio_root = windows_dir / "audio"
+    staged = {}
+    for target, olds in changed.items():
+        if len(olds) == 1 and (audio_root / stem(olds[0])).is_dir():
+            staged[target] = audio_root / f".relabel_{stem(olds[0])}"
+            (audio_root / stem(olds[0])).rename(staged[target])
+
+    written = []
+    for target, olds in changed.items():
+        output_path = windows_dir / f"{stem(target)}_segments.json"
+        if len(olds) == 1:
+            data = existing[olds[0]][1]
+            data['target_speaker'] = target
+            for window in data['windows']:
+                if 'speaker' in window:
+                    window['speaker'] = target
+            _save(output_path, data)
+            if target in staged:
+                staged[target].rename(audio_root / stem(target))
+            print(f"   {existing[olds[0]][0].name} -> {output_path.name}")
+        elif transcript_path is not None:
+            segments = bsj.filter_segments_by_speaker(bsj.load_transcript(str(transcript_path)), target)
+            windows = bsj.merge_adjacent_segments_for_speaker(bsj.drop_tiny_segments(segments), target)
+            bsj.save_segmentation_metadata(windows, str(output_path), target)
+            print(f"   Rebuilt {output_path.name} from {', '.join(olds)} (re-run slice_audio_segments.py for its audio)")
+        else:
+            # Without a transcript the windows can only be pooled, not re-merged
+            windows = sorted((w for old in olds for w in existing[old][1]['windows']), key=lambda w: w['start'])
+            bsj.save_segmentation_metadata(windows, str(output_path), target)
+            print(f"⚠️  Pooled the windows of {', '.join(olds)} into {output_path.name} (no transcript to rebuild from)")
+        written.append(str(output_path))
+    return written
+
+
+def relabel_artifacts(
+    mapping: Dict[str, str],
+    root: str = ".",
+    windows_dir: Optional[str] = SPEAKER_WINDOWS_DIR,
+    refresh_plots: bool = True
+) -> Dict[str, str]:
+    """
+    Apply a speaker mapping to every derived artifact of an episode.
+
+    Args:
+        mapping: Old label -> new label
+        root: Directory the artifact paths are relative to (the podcast_analysis directory)
+        windows_dir: Directory of the speaker window files (None to skip them)
+        refresh_plots: Re-render plots whose inputs changed
+
+    Returns:
+        dict: Artifact -> action taken ("renamed", "folded", "recomputed")
+    """
+    from analysis_speaking_features import detect_interruptions, turn_taking_stats
+    from rolling_metrics import rolling_metrics
+
+    mapping = {old: new for old, new in mapping.items() if old != new}
+    paths = {name: Path(root) / path for name, path in ARTIFACT_PATHS.items()}
+    actions = {}
+    start_time = time.time()
+    print(f"🏷️  Relabeling: {', '.join(f'{old} -> {new}' for old, new in mapping.items())}")
+
+    # A merge is judged on the labels the derived artifacts were built from: the transcript's
+    # (the diarization may already have been relabeled by update_speaker_labels)
+    merged = None
+    has_transcript = paths["transcript"].exists()
+    for name in ("transcript", "diarization"):
+        if paths[name].exists():
+            data = _load(paths[name])
+            segment_merge = _relabel_segments(data['segments'], mapping)
+            merged = segment_merge if merged is None else merged
+            if 'speakers' in data:
+                data['speakers'] = sorted({mapping.get(s, s) for s in data['speakers']})
+            _save(paths[name], data)
+            actions[name] = "renamed"
+    if merged is None:
+        targets = [mapping.get(label, label) for label in mapping]
+        merged = len(set(targets)) < len(targets)
+
+    if paths["basic_speaker_stats"].exists():
+        _save(paths["basic_speaker_stats"], relabel_basic_stats(_load(paths["basic_speaker_stats"]), mapping))
+        actions["basic_speaker_stats"] = "folded"
+    if paths["speaking_rate_timeseries"].exists():
+        data = relabel_timeseries(_load(paths["speaking_rate_timeseries"]), mapping)
+        _save(paths["speaking_rate_timeseries"], data)
+        actions["speaking_rate_timeseries"] = "folded"
+        plot_path = paths["speaking_rate_timeseries"].with_suffix(".png")
+        if plot_path.exists():
+            from analysis_speaking_features import _create_timeseries_plot
+            _create_timeseries_plot(data['timeseries'], sorted({e['speaker'] for e in data['timeseries']}), str(plot_path))
+
+    for name, rename in (("interruptions", rename_interruptions),
+                         ("turn_taking_stats", rename_turn_taking),
+                         ("rolling_metrics", rename_rolling_metrics)):
+        if not paths[name].exists():
+            continue
+        data = _load(paths[name])
+        if not merged:
+            _save(paths[name], rename(data, mapping), indent=None if name == "rolling_metrics" else 2)
+            actions[name] = "renamed"
+        elif not has_transcript:
+            print(f"⚠️  {paths[name]} depends on the merged labels but there is no transcript to recompute it from")
+        else:
+            if name == "interruptions":
+                detect_interruptions(str(paths["transcript"]), str(paths[name]), **data['parameters'])
+            elif name == "turn_taking_stats":
+                turn_taking_stats(str(paths["transcript"]), str(paths[name]),
+                                  data['merged_segments_info']['merge_gap_threshold_sec'])
+            else:
+                rolling_metrics(str(paths["transcript"]), str(paths[name]), data['window_size_sec'],
+                                data['step_size_sec'], data['merge_gap_sec'])
+            actions[name] = "recomputed"
+
+    if windows_dir is not None and (Path(root) / windows_dir).is_dir():
+        if relabel_speaker_windows(Path(root) / windows_dir, mapping, paths["transcript"] if has_transcript else None):
+            actions["speaker_windows"] = "rebuilt" if merged else "renamed"
+
+    print(f"\n✅ Relabeled {len(actions)} artifact(s) in {time.time() - start_time:.2f}s "
+          f"({'labels merged' if merged else 'pure rename'}):")
+    for name, action in actions.items():
+        print(f"   {name}: {action}")
+
+    if refresh_plots:
+        from plot_renderer import render_plots
+        render_plots(root=root)
+    return actions
+
+
+def main(argv: Optional[List[str]] = None):
+    """Main function to propagate a speaker relabeling."""
+    from config import SPEAKER_MAPPING_PATH
+    from update_speaker_labels import load_speaker_mapping
+
+    parser = argparse.ArgumentParser(description='Propagate a speaker relabeling to all derived artifacts')
+    parser.add_argument('--mapping', default=None, help=f'Mapping JSON (default: {SPEAKER_MAPPING_PATH})')
+    parser.add_argument('--map', action='append', default=[], metavar='OLD=NEW', help='Mapping entry (repeatable)')
+    parser.add_argument('--root', default='.', help='podcast_analysis directory')
+    parser.add_argument('--no-plots', action='store_true', help='Do not refresh the plots')
+    args = parser.parse_args(argv)
+
+    try:
+        mapping = {}
+        if args.mapping or not args.map:
+            mapping.update(load_speaker_mapping(args.mapping or os.path.join(args.root, SPEAKER_MAPPING_PATH)))
+        for entry in args.map:
+            old, sep, new = entry.partition('=')
+            if not sep:
+                raise ValueError(f"Expected OLD=NEW, got: {entry}")
+            mapping[old.strip()] = new.strip()
+        relabel_artifacts(mapping, args.root, refresh_plots=not args.no_plots)
+    except Exception as e:
+        print(f"❌ Error relabeling artifacts: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
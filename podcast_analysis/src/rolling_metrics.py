@@ -0,0 +1,243 @@
+"""
+Rolling-window conversation metrics.
+
+Computes, on one shared time grid, per-speaker speaking share, words per
+minute, the alternation rate between turns and interruptions per minute.
+Every metric is read off sorted event arrays with prefix sums and
+np.searchsorted, so each window costs O(log n) regardless of the window
+size and the whole table is built in a single vectorized pass:
+
+- speaking time: exact segment coverage C(t) = sum(t - start) - sum(t - end)
+  over the segments that started/ended before t, from prefix sums of the
+  sorted starts and ends
+- words: count of word start times in [window_start, window_end)
+- alternation rate: speaker changes / transitions among the turns that start
+  inside the window (turns as in analysis_speaking_features.turn_taking_stats)
+- interruptions: count of interruption times in the window
+  (analysis_speaking_features.find_interruptions)
+
+The result is a single columnar table (one list per column) saved to
+outputs/audio_features/rolling_metrics.json; per-speaker columns are named
+"<metric>:<speaker>".
+"""
+
+import json
+import os
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from analysis_speaking_features import (
+    MERGE_GAP_SEC,
+    compute_turn_taking,
+    find_interruptions,
+)
+
+# Default rolling window parameters
+WINDOW_SIZE_SEC = 120.0
+STEP_SIZE_SEC = 30.0
+
+
+def _count_in_windows(sorted_times: np.ndarray, window_starts: np.ndarray, window_ends: np.ndarray) -> np.ndarray:
+    """Count events with window_start <= t < window_end for every window."""
+    return (np.searchsorted(sorted_times, window_ends, side='left') -
+            np.searchsorted(sorted_times, window_starts, side='left'))
+
+
+def cumulative_coverage(starts: np.ndarray, ends: np.ndarray, t: np.ndarray) -> np.ndarray:
+    """
+    Total segment time before each query time.
+
+    Overlapping segments are counted once per segment, like the per-segment
+    sums elsewhere in the pipeline.
+
+    Args:
+        starts: Segment start times
+        ends: Segment end times
+        t: Query times
+
+    Returns:
+        np.ndarray: Seconds of segment time in (-inf, t] for every query time
+    """
+    sorted_starts = np.sort(np.asarray(starts, dtype=np.float64))
+    sorted_ends = np.sort(np.asarray(ends, dtype=np.float64))
+    start_sums = np.concatenate(([0.0], np.cumsum(sorted_starts)))
+    end_sums = np.concatenate(([0.0], np.cumsum(sorted_ends)))
+
+    t = np.asarray(t, dtype=np.float64)
+    num_started = np.searchsorted(sorted_starts, t, side='right')
+    num_ended = np.searchsorted(sorted_ends, t, side='right')
+    return (t * num_started - start_sums[num_started]) - (t * num_ended - end_sums[num_ended])
+
+
+def compute_rolling_metrics(
+    segments: List[Dict],
+    window_size_sec: float = WINDOW_SIZE_SEC,
+    step_size_sec: Optional[float] = STEP_SIZE_SEC,
+    merge_gap_sec: float = MERGE_GAP_SEC,
+    interruptions: Optional[List[Dict]] = None
+) -> Dict[str, list]:
+    """
+    Compute rolling conversation metrics on a shared time grid.
+
+    Windows start at the first segment start and advance by step_size_sec
+    while they start before the last segment end; the last window is clipped
+    to the conversation end, as in speaking_rate_timeseries.
+
+    Args:
+        segments: Transcript segments (speaker, start, end, words)
+        window_size_sec: Window length in seconds
+        step_size_sec: Step between window starts (None = non-overlapping)
+        merge_gap_sec: Merge gap used to build turns for the alternation rate
+        interruptions: Optional precomputed interruptions (find_interruptions);
+                       detected with the default parameters if omitted
+
+    Returns:
+        dict: Column name -> list of values, one entry per window
+    """
+    if step_size_sec is None:
+        step_size_sec = window_size_sec
+
+    segments = sorted(segments, key=lambda s: s['start'])
+    speakers = sorted({s['speaker'] for s in segments})
+    speaker_index = {speaker: code for code, speaker in enumerate(speakers)}
+
+    starts = np.array([s['start'] for s in segments], dtype=np.float64)
+    ends = np.array([s['end'] for s in segments], dtype=np.float64)
+    codes = np.array([speaker_index[s['speaker']] for s in segments], dtype=np.intp)
+
+    # Word start times with their speaker codes
+    word_starts = np.array([w['start'] for s in segments for w in s.get('words', [])], dtype=np.float64)
+    word_codes = np.repeat(codes, [len(s.get('words', [])) for s in segments])
+
+    # Shared time grid
+    conversation_start = float(starts.min()) if len(starts) else 0.0
+    conversation_end = float(ends.max()) if len(ends) else 0.0
+    window_starts = np.arange(conversation_start, conversation_end, step_size_sec)
+    window_ends = np.minimum(window_starts + window_size_sec, conversation_end)
+    window_min = (window_ends - window_starts) / 60.0
+
+    def per_minute(counts):
+        return np.divide(counts, window_min, out=np.zeros(len(window_min)), where=window_min > 0)
+
+    table = {
+        "window_start": window_starts,
+        "window_end": window_ends,
+    }
+
+    # Speaking time and words per speaker
+    speech_sec = np.zeros((len(speakers), len(window_starts)))
+    total_words = np.zeros(len(window_starts))
+    for code, speaker in enumerate(speakers):
+        mask = codes == code
+        coverage = cumulative_coverage(starts[mask], ends[mask], np.concatenate((window_starts, window_ends)))
+        speech_sec[code] = coverage[len(window_starts):] - coverage[:len(window_starts)]
+
+        words = _count_in_windows(np.sort(word_starts[word_codes == code]), window_starts, window_ends)
+        total_words += words
+        table[f"words_per_minute:{speaker}"] = per_minute(words)
+
+    total_speech = speech_sec.sum(axis=0)
+    for code, speaker in enumerate(speakers):
+        table[f"speaking_share:{speaker}"] = np.divide(
+            speech_sec[code], total_speech, out=np.zeros(len(window_starts)), where=total_speech > 0
+        )
+    table["words_per_minute"] = per_minute(total_words)
+
+    # Alternation rate over the transitions into turns that start in the window
+    core = compute_turn_taking(starts, ends, codes, len(speakers), merge_gap_sec)
+    transition_times = core['turn_starts'][1:]
+    is_alternation = core['turn_codes'][1:] != core['turn_codes'][:-1]
+    transitions = _count_in_windows(transition_times, window_starts, window_ends)
+    alternations = _count_in_windows(transition_times[is_alternation], window_starts, window_ends)
+    table["transitions"] = transitions
+    table["alternation_rate"] = np.divide(
+        alternations, transitions, out=np.zeros(len(window_starts)), where=transitions > 0
+    )
+
+    # Interruptions per minute, overall and by interrupter
+    if interruptions is None:
+        interruptions, _, _ = find_interruptions(segments)
+    interruption_times = np.array([i['time'] for i in interruptions], dtype=np.float64)
+    interrupters = np.array([i['interrupter'] for i in interruptions], dtype=object)
+    order = np.argsort(interruption_times, kind='stable')
+    interruption_times, interrupters = interruption_times[order], interrupters[order]
+    table["interruptions_per_minute"] = per_minute(
+        _count_in_windows(interruption_times, window_starts, window_ends)
+    )
+    for speaker in speakers:
+        table[f"interruptions_per_minute:{speaker}"] = per_minute(
+            _count_in_windows(interruption_times[interrupters == speaker], window_starts, window_ends)
+        )
+
+    return {column: np.asarray(values).tolist() for column, values in table.items()}
+
+
+def rolling_metrics(
+    transcript_path: str = "outputs/audio_features/transcript_with_speakers.json",
+    output_path: str = "outputs/audio_features/rolling_metrics.json",
+    window_size_sec: float = WINDOW_SIZE_SEC,
+    step_size_sec: Optional[float] = STEP_SIZE_SEC,
+    merge_gap_sec: float = MERGE_GAP_SEC
+) -> dict:
+    """
+    Compute rolling-window conversation metrics and save them as a columnar table.
+
+    Args:
+        transcript_path: Path to the transcript with speakers JSON file
+        output_path: Path where to save the rolling metrics JSON file
+        window_size_sec: Window length in seconds
+        step_size_sec: Step between window starts (None = non-overlapping)
+        merge_gap_sec: Merge gap used to build turns for the alternation rate
+
+    Returns:
+        Dictionary containing the rolling metrics table
+    """
+    # Load transcript data
+    with open(transcript_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    segments = data['segments']
+    table = compute_rolling_metrics(segments, window_size_sec, step_size_sec, merge_gap_sec)
+    speakers = sorted({s['speaker'] for s in segments})
+
+    # Create output structure
+    result = {
+        "audio_file": data['audio_file'],
+        "speakers": speakers,
+        "window_size_sec": window_size_sec,
+        "step_size_sec": step_size_sec if step_size_sec is not None else window_size_sec,
+        "merge_gap_sec": merge_gap_sec,
+        "table": table
+    }
+
+    # Print summary
+    num_windows = len(table['window_start'])
+    print(f"\n" + "="*70)
+    print("ROLLING CONVERSATION METRICS")
+    print("="*70)
+    print(f"Windows: {num_windows} ({window_size_sec:g}s window, {result['step_size_sec']:g}s step)")
+    if num_windows:
+        print(f"{'Metric':<45} {'Mean':<10} {'Max':<10}")
+        print("-" * 65)
+        for column, values in table.items():
+            if column in ("window_start", "window_end"):
+                continue
+            print(f"{column:<45} {np.mean(values):<10.2f} {np.max(values):<10.2f}")
+    print("="*70)
+
+    # Save to output file
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(result, f, ensure_ascii=False)
+
+    print(f"\nSaved rolling metrics to: {output_path}")
+
+    return result
+
+
+if __name__ == "__main__":
+    rolling_metrics(
+        transcript_path="../outputs/audio_features/transcript_with_speakers.json",
+        output_path="../outputs/audio_features/rolling_metrics.json"
+    )
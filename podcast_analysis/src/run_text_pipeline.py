@@ -0,0 +1,151 @@
+"""
+Run the text topic pipeline end-to-end.
+
+transcript_with_speakers.json -> time-based text blocks -> cached block
+embeddings -> adjacent cosine similarity and boundaries -> KMeans topics ->
+TF-IDF keywords -> topic timeline. All outputs go to outputs/text_analysis/.
+
+Usage (from the podcast_analysis directory):
+    python src/run_text_pipeline.py --block-duration 120 --clusters 6
+"""
+
+import argparse
+import json
+import os
+import sys
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from config import (
+    ADJACENT_SIM_THRESHOLD,
+    BLOCK_DURATION_SEC,
+    BLOCK_EMBEDDINGS_PATH,
+    BLOCK_SIM_BOUNDARIES_PATH,
+    BLOCK_TOPICS_CSV_PATH,
+    BLOCKS_JSON_PATH,
+    EMBEDDING_CACHE_DIR,
+    EMBEDDING_MODEL_NAME,
+    FINAL_TOPIC_SEGMENTS_JSON_PATH,
+    TOPIC_CLUSTER_COUNT,
+    TOPIC_KEYWORDS_JSON_PATH,
+    TRANSCRIPT_JSON_FOR_TEXT,
+    TRANSCRIPT_PLAIN_PATH,
+)
+from embeddings_topics import (
+    adjacent_similarities,
+    build_topic_segments,
+    cluster_blocks,
+    embed_texts,
+    topic_keywords,
+)
+from text_blocks import build_text_blocks, load_transcript_segments, save_plain_transcript, save_text_blocks
+
+
+def run_text_pipeline(
+    transcript_path: str = TRANSCRIPT_JSON_FOR_TEXT,
+    block_duration_sec: float = BLOCK_DURATION_SEC,
+    n_clusters: int = TOPIC_CLUSTER_COUNT,
+    sim_threshold: float = ADJACENT_SIM_THRESHOLD,
+    model_name: str = EMBEDDING_MODEL_NAME,
+    use_boundaries: bool = False
+) -> list:
+    """
+    Run every step of the text topic pipeline.
+
+    Args:
+        transcript_path: Path to the transcript with speakers JSON file
+        block_duration_sec: Maximum duration of a text block
+        n_clusters: Number of topics for KMeans
+        sim_threshold: Adjacent similarity below which a boundary is flagged
+        model_name: sentence-transformers model name (hashing stand-in if unavailable)
+        use_boundaries: Also break topic segments at flagged boundaries
+
+    Returns:
+        list: Final topic segments
+    """
+    print("="*70)
+    print("TEXT TOPIC PIPELINE")
+    print("="*70)
+
+    # Steps 1-4: transcript, plain text and cleaned blocks
+    segments = load_transcript_segments(transcript_path)
+    print(f"Loaded {len(segments)} transcript segments from {transcript_path}")
+    save_plain_transcript(segments, TRANSCRIPT_PLAIN_PATH)
+    blocks = build_text_blocks(segments, block_duration_sec)
+    save_text_blocks(blocks, BLOCKS_JSON_PATH)
+    if not blocks:
+        print("❌ No text blocks to analyze")
+        return []
+
+    # Step 5: embeddings (only blocks not in the cache are encoded)
+    texts = [block['clean_text'] for block in blocks]
+    embeddings = embed_texts(texts, model_name, EMBEDDING_CACHE_DIR)
+    np.save(BLOCK_EMBEDDINGS_PATH, embeddings)
+    print(f"Embeddings shape: {embeddings.shape}")
+
+    # Step 6: adjacent similarities and boundaries
+    similarities = adjacent_similarities(embeddings)
+    boundaries = similarities < sim_threshold
+    pd.DataFrame({
+        "block_id": np.arange(len(similarities)),
+        "next_block_id": np.arange(1, len(similarities) + 1),
+        "cosine_sim": similarities,
+        "is_boundary": boundaries
+    }).to_csv(BLOCK_SIM_BOUNDARIES_PATH, index=False)
+    print(f"Flagged {int(boundaries.sum())} boundaries (cosine < {sim_threshold})")
+
+    # Step 7: topics
+    labels = cluster_blocks(embeddings, n_clusters)
+    pd.DataFrame({
+        "block_id": [block['block_id'] for block in blocks],
+        "start_sec": [block['start_sec'] for block in blocks],
+        "end_sec": [block['end_sec'] for block in blocks],
+        "topic_id": labels
+    }).to_csv(BLOCK_TOPICS_CSV_PATH, index=False)
+    print(f"Blocks per topic: {np.bincount(labels).tolist()}")
+
+    # Step 8: keywords
+    keywords = topic_keywords(texts, labels)
+    with open(TOPIC_KEYWORDS_JSON_PATH, 'w', encoding='utf-8') as f:
+        json.dump(keywords, f, indent=2, ensure_ascii=False)
+    for entry in keywords:
+        print(f"  Topic {entry['topic_id']}: {', '.join(entry['keywords'])}")
+
+    # Step 9: timeline
+    topic_segments = build_topic_segments(blocks, labels, keywords, boundaries if use_boundaries else None)
+    with open(FINAL_TOPIC_SEGMENTS_JSON_PATH, 'w', encoding='utf-8') as f:
+        json.dump(topic_segments, f, indent=2, ensure_ascii=False)
+
+    print(f"\nTopic timeline ({len(topic_segments)} segments):")
+    for segment in topic_segments:
+        print(f"  {segment['start_sec'] / 60:>6.1f}-{segment['end_sec'] / 60:<6.1f}min  "
+              f"topic {segment['topic_id']}: {', '.join(segment['keywords'][:5])}")
+    print(f"\nSaved topic segments to: {FINAL_TOPIC_SEGMENTS_JSON_PATH}")
+
+    return topic_segments
+
+
+def main(argv: Optional[List[str]] = None):
+    """Main function to run the text topic pipeline."""
+    parser = argparse.ArgumentParser(description='Topic segmentation of the podcast transcript')
+    parser.add_argument('--transcript', default=TRANSCRIPT_JSON_FOR_TEXT, help='Transcript with speakers JSON')
+    parser.add_argument('--block-duration', type=float, default=BLOCK_DURATION_SEC, help='Block duration in seconds')
+    parser.add_argument('--clusters', type=int, default=TOPIC_CLUSTER_COUNT, help='Number of topics')
+    parser.add_argument('--threshold', type=float, default=ADJACENT_SIM_THRESHOLD, help='Boundary similarity threshold')
+    parser.add_argument('--model', default=EMBEDDING_MODEL_NAME, help='sentence-transformers model name')
+    parser.add_argument('--use-boundaries', action='store_true', help='Break topic segments at similarity boundaries')
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.transcript):
+        print(f"❌ Transcript not found: {args.transcript}")
+        return 1
+
+    run_text_pipeline(args.transcript, args.block_duration, args.clusters, args.threshold,
+                      args.model, args.use_boundaries)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
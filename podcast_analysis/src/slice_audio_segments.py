@@ -9,15 +9,19 @@ import sys
 import librosa
 import soundfile as sf
 import numpy as np
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
+from config import PCM_CACHE_DIR
+from pcm_cache import load_pcm
 
-def load_mono_audio(audio_path: str) -> tuple:
+
+def load_mono_audio(audio_path: str, cache_dir: Optional[str] = PCM_CACHE_DIR) -> tuple:
     """
-    Load mono audio file using librosa.
+    Load mono audio file from the shared PCM cache (decoded on first use).
     
     Args:
         audio_path: Path to the mono WAV file
+        cache_dir: PCM cache directory, None to decode without caching
         
     Returns:
         tuple: (audio_data, sample_rate)
@@ -28,7 +32,7 @@ def load_mono_audio(audio_path: str) -> tuple:
         raise FileNotFoundError(f"Audio file not found: {audio_path}")
     
     # Load audio with original sample rate
-    y, sr = librosa.load(audio_path, sr=None)
+    y, sr = load_pcm(audio_path, None, cache_dir)
     
     print(f"Loaded audio: {len(y)} samples at {sr} Hz ({len(y)/sr:.1f} seconds)")
     return y, sr
@@ -102,6 +106,48 @@ def save_segment_wav(y_segment: np.ndarray, sr: int, output_path: str) -> None:
     sf.write(output_path, y_segment, sr)
 
 
+def slice_windows_to_wavs(y: np.ndarray, sr: int, windows: List[Dict[str, Any]], output_dir: str) -> tuple:
+    """
+    Slice every window out of the full audio and save each as a WAV file.
+    
+    Args:
+        y: Full audio array
+        sr: Sample rate
+        windows: List of window metadata (window_id, start, end)
+        output_dir: Directory to write <window_id>.wav files into
+        
+    Returns:
+        tuple: (successful_segments, failed_segments)
+    """
+    successful_segments = 0
+    failed_segments = 0
+    
+    for i, window in enumerate(windows):
+        window_id = window['window_id']
+        start_time = window['start']
+        end_time = window['end']
+        
+        # Step 2.3: Slice audio
+        y_segment = slice_audio(y, sr, start_time, end_time)
+        
+        if len(y_segment) == 0:
+            print(f"Failed to slice segment {window_id}")
+            failed_segments += 1
+            continue
+        
+        # Step 2.4: Save segment as WAV file
+        output_path = os.path.join(output_dir, f"{window_id}.wav")
+        save_segment_wav(y_segment, sr, output_path)
+        
+        successful_segments += 1
+        
+        # Progress update
+        if (i + 1) % 50 == 0:
+            print(f"  Processed {i + 1}/{len(windows)} segments...")
+    
+    return successful_segments, failed_segments
+
+
 def verify_segments(output_dir: str, windows: List[Dict[str, Any]]) -> None:
     """
     Verify that all segments were created successfully.
@@ -145,14 +191,14 @@ def verify_segments(output_dir: str, windows: List[Dict[str, Any]]) -> None:
             print(f"  {window_id}: File missing ❌")
 
 
-def main():
+def main(argv: Optional[List[str]] = None):
     """Main function to run Phase 2 audio slicing pipeline."""
     import argparse
     
     # Parse command line arguments
     parser = argparse.ArgumentParser(description='Slice audio segments for a speaker')
     parser.add_argument('speaker', help='Speaker name (e.g., "Joe Rogan", "Donald Trump")')
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     target_speaker = args.speaker
     print(f"=== PHASE 2: Audio Slicing for {target_speaker} ===")
@@ -182,33 +228,7 @@ def main():
         
         # Step 2.3 & 2.4: Slice and save audio segments
         print(f"\nStep 2.3-2.4: Slicing and saving {len(windows)} segments...")
-        
-        successful_segments = 0
-        failed_segments = 0
-        
-        for i, window in enumerate(windows):
-            window_id = window['window_id']
-            start_time = window['start']
-            end_time = window['end']
-            expected_duration = window['duration']
-            
-            # Step 2.3: Slice audio
-            y_segment = slice_audio(y, sr, start_time, end_time)
-            
-            if len(y_segment) == 0:
-                print(f"Failed to slice segment {window_id}")
-                failed_segments += 1
-                continue
-            
-            # Step 2.4: Save segment as WAV file
-            output_path = os.path.join(output_dir, f"{window_id}.wav")
-            save_segment_wav(y_segment, sr, output_path)
-            
-            successful_segments += 1
-            
-            # Progress update
-            if (i + 1) % 50 == 0:
-                print(f"  Processed {i + 1}/{len(windows)} segments...")
+        successful_segments, failed_segments = slice_windows_to_wavs(y, sr, windows, output_dir)
         
         print(f"\nSegment processing complete!")
         print(f"  Successful: {successful_segments}")
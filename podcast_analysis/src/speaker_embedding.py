@@ -0,0 +1,89 @@
+"""
+Speaker embeddings for short audio snippets.
+
+Two embedders share one interface, embed(audio, sr) -> 1-D float32 vector:
+
+- "mfcc" (default, CPU, no model download): mean and standard deviation of
+  MFCCs 1-19 plus their deltas, i.e. the average vocal-tract shape and its
+  variability. Coarse, but enough to tell apart the hosts of one show.
+- "pyannote": the pyannote/embedding model (needs pyannote.audio and
+  HUGGINGFACE_TOKEN, like diarization.py); falls back to "mfcc" when it
+  cannot be loaded.
+"""
+
+import os
+from typing import Callable, Tuple
+
+import numpy as np
+
+N_MFCC = 20
+MIN_EMBEDDING_SEC = 0.5  # shorter snippets give unreliable embeddings
+
+
+def mfcc_embedding(audio: np.ndarray, sr: int) -> np.ndarray:
+    """
+    MFCC statistics embedding of a mono snippet.
+
+    Args:
+        audio: Mono signal
+        sr: Sample rate
+
+    Returns:
+        np.ndarray: float32 vector of length 4 * (N_MFCC - 1)
+    """
+    import librosa
+
+    mfcc = librosa.feature.mfcc(y=np.asarray(audio, dtype=np.float32), sr=sr, n_mfcc=N_MFCC)[1:]
+    # c0 is overall loudness, which says nothing about who is speaking
+    delta = librosa.feature.delta(mfcc, mode='nearest') if mfcc.shape[1] >= 3 else np.zeros_like(mfcc)
+    return np.concatenate([mfcc.mean(axis=1), mfcc.std(axis=1), delta.mean(axis=1), delta.std(axis=1)]).astype(np.float32)
+
+
+def load_speaker_embedder(method: str = "mfcc") -> Tuple[str, Callable[[np.ndarray, int], np.ndarray]]:
+    """
+    Load a speaker embedder.
+
+    Args:
+        method: "mfcc" or "pyannote"
+
+    Returns:
+        tuple: (effective method name, embed function (audio, sr) -> vector)
+    """
+    if method == "pyannote":
+        try:
+            import torch
+            from pyannote.audio import Inference, Model
+
+            model = Model.from_pretrained("pyannote/embedding", use_auth_token=os.environ.get("HUGGINGFACE_TOKEN"))
+            inference = Inference(model, window="whole")
+
+            def embed(audio, sr):
+                waveform = torch.from_numpy(np.asarray(audio, dtype=np.float32))[None, :]
+                return np.asarray(inference({"waveform": waveform, "sample_rate": sr}), dtype=np.float32).ravel()
+            return "pyannote", embed
+        except Exception as e:
+            print(f"⚠️  pyannote embedding model unavailable ({e.__class__.__name__}); using MFCC embeddings")
+    elif method != "mfcc":
+        raise ValueError(f"Unknown speaker embedding method: {method}")
+
+    return "mfcc", mfcc_embedding
+
+
+def cosine_similarity(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    Cosine similarity between vectors.
+
+    Args:
+        a: (dim,) or (n, dim) array
+        b: (dim,) or (m, dim) array
+
+    Returns:
+        np.ndarray: Similarities with shape (n, m) (scalar dimensions dropped)
+    """
+    a = np.atleast_2d(a).astype(np.float64)
+    b = np.atleast_2d(b).astype(np.float64)
+    a_norm = np.linalg.norm(a, axis=1, keepdims=True)
+    b_norm = np.linalg.norm(b, axis=1, keepdims=True)
+    a = np.divide(a, a_norm, out=np.zeros_like(a), where=a_norm > 0)
+    b = np.divide(b, b_norm, out=np.zeros_like(b), where=b_norm > 0)
+    return np.squeeze(a @ b.T)
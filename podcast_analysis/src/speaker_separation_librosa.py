@@ -7,14 +7,20 @@ import os
 import librosa
 import soundfile as sf
 import numpy as np
-from config import SAMPLE_RATE
+from config import PCM_CACHE_DIR, SAMPLE_RATE
+from pcm_cache import load_pcm
 
 
-def split_stereo_to_speakers_librosa():
+def split_stereo_to_speakers_librosa(audio_raw_path=None, processed_dir=None, cache_dir=PCM_CACHE_DIR):
     """
     Split stereo podcast.mp3 into two mono speaker files using librosa.
     Left channel = Speaker A, Right channel = Speaker B.
     
+    Args:
+        audio_raw_path: Optional input audio path. Defaults to data/raw/podcast.mp3
+        processed_dir: Optional output directory. Defaults to data/processed
+        cache_dir: PCM cache to fill with the outputs, None to skip filling it
+    
     Returns:
         bool: True if successful, False otherwise
     """
@@ -22,8 +28,10 @@ def split_stereo_to_speakers_librosa():
     project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
     
     # Create absolute paths with proper path separators
-    audio_raw_path = os.path.join(project_root, "podcast_analysis", "data", "raw", "podcast.mp3")
-    processed_dir = os.path.join(project_root, "podcast_analysis", "data", "processed")
+    if audio_raw_path is None:
+        audio_raw_path = os.path.join(project_root, "podcast_analysis", "data", "raw", "podcast.mp3")
+    if processed_dir is None:
+        processed_dir = os.path.join(project_root, "podcast_analysis", "data", "processed")
     speaker_a_path = os.path.join(processed_dir, "podcast_speaker_A_16k_mono.wav")
     speaker_b_path = os.path.join(processed_dir, "podcast_speaker_B_16k_mono.wav")
     
@@ -128,6 +136,10 @@ def split_stereo_to_speakers_librosa():
         
         # Verify both output files were created
         if os.path.exists(speaker_a_path) and os.path.exists(speaker_b_path):
+            # Decode both WAVs once into the shared PCM cache for the later stages
+            if cache_dir is not None:
+                load_pcm(speaker_a_path, SAMPLE_RATE, cache_dir)
+                load_pcm(speaker_b_path, SAMPLE_RATE, cache_dir)
             print("✅ Speaker separation completed successfully!")
             return True
         else:
@@ -177,8 +189,8 @@ def verify_speaker_files():
     
     try:
         # Try to load files to verify they're valid audio
-        audio_a, sr_a = librosa.load(speaker_a_path, sr=None)
-        audio_b, sr_b = librosa.load(speaker_b_path, sr=None)
+        audio_a, sr_a = load_pcm(speaker_a_path, None)
+        audio_b, sr_b = load_pcm(speaker_b_path, None)
         
         print(f"✅ Speaker A: {len(audio_a)} samples at {sr_a} Hz")
         print(f"✅ Speaker B: {len(audio_b)} samples at {sr_b} Hz")
@@ -0,0 +1,105 @@
+"""
+Build time-based text blocks from the speaker-labeled transcript.
+
+Groups transcript segments into blocks of at most BLOCK_DURATION_SEC, keeps
+their timing, and cleans the block text for embeddings and TF-IDF.
+"""
+
+import json
+import os
+import re
+from typing import Dict, List
+
+from config import BLOCK_DURATION_SEC
+
+# Filler words removed from the cleaned text
+FILLER_WORDS = ("uh", "um", "uhm", "erm", "hmm", "mm")
+
+_FILLER_PATTERN = re.compile(r"\b(?:" + "|".join(FILLER_WORDS) + r")\b[,.]?")
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+def load_transcript_segments(transcript_path: str) -> List[Dict]:
+    """
+    Load transcript segments sorted by start time.
+
+    Args:
+        transcript_path: Path to the transcript with speakers JSON file
+
+    Returns:
+        List of segments (speaker, start, end, text)
+    """
+    with open(transcript_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return sorted(data['segments'], key=lambda s: s['start'])
+
+
+def save_plain_transcript(segments: List[Dict], output_path: str) -> None:
+    """Write the transcript text, one segment per line, for manual inspection."""
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        for segment in segments:
+            f.write(f"[{segment['start']:.1f}s] {segment['speaker']}: {segment['text']}\n")
+    print(f"Saved plain transcript to: {output_path}")
+
+
+def clean_text(text: str) -> str:
+    """Lowercase, drop filler words and collapse whitespace."""
+    text = _FILLER_PATTERN.sub(" ", text.lower())
+    return _WHITESPACE_PATTERN.sub(" ", text).strip()
+
+
+def build_text_blocks(segments: List[Dict], block_duration_sec: float = BLOCK_DURATION_SEC) -> List[Dict]:
+    """
+    Group consecutive segments into time-based text blocks.
+
+    A segment joins the current block while the block (from its first
+    segment's start to this segment's end) stays within block_duration_sec;
+    otherwise it starts a new block.
+
+    Args:
+        segments: Segments sorted by start time
+        block_duration_sec: Maximum block duration in seconds
+
+    Returns:
+        List of blocks (block_id, start_sec, end_sec, text, clean_text)
+    """
+    blocks = []
+    current = None
+
+    for segment in segments:
+        if current is not None and segment['end'] - current['start_sec'] <= block_duration_sec:
+            current['texts'].append(segment['text'])
+            current['end_sec'] = max(current['end_sec'], segment['end'])
+            continue
+
+        if current is not None:
+            blocks.append(current)
+        current = {
+            "block_id": len(blocks),
+            "start_sec": segment['start'],
+            "end_sec": segment['end'],
+            "texts": [segment['text']]
+        }
+
+    if current is not None:
+        blocks.append(current)
+
+    for block in blocks:
+        block['text'] = " ".join(block.pop('texts')).strip()
+        block['clean_text'] = clean_text(block['text'])
+
+    return blocks
+
+
+def save_text_blocks(blocks: List[Dict], output_path: str) -> None:
+    """Save the blocks as JSON and print a short sanity check."""
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(blocks, f, indent=2, ensure_ascii=False)
+
+    print(f"Built {len(blocks)} text blocks")
+    for block in blocks[:2]:
+        print(f"  Block {block['block_id']}: {block['start_sec']:.1f}-{block['end_sec']:.1f}s "
+              f"\"{block['text'][:80]}...\"")
+    print(f"Saved text blocks to: {output_path}")
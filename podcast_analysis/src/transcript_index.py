@@ -0,0 +1,451 @@
+"""
+SQLite-backed index of transcripts, segments, windows and interruptions.
+
+Stores every episode's words, transcript and diarization segments, speaker
+windows (data/segments/*_segments.json) and interruptions in one local SQLite
+database, so consumers can fetch a few intervals without loading the full
+JSON files:
+
+- segments and windows are indexed with an R*Tree over (episode, time), so
+  "everything overlapping [t0, t1]" is a tree lookup
+- words are short, so they live in a sorted-interval table indexed on
+  (episode, speaker, start); an overlap query scans only the starts in
+  [t0 - longest word, t1)
+- interruptions are indexed on (episode, time)
+
+Usage (from the src directory):
+    python transcript_index.py build --episode-id ep001
+    python transcript_index.py words ep001 "Joe Rogan" 600 660
+    python transcript_index.py segments ep001 600 660
+"""
+
+import argparse
+import glob
+import json
+import os
+import sqlite3
+import sys
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+TRANSCRIPT_INDEX_PATH = "outputs/index/transcript_index.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS episodes (
+    id INTEGER PRIMARY KEY,
+    episode_id TEXT UNIQUE NOT NULL,
+    audio_file TEXT,
+    max_word_sec REAL NOT NULL DEFAULT 0,
+    added_at TEXT
+);
+CREATE TABLE IF NOT EXISTS speakers (
+    id INTEGER PRIMARY KEY,
+    name TEXT UNIQUE NOT NULL
+);
+CREATE TABLE IF NOT EXISTS segments (
+    id INTEGER PRIMARY KEY,
+    episode INTEGER NOT NULL REFERENCES episodes(id),
+    source TEXT NOT NULL,
+    segment_index INTEGER NOT NULL,
+    speaker INTEGER NOT NULL REFERENCES speakers(id),
+    start REAL NOT NULL,
+    "end" REAL NOT NULL,
+    text TEXT
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS segments_rtree USING rtree(id, episode_lo, episode_hi, t0, t1);
+CREATE TABLE IF NOT EXISTS words (
+    id INTEGER PRIMARY KEY,
+    episode INTEGER NOT NULL REFERENCES episodes(id),
+    speaker INTEGER NOT NULL REFERENCES speakers(id),
+    segment_index INTEGER NOT NULL,
+    word_index INTEGER NOT NULL,
+    start REAL NOT NULL,
+    "end" REAL NOT NULL,
+    word TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS words_by_speaker_start ON words(episode, speaker, start);
+CREATE INDEX IF NOT EXISTS words_by_start ON words(episode, start);
+CREATE TABLE IF NOT EXISTS windows (
+    id INTEGER PRIMARY KEY,
+    episode INTEGER NOT NULL REFERENCES episodes(id),
+    speaker INTEGER NOT NULL REFERENCES speakers(id),
+    window_id TEXT,
+    start REAL NOT NULL,
+    "end" REAL NOT NULL,
+    duration REAL,
+    word_count INTEGER,
+    text TEXT
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS windows_rtree USING rtree(id, episode_lo, episode_hi, t0, t1);
+CREATE TABLE IF NOT EXISTS interruptions (
+    id INTEGER PRIMARY KEY,
+    episode INTEGER NOT NULL REFERENCES episodes(id),
+    time REAL NOT NULL,
+    interrupter INTEGER NOT NULL REFERENCES speakers(id),
+    interrupted INTEGER NOT NULL REFERENCES speakers(id),
+    type TEXT,
+    overlap_duration REAL,
+    gap REAL
+);
+CREATE INDEX IF NOT EXISTS interruptions_by_time ON interruptions(episode, time);
+"""
+
+
+def connect_index(db_path: str = TRANSCRIPT_INDEX_PATH) -> sqlite3.Connection:
+    """
+    Open (and create if needed) the transcript index database.
+
+    Args:
+        db_path: Path of the SQLite database file
+
+    Returns:
+        sqlite3.Connection with rows accessible by column name
+    """
+    os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _speaker_ids(conn: sqlite3.Connection, names) -> Dict[str, int]:
+    """Intern speaker names and return name -> id."""
+    names = sorted(set(names))
+    conn.executemany("INSERT OR IGNORE INTO speakers(name) VALUES (?)", [(n,) for n in names])
+    return {
+        row['name']: row['id']
+        for row in conn.execute(f"SELECT id, name FROM speakers WHERE name IN ({','.join('?' * len(names))})", names)
+    } if names else {}
+
+
+def _episode_pk(conn: sqlite3.Connection, episode_id: str) -> Optional[int]:
+    """Primary key of an episode, or None if it is not indexed."""
+    row = conn.execute("SELECT id FROM episodes WHERE episode_id = ?", (episode_id,)).fetchone()
+    return row['id'] if row else None
+
+
+def _delete_episode(conn: sqlite3.Connection, episode: int) -> None:
+    """Remove all rows of an episode."""
+    for table in ("segments", "windows"):
+        conn.execute(f"DELETE FROM {table}_rtree WHERE id IN (SELECT id FROM {table} WHERE episode = ?)", (episode,))
+        conn.execute(f"DELETE FROM {table} WHERE episode = ?", (episode,))
+    conn.execute("DELETE FROM words WHERE episode = ?", (episode,))
+    conn.execute("DELETE FROM interruptions WHERE episode = ?", (episode,))
+
+
+def _insert_segments(conn, episode: int, source: str, segments: List[Dict], speakers: Dict[str, int]) -> None:
+    """Insert segments of one source plus their R*Tree entries."""
+    cursor = conn.execute("SELECT COALESCE(MAX(id), 0) FROM segments")
+    first_id = cursor.fetchone()[0] + 1
+    rows = [
+        (first_id + i, episode, source, i, speakers[s['speaker']], s['start'], s['end'], s.get('text'))
+        for i, s in enumerate(segments)
+    ]
+    conn.executemany('INSERT INTO segments(id, episode, source, segment_index, speaker, start, "end", text) '
+                     'VALUES (?, ?, ?, ?, ?, ?, ?, ?)', rows)
+    conn.executemany("INSERT INTO segments_rtree VALUES (?, ?, ?, ?, ?)",
+                     [(row[0], episode, episode, row[5], row[6]) for row in rows])
+
+
+def index_episode(
+    episode_id: str,
+    transcript_path: Optional[str] = None,
+    diarization_path: Optional[str] = None,
+    windows_paths: Optional[List[str]] = None,
+    interruptions_path: Optional[str] = None,
+    db_path: str = TRANSCRIPT_INDEX_PATH
+) -> Dict[str, int]:
+    """
+    Add (or replace) one episode in the index.
+
+    Any of the inputs may be omitted; an episode that is already indexed is
+    replaced as a whole.
+
+    Args:
+        episode_id: Episode identifier
+        transcript_path: transcript_with_speakers.json (transcript segments and words)
+        diarization_path: diarization_segments.json
+        windows_paths: Speaker window files (data/segments/*_segments.json)
+        interruptions_path: interruptions.json
+        db_path: Path of the SQLite database file
+
+    Returns:
+        dict: Number of rows indexed per table
+    """
+    def load(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    transcript = load(transcript_path) if transcript_path else None
+    diarization = load(diarization_path) if diarization_path else None
+    window_files = [load(p) for p in (windows_paths or [])]
+    interruptions = load(interruptions_path)['interruptions'] if interruptions_path else []
+
+    names = set()
+    for data in (transcript, diarization):
+        if data:
+            names.update(s['speaker'] for s in data['segments'])
+    names.update(w['speaker'] for f in window_files for w in f['windows'])
+    names.update(i['interrupter'] for i in interruptions)
+    names.update(i['interrupted'] for i in interruptions)
+
+    audio_file = (transcript or diarization or {}).get('audio_file')
+    counts = {"words": 0, "transcript_segments": 0, "diarization_segments": 0, "windows": 0, "interruptions": 0}
+
+    conn = connect_index(db_path)
+    try:
+        with conn:
+            existing = _episode_pk(conn, episode_id)
+            if existing is not None:
+                _delete_episode(conn, existing)
+                conn.execute("DELETE FROM episodes WHERE id = ?", (existing,))
+            episode = conn.execute(
+                "INSERT INTO episodes(episode_id, audio_file, added_at) VALUES (?, ?, ?)",
+                (episode_id, audio_file, datetime.now().isoformat(timespec="seconds"))
+            ).lastrowid
+            speakers = _speaker_ids(conn, names)
+
+            if transcript:
+                segments = transcript['segments']
+                _insert_segments(conn, episode, "transcript", segments, speakers)
+                word_rows = [
+                    (episode, speakers[s['speaker']], i, j, w['start'], w['end'], w['word'])
+                    for i, s in enumerate(segments)
+                    for j, w in enumerate(s.get('words', []))
+                ]
+                conn.executemany('INSERT INTO words(episode, speaker, segment_index, word_index, start, "end", word) '
+                                 'VALUES (?, ?, ?, ?, ?, ?, ?)', word_rows)
+                max_word_sec = max((row[5] - row[4] for row in word_rows), default=0.0)
+                conn.execute("UPDATE episodes SET max_word_sec = ? WHERE id = ?", (max_word_sec, episode))
+                counts["transcript_segments"] = len(segments)
+                counts["words"] = len(word_rows)
+
+            if diarization:
+                _insert_segments(conn, episode, "diarization", diarization['segments'], speakers)
+                counts["diarization_segments"] = len(diarization['segments'])
+
+            for window_file in window_files:
+                for w in window_file['windows']:
+                    window_pk = conn.execute(
+                        'INSERT INTO windows(episode, speaker, window_id, start, "end", duration, word_count, text) '
+                        'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                        (episode, speakers[w['speaker']], w.get('window_id'), w['start'], w['end'],
+                         w.get('duration'), w.get('word_count'), w.get('text'))
+                    ).lastrowid
+                    conn.execute("INSERT INTO windows_rtree VALUES (?, ?, ?, ?, ?)",
+                                 (window_pk, episode, episode, w['start'], w['end']))
+                    counts["windows"] += 1
+
+            conn.executemany(
+                "INSERT INTO interruptions(episode, time, interrupter, interrupted, type, overlap_duration, gap) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(episode, i['time'], speakers[i['interrupter']], speakers[i['interrupted']],
+                  i.get('type'), i.get('overlap_duration'), i.get('gap')) for i in interruptions]
+            )
+            counts["interruptions"] = len(interruptions)
+    finally:
+        conn.close()
+
+    print(f"✅ Indexed episode '{episode_id}': " + ", ".join(f"{n} {table}" for table, n in counts.items()))
+    return counts
+
+
+def words_between(
+    conn: sqlite3.Connection,
+    episode_id: str,
+    t0: float,
+    t1: float,
+    speaker: Optional[str] = None
+) -> List[Dict]:
+    """
+    Words overlapping [t0, t1], optionally of one speaker, in time order.
+
+    Args:
+        conn: Connection from connect_index()
+        episode_id: Episode identifier
+        t0: Range start in seconds
+        t1: Range end in seconds
+        speaker: Optional speaker label
+
+    Returns:
+        List of word dicts (speaker, segment_index, word_index, start, end, word)
+    """
+    row = conn.execute("SELECT id, max_word_sec FROM episodes WHERE episode_id = ?", (episode_id,)).fetchone()
+    if row is None:
+        return []
+    params = [row['id']]
+    speaker_clause = ""
+    if speaker is not None:
+        speaker_clause = "AND w.speaker = (SELECT id FROM speakers WHERE name = ?)"
+        params.append(speaker)
+    params += [t0 - row['max_word_sec'], t1, t0]
+
+    rows = conn.execute(
+        f'SELECT s.name AS speaker, w.segment_index, w.word_index, w.start, w."end", w.word '
+        f'FROM words w JOIN speakers s ON s.id = w.speaker '
+        f'WHERE w.episode = ? {speaker_clause} AND w.start >= ? AND w.start < ? AND w."end" > ? '
+        f'ORDER BY w.start',
+        params
+    )
+    return [dict(r) for r in rows]
+
+
+def segments_overlapping(
+    conn: sqlite3.Connection,
+    episode_id: str,
+    t0: float,
+    t1: float,
+    source: str = "transcript"
+) -> List[Dict]:
+    """
+    Segments overlapping [t0, t1] in time order.
+
+    Args:
+        conn: Connection from connect_index()
+        episode_id: Episode identifier
+        t0: Range start in seconds
+        t1: Range end in seconds
+        source: "transcript" or "diarization"
+
+    Returns:
+        List of segment dicts (segment_index, speaker, start, end, text)
+    """
+    episode = _episode_pk(conn, episode_id)
+    if episode is None:
+        return []
+    # The R*Tree stores float32 bounds (rounded outward); the exact columns refine the match
+    rows = conn.execute(
+        'SELECT g.segment_index, s.name AS speaker, g.start, g."end", g.text '
+        'FROM segments_rtree r JOIN segments g ON g.id = r.id JOIN speakers s ON s.id = g.speaker '
+        'WHERE r.episode_lo <= ? AND r.episode_hi >= ? AND r.t0 <= ? AND r.t1 >= ? '
+        'AND g.source = ? AND g.start < ? AND g."end" > ? '
+        'ORDER BY g.start',
+        (episode, episode, t1, t0, source, t1, t0)
+    )
+    return [dict(r) for r in rows]
+
+
+def windows_overlapping(
+    conn: sqlite3.Connection,
+    episode_id: str,
+    t0: float,
+    t1: float,
+    speaker: Optional[str] = None
+) -> List[Dict]:
+    """
+    Speaker windows overlapping [t0, t1] in time order.
+
+    Args:
+        conn: Connection from connect_index()
+        episode_id: Episode identifier
+        t0: Range start in seconds
+        t1: Range end in seconds
+        speaker: Optional speaker label
+
+    Returns:
+        List of window dicts in the data/segments metadata schema
+    """
+    episode = _episode_pk(conn, episode_id)
+    if episode is None:
+        return []
+    rows = conn.execute(
+        'SELECT w.window_id, s.name AS speaker, w.start, w."end", w.duration, w.word_count, w.text '
+        'FROM windows_rtree r JOIN windows w ON w.id = r.id JOIN speakers s ON s.id = w.speaker '
+        'WHERE r.episode_lo <= ? AND r.episode_hi >= ? AND r.t0 <= ? AND r.t1 >= ? '
+        'AND w.start < ? AND w."end" > ? AND (? IS NULL OR s.name = ?) '
+        'ORDER BY w.start',
+        (episode, episode, t1, t0, t1, t0, speaker, speaker)
+    )
+    return [dict(r) for r in rows]
+
+
+def interruptions_between(
+    conn: sqlite3.Connection,
+    episode_id: str,
+    t0: float,
+    t1: float
+) -> List[Dict]:
+    """
+    Interruptions with t0 <= time < t1 in time order.
+
+    Args:
+        conn: Connection from connect_index()
+        episode_id: Episode identifier
+        t0: Range start in seconds
+        t1: Range end in seconds
+
+    Returns:
+        List of interruption dicts (time, interrupter, interrupted, type, overlap_duration, gap)
+    """
+    episode = _episode_pk(conn, episode_id)
+    if episode is None:
+        return []
+    rows = conn.execute(
+        'SELECT i.time, a.name AS interrupter, b.name AS interrupted, i.type, i.overlap_duration, i.gap '
+        'FROM interruptions i JOIN speakers a ON a.id = i.interrupter JOIN speakers b ON b.id = i.interrupted '
+        'WHERE i.episode = ? AND i.time >= ? AND i.time < ? ORDER BY i.time',
+        (episode, t0, t1)
+    )
+    return [dict(r) for r in rows]
+
+
+def main(argv: Optional[List[str]] = None):
+    """Main function for the transcript index CLI."""
+    parser = argparse.ArgumentParser(description='Indexed store of transcripts, segments, windows and interruptions')
+    parser.add_argument('--db', default=TRANSCRIPT_INDEX_PATH, help='SQLite database file')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = subparsers.add_parser('build', help='Index one episode from the pipeline outputs')
+    build_parser.add_argument('--episode-id', required=True)
+    build_parser.add_argument('--transcript', default="outputs/audio_features/transcript_with_speakers.json")
+    build_parser.add_argument('--diarization', default="outputs/audio_features/diarization_segments.json")
+    build_parser.add_argument('--windows', default="data/segments/*_segments.json", help='Glob of window files')
+    build_parser.add_argument('--interruptions', default="outputs/audio_features/interruptions.json")
+
+    words_parser = subparsers.add_parser('words', help='Words of a speaker between t0 and t1')
+    words_parser.add_argument('episode_id')
+    words_parser.add_argument('speaker')
+    words_parser.add_argument('t0', type=float)
+    words_parser.add_argument('t1', type=float)
+
+    segments_parser = subparsers.add_parser('segments', help='Segments overlapping [t0, t1]')
+    segments_parser.add_argument('episode_id')
+    segments_parser.add_argument('t0', type=float)
+    segments_parser.add_argument('t1', type=float)
+    segments_parser.add_argument('--source', default='transcript', choices=['transcript', 'diarization'])
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        def existing(path):
+            if os.path.exists(path):
+                return path
+            print(f"⚠️  Skipping missing input: {path}")
+            return None
+        index_episode(
+            args.episode_id,
+            transcript_path=existing(args.transcript),
+            diarization_path=existing(args.diarization),
+            windows_paths=sorted(glob.glob(args.windows)),
+            interruptions_path=existing(args.interruptions),
+            db_path=args.db
+        )
+        return 0
+
+    conn = connect_index(args.db)
+    t0 = time.perf_counter()
+    if args.command == 'words':
+        results = words_between(conn, args.episode_id, args.t0, args.t1, args.speaker)
+        for w in results:
+            print(f"  {w['start']:>9.2f}-{w['end']:<9.2f} {w['word']}")
+    else:
+        results = segments_overlapping(conn, args.episode_id, args.t0, args.t1, args.source)
+        for s in results:
+            print(f"  {s['start']:>9.2f}-{s['end']:<9.2f} {s['speaker']:<15} {(s['text'] or '')[:60]}")
+    print(f"\n{len(results)} result(s) in {(time.perf_counter() - t0) * 1000:.1f} ms")
+    conn.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
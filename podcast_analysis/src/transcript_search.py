@@ -0,0 +1,348 @@
+"""
+Inverted full-text index over transcript words with timestamp postings.
+
+Builds a keyword/phrase search index from merge_speakers output
+(transcript_with_speakers.json). Every word is normalized (lowercase,
+punctuation stripped) and recorded as a posting
+
+    (position, word_index, speaker, start, end)
+
+where position counts the episode's indexed tokens in time order, so a
+phrase matches when its tokens appear at consecutive positions by the same
+speaker. Postings are stored per (token, episode) as a compact NumPy
+structured array blob (18 bytes per occurrence) in a local SQLite file;
+adding an episode only writes that episode's rows, and a query reads one
+blob per (query token, episode) and intersects positions with searchsorted.
+Episode ids default to the transcript's location (json_stream.
+episode_id_from_path); indexing an id that is already present fails unless
+replacing is requested.
+
+Usage (from the src directory):
+    python transcript_search.py add ../outputs/audio_features/transcript_with_speakers.json --episode-id ep001
+    python transcript_search.py add ../outputs/episodes/*/transcript_with_speakers.json --replace
+    python transcript_search.py search "make america great" --limit 20
+"""
+
+import argparse
+import json
+import os
+import re
+import sqlite3
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from json_stream import episode_id_from_path
+
+TRANSCRIPT_SEARCH_PATH = "outputs/index/transcript_search.sqlite"
+
+POSTING_DTYPE = np.dtype([
+    ('position', '<u4'),
+    ('word_index', '<u4'),
+    ('speaker', '<u2'),
+    ('start', '<f4'),
+    ('end', '<f4'),
+])
+
+_TOKEN_PATTERN = re.compile(r"[^\w']+")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS episodes (
+    id INTEGER PRIMARY KEY,
+    episode_id TEXT UNIQUE NOT NULL,
+    audio_file TEXT,
+    num_tokens INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS speakers (
+    id INTEGER PRIMARY KEY,
+    name TEXT UNIQUE NOT NULL
+);
+CREATE TABLE IF NOT EXISTS vocabulary (
+    id INTEGER PRIMARY KEY,
+    token TEXT UNIQUE NOT NULL
+);
+CREATE TABLE IF NOT EXISTS postings (
+    token INTEGER NOT NULL REFERENCES vocabulary(id),
+    episode INTEGER NOT NULL REFERENCES episodes(id),
+    data BLOB NOT NULL,
+    PRIMARY KEY (token, episode)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS postings_by_episode ON postings(episode);
+"""
+
+
+def normalize_token(word: str) -> str:
+    """Lowercase a word and strip punctuation (keeping inner apostrophes)."""
+    return _TOKEN_PATTERN.sub("", word.lower()).strip("'")
+
+
+def tokenize(text: str) -> List[str]:
+    """Split free text into normalized tokens."""
+    return [t for t in (normalize_token(w) for w in text.split()) if t]
+
+
+def connect_search_index(db_path: str = TRANSCRIPT_SEARCH_PATH) -> sqlite3.Connection:
+    """Open (and create if needed) the search index database."""
+    os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _intern(conn: sqlite3.Connection, table: str, column: str, values) -> Dict[str, int]:
+    """Insert missing values into a lookup table and return value -> id."""
+    values = sorted(set(values))
+    conn.executemany(f"INSERT OR IGNORE INTO {table}({column}) VALUES (?)", [(v,) for v in values])
+    ids = {}
+    # Stay under SQLite's bound-parameter limit
+    for i in range(0, len(values), 500):
+        chunk = values[i:i + 500]
+        ids.update(conn.execute(
+            f"SELECT {column}, id FROM {table} WHERE {column} IN ({','.join('?' * len(chunk))})", chunk
+        ).fetchall())
+    return ids
+
+
+def build_postings(segments: List[Dict]) -> Tuple[List[str], Dict[str, np.ndarray]]:
+    """
+    Build the postings of one episode.
+
+    Words are deduplicated (merge_speakers may attach a word to several
+    overlapping segments of the same speaker) and ordered by start time.
+
+    Args:
+        segments: Transcript segments (speaker, words)
+
+    Returns:
+        tuple: (speakers, postings)
+            - speakers: Sorted speaker names of the episode
+            - postings: token -> POSTING_DTYPE array in position order, with
+              'speaker' holding an index into speakers
+    """
+    words = {}
+    for segment in segments:
+        for word in segment.get('words', []):
+            key = (word['start'], word['end'], segment['speaker'], word['word'])
+            words.setdefault(key, None)
+    ordered = sorted(words)
+
+    speakers = sorted({speaker for _, _, speaker, _ in ordered})
+    speaker_index = {speaker: i for i, speaker in enumerate(speakers)}
+
+    postings = defaultdict(list)
+    position = 0
+    for word_index, (start, end, speaker, word) in enumerate(ordered):
+        token = normalize_token(word)
+        if not token:
+            continue
+        postings[token].append((position, word_index, speaker_index[speaker], start, end))
+        position += 1
+
+    return speakers, {token: np.array(rows, dtype=POSTING_DTYPE) for token, rows in postings.items()}
+
+
+def add_episode(
+    transcript_path: str,
+    episode_id: Optional[str] = None,
+    db_path: str = TRANSCRIPT_SEARCH_PATH,
+    replace: bool = False
+) -> int:
+    """
+    Add one episode to the search index.
+
+    Args:
+        transcript_path: Path to the merge_speakers output for the episode
+        episode_id: Episode identifier. Defaults to episode_id_from_path(transcript_path)
+        db_path: Path of the SQLite index
+        replace: Replace the episode's postings if it is already indexed
+
+    Returns:
+        int: Number of indexed tokens
+
+    Raises:
+        ValueError: If the episode is already indexed and replace is not set
+    """
+    if episode_id is None:
+        episode_id = episode_id_from_path(transcript_path)
+
+    with open(transcript_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    local_speakers, postings = build_postings(data['segments'])
+    num_tokens = int(sum(len(p) for p in postings.values()))
+
+    conn = connect_search_index(db_path)
+    try:
+        with conn:
+            row = conn.execute("SELECT id FROM episodes WHERE episode_id = ?", (episode_id,)).fetchone()
+            if row is not None:
+                if not replace:
+                    raise ValueError(f"Episode '{episode_id}' is already indexed; "
+                                     f"use replace (--replace) to overwrite it")
+                conn.execute("DELETE FROM postings WHERE episode = ?", (row[0],))
+                conn.execute("DELETE FROM episodes WHERE id = ?", (row[0],))
+            episode = conn.execute(
+                "INSERT INTO episodes(episode_id, audio_file, num_tokens) VALUES (?, ?, ?)",
+                (episode_id, data['audio_file'], num_tokens)
+            ).lastrowid
+
+            # Map episode-local speaker indices to global speaker ids
+            speaker_ids = _intern(conn, "speakers", "name", local_speakers)
+            to_global = np.array([speaker_ids[s] for s in local_speakers], dtype='<u2')
+            token_ids = _intern(conn, "vocabulary", "token", postings)
+
+            rows = []
+            for token, records in postings.items():
+                records['speaker'] = to_global[records['speaker']]
+                rows.append((token_ids[token], episode, records.tobytes()))
+            conn.executemany("INSERT INTO postings(token, episode, data) VALUES (?, ?, ?)", rows)
+    finally:
+        conn.close()
+
+    print(f"✅ Indexed episode '{episode_id}': {num_tokens} tokens, {len(postings)} distinct")
+    return num_tokens
+
+
+def search(
+    query: str,
+    db_path: str = TRANSCRIPT_SEARCH_PATH,
+    episode_id: Optional[str] = None,
+    speaker: Optional[str] = None,
+    limit: Optional[int] = None
+) -> List[Dict]:
+    """
+    Find every occurrence of a word or phrase.
+
+    Args:
+        query: Word or phrase; normalized like the indexed words
+        db_path: Path of the SQLite index
+        episode_id: Optional episode to restrict the search to
+        speaker: Optional speaker label to restrict the search to
+        limit: Optional maximum number of hits
+
+    Returns:
+        List of hits (episode_id, speaker, start, end, word_index) ordered by
+        episode and time; start/end span the whole phrase
+    """
+    tokens = tokenize(query)
+    if not tokens:
+        return []
+
+    conn = connect_search_index(db_path)
+    try:
+        token_ids = dict(conn.execute(
+            f"SELECT token, id FROM vocabulary WHERE token IN ({','.join('?' * len(set(tokens)))})",
+            sorted(set(tokens))
+        ).fetchall())
+        if len(token_ids) < len(set(tokens)):
+            return []
+
+        speaker_names = dict(conn.execute("SELECT id, name FROM speakers").fetchall())
+        speaker_filter = None
+        if speaker is not None:
+            speaker_filter = next((i for i, name in speaker_names.items() if name == speaker), None)
+            if speaker_filter is None:
+                return []
+
+        episode_clause, params = "", []
+        if episode_id is not None:
+            episode_clause = "AND e.episode_id = ?"
+            params = [episode_id]
+
+        # Postings of every query token, grouped by episode
+        by_episode = defaultdict(dict)
+        for token in set(tokens):
+            for ep, data in conn.execute(
+                f"SELECT e.episode_id, p.data FROM postings p JOIN episodes e ON e.id = p.episode "
+                f"WHERE p.token = ? {episode_clause}",
+                [token_ids[token]] + params
+            ):
+                by_episode[ep][token] = np.frombuffer(data, dtype=POSTING_DTYPE)
+    finally:
+        conn.close()
+
+    hits = []
+    for ep in sorted(by_episode):
+        postings = by_episode[ep]
+        if len(postings) < len(set(tokens)):
+            continue
+        first = postings[tokens[0]]
+        match = np.ones(len(first), dtype=bool)
+        last = first
+
+        # Phrase adjacency: token k must sit at position + k, said by the same speaker
+        for k, token in enumerate(tokens[1:], start=1):
+            other = postings[token]
+            idx = np.searchsorted(other['position'], first['position'] + k)
+            idx_clipped = np.minimum(idx, len(other) - 1)
+            match &= (idx < len(other)) & (other['position'][idx_clipped] == first['position'] + k)
+            match &= other['speaker'][idx_clipped] == first['speaker']
+            if k == len(tokens) - 1:
+                last = other[idx_clipped]
+
+        if speaker_filter is not None:
+            match &= first['speaker'] == speaker_filter
+
+        for i in np.flatnonzero(match):
+            hits.append({
+                "episode_id": ep,
+                "speaker": speaker_names[int(first['speaker'][i])],
+                "start": float(first['start'][i]),
+                "end": float(last['end'][i]),
+                "word_index": int(first['word_index'][i])
+            })
+            if limit is not None and len(hits) >= limit:
+                return hits
+
+    return hits
+
+
+def main(argv: Optional[List[str]] = None):
+    """Main function for the transcript search CLI."""
+    parser = argparse.ArgumentParser(description='Keyword and phrase search over transcript words')
+    parser.add_argument('--db', default=TRANSCRIPT_SEARCH_PATH, help='SQLite index file')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    add_parser = subparsers.add_parser('add', help='Add or replace episodes')
+    add_parser.add_argument('transcripts', nargs='+', help='transcript_with_speakers.json files')
+    add_parser.add_argument('--episode-id', help='Episode id (only with a single transcript)')
+    add_parser.add_argument('--replace', action='store_true', help='Replace episodes that are already indexed')
+
+    search_parser = subparsers.add_parser('search', help='Find every occurrence of a word or phrase')
+    search_parser.add_argument('query')
+    search_parser.add_argument('--episode-id')
+    search_parser.add_argument('--speaker')
+    search_parser.add_argument('--limit', type=int, default=50)
+    args = parser.parse_args(argv)
+
+    if args.command == 'add':
+        if args.episode_id and len(args.transcripts) > 1:
+            parser.error("--episode-id can only be used with a single transcript")
+        episode_ids = [args.episode_id] if args.episode_id else [episode_id_from_path(p) for p in args.transcripts]
+        duplicates = sorted({e for e in episode_ids if episode_ids.count(e) > 1})
+        if duplicates:
+            print(f"❌ Episode id(s) given more than once: {', '.join(duplicates)}; pass distinct episode ids")
+            return 1
+        for transcript_path, episode_id in zip(args.transcripts, episode_ids):
+            try:
+                add_episode(transcript_path, episode_id, args.db, args.replace)
+            except ValueError as e:
+                print(f"❌ {e}")
+                return 1
+        return 0
+
+    t0 = time.perf_counter()
+    hits = search(args.query, args.db, args.episode_id, args.speaker, args.limit)
+    elapsed = time.perf_counter() - t0
+    for hit in hits:
+        print(f"  {hit['episode_id']:<15} {hit['start'] / 60:>7.2f}min  {hit['speaker']:<15} "
+              f"({hit['start']:.2f}-{hit['end']:.2f}s)")
+    print(f"\n{len(hits)} hit(s) for \"{args.query}\" in {elapsed * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
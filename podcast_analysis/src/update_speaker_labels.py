@@ -2,28 +2,54 @@
 """
 Update Speaker Labels Script
 
-This script updates the speaker labels in the diarization JSON file:
-- S2 -> Joe Rogan
-- S0, S1, S3 -> Donald Trump
+This script updates the speaker labels in the diarization JSON file using a
+cluster -> speaker mapping, e.g. {"S0": "Donald Trump", "S2": "Joe Rogan"}.
+The mapping is produced by voiceprints.py (identify) from the enrolled
+voiceprint library, or can be written by hand.
 """
 
+import argparse
 import json
 import sys
 from pathlib import Path
+from typing import List, Optional
 
-def update_speaker_labels(input_file, output_file=None):
+from config import SPEAKER_MAPPING_PATH
+
+
+def load_speaker_mapping(mapping_file=SPEAKER_MAPPING_PATH):
+    """
+    Load a cluster -> speaker mapping.
+    
+    Args:
+        mapping_file (str): voiceprints.py output ({"mapping": {...}, ...}) or a plain {label: name} JSON
+    
+    Returns:
+        dict: Cluster label -> speaker name
+    """
+    with open(mapping_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return data.get('mapping', data)
+
+
+def update_speaker_labels(input_file, output_file=None, speaker_mapping=None):
     """
     Update speaker labels in diarization JSON file.
     
     Args:
         input_file (str): Path to input JSON file
         output_file (str): Path to output JSON file (if None, overwrites input)
+        speaker_mapping (dict or str): Cluster label -> speaker name, or a mapping file
+            (if None, SPEAKER_MAPPING_PATH is used)
     """
     
     # If no output file specified, overwrite the input file
     if output_file is None:
         output_file = input_file
     
+    if speaker_mapping is None or isinstance(speaker_mapping, str):
+        speaker_mapping = load_speaker_mapping(speaker_mapping or SPEAKER_MAPPING_PATH)
+    
     print(f"📖 Reading diarization data from: {input_file}")
     
     # Load the JSON data
@@ -42,12 +68,6 @@ def update_speaker_labels(input_file, output_file=None):
     
     # Update speaker labels according to the mapping
     updated_count = 0
-    speaker_mapping = {
-        'S0': 'Donald Trump',
-        'S1': 'Donald Trump', 
-        'S2': 'Joe Rogan',
-        'S3': 'Donald Trump'
-    }
     
     print(f"🔄 Applying speaker label mapping:")
     for old_label, new_label in speaker_mapping.items():
@@ -80,21 +100,26 @@ def update_speaker_labels(input_file, output_file=None):
     
     return data
 
-def main():
+def main(argv: Optional[List[str]] = None):
     """Main function to run the speaker label update."""
-    
-    # Default file path
-    input_file = "outputs/audio_features/diarization_segments.json"
-    
-    # Check if file exists
-    if not Path(input_file).exists():
-        print(f"❌ Error: File not found: {input_file}")
-        print(f"   Please run this script from the podcast_analysis directory.")
-        return 1
+    parser = argparse.ArgumentParser(description='Apply a cluster -> speaker mapping to diarization labels')
+    parser.add_argument('--input', default="outputs/audio_features/diarization_segments.json")
+    parser.add_argument('--output', default=None, help='Output file (default: overwrite input)')
+    parser.add_argument('--mapping', default=SPEAKER_MAPPING_PATH, help='Mapping JSON (see voiceprints.py identify)')
+    args = parser.parse_args(argv)
+    
+    # Check if files exist
+    for path in (args.input, args.mapping):
+        if not Path(path).exists():
+            print(f"❌ Error: File not found: {path}")
+            print(f"   Please run this script from the podcast_analysis directory.")
+            if path == args.mapping:
+                print(f"   Create the mapping with: python src/voiceprints.py identify")
+            return 1
     
     try:
         # Update the speaker labels
-        update_speaker_labels(input_file)
+        update_speaker_labels(args.input, args.output, args.mapping)
         return 0
         
     except Exception as e:
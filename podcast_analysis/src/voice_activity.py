@@ -0,0 +1,438 @@
+"""
+Voice activity detection (VAD) for the mono podcast.
+
+Finds the speech regions of podcast_16k_mono.wav so that the ASR and
+diarization stages can skip silences, music beds and ad breaks:
+
+- "energy" (default): framewise log energy with hysteresis above the noise
+  floor, gated by spectral flux over log band energies. Speech changes its spectrum every syllable,
+  while steady beds, hum and noise do not, so energetic frames whose smoothed
+  flux stays near the background level are rejected. The decoded signal is read in
+  blocks from the shared PCM cache (pcm_cache.py) and every block is framed
+  with strided views and one batched FFT.
+- "webrtc": the small WebRTC VAD model (pip install webrtcvad), used when
+  installed; falls back to "energy" otherwise.
+
+Regions are padded, short pauses are bridged and the result is written to
+speech_regions.json. The file records the source size/mtime and parameters,
+so a restart with unchanged input reuses it instead of recomputing.
+
+Consumers concatenate the regions into one shorter signal
+(concatenate_regions), process it, and map times back with
+to_source_time / split_to_source.
+"""
+
+import argparse
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import soundfile as sf
+from numpy.lib.stride_tricks import sliding_window_view
+
+from config import AUDIO_WAV_PATH, PCM_CACHE_DIR, SPEECH_REGIONS_PATH
+from frame_activity import hysteresis, mask_runs, smooth_activity
+from pcm_cache import pcm_blocks
+
+FRAME_SEC = 0.025
+HOP_SEC = 0.010
+NOISE_FLOOR_PERCENTILE = 10
+ON_THRESHOLD_DB = 12.0
+OFF_THRESHOLD_DB = 6.0
+FLUX_SMOOTHING_SEC = 0.5
+NUM_BANDS = 24
+FLUX_RATIO = 1.3  # smoothed flux must exceed the background flux by this factor
+PAD_SEC = 0.2
+MIN_SPEECH_SEC = 0.3
+MIN_SILENCE_SEC = 1.0  # shorter pauses are kept: skipping them saves little and cuts words
+BLOCK_FRAMES = 6000  # frames per streamed block (1 minute at a 10 ms hop)
+WEBRTC_FRAME_SEC = 0.03
+WEBRTC_AGGRESSIVENESS = 2
+
+
+def frame_features(
+    path: str,
+    frame_sec: float = FRAME_SEC,
+    hop_sec: float = HOP_SEC,
+    cache_dir: Optional[str] = PCM_CACHE_DIR
+) -> Tuple[np.ndarray, np.ndarray, int]:
+    """
+    Framewise log energy and log band energies of a mono audio file.
+
+    Args:
+        path: Mono audio file
+        frame_sec: Frame length in seconds
+        hop_sec: Hop between frames in seconds
+        cache_dir: PCM cache directory, None to read the file directly
+
+    Returns:
+        tuple: (energy in dB per frame, (frames, bands) float32 band energies in dB, sample rate)
+    """
+    sr = sf.info(path).samplerate
+    frame = int(round(frame_sec * sr))
+    hop = int(round(hop_sec * sr))
+    window = np.hanning(frame).astype(np.float32)
+    # Log-spaced bands above ~80 Hz, so a band change weighs the same at any pitch
+    band_edges = np.unique(np.geomspace(max(1, int(80 * frame / sr)), frame // 2 + 1, NUM_BANDS + 1).astype(int))
+
+    energies, bands = [], []
+    blocksize = BLOCK_FRAMES * hop + (frame - hop)
+    for block in pcm_blocks(path, blocksize, overlap=frame - hop, cache_dir=cache_dir):
+        if block.ndim > 1:
+            block = block.mean(axis=1)
+        if len(block) < frame:
+            break
+        frames = sliding_window_view(block, frame)[::hop]
+        energies.append(np.einsum('ij,ij->i', frames, frames, dtype=np.float64) / frame)
+
+        power = np.abs(np.fft.rfft(frames * window, axis=1)) ** 2
+        band_power = np.add.reduceat(power, band_edges[:-1], axis=1)
+        bands.append((10.0 * np.log10(band_power + 1e-10)).astype(np.float32))
+
+    if not energies:
+        return np.zeros(0), np.zeros((0, len(band_edges) - 1), dtype=np.float32), sr
+    return 10.0 * np.log10(np.concatenate(energies) + 1e-12), np.concatenate(bands), sr
+
+
+def spectral_flux(band_db: np.ndarray) -> np.ndarray:
+    """
+    Positive spectral flux per frame over log band energies.
+
+    Every band is floored at its own noise level first, so fluctuations of
+    the background noise do not count as spectral change.
+
+    Args:
+        band_db: (frames, bands) band energies in dB
+
+    Returns:
+        np.ndarray: Mean dB increase across bands from the previous frame
+    """
+    if len(band_db) == 0:
+        return np.zeros(0)
+    floored = np.maximum(band_db, np.percentile(band_db, NOISE_FLOOR_PERCENTILE, axis=0))
+    rise = np.diff(floored, axis=0, prepend=floored[:1])
+    return np.maximum(rise, 0.0).mean(axis=1)
+
+
+def energy_flux_activity(
+    energy_db: np.ndarray,
+    flux: np.ndarray,
+    hop_sec: float = HOP_SEC,
+    on_db: float = ON_THRESHOLD_DB,
+    off_db: float = OFF_THRESHOLD_DB,
+    flux_ratio: float = FLUX_RATIO
+) -> np.ndarray:
+    """
+    Per-frame speech activity from energy and spectral flux.
+
+    Args:
+        energy_db: Energy in dB per frame
+        flux: Spectral flux per frame
+        hop_sec: Hop between frames in seconds
+        on_db: Opening threshold above the noise floor
+        off_db: Closing threshold above the noise floor
+        flux_ratio: Required smoothed flux relative to the flux of the background
+
+    Returns:
+        np.ndarray: Boolean activity per frame
+    """
+    if len(energy_db) == 0:
+        return np.zeros(0, dtype=bool)
+
+    floor = np.percentile(energy_db, NOISE_FLOOR_PERCENTILE)
+    above_on = energy_db > floor + on_db
+    above_off = energy_db > floor + off_db
+
+    width = max(1, int(round(FLUX_SMOOTHING_SEC / hop_sec)))
+    smoothed = np.convolve(flux, np.ones(width) / width, mode='same')
+    # Background flux: low percentile over quiet frames, like the energy floor
+    # (pauses next to speech still pick up flux from the surrounding onsets)
+    quiet = ~above_off
+    if quiet.any():
+        flux_floor = np.percentile(smoothed[quiet], NOISE_FLOOR_PERCENTILE)
+        flux_ok = smoothed > flux_ratio * flux_floor
+        above_on &= flux_ok
+        above_off &= flux_ok
+
+    return hysteresis(above_on, above_off)
+
+
+def webrtc_activity(path: str, aggressiveness: int = WEBRTC_AGGRESSIVENESS) -> Tuple[np.ndarray, float]:
+    """
+    Per-frame speech activity from the WebRTC VAD model.
+
+    Args:
+        path: Mono 16-bit compatible audio file (8/16/32/48 kHz)
+        aggressiveness: 0 (least) to 3 (most aggressive non-speech filtering)
+
+    Returns:
+        tuple: (boolean activity per WEBRTC_FRAME_SEC frame, frame hop in seconds)
+    """
+    import webrtcvad
+
+    vad = webrtcvad.Vad(aggressiveness)
+    sr = sf.info(path).samplerate
+    frame = int(WEBRTC_FRAME_SEC * sr)
+
+    activity = []
+    for block in sf.blocks(path, blocksize=BLOCK_FRAMES * frame, dtype='int16', always_2d=False):
+        if block.ndim > 1:
+            block = block.mean(axis=1).astype(np.int16)
+        usable = len(block) // frame * frame
+        activity.extend(vad.is_speech(chunk.tobytes(), sr) for chunk in block[:usable].reshape(-1, frame))
+    return np.array(activity, dtype=bool), WEBRTC_FRAME_SEC
+
+
+def activity_to_regions(
+    active: np.ndarray,
+    hop_sec: float,
+    duration_sec: float,
+    pad_sec: float = PAD_SEC,
+    min_speech_sec: float = MIN_SPEECH_SEC,
+    min_silence_sec: float = MIN_SILENCE_SEC
+) -> List[Dict[str, float]]:
+    """
+    Turn per-frame activity into padded, merged speech regions.
+
+    Args:
+        active: Boolean activity per frame
+        hop_sec: Hop between frames in seconds
+        duration_sec: Audio duration (regions are clipped to it)
+        pad_sec: Padding added on both sides of every region
+        min_speech_sec: Shorter bursts are dropped
+        min_silence_sec: Shorter pauses are kept inside a region
+
+    Returns:
+        List of {"start", "end"} regions in seconds, sorted and non-overlapping
+    """
+    active = smooth_activity(active, int(round(min_speech_sec / hop_sec)), int(round(min_silence_sec / hop_sec)))
+    starts, ends = mask_runs(active)
+    if len(starts) == 0:
+        return []
+
+    starts = np.maximum(starts * hop_sec - pad_sec, 0.0)
+    ends = np.minimum(ends * hop_sec + pad_sec, duration_sec)
+    # Padding can bring regions closer than min_silence_sec again: merge them
+    new_region = np.ones(len(starts), dtype=bool)
+    new_region[1:] = starts[1:] - ends[:-1] >= min_silence_sec
+    firsts = np.flatnonzero(new_region)
+    lasts = np.append(firsts[1:], len(starts)) - 1
+    return [
+        {"start": round(float(starts[f]), 2), "end": round(float(ends[l]), 2)}
+        for f, l in zip(firsts, lasts)
+    ]
+
+
+def _source_fingerprint(path: str) -> Dict[str, Any]:
+    """Size and modification time of the audio file, used to validate a cached result."""
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime": stat.st_mtime}
+
+
+def detect_speech_regions(
+    audio_file_path: str = AUDIO_WAV_PATH,
+    output_file_path: str = SPEECH_REGIONS_PATH,
+    method: str = "energy",
+    pad_sec: float = PAD_SEC,
+    min_speech_sec: float = MIN_SPEECH_SEC,
+    min_silence_sec: float = MIN_SILENCE_SEC,
+    force: bool = False,
+    cache_dir: Optional[str] = PCM_CACHE_DIR
+) -> Dict[str, Any]:
+    """
+    Detect speech regions and save them to speech_regions.json.
+
+    Args:
+        audio_file_path: Mono audio file
+        output_file_path: Path to save the speech regions JSON
+        method: "energy" or "webrtc"
+        pad_sec: Padding added on both sides of every region
+        min_speech_sec: Shorter bursts are dropped
+        min_silence_sec: Shorter pauses are kept inside a region
+        force: Recompute even if an up-to-date result exists
+        cache_dir: PCM cache directory, None to read the file without caching it
+
+    Returns:
+        dict: audio_file, duration_sec, speech_sec, method, parameters and regions
+    """
+    if not os.path.exists(audio_file_path):
+        raise FileNotFoundError(f"Audio file not found: {audio_file_path}")
+
+    parameters = {"pad_sec": pad_sec, "min_speech_sec": min_speech_sec, "min_silence_sec": min_silence_sec}
+    fingerprint = _source_fingerprint(audio_file_path)
+    if not force and os.path.exists(output_file_path):
+        with open(output_file_path, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+        if (cached.get("source") == fingerprint and cached.get("requested_method") == method
+                and cached.get("parameters") == parameters):
+            print(f"✅ Reusing speech regions from: {output_file_path}")
+            return cached
+
+    print(f"🔊 Detecting speech regions ({method}) in: {audio_file_path}")
+    t0 = time.perf_counter()
+    duration = sf.info(audio_file_path).duration
+
+    used_method = method
+    active = None
+    if method == "webrtc":
+        try:
+            active, hop = webrtc_activity(audio_file_path)
+        except ImportError:
+            print("⚠️  webrtcvad not installed (pip install webrtcvad); using the energy detector")
+            used_method = "energy"
+    elif method != "energy":
+        raise ValueError(f"Unknown VAD method: {method}")
+    if active is None:
+        energy_db, band_db, _ = frame_features(audio_file_path, cache_dir=cache_dir)
+        active, hop = energy_flux_activity(energy_db, spectral_flux(band_db)), HOP_SEC
+
+    regions = activity_to_regions(active, hop, duration, pad_sec, min_speech_sec, min_silence_sec)
+    speech_sec = sum(r["end"] - r["start"] for r in regions)
+
+    result = {
+        "audio_file": audio_file_path,
+        "source": fingerprint,
+        "requested_method": method,
+        "method": used_method,
+        "parameters": parameters,
+        "duration_sec": round(duration, 2),
+        "speech_sec": round(speech_sec, 2),
+        "regions": regions
+    }
+
+    output_dir = Path(output_file_path).parent
+    output_dir.mkdir(parents=True, exist_ok=True)
+    with open(output_file_path, 'w', encoding='utf-8') as f:
+        json.dump(result, f, indent=2)
+
+    print(f"✅ {len(regions)} speech regions, {speech_sec / 60:.1f} of {duration / 60:.1f} min "
+          f"({speech_sec / duration * 100 if duration else 0:.1f}%) in {time.perf_counter() - t0:.2f}s")
+    print(f"💾 Saved speech regions to: {output_file_path}")
+    return result
+
+
+def load_speech_regions(path: str = SPEECH_REGIONS_PATH) -> List[Dict[str, float]]:
+    """Load the regions list of a speech_regions.json file."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)['regions']
+
+
+def concatenate_regions(audio: np.ndarray, sr: int, regions: List[Dict[str, float]]) -> np.ndarray:
+    """
+    Concatenate the speech regions of a signal into one shorter signal.
+
+    Args:
+        audio: Mono signal
+        sr: Sample rate
+        regions: Speech regions in seconds
+
+    Returns:
+        np.ndarray: The regions back to back
+    """
+    if not regions:
+        return audio[:0]
+    return np.concatenate([audio[int(r['start'] * sr):int(r['end'] * sr)] for r in regions])
+
+
+def _region_offsets(regions: List[Dict[str, float]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Source starts, source ends and concatenated-signal starts of the regions."""
+    starts = np.array([r['start'] for r in regions], dtype=np.float64)
+    ends = np.array([r['end'] for r in regions], dtype=np.float64)
+    concat_starts = np.concatenate(([0.0], np.cumsum(ends - starts)[:-1]))
+    return starts, ends, concat_starts
+
+
+def to_source_time(times, regions: List[Dict[str, float]], is_end: bool = False) -> np.ndarray:
+    """
+    Map times in the concatenated signal back to the source recording.
+
+    Args:
+        times: Scalar or array of times in the concatenated signal
+        regions: Regions used by concatenate_regions
+        is_end: Map a time on a region boundary to the end of the earlier
+            region (for end times) instead of the start of the later one
+
+    Returns:
+        np.ndarray: Times in the source recording
+    """
+    times = np.asarray(times, dtype=np.float64)
+    if not regions:
+        return times
+    starts, _, concat_starts = _region_offsets(regions)
+    idx = np.searchsorted(concat_starts, times, side='left' if is_end else 'right') - 1
+    idx = np.clip(idx, 0, len(regions) - 1)
+    return starts[idx] + (times - concat_starts[idx])
+
+
+def map_segments_to_source(segments: List[Dict[str, Any]], regions: List[Dict[str, float]]) -> None:
+    """
+    Map the start/end times of segments (and their words) back to the source, in place.
+
+    Args:
+        segments: Segments with start, end and optional words (start, end)
+        regions: Regions used by concatenate_regions
+    """
+    items = list(segments) + [w for s in segments for w in s.get('words', [])]
+    if not items or not regions:
+        return
+    starts = to_source_time([item['start'] for item in items], regions)
+    ends = to_source_time([item['end'] for item in items], regions, is_end=True)
+    for item, start, end in zip(items, starts.tolist(), ends.tolist()):
+        item['start'], item['end'] = start, end
+
+
+def split_to_source(start: float, end: float, regions: List[Dict[str, float]]) -> List[Tuple[float, float]]:
+    """
+    Map an interval of the concatenated signal to source intervals.
+
+    An interval crossing a region boundary is split so that no part of it
+    covers the skipped audio in between.
+
+    Args:
+        start: Interval start in the concatenated signal
+        end: Interval end in the concatenated signal
+        regions: Regions used by concatenate_regions
+
+    Returns:
+        List of (start, end) intervals in the source recording
+    """
+    if not regions:
+        return [(start, end)]
+    starts, ends, concat_starts = _region_offsets(regions)
+    concat_ends = concat_starts + (ends - starts)
+    first = max(int(np.searchsorted(concat_starts, start, side='right')) - 1, 0)
+    last = int(np.searchsorted(concat_starts, end, side='left'))
+
+    pieces = []
+    for i in range(first, last):
+        lo, hi = max(start, concat_starts[i]), min(end, concat_ends[i])
+        if hi > lo:
+            pieces.append((float(starts[i] + lo - concat_starts[i]), float(starts[i] + hi - concat_starts[i])))
+    return pieces
+
+
+def main(argv: Optional[List[str]] = None):
+    """Main function to detect the speech regions of the mono podcast."""
+    parser = argparse.ArgumentParser(description='Detect speech regions for the ASR and diarization stages')
+    parser.add_argument('--audio', default=AUDIO_WAV_PATH, help='Mono audio file')
+    parser.add_argument('--output', default=SPEECH_REGIONS_PATH, help='Speech regions JSON')
+    parser.add_argument('--method', choices=['energy', 'webrtc'], default='energy')
+    parser.add_argument('--force', action='store_true', help='Recompute even if the output is up to date')
+    parser.add_argument('--no-pcm-cache', action='store_true',
+                        help='Read the audio directly instead of caching its decoded samples')
+    args = parser.parse_args(argv)
+
+    try:
+        detect_speech_regions(args.audio, args.output, args.method, force=args.force,
+                              cache_dir=None if args.no_pcm_cache else PCM_CACHE_DIR)
+    except Exception as e:
+        print(f"❌ Voice activity detection failed: {str(e)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
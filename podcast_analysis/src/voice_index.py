@@ -0,0 +1,645 @@
+"""
+Corpus-wide index of per-segment speaker embeddings ("where else does this voice appear").
+
+Every indexed diarization segment contributes one L2-normalized speaker
+embedding (speaker_embedding.py) stored as float16, so a query voice can be
+matched against the whole archive without re-diarizing it:
+
+- raw MFCC statistics score close to 1 between any two voices, so vectors
+  are standardized per dimension before normalization, both when stored and
+  when querying, with the statistics of voiceprints.library_statistics: from
+  the voiceprint library when it holds at least two speakers of the index's
+  method, otherwise from the speaker clusters of the first indexed episode.
+  They are kept in meta.json and fixed for the life of the index. Results
+  below MIN_SIMILARITY are dropped, so episodes where the voice never
+  speaks are not reported
+- vectors.f16 and segments.bin are raw append-only files (float16 rows and
+  (episode, speaker, start, end) records) read through np.memmap; meta.json
+  holds the row count, episodes and label vocabulary and is written last,
+  so an interrupted append leaves the index at its previous state
+- removing an episode or training the IVF layer writes a new generation of
+  the data files (vectors.<n>.f16, ...) and switches to it by replacing
+  meta.json, so a crash at any point leaves a consistent index; the previous
+  generation is kept for readers that loaded the old meta.json and deleted
+  one switch later
+- add, remove and train hold an exclusive lock on <index dir>/.lock (fcntl)
+  and re-read meta.json under it, so concurrent writers (job_server workers)
+  are serialized; readers do not lock
+- flat search scores all rows in chunks (float16 -> float32 matmul) and
+  keeps a running top-k; it is exact and is used up to FLAT_SEARCH_ROWS
+- an IVF layer (spherical k-means centroids, one inverted list per
+  centroid) can be trained once the corpus is large; queries then score
+  only the rows of the NPROBE closest lists. Rows appended after training
+  are assigned to the existing centroids.
+
+Usage (from the podcast_analysis directory):
+    python src/voice_index.py add --episode-id ep001 --audio data/processed/podcast_16k_mono.wav
+    python src/voice_index.py train
+    python src/voice_index.py query --voiceprint "Joe Rogan" --per-episode
+    python src/voice_index.py query --audio clip.wav -k 20
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import soundfile as sf
+
+from config import VOICEPRINTS_PATH
+from speaker_embedding import MIN_EMBEDDING_SEC, load_speaker_embedder
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows: writers are not serialized there
+    fcntl = None
+
+VOICE_INDEX_DIR = "outputs/index/voice_index"
+
+SEGMENT_DTYPE = np.dtype([("episode", "<i4"), ("speaker", "<i4"), ("start", "<f4"), ("end", "<f4")])
+DATA_FILES = ("vectors.f16", "segments.bin", "ivf_assign.i4", "ivf_centroids.npy")
+SEARCH_CHUNK_ROWS = 262144
+FLAT_SEARCH_ROWS = 500000  # below this, exact search is fast enough
+NPROBE = 8
+IVF_TRAIN_SAMPLE = 100000
+IVF_ITERATIONS = 10
+IVF_MIN_POINTS_PER_LIST = 39
+MAX_SNIPPET_SEC = 10.0
+# Calibrated on standardized MFCC embeddings of the synthetic voices in
+# tests/test_voiceprints.py (four speakers behind the statistics): segments
+# of the query voice scored 0.45-0.85 against its voiceprint, segments of
+# other voices at most 0.41. Queries from a single clip are noisier.
+MIN_SIMILARITY = 0.45
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+
+def standardization_statistics(
+    embeddings: np.ndarray,
+    segments: List[Dict[str, Any]],
+    method: str,
+    library: Optional[Dict[str, Any]] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Per-dimension (center, scale) that standardize a new index's embeddings.
+
+    Args:
+        embeddings: (n, dim) raw embeddings of the first indexed episode
+        segments: n segments with speaker labels
+        method: Embedding method the vectors come from
+        library: Voiceprint library, used when it holds two or more speakers of method
+
+    Returns:
+        tuple: (center, scale) from voiceprints.library_statistics
+    """
+    from voiceprints import enroll_embeddings, library_statistics
+
+    if library is not None and library["method"] == method and len(library["speakers"]) >= 2:
+        return library_statistics(library)
+    clusters = {"method": None, "speakers": {}}
+    labels = np.array([s["speaker"] for s in segments])
+    for label in np.unique(labels):
+        enroll_embeddings(clusters, str(label), embeddings[labels == label], 0.0, method)
+    return library_statistics(clusters)
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k largest scores, best first."""
+    if len(scores) > k:
+        candidates = np.argpartition(scores, -k)[-k:]
+    else:
+        candidates = np.arange(len(scores))
+    return candidates[np.argsort(scores[candidates])[::-1]]
+
+
+class VoiceIndex:
+    """Append-only float16 embedding index with flat and IVF top-k search."""
+
+    def __init__(self, index_dir: str = VOICE_INDEX_DIR):
+        self.index_dir = Path(index_dir)
+        self._lock_depth = 0
+        self._load_meta()
+
+    # -- storage -------------------------------------------------------------
+
+    def _load_meta(self) -> None:
+        meta_path = self.index_dir / "meta.json"
+        if meta_path.exists():
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                self.meta = json.load(f)
+        else:
+            self.meta = {"method": None, "dim": None, "count": 0, "episodes": [], "labels": [], "ivf": None}
+        self._label_codes = {label: i for i, label in enumerate(self.meta["labels"])}
+        self._vectors = self._segments = self._ivf = None
+
+    @contextmanager
+    def _locked(self):
+        """Hold the index's exclusive writer lock, with meta.json re-read under it (re-entrant)."""
+        if self._lock_depth:
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+            return
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.index_dir / ".lock", 'a') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            self._lock_depth = 1
+            try:
+                self._load_meta()
+                yield
+            finally:
+                self._lock_depth = 0
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _standardize(self, vectors: np.ndarray) -> np.ndarray:
+        """Standardize with the index statistics (if any) and L2-normalize."""
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        if self.meta.get("center") is not None:
+            center = np.asarray(self.meta["center"], dtype=np.float32)
+            vectors = (vectors - center) / np.asarray(self.meta["scale"], dtype=np.float32)
+        return _normalize(vectors)
+
+    @property
+    def count(self) -> int:
+        return self.meta["count"]
+
+    @property
+    def generation(self) -> int:
+        return self.meta.get("generation", 0)
+
+    def _path(self, name: str, generation: Optional[int] = None) -> Path:
+        """Path of a data file in the current (or the given) generation."""
+        generation = self.generation if generation is None else generation
+        if generation and name in DATA_FILES:
+            stem, ext = name.split(".")
+            name = f"{stem}.{generation}.{ext}"
+        return self.index_dir / name
+
+    def _save_meta(self) -> None:
+        tmp = self._path("meta.json.tmp")
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.meta, f, indent=2, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self._path("meta.json"))
+        self._vectors = self._segments = self._ivf = None
+
+    def _switch_generation(self, generation: int) -> None:
+        """Commit the data files written for a new generation; files older than the previous one are deleted."""
+        self.meta["generation"] = generation
+        self._save_meta()
+        for name in DATA_FILES:
+            stem, ext = name.split(".")
+            for path in self.index_dir.glob(f"{stem}*.{ext}"):
+                suffix = path.name[len(stem):-len(ext) - 1].lstrip(".")
+                file_generation = int(suffix) if suffix.isdigit() else 0 if not suffix else None
+                if file_generation is not None and file_generation < generation - 1:
+                    path.unlink(missing_ok=True)
+
+    @staticmethod
+    def _write_durably(array: np.ndarray, path: Path) -> None:
+        """Write a new-generation file (unlinked first: a leftover may be a hard link to live data)."""
+        path.unlink(missing_ok=True)
+        with open(path, 'wb') as f:
+            if path.suffix == ".npy":
+                np.save(f, array)
+            else:
+                array.tofile(f)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _truncate(self, name: str, itemsize: int) -> None:
+        """Drop rows beyond the committed count (left by an interrupted append)."""
+        path = self._path(name)
+        if path.exists() and path.stat().st_size > self.count * itemsize:
+            os.truncate(path, self.count * itemsize)
+
+    @property
+    def vectors(self) -> np.ndarray:
+        """(count, dim) float16 memmap of normalized embeddings."""
+        if self._vectors is None:
+            if self.count == 0:
+                return np.zeros((0, self.meta["dim"] or 0), dtype=np.float16)
+            self._vectors = np.memmap(self._path("vectors.f16"), dtype=np.float16, mode='r',
+                                      shape=(self.count, self.meta["dim"]))
+        return self._vectors
+
+    @property
+    def segments(self) -> np.ndarray:
+        """(count,) structured memmap of (episode, speaker, start, end)."""
+        if self._segments is None:
+            if self.count == 0:
+                return np.zeros(0, dtype=SEGMENT_DTYPE)
+            self._segments = np.memmap(self._path("segments.bin"), dtype=SEGMENT_DTYPE, mode='r', shape=(self.count,))
+        return self._segments
+
+    # -- writing -------------------------------------------------------------
+
+    def add(self, episode_id: str, audio_file: str, embeddings: np.ndarray, segments: List[Dict[str, Any]],
+            method: str, library: Optional[Dict[str, Any]] = None) -> int:
+        """
+        Append one episode's segment embeddings (replacing the episode if already indexed).
+
+        Args:
+            episode_id: Episode identifier
+            audio_file: Audio the segment times refer to
+            embeddings: (n, dim) raw embeddings, one per segment
+            segments: n segments with speaker/start/end
+            method: Embedding method the vectors come from
+            library: Voiceprint library whose statistics standardize a new index
+                (see standardization_statistics)
+
+        Returns:
+            int: Number of rows added
+        """
+        with self._locked():
+            return self._add(episode_id, audio_file, embeddings, segments, method, library)
+
+    def _add(self, episode_id: str, audio_file: str, embeddings: np.ndarray, segments: List[Dict[str, Any]],
+             method: str, library: Optional[Dict[str, Any]]) -> int:
+        embeddings = np.atleast_2d(np.asarray(embeddings, dtype=np.float32))
+        if self.meta["method"] not in (None, method):
+            raise ValueError(f"Index holds {self.meta['method']} embeddings; cannot add {method} embeddings")
+        if self.meta["dim"] not in (None, embeddings.shape[1]):
+            raise ValueError(f"Index dimension is {self.meta['dim']}, got {embeddings.shape[1]}")
+        if any(e["episode_id"] == episode_id for e in self.meta["episodes"]):
+            self._remove_episode(episode_id)
+
+        if self.count == 0 and "center" not in self.meta:
+            center, scale = standardization_statistics(embeddings, segments, method, library)
+            self.meta["center"] = [round(float(v), 6) for v in center]
+            self.meta["scale"] = [round(float(v), 6) for v in scale]
+        embeddings = self._standardize(embeddings)
+        self.meta["method"] = method
+        self.meta["dim"] = int(embeddings.shape[1])
+        for name, dtype in (("vectors.f16", np.dtype(np.float16).itemsize * self.meta["dim"]),
+                            ("segments.bin", SEGMENT_DTYPE.itemsize),
+                            ("ivf_assign.i4", 4)):
+            self._truncate(name, dtype)
+
+        records = np.zeros(len(segments), dtype=SEGMENT_DTYPE)
+        records["episode"] = len(self.meta["episodes"])
+        records["speaker"] = [self._label_codes.setdefault(s["speaker"], len(self._label_codes)) for s in segments]
+        records["start"] = [s["start"] for s in segments]
+        records["end"] = [s["end"] for s in segments]
+
+        with open(self._path("vectors.f16"), 'ab') as f:
+            embeddings.astype(np.float16).tofile(f)
+        with open(self._path("segments.bin"), 'ab') as f:
+            records.tofile(f)
+        if self.meta["ivf"] is not None:
+            centroids = np.load(self._path("ivf_centroids.npy"))
+            with open(self._path("ivf_assign.i4"), 'ab') as f:
+                self._assign(embeddings, centroids).astype("<i4").tofile(f)
+
+        self.meta["episodes"].append({"episode_id": episode_id, "audio_file": audio_file,
+                                      "first_row": self.count, "num_rows": len(records)})
+        self.meta["labels"] = list(self._label_codes)
+        self.meta["count"] += len(records)
+        self._save_meta()
+        return len(records)
+
+    def remove_episode(self, episode_id: str) -> None:
+        """Remove an episode's rows (writes a new generation of the data files)."""
+        with self._locked():
+            self._remove_episode(episode_id)
+
+    def _remove_episode(self, episode_id: str) -> None:
+        position = next(i for i, e in enumerate(self.meta["episodes"]) if e["episode_id"] == episode_id)
+        keep = np.asarray(self.segments["episode"]) != position
+        records = np.array(self.segments[keep])
+        records["episode"] -= (records["episode"] > position)
+        new = self.generation + 1
+
+        self._write_durably(np.array(self.vectors[keep]), self._path("vectors.f16", new))
+        self._write_durably(records, self._path("segments.bin", new))
+        if self.meta["ivf"] is not None:
+            assign = np.fromfile(self._path("ivf_assign.i4"), dtype="<i4", count=self.count)[keep]
+            self._write_durably(assign, self._path("ivf_assign.i4", new))
+            self._write_durably(np.load(self._path("ivf_centroids.npy")), self._path("ivf_centroids.npy", new))
+        self._vectors = self._segments = None
+
+        del self.meta["episodes"][position]
+        first_row = 0
+        for episode in self.meta["episodes"]:
+            episode["first_row"] = first_row
+            first_row += episode["num_rows"]
+        self.meta["count"] = len(records)
+        self._switch_generation(new)
+
+    @staticmethod
+    def _assign(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+        """Nearest centroid of each row (chunked)."""
+        labels = np.empty(len(vectors), dtype=np.int32)
+        chunk_rows = max(1024, (1 << 24) // len(centroids))  # keeps the score block around 64 MB
+        for begin in range(0, len(vectors), chunk_rows):
+            chunk = np.asarray(vectors[begin:begin + chunk_rows], dtype=np.float32)
+            labels[begin:begin + len(chunk)] = (chunk @ centroids.T).argmax(axis=1)
+        return labels
+
+    def train_ivf(self, nlist: Optional[int] = None, iterations: int = IVF_ITERATIONS, seed: int = 0) -> int:
+        """
+        Train IVF centroids (spherical k-means on a sample) and assign every row.
+
+        Args:
+            nlist: Number of inverted lists (default: 4 * sqrt(rows), at most one per
+                IVF_MIN_POINTS_PER_LIST training rows)
+            iterations: k-means iterations
+            seed: Random seed for the sample and initial centroids
+
+        Returns:
+            int: Number of lists
+        """
+        with self._locked():
+            return self._train_ivf(nlist, iterations, seed)
+
+    def _train_ivf(self, nlist: Optional[int], iterations: int, seed: int) -> int:
+        if self.count == 0:
+            raise ValueError("Cannot train an empty index")
+        default = min(int(4 * np.sqrt(self.count)), max(1, min(self.count, IVF_TRAIN_SAMPLE) // IVF_MIN_POINTS_PER_LIST))
+        nlist = min(nlist or default, self.count)
+        rng = np.random.default_rng(seed)
+        sample_rows = np.sort(rng.choice(self.count, size=min(self.count, IVF_TRAIN_SAMPLE), replace=False))
+        sample = np.asarray(self.vectors[sample_rows], dtype=np.float32)
+
+        centroids = sample[rng.choice(len(sample), size=nlist, replace=False)]
+        for _ in range(iterations):
+            labels = (sample @ centroids.T).argmax(axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            empty = np.bincount(labels, minlength=nlist) == 0
+            sums[empty] = sample[rng.choice(len(sample), size=int(empty.sum()))]
+            centroids = _normalize(sums)
+
+        # The row files carry over to the new generation unchanged (hard links when supported)
+        new = self.generation + 1
+        for name, itemsize in (("vectors.f16", np.dtype(np.float16).itemsize * self.meta["dim"]),
+                               ("segments.bin", SEGMENT_DTYPE.itemsize)):
+            self._truncate(name, itemsize)
+            target = self._path(name, new)
+            target.unlink(missing_ok=True)
+            try:
+                os.link(self._path(name), target)
+            except OSError:
+                shutil.copyfile(self._path(name), target)
+        self._write_durably(centroids, self._path("ivf_centroids.npy", new))
+        self._write_durably(self._assign(self.vectors, centroids).astype("<i4"), self._path("ivf_assign.i4", new))
+        self.meta["ivf"] = {"nlist": nlist, "trained_on": self.count}
+        self._switch_generation(new)
+        return nlist
+
+    # -- search --------------------------------------------------------------
+
+    def _ivf_index(self):
+        if self._ivf is None:
+            centroids = np.load(self._path("ivf_centroids.npy"))
+            assign = np.fromfile(self._path("ivf_assign.i4"), dtype="<i4", count=self.count)
+            order = np.argsort(assign, kind='stable').astype(np.int64)
+            offsets = np.searchsorted(assign[order], np.arange(len(centroids) + 1))
+            self._ivf = (centroids, order, offsets)
+        return self._ivf
+
+    def search(self, query: np.ndarray, k: int = 10, nprobe: int = NPROBE, exact: bool = False,
+               min_similarity: float = MIN_SIMILARITY) -> List[Dict[str, Any]]:
+        """
+        Top-k segments most similar to a query embedding.
+
+        Args:
+            query: Raw query embedding (same method as the index), standardized like the rows
+            k: Number of results
+            nprobe: Inverted lists scanned when the IVF layer is used
+            exact: Always scan every row
+            min_similarity: Rows scoring below this are not returned
+
+        Returns:
+            list: {"episode", "speaker", "start", "end", "similarity"} dicts, best first
+        """
+        if self.count == 0:
+            return []
+        q = self._standardize(query)[0]
+        use_ivf = not exact and self.meta["ivf"] is not None and self.count > FLAT_SEARCH_ROWS
+
+        if use_ivf:
+            centroids, order, offsets = self._ivf_index()
+            lists = _top_k(centroids @ q, min(nprobe, len(centroids)))
+            rows = np.sort(np.concatenate([order[offsets[c]:offsets[c + 1]] for c in lists]))
+            scores = np.asarray(self.vectors[rows], dtype=np.float32) @ q
+            best = _top_k(scores, k)
+            rows, scores = rows[best], scores[best]
+        else:
+            rows = np.empty(0, dtype=np.int64)
+            scores = np.empty(0, dtype=np.float32)
+            for begin in range(0, self.count, SEARCH_CHUNK_ROWS):
+                chunk_scores = np.asarray(self.vectors[begin:begin + SEARCH_CHUNK_ROWS], dtype=np.float32) @ q
+                chunk_best = _top_k(chunk_scores, k)
+                rows = np.concatenate([rows, chunk_best + begin])
+                scores = np.concatenate([scores, chunk_scores[chunk_best]])
+            best = _top_k(scores, k)
+            rows, scores = rows[best], scores[best]
+
+        keep = scores >= min_similarity
+        rows, scores = rows[keep], scores[keep]
+        records = self.segments[rows]
+        labels = self.meta["labels"]
+        episodes = self.meta["episodes"]
+        return [
+            {
+                "episode": episodes[r["episode"]]["episode_id"],
+                "speaker": labels[r["speaker"]],
+                "start": round(float(r["start"]), 2),
+                "end": round(float(r["end"]), 2),
+                "similarity": round(min(float(s), 1.0), 4)  # float16 rounding can overshoot 1
+            }
+            for r, s in zip(records, scores)
+        ]
+
+
+def group_by_episode(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Summarize search results per episode.
+
+    Args:
+        results: search() output
+
+    Returns:
+        list: {"episode", "matches", "best_similarity", "speakers", "first_start"} per episode, best first
+    """
+    episodes: Dict[str, Dict[str, Any]] = {}
+    for r in results:
+        entry = episodes.setdefault(r["episode"], {"episode": r["episode"], "matches": 0, "best_similarity": -1.0,
+                                                   "speakers": set(), "first_start": r["start"]})
+        entry["matches"] += 1
+        entry["best_similarity"] = max(entry["best_similarity"], r["similarity"])
+        entry["speakers"].add(r["speaker"])
+        entry["first_start"] = min(entry["first_start"], r["start"])
+    summary = sorted(episodes.values(), key=lambda e: e["best_similarity"], reverse=True)
+    for entry in summary:
+        entry["speakers"] = sorted(entry["speakers"])
+    return summary
+
+
+def index_diarization(
+    audio_file_path: str,
+    segments: List[Dict[str, Any]],
+    episode_id: str,
+    index_dir: str = VOICE_INDEX_DIR,
+    method: str = "mfcc",
+    library_path: str = VOICEPRINTS_PATH
+) -> int:
+    """
+    Embed an episode's diarization segments and append them to the voice index.
+
+    Args:
+        audio_file_path: Audio the segment times refer to
+        segments: Diarization segments (speaker/start/end)
+        episode_id: Episode identifier
+        index_dir: Index directory
+        method: Speaker embedding method for a new index ("mfcc" or "pyannote")
+        library_path: Voiceprint library whose statistics standardize a new index
+
+    Returns:
+        int: Number of segments indexed
+    """
+    from voiceprints import load_library, read_snippet
+
+    index = VoiceIndex(index_dir)
+    method, embed_fn = load_speaker_embedder(index.meta["method"] or method)
+    usable = [s for s in segments if s["end"] - s["start"] >= MIN_EMBEDDING_SEC]
+    if not usable:
+        print(f"⚠️  No segments of at least {MIN_EMBEDDING_SEC}s to index for {episode_id}")
+        return 0
+
+    start_time = time.time()
+    with sf.SoundFile(audio_file_path) as audio:
+        embeddings = np.stack([
+            embed_fn(read_snippet(audio, s["start"], s["end"], MAX_SNIPPET_SEC), audio.samplerate) for s in usable
+        ])
+    added = index.add(episode_id, audio_file_path, embeddings, usable, method, load_library(library_path))
+    print(f"🗂️  Indexed {added} segment embeddings of {episode_id} in {time.time() - start_time:.1f}s "
+          f"({index.count} rows in {index_dir})")
+    return added
+
+
+def query_embedding(
+    index: VoiceIndex,
+    voiceprint: Optional[str] = None,
+    audio_path: Optional[str] = None,
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+    library_path: str = VOICEPRINTS_PATH
+) -> np.ndarray:
+    """
+    Build a query vector from an enrolled voiceprint or an audio clip.
+
+    Args:
+        index: Index the query will run against (fixes the embedding method)
+        voiceprint: Name of an enrolled speaker (voiceprints.py library)
+        audio_path: Audio clip of the voice
+        start: Clip start in seconds (default: file start)
+        end: Clip end in seconds (default: file end)
+        library_path: Voiceprint library holding the enrolled speaker
+
+    Returns:
+        np.ndarray: Raw query embedding (VoiceIndex.search standardizes it)
+    """
+    from voiceprints import load_library, read_snippet
+
+    if voiceprint is not None:
+        library = load_library(library_path)
+        if voiceprint not in library["speakers"]:
+            raise ValueError(f"No enrolled voiceprint named {voiceprint}")
+        if library["method"] != index.meta["method"]:
+            raise ValueError(f"Voiceprints are {library['method']} embeddings but the index holds {index.meta['method']}")
+        return np.asarray(library["speakers"][voiceprint]["centroid"], dtype=np.float32)
+
+    method, embed_fn = load_speaker_embedder(index.meta["method"])
+    if method != index.meta["method"]:
+        raise ValueError(f"Index holds {index.meta['method']} embeddings but only {method} embeddings are available")
+    with sf.SoundFile(audio_path) as audio:
+        duration = audio.frames / audio.samplerate
+        snippet = read_snippet(audio, start or 0.0, end or duration, max_sec=duration)
+        return embed_fn(snippet, audio.samplerate)
+
+
+def main(argv: Optional[List[str]] = None):
+    """Main function for the voice index CLI."""
+    parser = argparse.ArgumentParser(description='Corpus-wide speaker embedding index')
+    parser.add_argument('--index-dir', default=VOICE_INDEX_DIR)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    add_parser = subparsers.add_parser('add', help='Index an episode from its diarization output')
+    add_parser.add_argument('--episode-id', required=True)
+    add_parser.add_argument('--audio', default="data/processed/podcast_16k_mono.wav")
+    add_parser.add_argument('--diarization', default="outputs/audio_features/diarization_segments.json")
+    add_parser.add_argument('--method', default='mfcc', choices=['mfcc', 'pyannote'])
+
+    train_parser = subparsers.add_parser('train', help='Train the IVF layer')
+    train_parser.add_argument('--nlist', type=int, default=None)
+
+    query_parser = subparsers.add_parser('query', help='Find segments of a voice across episodes')
+    source = query_parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--voiceprint', help='Enrolled speaker name')
+    source.add_argument('--audio', help='Audio clip of the voice')
+    query_parser.add_argument('--start', type=float, default=None)
+    query_parser.add_argument('--end', type=float, default=None)
+    query_parser.add_argument('-k', type=int, default=50)
+    query_parser.add_argument('--nprobe', type=int, default=NPROBE)
+    query_parser.add_argument('--exact', action='store_true', help='Scan every row')
+    query_parser.add_argument('--min-similarity', type=float, default=MIN_SIMILARITY,
+                              help='Drop segments scoring below this standardized similarity')
+    query_parser.add_argument('--per-episode', action='store_true', help='Summarize matches per episode')
+
+    subparsers.add_parser('stats', help='Show index size')
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == 'add':
+            with open(args.diarization, 'r', encoding='utf-8') as f:
+                segments = json.load(f)['segments']
+            index_diarization(args.audio, segments, args.episode_id, args.index_dir, args.method)
+        elif args.command == 'train':
+            index = VoiceIndex(args.index_dir)
+            t0 = time.perf_counter()
+            nlist = index.train_ivf(args.nlist)
+            print(f"✅ Trained {nlist} IVF lists over {index.count} rows in {time.perf_counter() - t0:.1f}s")
+        elif args.command == 'query':
+            index = VoiceIndex(args.index_dir)
+            query = query_embedding(index, args.voiceprint, args.audio, args.start, args.end)
+            t0 = time.perf_counter()
+            results = index.search(query, args.k, args.nprobe, args.exact, args.min_similarity)
+            elapsed_ms = (time.perf_counter() - t0) * 1000
+            if args.per_episode:
+                for e in group_by_episode(results):
+                    print(f"  {e['episode']:<20} {e['matches']:>4} match(es)  best {e['best_similarity']:.3f}  "
+                          f"first at {e['first_start']:.1f}s  ({', '.join(e['speakers'])})")
+            else:
+                for r in results:
+                    print(f"  {r['episode']:<20} {r['start']:>9.2f}-{r['end']:<9.2f} {r['speaker']:<15} {r['similarity']:.4f}")
+            print(f"\n{len(results)} result(s) from {index.count} rows in {elapsed_ms:.1f} ms")
+        else:
+            index = VoiceIndex(args.index_dir)
+            print(f"🗂️  {index.count} rows, {len(index.meta['episodes'])} episode(s), "
+                  f"{index.meta['method']} embeddings (dim {index.meta['dim']}), "
+                  f"IVF: {index.meta['ivf'] or 'not trained'}")
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
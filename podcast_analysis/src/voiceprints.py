@@ -0,0 +1,437 @@
+"""
+Voiceprint library: enrolled speakers and automatic labeling of diarization clusters.
+
+Enrolled speakers are stored as embedding centroids (speaker_embedding.py)
+in a JSON library together with the number of snippets behind each one and
+their per-dimension spread, so further enrollment refines a centroid instead
+of replacing it. After diarization, every anonymous cluster (S0, S1, ...) is
+embedded from its longest segments and all clusters are scored against all
+enrolled speakers in one cosine-similarity matrix.
+
+Raw MFCC statistics share a large common component, so every voice scores
+close to 1 against every other. Before scoring, embeddings are standardized
+per dimension against the library (centered on the mean enrolled centroid,
+scaled by the pooled within-speaker deviation). A cluster is mapped only if
+its best score reaches the threshold and beats the runner-up by a margin;
+otherwise the best name is kept as a suggestion only. At least two enrolled
+speakers are needed, since one voice alone gives nothing to standardize
+against.
+
+The mapping is written as JSON and applied by update_speaker_labels.py.
+Several clusters may map to the same person (diarization often splits one
+voice), and unmatched clusters keep their label.
+
+Usage (from the podcast_analysis directory):
+    python src/voiceprints.py enroll "Joe Rogan" data/segments/audio/Joe_Rogan/*.wav
+    python src/voiceprints.py enroll-labeled outputs/audio_features/diarization_segments.json
+    python src/voiceprints.py identify
+    python src/update_speaker_labels.py
+"""
+
+import argparse
+import json
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Tuple, Optional
+
+import numpy as np
+import soundfile as sf
+
+from config import AUDIO_WAV_PATH, SPEAKER_MAPPING_PATH, VOICEPRINTS_PATH
+from speaker_embedding import MIN_EMBEDDING_SEC, cosine_similarity, load_speaker_embedder
+
+# Calibrated on standardized MFCC embeddings of synthetic voices (2-6 enrolled):
+# clusters of an enrolled voice mostly scored 0.78-0.95, voices with clearly
+# different pitch and formants at most 0.67. Near-identical voices (pitch
+# within ~15%, formants within ~7%) are beyond what MFCC statistics separate.
+MATCH_THRESHOLD = 0.75
+MIN_MATCH_MARGIN = 0.2  # best score must beat the second-best speaker by this much
+MIN_SCALE = 1e-6  # floor of the per-dimension scale (dimensions constant across snippets)
+MAX_SEGMENTS_PER_CLUSTER = 30
+MAX_SNIPPET_SEC = 10.0
+ANONYMOUS_LABEL = re.compile(r"^S\d+$")
+
+
+def load_library(library_path: str = VOICEPRINTS_PATH) -> Dict[str, Any]:
+    """
+    Load the voiceprint library (an empty one if the file does not exist).
+
+    Args:
+        library_path: Path to the library JSON
+
+    Returns:
+        dict: {"method", "speakers": {name: {"centroid", "m2", "num_snippets", "duration_sec"}}}
+    """
+    if not Path(library_path).exists():
+        return {"method": None, "speakers": {}}
+    with open(library_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_library(library: Dict[str, Any], library_path: str = VOICEPRINTS_PATH) -> None:
+    """Write the voiceprint library."""
+    Path(library_path).parent.mkdir(parents=True, exist_ok=True)
+    with open(library_path, 'w', encoding='utf-8') as f:
+        json.dump(library, f, indent=2, ensure_ascii=False)
+
+
+def read_snippet(audio: sf.SoundFile, start: float, end: float, max_sec: float = MAX_SNIPPET_SEC) -> np.ndarray:
+    """
+    Read the middle of a time range (at most max_sec) as mono float32.
+
+    Args:
+        audio: Open sound file
+        start: Range start in seconds
+        end: Range end in seconds
+        max_sec: Longest snippet to read
+
+    Returns:
+        np.ndarray: Mono samples
+    """
+    middle = (start + end) / 2
+    half = min(end - start, max_sec) / 2
+    audio.seek(max(0, int((middle - half) * audio.samplerate)))
+    samples = audio.read(int(2 * half * audio.samplerate), dtype='float32', always_2d=True)
+    return samples.mean(axis=1)
+
+
+def embed_segments(
+    audio_file_path: str,
+    segments: List[Dict[str, Any]],
+    embed_fn: Callable[[np.ndarray, int], np.ndarray],
+    max_segments: int = MAX_SEGMENTS_PER_CLUSTER
+) -> Dict[str, Tuple[np.ndarray, int, float]]:
+    """
+    Embed each speaker's longest segments.
+
+    Args:
+        audio_file_path: Audio the segment times refer to
+        segments: Segments with speaker/start/end
+        embed_fn: Speaker embedder (audio, sr) -> vector
+        max_segments: Segments embedded per speaker (longest first)
+
+    Returns:
+        dict: speaker -> (stacked embeddings, number of snippets, seconds of audio used)
+    """
+    by_speaker: Dict[str, List[Dict[str, Any]]] = {}
+    for segment in segments:
+        if segment['end'] - segment['start'] >= MIN_EMBEDDING_SEC:
+            by_speaker.setdefault(segment['speaker'], []).append(segment)
+
+    result = {}
+    with sf.SoundFile(audio_file_path) as audio:
+        for speaker, speaker_segments in sorted(by_speaker.items()):
+            longest = sorted(speaker_segments, key=lambda s: s['end'] - s['start'], reverse=True)[:max_segments]
+            snippets = [read_snippet(audio, s['start'], s['end']) for s in longest]
+            vectors = np.stack([embed_fn(snippet, audio.samplerate) for snippet in snippets])
+            result[speaker] = (vectors, len(snippets), sum(len(s) for s in snippets) / audio.samplerate)
+    return result
+
+
+def enroll_embeddings(library: Dict[str, Any], name: str, vectors: np.ndarray, duration_sec: float, method: str) -> None:
+    """
+    Fold snippet embeddings into a speaker's centroid and spread.
+
+    The centroid is a running mean; m2 is the running sum of squared
+    deviations from it (merged with Chan's parallel update), from which
+    library_statistics derives the within-speaker deviation.
+
+    Args:
+        library: Voiceprint library (updated in place)
+        name: Speaker name
+        vectors: (n, dim) snippet embeddings
+        duration_sec: Seconds of audio behind the embeddings
+        method: Embedding method the vectors come from
+    """
+    if library["method"] not in (None, method):
+        raise ValueError(f"Library holds {library['method']} voiceprints; cannot enroll {method} embeddings")
+    library["method"] = method
+
+    entry = library["speakers"].get(name)
+    vectors = np.asarray(vectors, dtype=np.float64)
+    count = len(vectors)
+    centroid = vectors.mean(axis=0)
+    m2 = ((vectors - centroid) ** 2).sum(axis=0)
+    if entry is not None:
+        previous = np.asarray(entry["centroid"], dtype=np.float64)
+        previous_count = entry["num_snippets"]
+        total = previous_count + count
+        delta = centroid - previous
+        if "m2" in entry:
+            m2 = np.asarray(entry["m2"], dtype=np.float64) + m2 + delta ** 2 * previous_count * count / total
+        centroid = (previous * previous_count + centroid * count) / total
+        count = total
+        duration_sec += entry["duration_sec"]
+    library["speakers"][name] = {
+        "centroid": [round(float(v), 6) for v in centroid],
+        "m2": [round(float(v), 6) for v in m2],
+        "num_snippets": count,
+        "duration_sec": round(duration_sec, 2)
+    }
+
+
+def enroll_speaker(
+    name: str,
+    audio_paths: Iterable[str],
+    library_path: str = VOICEPRINTS_PATH,
+    method: str = "mfcc"
+) -> Dict[str, Any]:
+    """
+    Enroll a speaker from audio files of their voice (e.g. slice_audio_segments output).
+
+    Args:
+        name: Speaker name
+        audio_paths: WAV files containing only this speaker
+        library_path: Path to the library JSON
+        method: Speaker embedding method ("mfcc" or "pyannote")
+
+    Returns:
+        dict: Updated library
+    """
+    library = load_library(library_path)
+    method, embed_fn = load_speaker_embedder(library["method"] or method)
+
+    vectors, duration = [], 0.0
+    for path in audio_paths:
+        with sf.SoundFile(path) as audio:
+            if audio.frames / audio.samplerate < MIN_EMBEDDING_SEC:
+                continue
+            snippet = read_snippet(audio, 0.0, audio.frames / audio.samplerate)
+            vectors.append(embed_fn(snippet, audio.samplerate))
+            duration += len(snippet) / audio.samplerate
+    if not vectors:
+        raise ValueError(f"No usable audio (>= {MIN_EMBEDDING_SEC}s) to enroll {name}")
+
+    enroll_embeddings(library, name, np.stack(vectors), duration, method)
+    save_library(library, library_path)
+    print(f"✅ Enrolled {name}: {len(vectors)} snippets ({duration:.1f}s), "
+          f"{library['speakers'][name]['num_snippets']} in total")
+    return library
+
+
+def enroll_labeled_segments(
+    diarization_file: str,
+    audio_file_path: str = AUDIO_WAV_PATH,
+    library_path: str = VOICEPRINTS_PATH,
+    method: str = "mfcc"
+) -> Dict[str, Any]:
+    """
+    Enroll every named speaker of an already labeled diarization (anonymous S* labels are skipped).
+
+    Args:
+        diarization_file: Diarization JSON whose segments carry speaker names
+        audio_file_path: Audio the segment times refer to
+        library_path: Path to the library JSON
+        method: Speaker embedding method ("mfcc" or "pyannote")
+
+    Returns:
+        dict: Updated library
+    """
+    with open(diarization_file, 'r', encoding='utf-8') as f:
+        segments = [s for s in json.load(f)['segments'] if not ANONYMOUS_LABEL.match(s['speaker'])]
+    if not segments:
+        raise ValueError(f"No named speakers in {diarization_file}")
+
+    library = load_library(library_path)
+    method, embed_fn = load_speaker_embedder(library["method"] or method)
+    for name, (vectors, count, duration) in embed_segments(audio_file_path, segments, embed_fn).items():
+        enroll_embeddings(library, name, vectors, duration, method)
+        print(f"✅ Enrolled {name}: {count} snippets ({duration:.1f}s)")
+    save_library(library, library_path)
+    return library
+
+
+def library_statistics(library: Dict[str, Any]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Per-dimension center and scale used to standardize embeddings before scoring.
+
+    The center is the mean of the enrolled centroids (every speaker weighs the
+    same); the scale is the pooled within-speaker standard deviation of the
+    enrolled snippets, so dimensions that vary within one voice count less
+    than those that separate voices. Entries enrolled before m2 was recorded
+    fall back to the spread of the centroids.
+
+    Args:
+        library: Voiceprint library with at least one speaker
+
+    Returns:
+        tuple: (center, scale) vectors
+    """
+    entries = [library["speakers"][name] for name in sorted(library["speakers"])]
+    centroids = np.array([entry["centroid"] for entry in entries], dtype=np.float64)
+    center = centroids.mean(axis=0)
+    if all("m2" in entry for entry in entries):
+        variance = np.sum([entry["m2"] for entry in entries], axis=0) / sum(e["num_snippets"] for e in entries)
+    else:
+        variance = centroids.var(axis=0)
+    return center, np.maximum(np.sqrt(variance), MIN_SCALE)
+
+
+def match_clusters(
+    cluster_centroids: Dict[str, np.ndarray],
+    library: Dict[str, Any],
+    threshold: float = MATCH_THRESHOLD,
+    min_margin: float = MIN_MATCH_MARGIN
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Match cluster centroids to enrolled speakers with one batched cosine similarity.
+
+    Centroids are standardized with library_statistics first. A cluster is
+    mapped when its best score reaches threshold and exceeds the second-best
+    score by min_margin; with fewer than two enrolled speakers nothing is
+    mapped.
+
+    Args:
+        cluster_centroids: Cluster label -> centroid
+        library: Voiceprint library
+        threshold: Minimum standardized similarity for a match
+        min_margin: Minimum lead of the best speaker over the runner-up
+
+    Returns:
+        dict: Cluster label -> {"speaker" (None if unmatched), "suggestion" (best
+        speaker), "score", "margin", "scores" per enrolled speaker}
+    """
+    names = sorted(library["speakers"])
+    labels = sorted(cluster_centroids)
+    if not names or not labels:
+        return {label: {"speaker": None, "suggestion": None, "score": None, "margin": None, "scores": {}}
+                for label in labels}
+
+    center, scale = library_statistics(library)
+    enrolled = (np.array([library["speakers"][name]["centroid"] for name in names], dtype=np.float64) - center) / scale
+    clusters = (np.array([cluster_centroids[l] for l in labels], dtype=np.float64) - center) / scale
+    scores = cosine_similarity(clusters, enrolled).reshape(len(labels), len(names))
+    ranked = np.sort(scores, axis=1)
+    best = scores.argmax(axis=1)
+    best_scores = ranked[:, -1]
+    margins = best_scores - ranked[:, -2] if len(names) > 1 else np.zeros(len(labels))
+    confident = (len(names) > 1) & (best_scores >= threshold) & (margins >= min_margin)
+
+    return {
+        label: {
+            "speaker": names[best[i]] if confident[i] else None,
+            "suggestion": names[best[i]],
+            "score": round(float(best_scores[i]), 4),
+            "margin": round(float(margins[i]), 4),
+            "scores": {name: round(float(s), 4) for name, s in zip(names, scores[i])}
+        }
+        for i, label in enumerate(labels)
+    }
+
+
+def identify_speakers(
+    audio_file_path: str = AUDIO_WAV_PATH,
+    diarization_file: str = "outputs/audio_features/diarization_segments.json",
+    output_file_path: str = SPEAKER_MAPPING_PATH,
+    library_path: str = VOICEPRINTS_PATH,
+    threshold: float = MATCH_THRESHOLD,
+    min_margin: float = MIN_MATCH_MARGIN
+) -> Dict[str, Any]:
+    """
+    Map diarization clusters to enrolled speakers and save the mapping.
+
+    Only confident matches go into "mapping" (what update_speaker_labels
+    applies); the best speaker of every cluster is reported as "suggestion".
+
+    Args:
+        audio_file_path: Audio the diarization refers to
+        diarization_file: Diarization JSON with anonymous S* labels
+        output_file_path: Where to write the mapping JSON
+        library_path: Path to the library JSON
+        threshold: Minimum standardized similarity for a match
+        min_margin: Minimum lead of the best speaker over the runner-up
+
+    Returns:
+        dict: {"mapping": {cluster: name}, "clusters": match details, ...}
+    """
+    print("🔎 Identifying diarization clusters against the voiceprint library...")
+    start_time = time.time()
+
+    library = load_library(library_path)
+    if not library["speakers"]:
+        raise ValueError(f"No enrolled speakers in {library_path}; run 'voiceprints.py enroll' first")
+    method, embed_fn = load_speaker_embedder(library["method"])
+    if method != library["method"]:
+        raise ValueError(f"Library holds {library['method']} voiceprints but only {method} embeddings are available")
+    if len(library["speakers"]) < 2:
+        print("⚠️  Only one enrolled speaker: scores cannot be standardized, so no cluster is mapped automatically")
+
+    with open(diarization_file, 'r', encoding='utf-8') as f:
+        segments = [s for s in json.load(f)['segments'] if ANONYMOUS_LABEL.match(s['speaker'])]
+
+    clusters = embed_segments(audio_file_path, segments, embed_fn)
+    matches = match_clusters({label: vectors.mean(axis=0) for label, (vectors, _, _) in clusters.items()},
+                             library, threshold, min_margin)
+    for label, (_, count, duration) in clusters.items():
+        matches[label].update({"num_snippets": count, "duration_sec": round(duration, 2)})
+
+    result = {
+        "audio_file": audio_file_path,
+        "diarization_file": diarization_file,
+        "method": method,
+        "threshold": threshold,
+        "min_margin": min_margin,
+        "mapping": {label: m["speaker"] for label, m in matches.items() if m["speaker"] is not None},
+        "clusters": matches
+    }
+
+    Path(output_file_path).parent.mkdir(parents=True, exist_ok=True)
+    with open(output_file_path, 'w', encoding='utf-8') as f:
+        json.dump(result, f, indent=2, ensure_ascii=False)
+
+    for label, m in matches.items():
+        target = m["speaker"] or f"(no match, label kept; closest: {m['suggestion']})"
+        print(f"   {label} -> {target}  [score {m['score']}, margin {m['margin']}]")
+    print(f"💾 Speaker mapping saved to: {output_file_path} ({time.time() - start_time:.1f}s)")
+    return result
+
+
+def main(argv: Optional[List[str]] = None):
+    """Main function to manage voiceprints and identify speakers."""
+    parser = argparse.ArgumentParser(description='Voiceprint enrollment and automatic speaker labeling')
+    parser.add_argument('--library', default=VOICEPRINTS_PATH, help='Voiceprint library JSON')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    enroll = subparsers.add_parser('enroll', help='Enroll a speaker from WAV files of their voice')
+    enroll.add_argument('name', help='Speaker name (e.g., "Joe Rogan")')
+    enroll.add_argument('audio', nargs='+', help='WAV files containing only this speaker')
+    enroll.add_argument('--method', default='mfcc', choices=['mfcc', 'pyannote'])
+
+    labeled = subparsers.add_parser('enroll-labeled', help='Enroll the named speakers of a labeled diarization')
+    labeled.add_argument('diarization', help='Diarization JSON with speaker names')
+    labeled.add_argument('--audio', default=AUDIO_WAV_PATH)
+    labeled.add_argument('--method', default='mfcc', choices=['mfcc', 'pyannote'])
+
+    identify = subparsers.add_parser('identify', help='Map diarization clusters to enrolled speakers')
+    identify.add_argument('--audio', default=AUDIO_WAV_PATH)
+    identify.add_argument('--diarization', default='outputs/audio_features/diarization_segments.json')
+    identify.add_argument('--output', default=SPEAKER_MAPPING_PATH)
+    identify.add_argument('--threshold', type=float, default=MATCH_THRESHOLD)
+    identify.add_argument('--min-margin', type=float, default=MIN_MATCH_MARGIN)
+
+    subparsers.add_parser('list', help='Show enrolled speakers')
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == 'enroll':
+            enroll_speaker(args.name, args.audio, args.library, args.method)
+        elif args.command == 'enroll-labeled':
+            enroll_labeled_segments(args.diarization, args.audio, args.library, args.method)
+        elif args.command == 'identify':
+            identify_speakers(args.audio, args.diarization, args.output, args.library, args.threshold,
+                              args.min_margin)
+        else:
+            library = load_library(args.library)
+            print(f"📚 {len(library['speakers'])} enrolled speaker(s) ({library['method']} embeddings)")
+            for name, entry in sorted(library['speakers'].items()):
+                print(f"   {name}: {entry['num_snippets']} snippets, {entry['duration_sec']:.1f}s")
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,310 @@
+"""
+Array-backed word and segment tables shared by the JSON stages.
+
+A transcript is held as two structured NumPy arrays instead of one dict per
+word:
+
+- words: (start, end, token) rows, 20 bytes each, grouped by segment; token
+  is a code into an interned Vocabulary, so a word that occurs thousands of
+  times is stored once
+- segments: (start, end, speaker, first_word, num_words) rows, where speaker
+  is a code into the sorted speaker list and first_word/num_words slice the
+  word table
+
+Segment texts are kept as one string per segment. Converters read and write
+the existing JSON schemas (ASR transcript_words.json and
+transcript_with_speakers.json); files are read lazily through json_stream.
+A 10-hour recording (~150k words) takes a few MB here versus hundreds of MB of word
+dicts.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from json_stream import iter_segments
+
+WORD_DTYPE = np.dtype([("start", "<f8"), ("end", "<f8"), ("token", "<i4")])
+SEGMENT_DTYPE = np.dtype([("start", "<f8"), ("end", "<f8"), ("speaker", "<i4"),
+                          ("first_word", "<i8"), ("num_words", "<i4")])
+PAIR_CHUNK = 1 << 22  # candidate pairs materialized at once by overlapping_pairs
+
+
+class Vocabulary:
+    """Interned word tokens: each distinct string is stored once and referenced by code."""
+
+    __slots__ = ("tokens", "_codes")
+
+    def __init__(self, tokens: Iterable[str] = ()):
+        self.tokens: List[str] = []
+        self._codes: Dict[str, int] = {}
+        for token in tokens:
+            self.intern(token)
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    def intern(self, token: str) -> int:
+        """Return the code of a token, adding it if new."""
+        code = self._codes.get(token)
+        if code is None:
+            code = self._codes[token] = len(self.tokens)
+            self.tokens.append(token)
+        return code
+
+    def decode(self, codes: Iterable[int]) -> List[str]:
+        """Tokens of a sequence of codes."""
+        tokens = self.tokens
+        return [tokens[code] for code in codes]
+
+
+def words_from_asr(asr_data: Dict[str, Any], vocabulary: Optional[Vocabulary] = None) -> Tuple[np.ndarray, Vocabulary]:
+    """
+    Word table of an ASR transcript (transcript_words.json), in transcript order.
+
+    Words are stripped and empty words are skipped, as merge_speakers does.
+
+    Args:
+        asr_data: ASR transcript with segments[].words[] (start, end, word); the
+            segments may be any iterable, e.g. json_stream.iter_segments
+        vocabulary: Vocabulary to intern into (a new one by default)
+
+    Returns:
+        tuple: (WORD_DTYPE array, vocabulary)
+    """
+    vocabulary = vocabulary if vocabulary is not None else Vocabulary()
+    starts, ends, tokens = [], [], []
+    intern = vocabulary.intern
+    for segment in asr_data["segments"]:
+        for word in segment.get("words", ()):
+            text = word.get("word", "").strip()
+            if text:
+                starts.append(word["start"])
+                ends.append(word["end"])
+                tokens.append(intern(text))
+    words = np.empty(len(starts), dtype=WORD_DTYPE)
+    words["start"] = starts
+    words["end"] = ends
+    words["token"] = tokens
+    return words, vocabulary
+
+
+def overlapping_pairs(
+    query_starts: np.ndarray,
+    query_ends: np.ndarray,
+    starts: np.ndarray,
+    ends: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    All (query, interval) pairs with positive overlap.
+
+    Intervals are sorted by start with a running maximum of their ends, so the
+    candidates of a query are one contiguous range found by searchsorted;
+    candidates are expanded in chunks of PAIR_CHUNK pairs and filtered exactly
+    with overlap = min(ends) - max(starts) > 0.
+
+    Args:
+        query_starts: Query interval starts
+        query_ends: Query interval ends
+        starts: Interval starts (any order)
+        ends: Interval ends
+
+    Returns:
+        tuple: (query indices, interval indices, overlaps), ordered by query
+    """
+    query_starts = np.asarray(query_starts, dtype=np.float64)
+    query_ends = np.asarray(query_ends, dtype=np.float64)
+    starts = np.asarray(starts, dtype=np.float64)
+    ends = np.asarray(ends, dtype=np.float64)
+    empty = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64))
+    if len(query_starts) == 0 or len(starts) == 0:
+        return empty
+
+    order = np.argsort(starts, kind='stable')
+    sorted_starts = starts[order]
+    reach = np.maximum.accumulate(ends[order])
+    lo = np.searchsorted(reach, query_starts, side='right')
+    hi = np.searchsorted(sorted_starts, query_ends, side='left')
+    counts = np.maximum(hi - lo, 0)
+    cumulative = np.cumsum(counts)
+
+    results = []
+    first = 0
+    while first < len(query_starts):
+        # Largest run of queries whose candidates fit in one chunk (at least one query)
+        base = cumulative[first - 1] if first else 0
+        last = max(int(np.searchsorted(cumulative, base + PAIR_CHUNK, side='right')), first + 1)
+        chunk_counts = counts[first:last]
+        queries = np.repeat(np.arange(first, last), chunk_counts)
+        within = np.arange(len(queries)) - np.repeat(np.cumsum(chunk_counts) - chunk_counts, chunk_counts)
+        positions = lo[queries] + within
+        overlap = (np.minimum(query_ends[queries], ends[order[positions]])
+                   - np.maximum(query_starts[queries], sorted_starts[positions]))
+        keep = overlap > 0
+        results.append((queries[keep], order[positions[keep]], overlap[keep]))
+        first = last
+
+    return tuple(np.concatenate(parts) for parts in zip(*results)) if results else empty
+
+
+class TranscriptTable:
+    """A speaker-attributed transcript as word/segment tables (transcript_with_speakers.json schema)."""
+
+    __slots__ = ("words", "segments", "vocabulary", "speakers", "texts", "metadata")
+
+    def __init__(self, words: np.ndarray, segments: np.ndarray, vocabulary: Vocabulary,
+                 speakers: Sequence[str], texts: Optional[List[str]] = None,
+                 metadata: Optional[Dict[str, Any]] = None):
+        self.words = words
+        self.segments = segments
+        self.vocabulary = vocabulary
+        self.speakers = list(speakers)
+        self.texts = texts
+        self.metadata = dict(metadata or {})
+
+    def __len__(self) -> int:
+        return len(self.segments)
+
+    @classmethod
+    def from_segments(cls, raw_segments: Iterable[Dict[str, Any]],
+                      metadata: Optional[Dict[str, Any]] = None) -> "TranscriptTable":
+        """
+        Build the tables from segment dicts, consumed one at a time.
+
+        Args:
+            raw_segments: Segments with speaker, start, end, text, words (any iterable,
+                e.g. json_stream.iter_segments)
+            metadata: Top-level fields to keep
+
+        Returns:
+            TranscriptTable: Segments in input order
+        """
+        first_seen: Dict[str, int] = {}
+        vocabulary = Vocabulary()
+        intern = vocabulary.intern
+
+        seg_starts, seg_ends, seg_speakers, seg_counts = [], [], [], []
+        word_starts, word_ends, tokens, texts = [], [], [], []
+        for segment in raw_segments:
+            words = segment.get("words", ())
+            seg_starts.append(segment["start"])
+            seg_ends.append(segment["end"])
+            seg_speakers.append(first_seen.setdefault(segment["speaker"], len(first_seen)))
+            seg_counts.append(len(words))
+            for word in words:
+                word_starts.append(word["start"])
+                word_ends.append(word["end"])
+                tokens.append(intern(word["word"]))
+            texts.append(segment.get("text", ""))
+
+        # Speaker codes index the sorted speaker list
+        speakers = sorted(first_seen)
+        to_sorted = np.empty(len(speakers), dtype=np.int32)
+        for code, speaker in enumerate(speakers):
+            to_sorted[first_seen[speaker]] = code
+
+        segments = np.empty(len(seg_starts), dtype=SEGMENT_DTYPE)
+        segments["start"] = seg_starts
+        segments["end"] = seg_ends
+        segments["speaker"] = to_sorted[np.asarray(seg_speakers, dtype=np.int64)]
+        segments["num_words"] = seg_counts
+        segments["first_word"] = np.cumsum(segments["num_words"], dtype=np.int64) - segments["num_words"]
+
+        words = np.empty(len(word_starts), dtype=WORD_DTYPE)
+        words["start"] = word_starts
+        words["end"] = word_ends
+        words["token"] = tokens
+        return cls(words, segments, vocabulary, speakers, texts, metadata)
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "TranscriptTable":
+        """
+        Build the tables from transcript_with_speakers.json data.
+
+        Args:
+            data: Parsed transcript (segments with speaker, start, end, text, words)
+
+        Returns:
+            TranscriptTable: Segments in file order; other top-level keys kept as metadata
+        """
+        metadata = {key: value for key, value in data.items() if key not in ("segments", "speakers")}
+        return cls.from_segments(data["segments"], metadata)
+
+    @classmethod
+    def load(cls, path: str) -> "TranscriptTable":
+        """Load a transcript_with_speakers.json file, streaming its segments."""
+        fields: Dict[str, Any] = {}
+        table = cls.from_segments(iter_segments(path, fields))
+        table.metadata = {key: value for key, value in fields.items() if key != "speakers"}
+        return table
+
+    # -- views ---------------------------------------------------------------
+
+    @property
+    def word_counts(self) -> np.ndarray:
+        """Number of words per segment."""
+        return self.segments["num_words"]
+
+    @property
+    def word_speakers(self) -> np.ndarray:
+        """Speaker code of every word row."""
+        return np.repeat(self.segments["speaker"], self.segments["num_words"])
+
+    def segment_text(self, index: int) -> str:
+        """Text of a segment (joined words when no text was stored)."""
+        if self.texts is not None:
+            return self.texts[index]
+        segment = self.segments[index]
+        first = int(segment["first_word"])
+        return " ".join(self.vocabulary.decode(self.words["token"][first:first + int(segment["num_words"])]))
+
+    def speaker_words(self, code: int) -> np.ndarray:
+        """Word rows of one speaker, sorted by start (stable)."""
+        words = self.words[self.word_speakers == code]
+        return words[np.argsort(words["start"], kind='stable')]
+
+    # -- converters ----------------------------------------------------------
+
+    def segment_dict(self, index: int, with_words: bool = True) -> Dict[str, Any]:
+        """
+        One segment in the JSON schema.
+
+        Args:
+            index: Segment index
+            with_words: Include the word dicts; otherwise a "word_count" field is added instead
+
+        Returns:
+            dict: Segment (speaker, start, end, text, words | word_count)
+        """
+        segment = self.segments[index]
+        result = {
+            "speaker": self.speakers[segment["speaker"]],
+            "start": float(segment["start"]),
+            "end": float(segment["end"]),
+            "text": self.segment_text(index),
+        }
+        first = int(segment["first_word"])
+        count = int(segment["num_words"])
+        if with_words:
+            rows = self.words[first:first + count]
+            result["words"] = [
+                {"start": start, "end": end, "word": token}
+                for start, end, token in zip(rows["start"].tolist(), rows["end"].tolist(),
+                                             self.vocabulary.decode(rows["token"].tolist()))
+            ]
+        else:
+            result["word_count"] = count
+        return result
+
+    def segment_dicts(self, with_words: bool = True) -> List[Dict[str, Any]]:
+        """All segments in the JSON schema (see segment_dict)."""
+        return [self.segment_dict(index, with_words) for index in range(len(self.segments))]
+
+    def to_json_header(self) -> Dict[str, Any]:
+        """Top-level fields of the JSON schema, without segments (for streaming writers)."""
+        used = sorted({self.speakers[code] for code in np.unique(self.segments["speaker"]).tolist()})
+        return {**self.metadata, "speakers": used}
+
+    def to_json(self) -> Dict[str, Any]:
+        """The transcript in the transcript_with_speakers.json schema."""
+        return {**self.to_json_header(), "segments": self.segment_dicts()}
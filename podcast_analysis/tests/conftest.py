@@ -0,0 +1,58 @@
+"""
+Shared pytest setup: the pipeline modules are flat scripts in ../src that
+import each other by module name, so src is put on sys.path.
+
+Run from the podcast_analysis directory:
+    python -m pytest -q tests
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+
+def make_segment(speaker, start, end, words):
+    """Transcript segment whose words are (text, start, end) tuples."""
+    return {
+        "speaker": speaker,
+        "start": start,
+        "end": end,
+        "text": " ".join(w for w, _, _ in words),
+        "words": [{"word": w, "start": s, "end": e} for w, s, e in words],
+    }
+
+
+# Two speakers with a backchannel, an interruption and a long run
+SAMPLE_SEGMENTS = [
+    make_segment("Joe Rogan", 0.0, 4.0, [("so", 0.0, 0.5), ("tell", 0.5, 1.0), ("me", 1.0, 1.5),
+                                         ("about", 1.5, 2.5), ("america", 2.5, 4.0)]),
+    make_segment("Donald Trump", 3.5, 9.0, [("make", 3.5, 4.5), ("america", 4.5, 5.5), ("great", 5.5, 6.5),
+                                            ("again", 6.5, 9.0)]),
+    make_segment("Joe Rogan", 6.0, 6.4, [("yeah", 6.0, 6.4)]),
+    make_segment("Donald Trump", 9.2, 12.0, [("believe", 9.2, 10.0), ("me", 10.0, 12.0)]),
+    make_segment("Joe Rogan", 11.0, 16.0, [("wait", 11.0, 11.5), ("make", 12.0, 12.5), ("america", 12.5, 13.0),
+                                           ("great", 13.0, 14.0), ("what", 14.0, 16.0)]),
+    make_segment("Donald Trump", 16.5, 20.0, [("exactly", 16.5, 20.0)]),
+]
+
+
+@pytest.fixture
+def sample_segments():
+    """Deep copy of SAMPLE_SEGMENTS (tests may mutate it)."""
+    return json.loads(json.dumps(SAMPLE_SEGMENTS))
+
+
+@pytest.fixture
+def write_transcript(tmp_path):
+    """Factory writing a transcript_with_speakers.json-style file under tmp_path."""
+    def write(relative_path, segments):
+        path = tmp_path / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = {"audio_file": "data/processed/podcast_16k_mono.wav", "sample_rate": 16000, "segments": segments}
+        path.write_text(json.dumps(data), encoding="utf-8")
+        return str(path)
+    return write
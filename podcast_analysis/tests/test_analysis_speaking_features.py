@@ -0,0 +1,107 @@
+import json
+
+import numpy as np
+import pytest
+
+from analysis_speaking_features import (
+    basic_speaker_stats,
+    compute_turn_taking,
+    detect_interruptions,
+    sweep_merge_gap,
+    turn_taking_stats,
+)
+
+# Outputs of the original (pre-vectorization) implementation on SAMPLE_SEGMENTS
+BASELINE_BASIC_SPEAKERS = {
+    "Joe Rogan": {"total_speaking_time_sec": 9.4, "total_words": 11, "num_segments": 3,
+                  "total_speaking_time_min": 0.15666666666666668, "words_per_minute": 70.2127659574468},
+    "Donald Trump": {"total_speaking_time_sec": 11.8, "total_words": 7, "num_segments": 3,
+                     "total_speaking_time_min": 0.19666666666666668, "words_per_minute": 35.593220338983045},
+}
+BASELINE_TURN_TAKING = {
+    "speakers": ["Donald Trump", "Joe Rogan"],
+    "transitions": {"Donald Trump->Donald Trump": 0, "Donald Trump->Joe Rogan": 2,
+                    "Joe Rogan->Donald Trump": 3, "Joe Rogan->Joe Rogan": 0},
+    "total_transitions": 5,
+    "alternation_rate": 1.0,
+    "runs": {
+        "Donald Trump": {"num_runs": 3, "avg_run_segments": 1.0, "avg_run_duration_sec": 3.9333333333333336,
+                         "max_run_duration_sec": 5.5, "max_run_segments": 1, "total_speaking_time_sec": 11.8},
+        "Joe Rogan": {"num_runs": 3, "avg_run_segments": 1.0, "avg_run_duration_sec": 3.1333333333333333,
+                      "max_run_duration_sec": 5.0, "max_run_segments": 1, "total_speaking_time_sec": 9.4},
+    },
+    "merged_segments_info": {"original_segments": 6, "merged_segments": 6, "merge_gap_threshold_sec": 0.5},
+}
+BASELINE_INTERRUPTIONS = [(3.5, "Donald Trump", "Joe Rogan", 0.5), (11.0, "Joe Rogan", "Donald Trump", 1.0)]
+
+
+def assert_contains(expected, actual):
+    """Every field of expected is in actual with the same value (later versions may add fields)."""
+    if isinstance(expected, dict):
+        for key, value in expected.items():
+            assert key in actual, key
+            assert_contains(value, actual[key])
+    elif isinstance(expected, float):
+        assert actual == pytest.approx(expected)
+    else:
+        assert actual == expected
+
+
+@pytest.fixture
+def transcript(write_transcript, sample_segments):
+    return write_transcript("transcript_with_speakers.json", sample_segments)
+
+
+def test_matches_baseline_on_sample(transcript, tmp_path):
+    assert_contains(BASELINE_BASIC_SPEAKERS, basic_speaker_stats(transcript, str(tmp_path / "out/basic.json"))["speakers"])
+    assert_contains(BASELINE_TURN_TAKING, turn_taking_stats(transcript, str(tmp_path / "out/turns.json")))
+    interruptions = detect_interruptions(transcript, str(tmp_path / "out/interruptions.json"))["interruptions"]
+    assert [(i["time"], i["interrupter"], i["interrupted"], i["overlap_duration"]) for i in interruptions] \
+        == BASELINE_INTERRUPTIONS
+
+
+def test_turn_taking_of_empty_transcript(write_transcript, tmp_path):
+    result = turn_taking_stats(write_transcript("empty.json", []), str(tmp_path / "out/turns.json"))
+    assert result["total_transitions"] == 0
+    assert result["alternation_rate"] == 0.0
+    assert result["runs"] == {}
+    assert json.loads((tmp_path / "out/turns.json").read_text())["speakers"] == []
+
+
+def test_compute_turn_taking_empty_and_single():
+    core = compute_turn_taking(np.zeros(0), np.zeros(0), np.zeros(0, dtype=int), 0)
+    assert all(len(v) == 0 for v in core.values())
+
+    core = compute_turn_taking([1.0], [2.5], [0], 1)
+    assert core["transition_matrix"].tolist() == [[0]]
+    assert core["run_durations"].tolist() == [1.5]
+    assert core["turn_segment_counts"].tolist() == [1]
+
+
+def test_single_segment_transcript(write_transcript, sample_segments, tmp_path):
+    path = write_transcript("single.json", sample_segments[:1])
+    result = turn_taking_stats(path, str(tmp_path / "out/turns.json"))
+    assert result["total_transitions"] == 0
+    assert result["runs"]["Joe Rogan"]["num_runs"] == 1
+    assert basic_speaker_stats(path, str(tmp_path / "out/basic.json"))["speakers"]["Joe Rogan"]["total_words"] == 5
+
+
+def test_run_length_encoding_of_turns_and_runs():
+    # A: two segments 0.3 s apart (one turn), then 2 s later a new A turn; B; A
+    starts = [0.0, 1.3, 4.0, 6.0, 8.0]
+    ends = [1.0, 2.0, 5.0, 7.0, 9.0]
+    codes = [0, 0, 0, 1, 0]
+
+    core = compute_turn_taking(starts, ends, codes, 2, merge_gap_sec=0.5)
+
+    assert core["turn_codes"].tolist() == [0, 0, 1, 0]
+    assert core["turn_segment_counts"].tolist() == [2, 1, 1, 1]
+    assert core["turn_ends"].tolist() == [2.0, 5.0, 7.0, 9.0]
+    assert core["transition_matrix"].tolist() == [[1, 1], [1, 0]]
+    assert core["run_codes"].tolist() == [0, 1, 0]
+    assert core["run_turns"].tolist() == [2, 1, 1]
+    assert core["run_durations"].tolist() == [5.0, 1.0, 1.0]
+
+    segments = [{"start": s, "end": e, "speaker": "AB"[c]} for s, e, c in zip(starts, ends, codes)]
+    merged = [summary["merged_segments"] for summary in sweep_merge_gap(segments, [0.0, 0.5, 3.0])]
+    assert merged == [5, 4, 3]
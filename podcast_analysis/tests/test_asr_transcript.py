@@ -0,0 +1,44 @@
+import functools
+import json
+
+import numpy as np
+import soundfile as sf
+
+from asr_transcript import transcribe_podcast, transcribe_with_librosa
+from json_stream import load_json
+import pcm_cache
+
+
+def write_audio(path, seconds, sr=16000):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    sf.write(path, np.zeros(int(seconds * sr), dtype=np.float32), sr)
+    return str(path)
+
+
+def write_regions(path, regions):
+    path.write_text(json.dumps({"regions": regions}))
+    return str(path)
+
+
+def test_no_speech_regions_give_an_empty_transcript(tmp_path, monkeypatch):
+    # Keep the decoded test audio out of the project's PCM cache
+    monkeypatch.setattr(pcm_cache, "load_pcm",
+                        functools.partial(pcm_cache.load_pcm, cache_dir=str(tmp_path / "cache")))
+    audio = write_audio(tmp_path / "podcast_16k_mono.wav", 2.0)
+    output = tmp_path / "out" / "transcript_words.json"
+
+    result = transcribe_podcast(audio, str(output), write_regions(tmp_path / "speech_regions.json", []))
+
+    assert result["num_segments"] == 0
+    assert load_json(output)["segments"] == []
+
+
+def test_librosa_fallback_maps_regions_to_source_time(tmp_path):
+    audio = write_audio(tmp_path / "podcast_16k_mono.wav", 60.0)
+    regions = write_regions(tmp_path / "speech_regions.json",
+                            [{"start": 5.0, "end": 15.0}, {"start": 30.0, "end": 40.0}])
+
+    result = transcribe_with_librosa(audio, str(tmp_path / "out" / "transcript_words.json"), regions)
+
+    assert [(s["start"], s["end"]) for s in result["segments"]] == [(5.0, 15.0), (30.0, 40.0)]
+    assert result["segments"][1]["words"][0]["start"] == 30.0
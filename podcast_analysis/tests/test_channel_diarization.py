@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+import soundfile as sf
+
+from channel_diarization import diarize_channels
+
+SR = 16000
+
+
+def test_left_right_and_both_active_spans(tmp_path):
+    rng = np.random.default_rng(0)
+    n = 12 * SR
+    left = 0.001 * rng.standard_normal(n)
+    right = 0.001 * rng.standard_normal(n)
+
+    def speech(start, end):
+        return 0.1 * rng.standard_normal(int((end - start) * SR))
+
+    # Left only (with -20 dB bleed into the right mic), right only (bleed into the left), then both
+    span = slice(1 * SR, 3 * SR)
+    left[span] += speech(1, 3)
+    right[span] += 0.1 * left[span]
+    span = slice(4 * SR, 6 * SR)
+    right[span] += speech(4, 6)
+    left[span] += 0.1 * right[span]
+    left[7 * SR:9 * SR] += speech(7, 9)
+    right[7 * SR:9 * SR] += speech(7, 9)
+
+    paths = []
+    for name, channel in (("A", left), ("B", right)):
+        paths.append(str(tmp_path / f"speaker_{name}.wav"))
+        sf.write(paths[-1], channel.astype(np.float32), SR, subtype='FLOAT')
+
+    result = diarize_channels(paths[0], paths[1], str(tmp_path / "diarization_segments.json"),
+                              cache_dir=str(tmp_path / "cache"))
+
+    spans = [(s["speaker"], s["start"], s["end"]) for s in result["segments"]]
+    assert [speaker for speaker, _, _ in spans] == ["S0", "S1", "S0", "S1"]
+    expected = [(1.0, 3.0), (4.0, 6.0), (7.0, 9.0), (7.0, 9.0)]
+    for (_, start, end), (expected_start, expected_end) in zip(spans, expected):
+        assert start == pytest.approx(expected_start, abs=0.03)
+        assert end == pytest.approx(expected_end, abs=0.03)
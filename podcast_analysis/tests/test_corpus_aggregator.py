@@ -0,0 +1,52 @@
+import pytest
+
+from corpus_aggregator import add_episode, add_episodes, load_store, query_speaker
+from json_stream import episode_id_from_path
+
+
+def test_default_episode_ids_come_from_the_path(tmp_path):
+    assert episode_id_from_path(tmp_path / "episodes/ep042/outputs/audio_features/transcript_with_speakers.json") == "ep042"
+    assert episode_id_from_path(tmp_path / "outputs/episodes/ep043/transcript_with_speakers.json") == "ep043"
+    assert episode_id_from_path(tmp_path / "ep044.json") == "ep044"
+
+
+def test_batch_add_keeps_every_episode_and_saves_once(tmp_path, write_transcript, sample_segments, monkeypatch):
+    import corpus_aggregator
+    a = write_transcript("ep1/transcript_with_speakers.json", sample_segments)
+    b = write_transcript("ep2/transcript_with_speakers.json", sample_segments[:3])
+    store_path = str(tmp_path / "store.json")
+    saves = []
+    save_store = corpus_aggregator.save_store
+    monkeypatch.setattr(corpus_aggregator, "save_store", lambda *args: saves.append(1) or save_store(*args))
+
+    add_episodes([a, b], store_path=store_path)
+
+    assert len(saves) == 1
+    store = load_store(store_path)
+    assert sorted(store["episodes"]) == ["ep1", "ep2"]
+    assert store["speakers"]["Joe Rogan"]["episodes"] == 2
+
+
+def test_duplicate_episode_id_is_rejected_unless_replacing(tmp_path, write_transcript, sample_segments):
+    path = write_transcript("ep1/transcript_with_speakers.json", sample_segments)
+    store_path = str(tmp_path / "store.json")
+    add_episode(path, store_path=store_path)
+
+    with pytest.raises(ValueError, match="already in the corpus store"):
+        add_episode(path, store_path=store_path)
+    with pytest.raises(ValueError, match="given twice"):
+        add_episodes([path, path], ["x", "x"], replace=True, store_path=store_path)
+
+    add_episode(path, replace=True, store_path=store_path)
+    assert query_speaker("Joe Rogan", store_path)["episodes"] == 1
+
+
+def test_store_round_trip_matches_a_fresh_summary(tmp_path, write_transcript, sample_segments):
+    store_path = str(tmp_path / "store.json")
+    add_episode(write_transcript("a.json", sample_segments), store_path=store_path)
+    add_episode(write_transcript("b.json", sample_segments), store_path=store_path)
+    result = query_speaker("Donald Trump", store_path)
+    assert result["episodes"] == 2
+    assert result["num_segments"] == 6
+    assert result["total_speaking_time_min"] == pytest.approx(2 * (5.5 + 2.8 + 3.5) / 60)
+    assert result["total_words"] == 14
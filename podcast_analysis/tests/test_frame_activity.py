@@ -0,0 +1,29 @@
+import numpy as np
+
+from frame_activity import hysteresis, mask_runs, smooth_activity
+
+
+def mask(text):
+    return np.array([c == "#" for c in text])
+
+
+def test_mask_runs():
+    starts, ends = mask_runs(mask("##..#...###"))
+    assert starts.tolist() == [0, 4, 8]
+    assert ends.tolist() == [2, 5, 11]
+    assert [a.tolist() for a in mask_runs(mask(""))] == [[], []]
+    assert [a.tolist() for a in mask_runs(mask("...."))] == [[], []]
+
+
+def test_hysteresis_keeps_runs_that_reach_the_on_threshold():
+    above_on = mask("..#.......#.")
+    above_off = mask(".####..##.##")
+    assert hysteresis(above_on, above_off).tolist() == mask(".####.....##").tolist()
+
+
+def test_smooth_activity_bridges_gaps_then_drops_bursts():
+    active = mask("###.###.....#..")
+    smoothed = smooth_activity(active, min_speech_frames=2, min_silence_frames=2)
+    assert smoothed.tolist() == mask("#######........").tolist()
+    # Leading and trailing silence is never bridged
+    assert smooth_activity(mask("..##.."), 1, 5).tolist() == mask("..##..").tolist()
@@ -0,0 +1,81 @@
+import asyncio
+import os
+
+from job_server import JobServer, LRUCache, run_episode_pipeline
+
+
+class ListQueue(list):
+    """Stands in for the manager queue inside a worker."""
+
+    def put(self, event):
+        self.append(event)
+
+
+def test_cache_rereads_a_rewritten_file(tmp_path):
+    path = tmp_path / "transcript_with_speakers.json"
+    path.write_text('{"segments": [1]}')
+    cache = LRUCache(1 << 20)
+    assert cache.get_json(str(path)) == {"segments": [1]}
+    assert cache.get_json(str(path)) == {"segments": [1]}
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # Same size, new contents and modification time
+    path.write_text('{"segments": [2]}')
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert cache.get_json(str(path)) == {"segments": [2]}
+    assert len(cache._entries) == 1 and cache.size == stat.st_size
+
+    cache.invalidate_prefix(str(tmp_path) + os.sep)
+    assert cache.size == 0 and not cache._entries
+
+
+def test_failed_stage_is_followed_by_the_terminal_event(tmp_path):
+    progress = ListQueue()
+    outputs = run_episode_pipeline("job1", str(tmp_path / "missing.mp3"), str(tmp_path / "ep1"), {}, progress)
+
+    assert outputs == {}
+    assert [(e["stage"], e["status"]) for e in progress] == [
+        ("preprocess", "started"), ("preprocess", "failed"), (None, "failed")
+    ]
+    assert progress[-1]["error"] == progress[1]["error"]
+
+
+def test_job_ends_on_the_worker_terminal_event(tmp_path):
+    server = JobServer(str(tmp_path))
+    (tmp_path / "ep1").mkdir()
+    path = tmp_path / "ep1" / "transcript_with_speakers.json"
+    path.write_text('{"segments": []}')
+    server.cache.get(str(path))
+    server.jobs["job1"] = {"job_id": "job1", "episode_id": "ep1", "status": "queued",
+                           "stages": {}, "events": [], "outputs": {}, "error": None}
+
+    async def worker_then_finish():
+        future = asyncio.get_running_loop().create_future()
+        future.set_result({"transcript": str(path)})
+        server._publish({"job_id": "job1", "stage": "merge", "status": "done", "time": 0.0})
+        server._publish({"job_id": "job1", "stage": None, "status": "done",
+                         "outputs": {"transcript": str(path)}, "time": 0.0})
+        await server._finish("job1", future)
+
+    asyncio.run(worker_then_finish())
+    job = server.jobs["job1"]
+    assert job["status"] == "done"
+    assert job["outputs"] == {"transcript": str(path)}
+    assert [e["stage"] for e in job["events"]] == ["merge", None]
+    assert not server.cache._entries
+
+
+def test_worker_crash_fails_the_job(tmp_path):
+    server = JobServer(str(tmp_path))
+    server.jobs["job1"] = {"job_id": "job1", "episode_id": "ep1", "status": "running",
+                           "stages": {}, "events": [], "outputs": {}, "error": None}
+
+    async def crash():
+        future = asyncio.get_running_loop().create_future()
+        future.set_exception(RuntimeError("worker died"))
+        await server._finish("job1", future)
+
+    asyncio.run(crash())
+    assert server.jobs["job1"]["status"] == "failed"
+    assert server.jobs["job1"]["error"] == "RuntimeError: worker died"
@@ -0,0 +1,77 @@
+import json
+
+import pytest
+
+import json_stream
+from json_stream import JsonArrayWriter, iter_array, iter_segments, iter_words, load_json, read_fields
+
+SEGMENTS = [
+    {"speaker": "Joe Rogan", "start": 0.0, "end": 1.5, "text": "héllo there",
+     "words": [{"word": "héllo", "start": 0.0, "end": 0.6}, {"word": "there", "start": 0.7, "end": 1.5}]},
+    {"speaker": "Elon Musk", "start": 1e16, "end": 12345678901234567890, "text": "", "words": []},
+    {"speaker": None, "start": -2.5e-3, "end": True, "nested": [[], {}, [1, [2, {"x": "]}"}]]]},
+]
+
+
+def test_writer_round_trip_with_header_and_trailer(tmp_path):
+    path = tmp_path / "out" / "transcript.json"
+    with JsonArrayWriter(str(path), header={"audio_file": "a.wav"}) as writer:
+        for segment in SEGMENTS:
+            writer.write(segment)
+        writer.close(trailer={"num_segments": writer.count})
+
+    assert load_json(path) == {"audio_file": "a.wav", "segments": SEGMENTS, "num_segments": 3}
+    fields = {}
+    assert list(iter_segments(str(path), fields)) == SEGMENTS
+    assert fields == {"audio_file": "a.wav", "num_segments": 3}
+    assert not (tmp_path / "out" / "transcript.json.partial").exists()
+
+
+@pytest.mark.parametrize("chunk", [1, 2, 3, 7, 64])
+def test_reader_handles_values_split_across_chunks(tmp_path, monkeypatch, chunk):
+    monkeypatch.setattr(json_stream, "READ_CHUNK_CHARS", chunk)
+    path = tmp_path / "indented.json"
+    document = {"audio_file": "a.wav", "segments": SEGMENTS, "language": "en", "total": 1e16}
+    path.write_text(json.dumps(document, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    fields = {}
+    assert list(iter_array(str(path), "segments", fields)) == SEGMENTS
+    assert fields == {"audio_file": "a.wav", "language": "en", "total": 1e16}
+    assert read_fields(str(path)) == fields
+
+
+def test_empty_and_missing_arrays(tmp_path):
+    path = tmp_path / "empty.json"
+    with JsonArrayWriter(str(path), header={"audio_file": "a.wav"}):
+        pass
+    assert load_json(path) == {"audio_file": "a.wav", "segments": []}
+    assert list(iter_segments(str(path))) == []
+
+    (tmp_path / "none.json").write_text("{}")
+    assert list(iter_segments(str(tmp_path / "none.json"))) == []
+
+
+def test_iter_words_adds_the_segment_speaker(tmp_path):
+    path = tmp_path / "t.json"
+    path.write_text(json.dumps({"segments": SEGMENTS[:2] + [{"words": [{"word": "x", "start": 0, "end": 1}]}]}))
+    assert list(iter_words(str(path))) == [
+        {"word": "héllo", "start": 0.0, "end": 0.6, "speaker": "Joe Rogan"},
+        {"word": "there", "start": 0.7, "end": 1.5, "speaker": "Joe Rogan"},
+        {"word": "x", "start": 0, "end": 1},
+    ]
+
+
+def test_failed_write_leaves_no_file(tmp_path):
+    path = tmp_path / "t.json"
+    with pytest.raises(RuntimeError):
+        with JsonArrayWriter(str(path)) as writer:
+            writer.write({"a": 1})
+            raise RuntimeError("stage failed")
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_malformed_file_raises(tmp_path):
+    path = tmp_path / "bad.json"
+    path.write_text('{"segments": [{"a": 1} {"b": 2}]}')
+    with pytest.raises(ValueError):
+        list(iter_segments(str(path)))
@@ -0,0 +1,67 @@
+import json
+
+import numpy as np
+
+from live_stream import LiveTranscriptionEngine, run_live
+
+SR = 16000
+# Words (text, start, end) in stream time, grouped into the segments Whisper would return
+SCRIPT = [
+    [("hello", 0.5, 1.0), ("there", 1.2, 1.8), ("friend", 2.0, 2.6)],
+    [("how", 3.5, 3.9), ("are", 4.0, 4.3), ("you", 4.4, 4.9)],
+    [("fine", 6.0, 6.5), ("thanks", 8.2, 8.8)],
+]
+
+
+def clock_blocks(seconds, block_sec=0.5):
+    """Blocks whose samples are their own stream time, so the fake ASR knows where the buffer starts."""
+    n = int(block_sec * SR)
+    for begin in range(0, int(seconds * SR), n):
+        yield (np.arange(begin, begin + n) / SR).astype(np.float32)
+
+
+def fake_transcribe(audio):
+    """Whisper-style result for the scripted words heard completely within the buffer (buffer-relative times)."""
+    offset = round(float(audio[0]) * SR) / SR
+    end = offset + len(audio) / SR
+    segments = []
+    for words in SCRIPT:
+        heard = [{"word": f" {w}", "start": s - offset, "end": e - offset}
+                 for w, s, e in words if s >= offset and e <= end]
+        if heard:
+            segments.append({"text": "".join(w["word"] for w in heard), "words": heard})
+    return {"segments": segments}
+
+
+def test_words_inside_the_holdback_wait_for_more_audio():
+    engine = LiveTranscriptionEngine(fake_transcribe, lambda audio, sr: np.ones(4), step_sec=5.0, holdback_sec=2.0)
+
+    committed = []
+    for i, block in enumerate(clock_blocks(10.0)):
+        for event in engine.feed(block):
+            committed.append(((i + 1) * 0.5, event["text"], event["start"], event["end"]))
+    flushed = [(event["text"], event["start"], event["end"]) for event in engine.flush()]
+
+    # At 5 s the horizon is 3 s: "how" (ends 3.9) is held back. At 10 s it is 8 s: "thanks" (ends 8.8) is held back.
+    assert committed == [
+        (5.0, "hello there friend", 0.5, 2.6),
+        (10.0, "how are you", 3.5, 4.9),
+        (10.0, "fine", 6.0, 6.5),
+    ]
+    assert flushed == [("thanks", 8.2, 8.8)]
+    assert [s["text"] for s in engine.segments] == ["hello there friend", "how are you", "fine", "thanks"]
+    assert engine.segments[3]["words"] == [{"start": 8.2, "end": 8.8, "word": "thanks"}]
+    assert {s["speaker"] for s in engine.segments} == {"S0"}
+
+
+def test_run_live_records_when_each_segment_was_committed(tmp_path):
+    events_path = tmp_path / "events.jsonl"
+    transcript = run_live(clock_blocks(10.0), "clock", events_path=str(events_path),
+                          output_path=str(tmp_path / "transcript.json"), transcribe_fn=fake_transcribe)
+
+    events = [json.loads(line) for line in events_path.read_text().splitlines()]
+    # lag = audio received at commit time - segment end
+    assert [(e["text"], e["lag_sec"]) for e in events] == [
+        ("hello there friend", 2.4), ("how are you", 5.1), ("fine", 3.5), ("thanks", 1.2)
+    ]
+    assert [s["text"] for s in transcript["segments"]] == [e["text"] for e in events]
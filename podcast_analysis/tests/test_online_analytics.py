@@ -0,0 +1,39 @@
+import json
+
+from online_analytics import OnlineConversationStats
+
+
+def words_of(segments):
+    return [(s["speaker"], w["start"], w["end"], w["word"]) for s in segments for w in s["words"]]
+
+
+def test_checkpoint_keeps_pending_words(sample_segments):
+    words = words_of(sample_segments)
+    cut = len(words) // 2 + 1  # inside a segment
+
+    uninterrupted = OnlineConversationStats()
+    for word in words:
+        uninterrupted.add_word(*word)
+    uninterrupted.flush()
+
+    first = OnlineConversationStats()
+    for word in words[:cut]:
+        first.add_word(*word)
+    pending = list(first._pending_words)
+    state = json.loads(json.dumps(first.to_dict()))
+    assert pending and first._pending_words == pending  # to_dict does not close the segment
+    assert state["pending_words"] == pending
+
+    resumed = OnlineConversationStats.from_dict(state)
+    for word in words[cut:]:
+        resumed.add_word(*word)
+    resumed.flush()
+
+    assert resumed.snapshot() == uninterrupted.snapshot()
+
+
+def test_empty_state_round_trips():
+    stats = OnlineConversationStats.from_dict(json.loads(json.dumps(OnlineConversationStats().to_dict())))
+    snapshot = stats.snapshot()
+    assert snapshot["speakers"] == {}
+    assert snapshot["turn_taking"]["num_turns"] == 0
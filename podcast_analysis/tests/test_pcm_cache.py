@@ -0,0 +1,92 @@
+import json
+
+import numpy as np
+import soundfile as sf
+
+from pcm_cache import load_pcm, pcm_blocks
+
+
+def write_audio(path, samples, sr=16000):
+    sf.write(path, samples, sr, subtype='FLOAT')
+    return str(path)
+
+
+def test_cached_samples_match_the_file_and_are_read_only(tmp_path):
+    samples = np.random.default_rng(0).uniform(-0.5, 0.5, 40000).astype(np.float32)
+    path = write_audio(tmp_path / "mono.wav", samples)
+    cache_dir = str(tmp_path / "cache")
+
+    audio, sr = load_pcm(path, 16000, cache_dir)
+    again, _ = load_pcm(path, 16000, cache_dir)
+
+    assert sr == 16000
+    np.testing.assert_array_equal(audio, samples)
+    np.testing.assert_array_equal(again, samples)
+    assert not audio.flags.writeable
+    assert len(list((tmp_path / "cache").glob("*.npy"))) == 1
+
+
+def test_stereo_sources_are_averaged(tmp_path):
+    left = np.linspace(-0.5, 0.5, 1000, dtype=np.float32)
+    path = write_audio(tmp_path / "stereo.wav", np.stack([left, np.zeros_like(left)], axis=1))
+    audio, _ = load_pcm(path, None, str(tmp_path / "cache"))
+    np.testing.assert_allclose(audio, left / 2, atol=1e-7)
+
+
+def test_rewritten_source_replaces_its_entry(tmp_path):
+    path = tmp_path / "mono.wav"
+    cache_dir = tmp_path / "cache"
+    write_audio(path, np.zeros(1000, dtype=np.float32))
+    load_pcm(str(path), None, str(cache_dir))
+
+    write_audio(path, np.full(2000, 0.25, dtype=np.float32))
+    audio, _ = load_pcm(str(path), None, str(cache_dir))
+
+    assert len(audio) == 2000 and audio[0] == np.float32(0.25)
+    assert len(list(cache_dir.glob("*.npy"))) == 1
+
+
+def test_blocks_match_soundfile_blocks(tmp_path):
+    samples = np.random.default_rng(1).uniform(-0.5, 0.5, 10007).astype(np.float32)
+    path = write_audio(tmp_path / "mono.wav", samples)
+
+    cached = list(pcm_blocks(path, 1000, overlap=120, cache_dir=str(tmp_path / "cache")))
+    expected = list(sf.blocks(path, blocksize=1000, overlap=120, dtype='float32'))
+
+    assert len(cached) == len(expected)
+    for block, reference in zip(cached, expected):
+        np.testing.assert_array_equal(block, reference)
+
+
+def test_empty_source(tmp_path):
+    path = write_audio(tmp_path / "empty.wav", np.zeros(0, dtype=np.float32))
+    audio, sr = load_pcm(path, None, str(tmp_path / "cache"))
+    assert len(audio) == 0 and sr == 16000
+    assert list(pcm_blocks(path, 1000, cache_dir=str(tmp_path / "cache"))) == []
+
+
+def test_no_cache_reads_the_same_samples(tmp_path):
+    samples = np.random.default_rng(2).uniform(-0.5, 0.5, 5003).astype(np.float32)
+    path = write_audio(tmp_path / "stereo.wav", np.stack([samples, -samples / 2], axis=1))
+
+    cached, _ = load_pcm(path, None, str(tmp_path / "cache"))
+    direct, sr = load_pcm(path, None, None)
+    blocks = list(pcm_blocks(path, 1000, overlap=100, cache_dir=None))
+
+    assert sr == 16000
+    np.testing.assert_array_equal(direct, cached)
+    np.testing.assert_array_equal(np.concatenate([b[100:] for b in blocks[1:]]), cached[1000:])
+
+
+def test_deleted_sources_are_pruned(tmp_path):
+    cache_dir = tmp_path / "cache"
+    gone = write_audio(tmp_path / "gone.wav", np.zeros(1000, dtype=np.float32))
+    load_pcm(gone, None, str(cache_dir))
+    (tmp_path / "gone.wav").unlink()
+
+    kept = write_audio(tmp_path / "kept.wav", np.full(500, 0.5, dtype=np.float32))
+    load_pcm(kept, None, str(cache_dir))
+
+    index = json.loads((cache_dir / "index.json").read_text())
+    assert list(index) == [str(tmp_path / "kept.wav")]
+    assert len(list(cache_dir.glob("*.npy"))) == 1
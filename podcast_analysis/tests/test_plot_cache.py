@@ -0,0 +1,54 @@
+import importlib
+import sys
+
+import pytest
+
+from plot_cache import plot_fingerprint
+
+
+@pytest.fixture
+def builder_module(tmp_path, monkeypatch):
+    """A builder module in its own source directory that uses a helper module next to it."""
+    (tmp_path / "fake_helpers.py").write_text("def dominance(x):\n    return x\n")
+    (tmp_path / "fake_plots.py").write_text(
+        "from plot_cache import declare_plot\n"
+        "from fake_helpers import dominance\n\n"
+        "@declare_plot('fake', inputs=['stats'], outputs=['fake.png'])\n"
+        "def make_fake():\n"
+        "    return dominance(1)\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield importlib.import_module("fake_plots")
+    for name in ("fake_plots", "fake_helpers"):
+        sys.modules.pop(name, None)
+
+
+def test_helper_module_source_is_fingerprinted(tmp_path, builder_module):
+    stats = tmp_path / "outputs" / "stats.json"
+    stats.parent.mkdir()
+    stats.write_text("{}")
+    spec = builder_module.make_fake.plot_spec
+
+    before = plot_fingerprint(spec, [stats], root=tmp_path)
+    assert plot_fingerprint(spec, [stats], root=tmp_path) == before
+
+    (tmp_path / "fake_helpers.py").write_text("def dominance(x):\n    return 2 * x\n")
+    assert plot_fingerprint(spec, [stats], root=tmp_path) != before
+
+
+def test_inputs_are_keyed_by_path_relative_to_the_root(tmp_path, builder_module):
+    spec = builder_module.make_fake.plot_spec
+    for episode in ("ep1", "ep2"):
+        stats = tmp_path / episode / "outputs" / "audio_features" / "stats.json"
+        stats.parent.mkdir(parents=True)
+        stats.write_text("{}")
+    a = tmp_path / "ep1" / "outputs" / "audio_features" / "stats.json"
+    moved = tmp_path / "ep1" / "outputs" / "stats.json"
+    moved.write_text("{}")
+
+    # Same relative layout under another root: same fingerprint
+    assert (plot_fingerprint(spec, [a], root=tmp_path / "ep1")
+            == plot_fingerprint(spec, [tmp_path / "ep2" / "outputs" / "audio_features" / "stats.json"],
+                                root=tmp_path / "ep2"))
+    # Same basename and contents at another path: different fingerprint
+    assert plot_fingerprint(spec, [a], root=tmp_path / "ep1") != plot_fingerprint(spec, [moved], root=tmp_path / "ep1")
@@ -0,0 +1,51 @@
+import json
+
+import pytest
+
+import cli
+import plot_conversation_features as pcf
+import plot_renderer
+import plot_speaker_summary as pss
+from plot_renderer import render_plots
+
+
+@pytest.fixture(autouse=True)
+def restore_project_root(monkeypatch):
+    for module in (pcf, pss):
+        monkeypatch.setattr(module, "PROJECT_ROOT", module.PROJECT_ROOT)
+        monkeypatch.setattr(module, "PLOTS_DIR", module.PLOTS_DIR)
+
+
+def test_cli_root_redirects_plot_inputs_and_outputs(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    episode = tmp_path / "episodes" / "ep42"
+    stats = episode / "outputs" / "audio_features" / "basic_speaker_stats.json"
+    stats.parent.mkdir(parents=True)
+    stats.write_text(json.dumps({"speakers": {
+        "Joe Rogan": {"total_speaking_time_sec": 120.0, "total_words": 300, "num_segments": 4,
+                      "total_speaking_time_min": 2.0, "words_per_minute": 150.0}
+    }}))
+
+    assert cli.main(["-C", str(episode), "plots", "--only", "total_speaking_time", "--workers", "1"]) == 0
+
+    assert (episode / "outputs" / "plots" / "01_total_speaking_time_by_speaker.png").exists()
+    assert pcf.PROJECT_ROOT == episode
+
+
+def test_figures_without_inputs_are_reported_as_missing(tmp_path, capsys):
+    stats = tmp_path / "outputs" / "audio_features" / "basic_speaker_stats.json"
+    stats.parent.mkdir(parents=True)
+    stats.write_text(json.dumps({"speakers": {
+        "Joe Rogan": {"total_speaking_time_sec": 120.0, "total_words": 300, "num_segments": 4,
+                      "total_speaking_time_min": 2.0, "words_per_minute": 150.0}
+    }}))
+    args = ["--root", str(tmp_path), "--only", "total_speaking_time", "rolling_metrics", "--workers", "1"]
+
+    timings = render_plots(["total_speaking_time", "rolling_metrics"], workers=1, root=str(tmp_path))
+    assert list(timings) == ["total_speaking_time"] and timings["total_speaking_time"] > 0
+
+    capsys.readouterr()
+    assert plot_renderer.main(args) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert any(line.split()[1:] == ["total_speaking_time", "cached"] for line in lines)
+    assert any(line.split()[1:] == ["rolling_metrics", "missing", "inputs"] for line in lines)
@@ -0,0 +1,65 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from analysis_speaking_features import basic_speaker_stats, detect_interruptions, speaking_rate_timeseries, turn_taking_stats
+from relabel import ARTIFACT_PATHS, relabel_artifacts
+from rolling_metrics import rolling_metrics
+
+ANALYSES = ("basic_speaker_stats", "speaking_rate_timeseries", "interruptions", "turn_taking_stats", "rolling_metrics")
+
+
+def build_artifacts(root, segments, write_transcript):
+    """Run every analysis relabel_artifacts updates on a transcript written under root."""
+    transcript = write_transcript(Path(root).name + "/" + ARTIFACT_PATHS["transcript"], segments)
+    paths = {name: str(Path(root) / ARTIFACT_PATHS[name]) for name in ANALYSES}
+    basic_speaker_stats(transcript, paths["basic_speaker_stats"])
+    speaking_rate_timeseries(transcript, paths["speaking_rate_timeseries"],
+                             paths["speaking_rate_timeseries"].replace(".json", ".png"), window_size_sec=5.0)
+    detect_interruptions(transcript, paths["interruptions"])
+    turn_taking_stats(transcript, paths["turn_taking_stats"])
+    rolling_metrics(transcript, paths["rolling_metrics"], window_size_sec=8.0, step_size_sec=2.0)
+
+
+def load_artifacts(root):
+    return {name: json.loads((Path(root) / ARTIFACT_PATHS[name]).read_text()) for name in ANALYSES}
+
+
+def rounded(value):
+    """Round floats so folded sums compare equal to recomputed ones."""
+    if isinstance(value, float):
+        return round(value, 9)
+    if isinstance(value, dict):
+        return {k: rounded(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [rounded(v) for v in value]
+    return value
+
+
+@pytest.fixture
+def numbered_segments(sample_segments):
+    """SAMPLE_SEGMENTS with anonymous labels; the backchannel is a third cluster."""
+    labels = {"Joe Rogan": "Speaker 0", "Donald Trump": "Speaker 1"}
+    for segment in sample_segments:
+        segment["speaker"] = labels[segment["speaker"]]
+    sample_segments[2]["speaker"] = "Speaker 2"
+    return sample_segments
+
+
+@pytest.mark.parametrize("mapping, expected_action", [
+    ({"Speaker 1": "Speaker 0"}, "recomputed"),
+    ({"Speaker 0": "Joe Rogan", "Speaker 1": "Donald Trump", "Speaker 2": "Jamie"}, "renamed"),
+], ids=["merge", "rename"])
+def test_relabel_matches_a_fresh_recompute(tmp_path, write_transcript, numbered_segments, mapping, expected_action):
+    build_artifacts(tmp_path / "episode", numbered_segments, write_transcript)
+    actions = relabel_artifacts(mapping, str(tmp_path / "episode"), windows_dir=None, refresh_plots=False)
+
+    relabeled = [{**segment, "speaker": mapping.get(segment["speaker"], segment["speaker"])}
+                 for segment in numbered_segments]
+    build_artifacts(tmp_path / "fresh", relabeled, write_transcript)
+
+    assert actions["interruptions"] == actions["turn_taking_stats"] == expected_action
+    transcript = json.loads((tmp_path / "episode" / ARTIFACT_PATHS["transcript"]).read_text())
+    assert [s["speaker"] for s in transcript["segments"]] == [s["speaker"] for s in relabeled]
+    assert rounded(load_artifacts(tmp_path / "episode")) == rounded(load_artifacts(tmp_path / "fresh"))
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from rolling_metrics import compute_rolling_metrics, rolling_metrics
+
+
+def brute_force(segments, window_start, window_end, speaker):
+    """Speaking seconds and word count of one speaker in one window, by direct clipping."""
+    own = [s for s in segments if s["speaker"] == speaker]
+    speech = sum(max(0.0, min(s["end"], window_end) - max(s["start"], window_start)) for s in own)
+    words = sum(window_start <= w["start"] < window_end for s in own for w in s["words"])
+    return speech, words
+
+
+def test_matches_direct_computation(sample_segments):
+    table = compute_rolling_metrics(sample_segments, window_size_sec=4.0, step_size_sec=1.5)
+    speakers = sorted({s["speaker"] for s in sample_segments})
+
+    assert table["window_start"][0] == 0.0
+    assert max(table["window_end"]) == max(s["end"] for s in sample_segments)
+    for i, (t0, t1) in enumerate(zip(table["window_start"], table["window_end"])):
+        speech = {speaker: brute_force(sample_segments, t0, t1, speaker) for speaker in speakers}
+        total = sum(sec for sec, _ in speech.values())
+        for speaker, (sec, words) in speech.items():
+            assert table[f"speaking_share:{speaker}"][i] == pytest.approx(sec / total if total else 0.0)
+            assert table[f"words_per_minute:{speaker}"][i] == pytest.approx(words / ((t1 - t0) / 60.0))
+
+
+def test_empty_and_single_segment(sample_segments, write_transcript, tmp_path):
+    empty = compute_rolling_metrics([])
+    assert empty == {"window_start": [], "window_end": [], "words_per_minute": [], "transitions": [],
+                     "alternation_rate": [], "interruptions_per_minute": []}
+
+    result = rolling_metrics(write_transcript("single.json", sample_segments[:1]), str(tmp_path / "out/rolling.json"))
+    table = result["table"]
+    assert table["speaking_share:Joe Rogan"] == [1.0]
+    assert table["transitions"] == [0] and table["alternation_rate"] == [0.0]
+    assert np.isclose(table["words_per_minute"][0], 5 / (sample_segments[0]["end"] / 60.0))
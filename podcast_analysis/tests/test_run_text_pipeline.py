@@ -0,0 +1,42 @@
+import json
+
+import pandas as pd
+
+from embeddings_topics import HASHING_MODEL_NAME
+from run_text_pipeline import run_text_pipeline
+
+BOXING = ["uh the fight in the ring went five rounds", "um he threw a punch and won the fight",
+          "the punch in the ring ended the fight", "a fight punch like that wins the ring"]
+ELECTION = ["the election campaign raised money for the vote", "um every vote counts in the election",
+            "the campaign lost the election vote", "the vote after the election campaign"]
+
+
+def test_blocks_and_topic_timeline(tmp_path, monkeypatch, write_transcript):
+    # Eight one-minute segments: boxing for four minutes, then the election
+    segments = [{"speaker": "Joe Rogan" if i % 2 == 0 else "Donald Trump", "start": 60.0 * i,
+                 "end": 60.0 * i + 55.0, "text": text}
+                for i, text in enumerate(BOXING + ELECTION)]
+    transcript = write_transcript("outputs/audio_features/transcript_with_speakers.json", segments)
+    monkeypatch.chdir(tmp_path)
+
+    topic_segments = run_text_pipeline(transcript, block_duration_sec=120.0, n_clusters=2, sim_threshold=0.2,
+                                       model_name=HASHING_MODEL_NAME)
+
+    blocks = json.loads((tmp_path / "outputs" / "text_analysis" / "text_blocks.json").read_text())
+    assert [(b["block_id"], b["start_sec"], b["end_sec"]) for b in blocks] == [
+        (0, 0.0, 115.0), (1, 120.0, 235.0), (2, 240.0, 355.0), (3, 360.0, 475.0)
+    ]
+    assert blocks[0]["text"] == "uh the fight in the ring went five rounds um he threw a punch and won the fight"
+    assert blocks[0]["clean_text"] == "the fight in the ring went five rounds he threw a punch and won the fight"
+
+    similarities = pd.read_csv(tmp_path / "outputs" / "text_analysis" / "block_similarities_and_boundaries.csv")
+    assert similarities["is_boundary"].tolist() == [False, True, False]
+
+    assert [(s["block_ids"], s["start_sec"], s["end_sec"]) for s in topic_segments] == [
+        ([0, 1], 0.0, 235.0), ([2, 3], 240.0, 475.0)
+    ]
+    assert topic_segments[0]["topic_id"] != topic_segments[1]["topic_id"]
+    assert {"fight", "punch", "ring"} <= set(topic_segments[0]["keywords"])
+    assert {"election", "campaign", "vote"} <= set(topic_segments[1]["keywords"])
+    saved = json.loads((tmp_path / "outputs" / "text_analysis" / "final_topic_segments.json").read_text())
+    assert saved == topic_segments
@@ -0,0 +1,37 @@
+import pytest
+
+from transcript_search import add_episode, main, search
+
+
+def test_round_trip_phrase_search(tmp_path, write_transcript, sample_segments):
+    db = str(tmp_path / "search.sqlite")
+    assert add_episode(write_transcript("ep1/transcript_with_speakers.json", sample_segments), db_path=db) == 18
+
+    hits = search("make america great", db)
+    assert [(h["episode_id"], h["speaker"], h["start"], h["end"]) for h in hits] == [
+        ("ep1", "Donald Trump", 3.5, 6.5),
+        ("ep1", "Joe Rogan", 12.0, 14.0),
+    ]
+    assert [h["start"] for h in search("america", db, speaker="Joe Rogan")] == [2.5, 12.5]
+    assert search("great make", db) == []
+
+
+def test_second_episode_keeps_the_first(tmp_path, write_transcript, sample_segments):
+    db = str(tmp_path / "search.sqlite")
+    a = write_transcript("ep1/transcript_with_speakers.json", sample_segments)
+    b = write_transcript("ep2/transcript_with_speakers.json", sample_segments)
+    assert main(["--db", db, "add", a, b]) == 0
+    assert sorted({h["episode_id"] for h in search("exactly", db)}) == ["ep1", "ep2"]
+
+
+def test_collision_fails_unless_replacing(tmp_path, write_transcript, sample_segments):
+    db = str(tmp_path / "search.sqlite")
+    path = write_transcript("ep1/transcript_with_speakers.json", sample_segments)
+    add_episode(path, db_path=db)
+    with pytest.raises(ValueError, match="already indexed"):
+        add_episode(path, db_path=db)
+    assert len(search("exactly", db)) == 1
+
+    add_episode(write_transcript("other/ep1.json", sample_segments[:1]), db_path=db, replace=True)
+    assert search("exactly", db) == []
+    assert main(["--db", db, "add", path, path]) == 1
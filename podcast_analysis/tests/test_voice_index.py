@@ -0,0 +1,114 @@
+import multiprocessing
+
+import numpy as np
+import pytest
+
+from speaker_embedding import mfcc_embedding
+from test_voiceprints import SR, VOICES, make_library, synthetic_voice
+from voice_index import VoiceIndex, group_by_episode, query_embedding
+from voiceprints import save_library
+
+DIM = 16
+
+
+def episode_rows(seed, n=20):
+    rng = np.random.default_rng(seed)
+    embeddings = rng.standard_normal((n, DIM)).astype(np.float32)
+    segments = [{"speaker": f"S{i % 3}", "start": float(i), "end": float(i) + 0.8} for i in range(n)]
+    return embeddings, segments
+
+
+def add_episode(index_dir, seed):
+    embeddings, segments = episode_rows(seed)
+    VoiceIndex(index_dir).add(f"ep{seed}", "audio.wav", embeddings, segments, "mfcc")
+
+
+def assert_episode_intact(index, seed):
+    embeddings, segments = episode_rows(seed)
+    entry = next(e for e in index.meta["episodes"] if e["episode_id"] == f"ep{seed}")
+    rows = slice(entry["first_row"], entry["first_row"] + entry["num_rows"])
+    expected = index._standardize(embeddings)
+    np.testing.assert_allclose(np.asarray(index.vectors[rows], dtype=np.float32), expected, atol=2e-3)
+    assert np.asarray(index.segments["start"][rows]).tolist() == [s["start"] for s in segments]
+
+
+def test_round_trip_search_train_remove(tmp_path):
+    index_dir = str(tmp_path / "index")
+    for seed in range(3):
+        add_episode(index_dir, seed)
+    index = VoiceIndex(index_dir)
+    assert index.count == 60
+
+    query = episode_rows(1)[0][5]
+    best = index.search(query, k=1, exact=True)[0]
+    assert (best["episode"], best["start"], best["speaker"]) == ("ep1", 5.0, "S2")
+
+    index.train_ivf(nlist=4)
+    index.remove_episode("ep0")
+    index = VoiceIndex(index_dir)
+    assert index.count == 40 and [e["episode_id"] for e in index.meta["episodes"]] == ["ep1", "ep2"]
+    for seed in (1, 2):
+        assert_episode_intact(index, seed)
+    assert index.search(query, k=1, exact=True)[0]["episode"] == "ep1"
+
+    add_episode(index_dir, 0)
+    index = VoiceIndex(index_dir)
+    assert index.count == 60
+    assert_episode_intact(index, 0)
+    assert len(index._ivf_index()[1]) == 60  # rows added after training are assigned
+
+
+def test_crash_during_remove_keeps_previous_state(tmp_path, monkeypatch):
+    index_dir = str(tmp_path / "index")
+    for seed in range(2):
+        add_episode(index_dir, seed)
+
+    def crash(self):
+        raise OSError("simulated crash before meta.json is written")
+    monkeypatch.setattr(VoiceIndex, "_save_meta", crash)
+    with pytest.raises(OSError):
+        VoiceIndex(index_dir).remove_episode("ep0")
+    monkeypatch.undo()
+
+    index = VoiceIndex(index_dir)
+    assert index.count == 40
+    for seed in range(2):
+        assert_episode_intact(index, seed)
+
+
+def test_concurrent_writers_are_serialized(tmp_path):
+    index_dir = str(tmp_path / "index")
+    context = multiprocessing.get_context("fork")
+    workers = [context.Process(target=add_episode, args=(index_dir, seed)) for seed in range(6)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+        assert worker.exitcode == 0
+
+    index = VoiceIndex(index_dir)
+    assert index.count == 120
+    for seed in range(6):
+        assert_episode_intact(index, seed)
+
+
+def test_episode_without_the_voice_is_not_returned(tmp_path):
+    embeddings = {name: np.stack([mfcc_embedding(synthetic_voice(f0, formants, seed=100 * i + seed), SR)
+                                  for seed in range(12)])
+                  for i, (name, (f0, formants)) in enumerate(VOICES.items())}
+    library = make_library(embeddings, list(VOICES))
+    library_path = str(tmp_path / "voiceprints.json")
+    save_library(library, library_path)
+
+    index = VoiceIndex(str(tmp_path / "index"))
+    for episode_id, voices in (("with_low", ["low", "high"]), ("without_low", ["mid", "other"])):
+        vectors = np.concatenate([embeddings[name][6:] for name in voices])
+        segments = [{"speaker": f"S{v}", "start": 4.0 * i, "end": 4.0 * i + 4.0}
+                    for v in range(2) for i in range(6)]
+        index.add(episode_id, "audio.wav", vectors, segments, "mfcc", library)
+
+    query = query_embedding(index, voiceprint="low", library_path=library_path)
+    results = index.search(query, k=24, exact=True)
+
+    assert {(r["episode"], r["speaker"]) for r in results} == {("with_low", "S0")}
+    assert [e["episode"] for e in group_by_episode(results)] == ["with_low"]
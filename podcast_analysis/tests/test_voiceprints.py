@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+from scipy.signal import lfilter
+
+from speaker_embedding import mfcc_embedding
+from voiceprints import enroll_embeddings, load_library, match_clusters, save_library
+
+SR = 16000
+# f0 and (formant, bandwidth) pairs of clearly different synthetic voices
+VOICES = {
+    "low": (110, [(700, 80), (1200, 90), (2500, 120)]),
+    "high": (210, [(850, 90), (1600, 100), (2900, 140)]),
+    "mid": (150, [(600, 80), (1000, 90), (2300, 120)]),
+    "other": (180, [(750, 90), (1400, 100), (2700, 130)]),
+}
+
+
+def synthetic_voice(f0, formants, seed, seconds=4.0):
+    """Vowel-like signal: jittered glottal pulses through formant resonators, new vowel every 200 ms."""
+    rng = np.random.default_rng(seed)
+    n = int(seconds * SR)
+    t = np.arange(n) / SR
+    pitch = f0 * (1 + 0.08 * np.sin(2 * np.pi * 0.7 * t + rng.uniform(0, 6)))
+    source = np.diff(np.floor(np.cumsum(pitch) / SR), prepend=0.0) + 0.02 * rng.standard_normal(n)
+    out = np.zeros(n)
+    syllable = int(0.2 * SR)
+    for s in range(0, n, syllable):
+        y = source[s:s + syllable]
+        for fc, bw in formants:
+            fc *= 1 + 0.12 * rng.standard_normal()
+            r = np.exp(-np.pi * bw / SR)
+            y = lfilter([1 - r], [1, -2 * r * np.cos(2 * np.pi * fc / SR), r * r], y)
+        out[s:s + syllable] = y
+    out *= 0.6 + 0.4 * np.sin(2 * np.pi * 4 * t) ** 2
+    return (0.3 * out / np.abs(out).max()).astype(np.float32)
+
+
+@pytest.fixture(scope="module")
+def embeddings():
+    return {name: np.stack([mfcc_embedding(synthetic_voice(f0, formants, seed=100 * i + seed), SR)
+                            for seed in range(12)])
+            for i, (name, (f0, formants)) in enumerate(VOICES.items())}
+
+
+def make_library(embeddings, names):
+    library = {"method": None, "speakers": {}}
+    for name in names:
+        enroll_embeddings(library, name, embeddings[name][:6], 24.0, "mfcc")
+    return library
+
+
+def test_unenrolled_voice_is_not_mapped(embeddings):
+    library = make_library(embeddings, ["low", "high"])
+    matches = match_clusters({name: vectors[6:].mean(axis=0) for name, vectors in embeddings.items()}, library)
+    assert matches["low"]["speaker"] == "low"
+    assert matches["high"]["speaker"] == "high"
+    assert matches["mid"]["speaker"] is None
+    assert matches["other"]["speaker"] is None
+    assert matches["mid"]["suggestion"] in ("low", "high")
+
+
+def test_single_enrolled_speaker_maps_nothing(embeddings):
+    library = make_library(embeddings, ["low"])
+    matches = match_clusters({"S0": embeddings["low"][6:].mean(axis=0)}, library)
+    assert matches["S0"]["speaker"] is None
+    assert matches["S0"]["suggestion"] == "low"
+
+
+def test_incremental_enrollment_round_trip(embeddings, tmp_path):
+    vectors = embeddings["low"]
+    once = {"method": None, "speakers": {}}
+    enroll_embeddings(once, "low", vectors, 48.0, "mfcc")
+
+    path = str(tmp_path / "voiceprints.json")
+    twice = {"method": None, "speakers": {}}
+    enroll_embeddings(twice, "low", vectors[:5], 20.0, "mfcc")
+    save_library(twice, path)
+    twice = load_library(path)
+    enroll_embeddings(twice, "low", vectors[5:], 28.0, "mfcc")
+
+    a, b = once["speakers"]["low"], twice["speakers"]["low"]
+    assert b["num_snippets"] == 12 and b["duration_sec"] == 48.0
+    np.testing.assert_allclose(b["centroid"], a["centroid"], atol=1e-5)
+    np.testing.assert_allclose(b["m2"], a["m2"], rtol=1e-5, atol=1e-4)
@@ -0,0 +1,84 @@
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from analysis_speaking_features import detect_word_overlaps, find_word_overlaps, merge_word_intervals
+from conftest import make_segment
+
+
+def words(intervals):
+    starts = np.array([s for s, _ in intervals], dtype=np.float64)
+    ends = np.array([e for _, e in intervals], dtype=np.float64)
+    return starts, ends, [f"w{i}" for i in range(len(intervals))]
+
+
+def test_touching_words_merge_within_a_speaker():
+    starts, ends, _ = words([(0.0, 1.0), (1.0, 2.0), (2.5, 3.0)])
+    span_starts, span_ends, first_word = merge_word_intervals(starts, ends)
+    assert span_starts.tolist() == [0.0, 2.5]
+    assert span_ends.tolist() == [2.0, 3.0]
+    assert first_word.tolist() == [0, 2]
+
+
+def test_touching_words_of_two_speakers_do_not_overlap():
+    overlaps = find_word_overlaps({"A": words([(0.0, 1.0), (1.0, 2.0)]), "B": words([(2.0, 3.0)])})
+    assert overlaps == []
+
+
+def test_overlap_words_in_a_long_monologue():
+    monologue = [(i * 0.5, (i + 1) * 0.5) for i in range(2000)]  # one touching span of 1000 s
+    overlaps = find_word_overlaps({"A": words(monologue), "B": words([(100.2, 100.9), (700.0, 700.25)])})
+    assert [(o["start"], o["end"], o["first_speaker"]) for o in overlaps] == [(100.2, 100.9, "A"), (700.0, 700.25, "A")]
+    assert overlaps[0]["first_words"] == "w200 w201"  # [100.0, 100.5) and [100.5, 101.0)
+    assert overlaps[1]["first_words"] == "w1400"  # [700.0, 700.5); w1399 only touches 700.0
+    assert overlaps[0]["second_words"] == "w0"
+
+
+def test_matches_brute_force_on_random_words():
+    rng = np.random.default_rng(0)
+    speaker_words = {}
+    for speaker in ("A", "B", "C"):
+        starts = np.sort(np.round(rng.uniform(0, 60, 80), 1))
+        ends = starts + np.round(rng.uniform(0.1, 2.0, 80), 1)  # nested and overlapping words
+        speaker_words[speaker] = (starts, ends, [f"{speaker}{i}" for i in range(80)])
+
+    for overlap in find_word_overlaps(speaker_words):
+        t0, t1 = overlap["start"], overlap["end"]
+        for key, speaker in (("first_words", overlap["first_speaker"]), ("second_words", overlap["second_speaker"])):
+            starts, ends, texts = speaker_words[speaker]
+            span_start = overlap["first_span_start" if key == "first_words" else "second_span_start"]
+            span_starts, span_ends, _ = merge_word_intervals(starts, ends)
+            span = int(np.flatnonzero(span_starts == span_start)[0])
+            expected = [texts[k] for k in range(len(starts))
+                        if span_starts[span] <= starts[k] <= span_ends[span] and starts[k] < t1 and ends[k] > t0]
+            assert overlap[key] == " ".join(expected)
+
+
+def test_three_concurrent_speakers(tmp_path, write_transcript):
+    # A talks over [0, 4] and [10, 11], B over [1.5, 3.5] and [20, 21], C over [3, 5] and [10.5, 12]
+    transcript = write_transcript("transcript_with_speakers.json", [
+        make_segment("A", 0.0, 4.0, [("a1", 0.0, 1.0), ("a2", 1.0, 2.0), ("a3", 2.0, 3.0), ("a4", 3.0, 4.0)]),
+        make_segment("B", 1.5, 3.5, [("b1", 1.5, 2.5), ("b2", 2.5, 3.5)]),
+        make_segment("C", 3.0, 5.0, [("c1", 3.0, 5.0)]),
+        make_segment("A", 10.0, 11.0, [("a5", 10.0, 11.0)]),
+        make_segment("C", 10.5, 12.0, [("c2", 10.5, 12.0)]),
+        make_segment("B", 20.0, 21.0, [("b3", 20.0, 21.0)]),
+    ])
+
+    result = detect_word_overlaps(transcript, str(tmp_path / "word_overlaps.json"))
+
+    assert sorted((o["start"], o["end"], o["first_speaker"], o["second_speaker"], o["first_words"], o["second_words"])
+                  for o in result["overlaps"]) == [
+        (1.5, 3.5, "A", "B", "a2 a3 a4", "b1 b2"),
+        (3.0, 3.5, "B", "C", "b2", "c1"),
+        (3.0, 4.0, "A", "C", "a4", "c1"),
+        (10.5, 11.0, "A", "C", "a5", "c2"),
+    ]
+    pairs = Counter((o["first_speaker"], o["second_speaker"]) for o in result["overlaps"])
+    assert pairs == {("A", "B"): 1, ("A", "C"): 2, ("B", "C"): 1}
+    assert result["stats"]["total_overlaps"] == 4
+    assert result["stats"]["total_overlap_sec"] == pytest.approx(4.0)
+    per_speaker = {speaker: (s["overlaps_started_first"], s["overlaps_joined"], round(s["overlap_time_sec"], 6))
+                   for speaker, s in result["stats"]["per_speaker"].items()}
+    assert per_speaker == {"A": (3, 0, 3.5), "B": (1, 1, 2.5), "C": (0, 3, 2.0)}
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+import word_table
+from word_table import TranscriptTable, overlapping_pairs, words_from_asr
+
+
+def test_round_trip(sample_segments, write_transcript):
+    data = {"audio_file": "a.wav", "segments": sample_segments}
+    table = TranscriptTable.from_json(data)
+
+    assert table.to_json() == {**data, "speakers": sorted({s["speaker"] for s in sample_segments})}
+    assert len(table.words) == sum(len(s["words"]) for s in sample_segments)
+    assert len(table.vocabulary) < len(table.words)  # repeated words are interned once
+
+    loaded = TranscriptTable.load(write_transcript("transcript_with_speakers.json", sample_segments))
+    assert loaded.segment_dicts() == sample_segments
+    assert loaded.metadata["audio_file"] == "data/processed/podcast_16k_mono.wav"
+
+
+def test_empty_and_single_segment(sample_segments):
+    empty = TranscriptTable.from_json({"segments": []})
+    assert len(empty) == 0 and len(empty.words) == 0
+    assert empty.to_json() == {"speakers": [], "segments": []}
+    assert len(empty.speaker_words(0)) == 0
+
+    single = TranscriptTable.from_json({"segments": sample_segments[:1]})
+    assert single.to_json()["segments"] == sample_segments[:1]
+    assert single.segment_dict(0, with_words=False)["word_count"] == len(sample_segments[0]["words"])
+    assert single.word_speakers.tolist() == [0] * len(sample_segments[0]["words"])
+
+
+def test_segment_text_falls_back_to_the_words(sample_segments):
+    table = TranscriptTable.from_json({"segments": sample_segments})
+    table.texts = None
+    assert table.segment_text(1) == " ".join(w["word"] for w in sample_segments[1]["words"])
+
+
+def test_words_from_asr_strips_and_skips_empty_words():
+    words, vocabulary = words_from_asr({"segments": [
+        {"words": [{"word": " Hello", "start": 0.0, "end": 0.5}, {"word": " ", "start": 0.5, "end": 0.6}]},
+        {"words": [{"word": "hello ", "start": 1.0, "end": 1.4}, {"word": "Hello", "start": 2.0, "end": 2.2}]},
+        {},
+    ]})
+    assert vocabulary.decode(words["token"].tolist()) == ["Hello", "hello", "Hello"]
+    assert words["start"].tolist() == [0.0, 1.0, 2.0]
+
+
+@pytest.mark.parametrize("chunk", [1, 7, 1 << 22])
+def test_overlapping_pairs_matches_brute_force(monkeypatch, chunk):
+    monkeypatch.setattr(word_table, "PAIR_CHUNK", chunk)
+    rng = np.random.default_rng(3)
+    starts = rng.uniform(0, 100, 300)
+    ends = starts + rng.exponential(2.0, 300)
+    query_starts = rng.uniform(0, 100, 50)
+    query_ends = query_starts + rng.exponential(5.0, 50)
+
+    queries, intervals, overlaps = overlapping_pairs(query_starts, query_ends, starts, ends)
+
+    expected = sorted(
+        (q, i) for q in range(50) for i in range(300)
+        if min(query_ends[q], ends[i]) - max(query_starts[q], starts[i]) > 0
+    )
+    assert sorted(zip(queries.tolist(), intervals.tolist())) == expected
+    assert np.all(np.diff(queries) >= 0)
+    np.testing.assert_allclose(
+        overlaps, np.minimum(query_ends[queries], ends[intervals]) - np.maximum(query_starts[queries], starts[intervals])
+    )
+    assert all(len(a) == 0 for a in overlapping_pairs([], [], starts, ends))